@@ -13,7 +13,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 # Import models and config
 from app.database import Base
 from app.config import settings
-from app.models import Transaction, EventRecord, AccountingRecord, CashFlow
+from app.models import (
+    Transaction, EventRecord, AccountingRecord, CashFlow, DeletedRecord,
+    TransactionArchive, EventRecordArchive, CashFlowArchive, AccountingRecordArchive
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,43 @@
+"""Add delta export support
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Indexes for (last_modified_date, id) watermark scans
+    op.create_index('idx_transaction_last_modified', 'transactions', ['last_modified_date', 'external_id'])
+    op.create_index('idx_cash_flow_last_modified', 'cash_flows', ['last_modified_date', 'cash_flow_id'])
+    
+    # Create deleted_records (tombstone) table
+    op.create_table(
+        'deleted_records',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, comment='墓碑ID'),
+        sa.Column('entity_type', sa.String(20), nullable=False, comment='实体类型'),
+        sa.Column('entity_id', sa.String(100), nullable=False, comment='实体ID'),
+        sa.Column('transaction_id', sa.String(100), nullable=True, comment='交易流水号'),
+        sa.Column('deleted_date', sa.DateTime(), nullable=False, comment='删除时间'),
+        sa.Column('deleted_by', sa.String(100), nullable=False, comment='删除人'),
+    )
+    
+    # Create indexes for deleted_records
+    op.create_index('idx_deleted_records_type_date', 'deleted_records', ['entity_type', 'deleted_date', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_deleted_records_type_date', table_name='deleted_records')
+    op.drop_table('deleted_records')
+    op.drop_index('idx_cash_flow_last_modified', table_name='cash_flows')
+    op.drop_index('idx_transaction_last_modified', table_name='transactions')
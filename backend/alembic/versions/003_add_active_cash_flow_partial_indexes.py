@@ -0,0 +1,41 @@
+"""Add partial indexes over active cash flows
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+# 与 app.models.cash_flow.ACTIVE_CASH_FLOW_INDEX_WHERE 一致（Enum 列存储枚举名）
+ACTIVE_WHERE = "current_status NOT IN ('CORE_SUCCESS', 'CANCEL_SUCCESS')"
+
+
+def upgrade() -> None:
+    # 在线建索引，不阻塞现金流写入（CONCURRENTLY 不能在事务中执行）
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_active_payment_date_status', 'cash_flows', ['payment_date', 'current_status'],
+            postgresql_where=sa.text(ACTIVE_WHERE), sqlite_where=sa.text(ACTIVE_WHERE),
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_active_currency_direction', 'cash_flows', ['currency', 'direction'],
+            postgresql_where=sa.text(ACTIVE_WHERE), sqlite_where=sa.text(ACTIVE_WHERE),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_active_currency_direction', table_name='cash_flows', postgresql_concurrently=True)
+        op.drop_index('idx_active_payment_date_status', table_name='cash_flows', postgresql_concurrently=True)
@@ -0,0 +1,116 @@
+"""Partition events and cash_flows by month
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.partitioning import (
+    PARTITIONED_TABLES, add_months, month_start, create_partition_sql, default_partition_name
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+# 分区表的主键须包含分区键，数据库不再保证现金流ID/事件ID唯一：
+# 由 CashFlowRepository.create / EventRepository.create 加锁检查后再插入
+PRIMARY_KEYS = {
+    'events': 'event_id',
+    'cash_flows': 'cash_flow_id',
+}
+
+# 迁移时除覆盖已有数据的月份外，额外提前创建的月数（之后由 PartitionManager 维护）
+MONTHS_AHEAD = 3
+
+
+def _capture(conn, table):
+    """读取表上的外键和非主键索引定义，用于在重建后的表上重新创建"""
+    foreign_keys = conn.execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+    ), {'table': table}).fetchall()
+    indexes = conn.execute(sa.text(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexname NOT IN "
+        "(SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'p')"
+    ), {'table': table}).scalars().all()
+    return foreign_keys, indexes
+
+
+def _restore(conn, table, primary_key, foreign_keys, indexes):
+    """在重建后的同名表上创建主键、外键和索引（定义在改名前读取，仍指向原表名）"""
+    conn.execute(sa.text(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})'))
+    for name, definition in foreign_keys:
+        conn.execute(sa.text(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}'))
+    for definition in indexes:
+        # 分区父表上的索引定义为 ON ONLY，重建到普通表时去掉
+        conn.execute(sa.text(definition.replace(' ON ONLY ', ' ON ')))
+
+
+def _data_months(conn, table, key):
+    """已有数据覆盖的月份至当前月之后 MONTHS_AHEAD 个月"""
+    lowest = conn.execute(sa.text(f'SELECT min({key}) FROM {table}')).scalar()
+    current = month_start(date.today())
+    month = month_start(lowest) if lowest is not None and lowest.date() < current else current
+    last = add_months(current, MONTHS_AHEAD)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        # 声明式分区仅适用于 PostgreSQL，其他数据库保持普通表
+        return
+
+    for table, key in PARTITIONED_TABLES.items():
+        source = f'{table}_unpartitioned'
+        foreign_keys, indexes = _capture(conn, table)
+
+        op.rename_table(table, source)
+        conn.execute(sa.text(
+            f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS INCLUDING COMMENTS) '
+            f'PARTITION BY RANGE ({key})'
+        ))
+        for month in _data_months(conn, source, key):
+            conn.execute(sa.text(create_partition_sql(table, month)))
+        # 超出已建分区范围（如远期收付日期）的行落入默认分区，建新分区时由 PartitionManager 移出
+        conn.execute(sa.text(f'CREATE TABLE {default_partition_name(table)} PARTITION OF {table} DEFAULT'))
+
+        conn.execute(sa.text(f'INSERT INTO {table} SELECT * FROM {source}'))
+        op.drop_table(source)
+
+        # 数据载入后再建主键和索引；在分区父表上建的索引会自动在各分区上创建
+        _restore(conn, table, f'{PRIMARY_KEYS[table]}, {key}', foreign_keys, indexes)
+        conn.execute(sa.text(f'ANALYZE {table}'))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    # 已被 PartitionManager 分离的旧分区是独立表，不会并回
+    for table in PARTITIONED_TABLES:
+        source = f'{table}_partitioned'
+        foreign_keys, indexes = _capture(conn, table)
+
+        op.rename_table(table, source)
+        conn.execute(sa.text(f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS INCLUDING COMMENTS)'))
+        conn.execute(sa.text(f'INSERT INTO {table} SELECT * FROM {source}'))
+        conn.execute(sa.text(f'DROP TABLE {source} CASCADE'))
+
+        _restore(conn, table, PRIMARY_KEYS[table], foreign_keys, indexes)
+        conn.execute(sa.text(f'ANALYZE {table}'))
@@ -0,0 +1,74 @@
+"""Add archive tables for matured and invalid transaction graphs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+# 热表 → (主键列, [(索引名, 列, 是否唯一)])
+ARCHIVE_TABLES = {
+    'transactions': ('external_id', [
+        ('idx_transactions_archive_transaction_id', ['transaction_id'], True),
+        ('idx_transactions_archive_trade_date', ['trade_date'], False),
+    ]),
+    'events': ('event_id', [
+        ('idx_events_archive_external_id', ['external_id', 'modified_date'], False),
+        ('idx_events_archive_transaction_id', ['transaction_id', 'modified_date'], False),
+    ]),
+    'cash_flows': ('cash_flow_id', [
+        ('idx_cash_flows_archive_transaction_id', ['transaction_id'], False),
+        ('idx_cash_flows_archive_payment_date', ['payment_date'], False),
+    ]),
+    'accounting_records': ('voucher_id', [
+        ('idx_accounting_records_archive_transaction_id', ['transaction_id', 'actual_accounting_date'], False),
+    ]),
+}
+
+
+def _create_archive_table(conn, table, primary_key):
+    """按热表当前结构创建归档表（不含外键和热表索引）"""
+    archive = f'{table}_archive'
+    if conn.dialect.name == 'postgresql':
+        # LIKE 复用热表的列类型（包括已有的枚举类型），不复制主键、外键和索引
+        conn.execute(sa.text(f'CREATE TABLE {archive} (LIKE {table} INCLUDING DEFAULTS INCLUDING COMMENTS)'))
+        conn.execute(sa.text(f'ALTER TABLE {archive} ADD CONSTRAINT {archive}_pkey PRIMARY KEY ({primary_key})'))
+        op.add_column(archive, sa.Column('archived_date', sa.DateTime(), nullable=False,
+                                         server_default=sa.func.now(), comment='归档时间'))
+        return
+
+    columns = [
+        sa.Column(column['name'], column['type'], nullable=column['nullable'],
+                  primary_key=column['name'] == primary_key)
+        for column in sa.inspect(conn).get_columns(table)
+    ]
+    op.create_table(
+        archive,
+        *columns,
+        sa.Column('archived_date', sa.DateTime(), nullable=False, server_default=sa.func.now(), comment='归档时间'),
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, (primary_key, indexes) in ARCHIVE_TABLES.items():
+        _create_archive_table(conn, table, primary_key)
+        for name, columns, unique in indexes:
+            op.create_index(name, f'{table}_archive', columns, unique=unique)
+
+
+def downgrade() -> None:
+    for table, (_, indexes) in reversed(list(ARCHIVE_TABLES.items())):
+        for name, _, _ in indexes:
+            op.drop_index(name, table_name=f'{table}_archive')
+        op.drop_table(f'{table}_archive')
@@ -0,0 +1,170 @@
+"""Store enum columns as stable integer codes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.enum_codes import ENUM_CODES
+from app.models.enums import (
+    ProductType,
+    TransactionStatus,
+    BackOfficeStatus,
+    SettlementMethod,
+    ConfirmationType,
+    TransactionSource,
+    MatchStatus,
+    CashFlowStatus,
+    Direction,
+    DebitCreditIndicator,
+    DeletedEntityType
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+# 表 → [(列, 枚举类, 是否可空, 001/002 中的 VARCHAR 长度)]；归档表与热表结构相同
+_TRANSACTION_COLUMNS = [
+    ('product', ProductType, False, 50),
+    ('direction', Direction, False, 20),
+    ('status', TransactionStatus, False, 20),
+    ('back_office_status', BackOfficeStatus, False, 50),
+    ('settlement_method', SettlementMethod, False, 50),
+    ('confirmation_type', ConfirmationType, False, 20),
+    ('confirmation_match_status', MatchStatus, True, 50),
+    ('source', TransactionSource, False, 20),
+]
+_EVENT_COLUMNS = [
+    ('product', ProductType, False, 50),
+    ('transaction_status', TransactionStatus, False, 20),
+    ('back_office_status', BackOfficeStatus, False, 50),
+    ('confirmation_match_status', MatchStatus, True, 50),
+]
+_CASH_FLOW_COLUMNS = [
+    ('direction', Direction, False, 20),
+    ('settlement_method', SettlementMethod, False, 50),
+    ('current_status', CashFlowStatus, False, 50),
+]
+_ACCOUNTING_COLUMNS = [
+    ('debit_credit_indicator', DebitCreditIndicator, False, 20),
+]
+
+ENUM_COLUMNS = {
+    'transactions': _TRANSACTION_COLUMNS,
+    'transactions_archive': _TRANSACTION_COLUMNS,
+    'events': _EVENT_COLUMNS,
+    'events_archive': _EVENT_COLUMNS,
+    'cash_flows': _CASH_FLOW_COLUMNS,
+    'cash_flows_archive': _CASH_FLOW_COLUMNS,
+    'accounting_records': _ACCOUNTING_COLUMNS,
+    'accounting_records_archive': _ACCOUNTING_COLUMNS,
+    'deleted_records': [('entity_type', DeletedEntityType, False, 20)],
+}
+
+# 在途现金流部分索引（003 创建）的条件依赖状态的存储形式，转换前后需重建
+ACTIVE_INDEXES = [
+    ('idx_active_payment_date_status', ['payment_date', 'current_status']),
+    ('idx_active_currency_direction', ['currency', 'direction']),
+]
+TERMINAL_STATUSES = (CashFlowStatus.CORE_SUCCESS, CashFlowStatus.CANCEL_SUCCESS)
+ACTIVE_WHERE_CODES = "current_status NOT IN ({})".format(
+    ", ".join(str(ENUM_CODES[CashFlowStatus][status]) for status in TERMINAL_STATUSES)
+)
+ACTIVE_WHERE_NAMES = "current_status NOT IN ({})".format(
+    ", ".join(f"'{status.name}'" for status in TERMINAL_STATUSES)
+)
+
+
+def _name_to_code(column, enum_class):
+    """CASE 表达式：枚举名 → 编码"""
+    whens = ' '.join(f"WHEN '{member.name}' THEN {code}" for member, code in ENUM_CODES[enum_class].items())
+    return f'CASE {column} {whens} END'
+
+
+def _code_to_name(column, enum_class):
+    """CASE 表达式：编码 → 枚举名"""
+    whens = ' '.join(f"WHEN {code} THEN '{member.name}'" for member, code in ENUM_CODES[enum_class].items())
+    return f'CASE {column} {whens} END'
+
+
+def _pg_type_name(enum_class):
+    """SQLAlchemy Enum 在 PostgreSQL 上创建的类型名（仅 create_all 建库时存在）"""
+    return enum_class.__name__.lower()
+
+
+def _existing_tables(conn):
+    tables = set(sa.inspect(conn).get_table_names())
+    return [(table, columns) for table, columns in ENUM_COLUMNS.items() if table in tables]
+
+
+def _recreate_active_indexes(where):
+    for name, columns in ACTIVE_INDEXES:
+        op.create_index(name, 'cash_flows', columns,
+                        postgresql_where=sa.text(where), sqlite_where=sa.text(where))
+
+
+def _drop_active_indexes():
+    for name, _ in ACTIVE_INDEXES:
+        op.drop_index(name, table_name='cash_flows')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    _drop_active_indexes()
+
+    for table, columns in _existing_tables(conn):
+        if conn.dialect.name == 'postgresql':
+            # 一次 ALTER TABLE 完成整表改写，列上的普通索引随之重建
+            # （分区表上的修改会传递到各分区）
+            conn.execute(sa.text(f'ALTER TABLE {table} ' + ', '.join(
+                f'ALTER COLUMN {column} TYPE smallint USING {_name_to_code(f"{column}::text", enum_class)}'
+                for column, enum_class, _, _ in columns
+            )))
+            continue
+
+        # 其他方言：先把枚举名改写为编码文本，再批量改列类型（SQLite 上重建表时转为整数）
+        conn.execute(sa.text(f'UPDATE {table} SET ' + ', '.join(
+            f'{column} = {_name_to_code(column, enum_class)}' for column, enum_class, _, _ in columns
+        )))
+        with op.batch_alter_table(table) as batch_op:
+            for column, _, nullable, length in columns:
+                batch_op.alter_column(column, type_=sa.SmallInteger(),
+                                      existing_type=sa.String(length), existing_nullable=nullable)
+
+    if conn.dialect.name == 'postgresql':
+        for enum_class in ENUM_CODES:
+            conn.execute(sa.text(f'DROP TYPE IF EXISTS {_pg_type_name(enum_class)}'))
+
+    _recreate_active_indexes(ACTIVE_WHERE_CODES)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    _drop_active_indexes()
+
+    # 恢复为 001/002 创建的 VARCHAR 列（迁移链从未使用 PostgreSQL 原生枚举类型）
+    for table, columns in _existing_tables(conn):
+        if conn.dialect.name == 'postgresql':
+            conn.execute(sa.text(f'ALTER TABLE {table} ' + ', '.join(
+                f'ALTER COLUMN {column} TYPE varchar({length}) USING {_code_to_name(column, enum_class)}'
+                for column, enum_class, _, length in columns
+            )))
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            for column, _, nullable, length in columns:
+                batch_op.alter_column(column, type_=sa.String(length),
+                                      existing_type=sa.SmallInteger(), existing_nullable=nullable)
+        conn.execute(sa.text(f'UPDATE {table} SET ' + ', '.join(
+            f'{column} = {_code_to_name(column, enum_class)}' for column, enum_class, _, _ in columns
+        )))
+
+    _recreate_active_indexes(ACTIVE_WHERE_NAMES)
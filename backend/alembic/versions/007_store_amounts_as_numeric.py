@@ -0,0 +1,57 @@
+"""Store monetary amounts as NUMERIC(20, 4)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.money import AMOUNT_PRECISION, AMOUNT_SCALE
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+# 表 → 金额列；归档表与热表结构相同
+AMOUNT_COLUMNS = {
+    'cash_flows': 'amount',
+    'cash_flows_archive': 'amount',
+    'accounting_records': 'transaction_amount',
+    'accounting_records_archive': 'transaction_amount',
+}
+
+
+def _existing_tables(conn):
+    tables = set(sa.inspect(conn).get_table_names())
+    return [(table, column) for table, column in AMOUNT_COLUMNS.items() if table in tables]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, column in _existing_tables(conn):
+        if conn.dialect.name == 'postgresql':
+            # float8 → numeric 按 15 位有效数字转换，再舍入到金额精度（分区表的修改会传递到各分区）
+            conn.execute(sa.text(
+                f'ALTER TABLE {table} ALTER COLUMN {column} '
+                f'TYPE numeric({AMOUNT_PRECISION}, {AMOUNT_SCALE}) USING round({column}::numeric, {AMOUNT_SCALE})'
+            ))
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.Numeric(AMOUNT_PRECISION, AMOUNT_SCALE),
+                                  existing_type=sa.Float(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table, column in _existing_tables(conn):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.Float(),
+                                  existing_type=sa.Numeric(AMOUNT_PRECISION, AMOUNT_SCALE),
+                                  existing_nullable=False, postgresql_using=f'{column}::double precision')
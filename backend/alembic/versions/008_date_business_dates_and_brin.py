@@ -0,0 +1,169 @@
+"""Store business dates as DATE and use BRIN for append-ordered timestamps
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.partitioning import PARTITIONED_TABLES
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+# 表 → 营业日期列；归档表与热表结构相同
+_TRANSACTION_DATES = ['trade_date', 'value_date', 'maturity_date']
+DATE_COLUMNS = {
+    'transactions': _TRANSACTION_DATES,
+    'transactions_archive': _TRANSACTION_DATES,
+    'events': ['trade_date'],
+    'events_archive': ['trade_date'],
+    'cash_flows': ['payment_date'],
+    'cash_flows_archive': ['payment_date'],
+}
+
+# 随写入单调递增的时间列：PostgreSQL 上由 B-tree 改为 BRIN（其他数据库保留 B-tree）。
+# 索引名沿用 001 创建的名称；008 之前以 create_all 建库时名称为 ix_<表>_<列>，一并删除
+BRIN_REPLACEMENTS = [
+    ('idx_modified_date', 'ix_events_modified_date', 'events', 'modified_date'),
+    ('idx_actual_accounting_date', 'ix_accounting_records_actual_accounting_date',
+     'accounting_records', 'actual_accounting_date'),
+]
+# 仅在 PostgreSQL 上新建的 BRIN 索引
+BRIN_ONLY = [
+    ('idx_transactions_entry_date_brin', 'transactions', 'entry_date'),
+    ('idx_events_entry_date_brin', 'events', 'entry_date'),
+]
+
+
+def _existing_tables(conn):
+    tables = set(sa.inspect(conn).get_table_names())
+    return [(table, columns) for table, columns in DATE_COLUMNS.items() if table in tables]
+
+
+def _is_partitioned(conn, table):
+    return conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {'table': table}).scalar()
+
+
+def _retype_partition_key(conn, table, key, type_sql):
+    """
+    修改分区键列的类型
+
+    PostgreSQL 不允许修改分区键的类型（分离全部分区后父表仍是分区表，同样不允许）：
+    先分离全部分区并逐个改列类型；父表改名后以 LIKE 复制出普通表改列类型，再以它为模板
+    按新类型重建父表，以原边界重新挂载分区，最后在父表上恢复约束和索引（与分区上已有的
+    同构索引自动关联，不重建）。已被 PartitionManager 分离的历史分区是独立表，不在此处理
+    """
+    constraints = conn.execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(:table) AND contype IN ('p', 'f') ORDER BY contype DESC"
+    ), {'table': table}).fetchall()
+    indexes = conn.execute(sa.text(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexname NOT IN "
+        "(SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table))"
+    ), {'table': table}).scalars().all()
+    partitions = conn.execute(sa.text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+    ), {'table': table}).fetchall()
+
+    for name, _ in partitions:
+        conn.execute(sa.text(f'ALTER TABLE {table} DETACH PARTITION {name}'))
+        conn.execute(sa.text(f'ALTER TABLE {name} ALTER COLUMN {key} TYPE {type_sql} USING {key}::{type_sql}'))
+
+    previous, template = f'{table}_previous', f'{table}_template'
+    conn.execute(sa.text(f'ALTER TABLE {table} RENAME TO {previous}'))
+    conn.execute(sa.text(f'CREATE TABLE {template} (LIKE {previous} INCLUDING DEFAULTS INCLUDING COMMENTS)'))
+    conn.execute(sa.text(f'ALTER TABLE {template} ALTER COLUMN {key} TYPE {type_sql} USING {key}::{type_sql}'))
+    conn.execute(sa.text(
+        f'CREATE TABLE {table} (LIKE {template} INCLUDING DEFAULTS INCLUDING COMMENTS) PARTITION BY RANGE ({key})'
+    ))
+    conn.execute(sa.text(f'DROP TABLE {template}'))
+    conn.execute(sa.text(f'DROP TABLE {previous}'))
+
+    for name, bound in partitions:
+        # 边界字面量（如 '2026-10-01 00:00:00'）按新的键类型解析
+        conn.execute(sa.text(f'ALTER TABLE {table} ATTACH PARTITION {name} {bound}'))
+    for name, definition in constraints:
+        conn.execute(sa.text(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}'))
+    for definition in indexes:
+        conn.execute(sa.text(definition.replace(' ON ONLY ', ' ON ')))
+
+
+def _retype(conn, table, columns, type_sql):
+    """PostgreSQL：一次 ALTER TABLE 修改多列类型（分区键另行处理）"""
+    key = PARTITIONED_TABLES.get(table)
+    if key in columns and _is_partitioned(conn, table):
+        _retype_partition_key(conn, table, key, type_sql)
+        columns = [column for column in columns if column != key]
+    if columns:
+        conn.execute(sa.text(f'ALTER TABLE {table} ' + ', '.join(
+            f'ALTER COLUMN {column} TYPE {type_sql} USING {column}::{type_sql}' for column in columns
+        )))
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, columns in _existing_tables(conn):
+        if conn.dialect.name == 'postgresql':
+            _retype(conn, table, columns, 'date')
+            continue
+
+        if conn.dialect.name == 'sqlite':
+            # SQLite 以文本存储日期时间，截掉时间部分即可按整日比较。不改声明类型：
+            # 批量改列重建表时会 CAST(col AS DATE)，DATE 为 NUMERIC 亲和性，'2026-01-02' 会变成 2026
+            conn.execute(sa.text(f'UPDATE {table} SET ' + ', '.join(
+                f'{column} = date({column})' for column in columns
+            )))
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.Date(), existing_type=sa.DateTime(), existing_nullable=False)
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    for name, create_all_name, table, column in BRIN_REPLACEMENTS:
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS {name}'))
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS {create_all_name}'))
+        op.create_index(name, table, [column], postgresql_using='brin')
+    for name, table, column in BRIN_ONLY:
+        op.create_index(name, table, [column], postgresql_using='brin')
+    for table in {table for *_, table, _ in BRIN_REPLACEMENTS + BRIN_ONLY}:
+        conn.execute(sa.text(f'ANALYZE {table}'))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        for name, table, _ in BRIN_ONLY:
+            op.drop_index(name, table_name=table)
+        for name, _, table, column in BRIN_REPLACEMENTS:
+            op.drop_index(name, table_name=table)
+            op.create_index(name, table, [column])
+
+    for table, columns in _existing_tables(conn):
+        if conn.dialect.name == 'postgresql':
+            _retype(conn, table, columns, 'timestamp')
+            continue
+
+        if conn.dialect.name == 'sqlite':
+            # 恢复 SQLAlchemy DateTime 的文本格式（声明类型未改动，原因同 upgrade）
+            conn.execute(sa.text(f'UPDATE {table} SET ' + ', '.join(
+                f"{column} = {column} || ' 00:00:00.000000'" for column in columns
+            )))
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.DateTime(), existing_type=sa.Date(), existing_nullable=False)
@@ -1,4 +1,4 @@
 """API routes"""
-from app.api import transactions, cash_flows, export
+from app.api import transactions, cash_flows, export, admin
 
-__all__ = ['transactions', 'cash_flows', 'export']
+__all__ = ['transactions', 'cash_flows', 'export', 'admin']
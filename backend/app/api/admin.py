@@ -0,0 +1,151 @@
+"""Admin diagnostics API endpoints"""
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.dependencies import get_db
+from app.config import settings
+from app.database import engine
+from app.partitioning import PartitionManager
+from app.profiling import SamplingProfiler, memory_profiler
+from app.query_workload import query_workload
+from app.schemas.archive import ArchiveRunResponse
+from app.schemas.partitioning import PartitionMaintenanceResponse, PartitionsResponse
+from app.schemas.profiling import MemorySnapshotResponse, MemoryTracingStatus
+from app.schemas.query_workload import QueryWorkloadResponse, QueryWorkloadStatus
+from app.services.archive_service import ArchiveService
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(5.0, gt=0, le=60, description="采样时长（秒）"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="采样间隔（毫秒）"),
+    include_idle: bool = Query(False, description="是否包含空闲线程")
+):
+    """
+    对当前工作进程做限时统计采样
+
+    返回折叠栈文本（flamegraph.pl / speedscope 可直接读取），
+    采样在后台线程中进行，不阻塞事件循环
+    """
+    profiler = SamplingProfiler(
+        duration=seconds, interval=interval_ms / 1000, include_idle=include_idle
+    )
+    result = await run_in_threadpool(profiler.run)
+
+    filename = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.collapsed"
+    return PlainTextResponse(
+        result.to_collapsed(),
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Profile-Samples": str(result.samples),
+        }
+    )
+
+
+@router.post("/tracemalloc/start", response_model=MemoryTracingStatus)
+async def start_tracemalloc(
+    frames: int = Query(10, ge=1, le=100, description="每次分配保留的调用栈帧数")
+):
+    """开启内存分配追踪并记录基线快照"""
+    await run_in_threadpool(memory_profiler.start, frames)
+    return MemoryTracingStatus(tracing=memory_profiler.is_tracing)
+
+
+@router.get("/tracemalloc/snapshot", response_model=MemorySnapshotResponse)
+async def snapshot_tracemalloc(
+    limit: int = Query(20, ge=1, le=200, description="返回条数"),
+    group_by: str = Query("lineno", description="聚合方式(lineno/filename/traceback)"),
+    reset_baseline: bool = Query(False, description="是否以本次快照作为新基线")
+):
+    """
+    获取内存快照
+
+    返回当前占用排行及相对基线（开启追踪或上次重置时）的增长排行
+    """
+    snapshot = await run_in_threadpool(
+        memory_profiler.snapshot, limit, group_by, reset_baseline
+    )
+    return MemorySnapshotResponse.model_validate(snapshot)
+
+
+@router.post("/tracemalloc/stop", response_model=MemoryTracingStatus)
+async def stop_tracemalloc():
+    """停止内存分配追踪"""
+    memory_profiler.stop()
+    return MemoryTracingStatus(tracing=memory_profiler.is_tracing)
+
+
+@router.post("/query-workload/start", response_model=QueryWorkloadStatus)
+async def start_query_workload(
+    reset: bool = Query(False, description="是否清空已记录的查询形态")
+):
+    """开始记录查询条件形态（索引顾问的输入）"""
+    query_workload.start(reset=reset)
+    return QueryWorkloadStatus(recording=query_workload.enabled)
+
+
+@router.get("/query-workload", response_model=QueryWorkloadResponse)
+async def get_query_workload():
+    """
+    获取已记录的查询负载
+
+    返回的JSON可保存后交给 python -m benchmarks.index_advisor 回放分析
+    """
+    return QueryWorkloadResponse.model_validate(query_workload.snapshot())
+
+
+@router.post("/query-workload/stop", response_model=QueryWorkloadStatus)
+async def stop_query_workload():
+    """停止记录查询负载（保留已记录的形态）"""
+    query_workload.stop()
+    return QueryWorkloadStatus(recording=query_workload.enabled)
+
+
+@router.get("/partitions", response_model=PartitionsResponse)
+async def get_partitions():
+    """列出事件表和现金流表的分区（仅 PostgreSQL 且已执行迁移 004）"""
+    tables = await run_in_threadpool(PartitionManager(engine).describe)
+    return PartitionsResponse(tables={
+        table: [asdict(partition) for partition in partitions]
+        for table, partitions in tables.items()
+    })
+
+
+@router.post("/partitions/maintain", response_model=PartitionMaintenanceResponse)
+async def maintain_partitions():
+    """立即执行一次分区维护：创建未来月份的分区，分离超出保留期的分区"""
+    result = await run_in_threadpool(
+        PartitionManager(engine).maintain,
+        settings.partition_months_ahead,
+        settings.partition_retention_months
+    )
+    return PartitionMaintenanceResponse(tables=result)
+
+
+@router.post("/archive/run", response_model=ArchiveRunResponse)
+async def run_archive(
+    max_batches: int = Query(10, ge=1, le=1000, description="最多执行的批次数"),
+    retention_days: Optional[int] = Query(None, ge=0, description="保留天数（默认 ARCHIVE_RETENTION_DAYS）"),
+    db: Session = Depends(get_db)
+):
+    """
+    执行归档：把到期/失效且后线处理完成的交易图移入归档表
+
+    每批一个事务，可重复调用直至 transactions 为0；大批量归档建议使用 python -m app.archive_job
+    """
+    result = await run_in_threadpool(
+        ArchiveService(db).run,
+        retention_days=settings.archive_retention_days if retention_days is None else retention_days,
+        batch_size=settings.archive_batch_size,
+        max_batches=max_batches
+    )
+    return ArchiveRunResponse(**result.to_dict())
@@ -1,9 +1,11 @@
 """Cash flow API endpoints"""
+from decimal import Decimal
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
+from app.api.responses import model_response
 from app.services.query_service import QueryService
 from app.services.status_tracking_service import StatusTrackingService
 from app.services.operation_guide_service import OperationGuideService
@@ -27,11 +29,13 @@ async def query_cash_flows(
     settlement_id: Optional[str] = Query(None, description="结算内部ID"),
     direction: Optional[str] = Query(None, description="方向(RECEIVE/PAY)"),
     currency: Optional[str] = Query(None, description="币种"),
-    amount_min: Optional[float] = Query(None, description="最小金额"),
-    amount_max: Optional[float] = Query(None, description="最大金额"),
+    amount_min: Optional[Decimal] = Query(None, description="最小金额"),
+    amount_max: Optional[Decimal] = Query(None, description="最大金额"),
     payment_date_from: Optional[str] = Query(None, description="收付日期起始"),
     payment_date_to: Optional[str] = Query(None, description="收付日期结束"),
     status: Optional[str] = Query(None, description="状态"),
+    active_only: bool = Query(False, description="仅查询在途现金流（排除结算完成/撤销成功）"),
+    include_archived: bool = Query(False, description="是否同时查询已归档现金流"),
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页记录数"),
     db: Session = Depends(get_db)
@@ -53,7 +57,9 @@ async def query_cash_flows(
         amount_max=amount_max,
         payment_date_from=payment_date_from,
         payment_date_to=payment_date_to,
-        status=status
+        status=status,
+        active_only=active_only,
+        include_archived=include_archived
     )
     
     # 构建分页参数
@@ -66,7 +72,7 @@ async def query_cash_flows(
     query_service = QueryService(db)
     result = query_service.query_cash_flows(criteria, pagination)
     
-    return result
+    return model_response(result)
 
 
 @router.get("/{cash_flow_id}", response_model=CashFlowDetail)
@@ -99,7 +105,7 @@ async def get_cash_flow_detail(
             }
         )
     
-    return detail
+    return model_response(detail)
 
 
 @router.get("/{cash_flow_id}/progress", response_model=PaymentProgress)
@@ -119,7 +125,7 @@ async def get_cash_flow_progress(
     status_tracking_service = StatusTrackingService(db)
     try:
         progress = status_tracking_service.get_cash_flow_progress(cash_flow_id)
-        return progress
+        return model_response(progress)
     except ValueError as e:
         error_msg = str(e)
         if "RESOURCE_NOT_FOUND" in error_msg:
@@ -1,11 +1,15 @@
 """Export API endpoints"""
+from datetime import datetime
+from decimal import Decimal
 from typing import Optional, List
+from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
-from app.services.export_service import ExportService, ExportFormat
+from app.services.export_service import ExportService, ExportFormat, DeltaExportResult
+from app.models.enums import DeletedEntityType
 from app.schemas.transaction import TransactionQueryCriteria
 from app.schemas.cash_flow import CashFlowQueryCriteria
 
@@ -13,6 +17,33 @@ from app.schemas.cash_flow import CashFlowQueryCriteria
 router = APIRouter(prefix="/api/export", tags=["export"])
 
 
+def _content_disposition(filename: str) -> str:
+    """构建附件响应头（文件名含中文，按 RFC 5987 进行 UTF-8 编码）"""
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+def _parse_export_format(format: str) -> ExportFormat:
+    """解析导出格式"""
+    try:
+        return ExportFormat(format.lower())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "INVALID_PARAMETER",
+                "message": f"不支持的导出格式: {format}",
+                "details": {
+                    "invalidFields": [
+                        {
+                            "field": "format",
+                            "reason": "必须是 'excel' 或 'csv'"
+                        }
+                    ]
+                }
+            }
+        )
+
+
 @router.get("/transactions")
 async def export_transactions(
     format: str = Query("excel", description="导出格式(excel/csv)"),
@@ -41,24 +72,7 @@ async def export_transactions(
     支持Excel和CSV格式导出
     """
     # 验证导出格式
-    try:
-        export_format = ExportFormat(format.lower())
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "code": "INVALID_PARAMETER",
-                "message": f"不支持的导出格式: {format}",
-                "details": {
-                    "invalidFields": [
-                        {
-                            "field": "format",
-                            "reason": "必须是 'excel' 或 'csv'"
-                        }
-                    ]
-                }
-            }
-        )
+    export_format = _parse_export_format(format)
     
     # 构建查询条件
     criteria = TransactionQueryCriteria(
@@ -110,7 +124,7 @@ async def export_transactions(
         content=result.content,
         media_type=media_type,
         headers={
-            "Content-Disposition": f'attachment; filename="{result.filename}"'
+            "Content-Disposition": _content_disposition(result.filename)
         }
     )
 
@@ -124,37 +138,28 @@ async def export_cash_flows(
     settlement_id: Optional[str] = Query(None, description="结算内部ID"),
     direction: Optional[str] = Query(None, description="方向(RECEIVE/PAY)"),
     currency: Optional[str] = Query(None, description="币种"),
-    amount_min: Optional[float] = Query(None, description="最小金额"),
-    amount_max: Optional[float] = Query(None, description="最大金额"),
+    amount_min: Optional[Decimal] = Query(None, description="最小金额"),
+    amount_max: Optional[Decimal] = Query(None, description="最大金额"),
     payment_date_from: Optional[str] = Query(None, description="收付日期起始"),
     payment_date_to: Optional[str] = Query(None, description="收付日期结束"),
     status: Optional[str] = Query(None, description="状态"),
+    active_only: bool = Query(False, description="仅导出在途现金流（排除结算完成/撤销成功）"),
+    counterparty: Optional[str] = Query(None, description="交易对手"),
+    product: Optional[str] = Query(None, description="产品"),
+    trade_date_from: Optional[str] = Query(None, description="交易日起始"),
+    trade_date_to: Optional[str] = Query(None, description="交易日结束"),
+    operating_institution: Optional[str] = Query(None, description="运营机构"),
+    enriched: bool = Query(False, description="是否附带交易信息(交易对手/产品/交易日/运营机构/交易员)"),
     db: Session = Depends(get_db)
 ):
     """
     导出现金流列表
     
-    支持Excel和CSV格式导出
+    支持Excel和CSV格式导出；支持按交易层条件过滤，
+    enriched=true 时在同一条查询中关联交易表输出交易信息
     """
     # 验证导出格式
-    try:
-        export_format = ExportFormat(format.lower())
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "code": "INVALID_PARAMETER",
-                "message": f"不支持的导出格式: {format}",
-                "details": {
-                    "invalidFields": [
-                        {
-                            "field": "format",
-                            "reason": "必须是 'excel' 或 'csv'"
-                        }
-                    ]
-                }
-            }
-        )
+    export_format = _parse_export_format(format)
     
     # 构建查询条件
     criteria = CashFlowQueryCriteria(
@@ -168,7 +173,13 @@ async def export_cash_flows(
         amount_max=amount_max,
         payment_date_from=payment_date_from,
         payment_date_to=payment_date_to,
-        status=status
+        status=status,
+        active_only=active_only,
+        counterparty=counterparty,
+        product=product,
+        trade_date_from=trade_date_from,
+        trade_date_to=trade_date_to,
+        operating_institution=operating_institution
     )
     
     # 执行导出
@@ -176,7 +187,8 @@ async def export_cash_flows(
     try:
         result = export_service.export_cash_flows(
             criteria=criteria,
-            format=export_format
+            format=export_format,
+            enriched=enriched
         )
     except ValueError as e:
         error_msg = str(e)
@@ -195,6 +207,169 @@ async def export_cash_flows(
         content=result.content,
         media_type=media_type,
         headers={
-            "Content-Disposition": f'attachment; filename="{result.filename}"'
+            "Content-Disposition": _content_disposition(result.filename)
         }
     )
+
+
+def _delta_response(result: DeltaExportResult) -> Response:
+    """构建增量导出响应（水位线通过响应头返回）"""
+    media_type = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if result.format == ExportFormat.EXCEL
+        else "text/csv"
+    )
+    
+    headers = {
+        "Content-Disposition": _content_disposition(result.filename),
+        "X-Next-Watermark": result.next_watermark.isoformat(),
+        "X-Has-More": "true" if result.has_more else "false",
+        "X-Record-Count": str(result.record_count)
+    }
+    if result.next_watermark_id is not None:
+        headers["X-Next-Watermark-Id"] = str(result.next_watermark_id)
+    
+    return Response(
+        content=result.content,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+@router.get("/transactions/delta")
+async def export_transactions_delta(
+    since: datetime = Query(..., description="水位线：导出该时间之后修改的交易"),
+    since_id: Optional[str] = Query(None, description="水位线ID（上次响应的X-Next-Watermark-Id）"),
+    format: str = Query("csv", description="导出格式(excel/csv)"),
+    fields: Optional[str] = Query(None, description="导出字段(逗号分隔)"),
+    db: Session = Depends(get_db)
+):
+    """
+    增量导出交易
+    
+    返回 last_modified_date 晚于水位线的交易，按 (last_modified_date, external_id) 升序；
+    下一次导出的水位线通过 X-Next-Watermark / X-Next-Watermark-Id 响应头返回，
+    X-Has-More 为 true 时应立即使用新水位线继续拉取
+    
+    注意：last_modified_date 取自写入时刻而非提交时刻，执行较久的事务可能在客户端
+    收到更晚的水位线之后才提交，客户端应定期以回退安全间隔的水位线重新拉取并按ID幂等合并
+    """
+    export_format = _parse_export_format(format)
+    
+    field_list = None
+    if fields:
+        field_list = [f.strip() for f in fields.split(',')]
+    
+    export_service = ExportService(db)
+    result = export_service.export_transactions_delta(
+        since=since,
+        format=export_format,
+        since_id=since_id,
+        fields=field_list
+    )
+    
+    return _delta_response(result)
+
+
+@router.get("/cash-flows/delta")
+async def export_cash_flows_delta(
+    since: datetime = Query(..., description="水位线：导出该时间之后修改的现金流"),
+    since_id: Optional[str] = Query(None, description="水位线ID（上次响应的X-Next-Watermark-Id）"),
+    format: str = Query("csv", description="导出格式(excel/csv)"),
+    db: Session = Depends(get_db)
+):
+    """
+    增量导出现金流
+    
+    返回 last_modified_date 晚于水位线的现金流，按 (last_modified_date, cash_flow_id) 升序
+    
+    注意：last_modified_date 取自写入时刻而非提交时刻，执行较久的事务可能在客户端
+    收到更晚的水位线之后才提交，客户端应定期以回退安全间隔的水位线重新拉取并按ID幂等合并
+    """
+    export_format = _parse_export_format(format)
+    
+    export_service = ExportService(db)
+    result = export_service.export_cash_flows_delta(
+        since=since,
+        format=export_format,
+        since_id=since_id
+    )
+    
+    return _delta_response(result)
+
+
+# 交易墓碑导出包含随交易删除的事件；现金流墓碑单独导出，分别按对应的导出权限授权
+TRANSACTION_TOMBSTONE_TYPES = [DeletedEntityType.TRANSACTION, DeletedEntityType.EVENT]
+CASH_FLOW_TOMBSTONE_TYPES = [DeletedEntityType.CASH_FLOW]
+
+
+@router.get("/transactions/tombstones")
+async def export_transaction_tombstones(
+    since: datetime = Query(..., description="水位线：导出该时间之后的删除记录"),
+    since_id: Optional[int] = Query(None, description="水位线ID（上次响应的X-Next-Watermark-Id）"),
+    entity_type: Optional[DeletedEntityType] = Query(None, description="实体类型(TRANSACTION/EVENT)，默认全部"),
+    format: str = Query("csv", description="导出格式(excel/csv)"),
+    db: Session = Depends(get_db)
+):
+    """
+    导出交易和事件的删除记录（墓碑）
+    
+    与增量导出配合使用，下游据此删除已不存在的交易和事件；
+    删除时间同样取自写入时刻，水位线的提交时序问题同增量导出
+    """
+    export_format = _parse_export_format(format)
+    
+    entity_types = TRANSACTION_TOMBSTONE_TYPES
+    if entity_type is not None:
+        if entity_type not in TRANSACTION_TOMBSTONE_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "code": "INVALID_PARAMETER",
+                    "message": f"不支持的实体类型: {entity_type.value}",
+                    "details": {
+                        "invalidFields": [
+                            {
+                                "field": "entity_type",
+                                "reason": "必须是 'TRANSACTION' 或 'EVENT'"
+                            }
+                        ]
+                    }
+                }
+            )
+        entity_types = [entity_type]
+    
+    export_service = ExportService(db)
+    result = export_service.export_tombstones(
+        since=since,
+        format=export_format,
+        since_id=since_id,
+        entity_types=entity_types
+    )
+    
+    return _delta_response(result)
+
+
+@router.get("/cash-flows/tombstones")
+async def export_cash_flow_tombstones(
+    since: datetime = Query(..., description="水位线：导出该时间之后的删除记录"),
+    since_id: Optional[int] = Query(None, description="水位线ID（上次响应的X-Next-Watermark-Id）"),
+    format: str = Query("csv", description="导出格式(excel/csv)"),
+    db: Session = Depends(get_db)
+):
+    """
+    导出现金流的删除记录（墓碑）
+    
+    与现金流增量导出配合使用，水位线的提交时序问题同增量导出
+    """
+    export_format = _parse_export_format(format)
+    
+    export_service = ExportService(db)
+    result = export_service.export_tombstones(
+        since=since,
+        format=export_format,
+        since_id=since_id,
+        entity_types=CASH_FLOW_TOMBSTONE_TYPES
+    )
+    
+    return _delta_response(result)
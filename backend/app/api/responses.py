@@ -0,0 +1,39 @@
+"""Fast JSON responses for high-volume endpoints"""
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app import tracing
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    直接序列化已校验Pydantic模型的JSON响应
+
+    服务层返回的模型已由 model_validate 校验过，路由直接返回本响应时，
+    FastAPI 不再按 response_model 做 dump → 校验 → 序列化 的二次处理，
+    而是由 pydantic-core 一次性把模型写成UTF-8 JSON字节。
+    路由上的 response_model 仍保留，用于生成 OpenAPI 文档。
+    """
+
+    def render(self, content: Any) -> bytes:
+        with tracing.span('response.serialize'):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(content)
+            return pydantic_core.to_json(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> ModelJSONResponse:
+    """
+    把服务层返回的可信模型包装为快速JSON响应
+
+    Args:
+        model: 已校验的Pydantic模型
+        status_code: HTTP状态码
+
+    Returns:
+        ModelJSONResponse: JSON响应
+    """
+    return ModelJSONResponse(content=model, status_code=status_code)
@@ -1,9 +1,11 @@
 """Transaction API endpoints"""
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
+from app.api.responses import model_response
 from app.services.query_service import QueryService
 from app.services.event_service import EventService
 from app.services.accounting_service import AccountingService
@@ -40,6 +42,7 @@ async def query_transactions(
     settlement_method: Optional[str] = Query(None, description="清算方式"),
     confirmation_type: Optional[str] = Query(None, description="证实方式"),
     source: Optional[str] = Query(None, description="交易来源"),
+    include_archived: bool = Query(False, description="是否同时查询已归档交易"),
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页记录数"),
     sort_by: Optional[str] = Query("trade_date", description="排序字段"),
@@ -68,7 +71,8 @@ async def query_transactions(
         business_institution=business_institution,
         settlement_method=settlement_method,
         confirmation_type=confirmation_type,
-        source=source
+        source=source,
+        include_archived=include_archived
     )
     
     # 构建分页参数
@@ -83,7 +87,7 @@ async def query_transactions(
     query_service = QueryService(db)
     result = query_service.query_transactions(criteria, pagination)
     
-    return result
+    return model_response(result)
 
 
 @router.get("/{external_id}", response_model=TransactionDetail)
@@ -116,7 +120,7 @@ async def get_transaction_detail(
             }
         )
     
-    return detail
+    return model_response(detail)
 
 
 @router.get("/{external_id}/events", response_model=PagedResult[EventRecordResponse])
@@ -124,6 +128,8 @@ async def get_transaction_events(
     external_id: str,
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(15, ge=1, le=100, description="每页记录数"),
+    modified_date_from: Optional[datetime] = Query(None, description="修改日起始"),
+    modified_date_to: Optional[datetime] = Query(None, description="修改日结束"),
     db: Session = Depends(get_db)
 ):
     """
@@ -133,6 +139,8 @@ async def get_transaction_events(
         external_id: 外部流水号
         page: 页码
         page_size: 每页记录数
+        modified_date_from: 修改日起始
+        modified_date_to: 修改日结束
     
     Returns:
         PagedResult[EventRecordResponse]: 分页的事件记录列表
@@ -143,9 +151,11 @@ async def get_transaction_events(
     try:
         result = event_service.query_events(
             external_id=external_id,
-            pagination=pagination
+            pagination=pagination,
+            modified_date_from=modified_date_from,
+            modified_date_to=modified_date_to
         )
-        return result
+        return model_response(result)
     except ValueError as e:
         error_msg = str(e)
         if "MISSING_REQUIRED_FIELD" in error_msg:
@@ -204,7 +214,7 @@ async def get_accounting_records(
         pagination=pagination
     )
     
-    return result
+    return model_response(result)
 
 
 @router.get("/{transaction_id}/accounting-summary")
@@ -219,7 +229,7 @@ async def get_accounting_summary(
         transaction_id: 交易流水号
     
     Returns:
-        Dict: 按币种汇总的借贷金额
+        Dict: 按币种汇总的借贷金额（JSON 中为数字）
     """
     accounting_service = AccountingService(db)
     summary = accounting_service.get_amount_summary(transaction_id)
@@ -244,7 +254,7 @@ async def get_transaction_progress(
     status_tracking_service = StatusTrackingService(db)
     try:
         progress = status_tracking_service.get_transaction_progress(transaction_id)
-        return progress
+        return model_response(progress)
     except ValueError as e:
         error_msg = str(e)
         if "RESOURCE_NOT_FOUND" in error_msg:
@@ -0,0 +1,47 @@
+"""Archive job entry point
+
+用法（在 backend 目录下运行，可由 cron 定时执行）:
+    python -m app.archive_job
+    python -m app.archive_job --retention-days 730 --batch-size 200 --max-batches 100
+
+把到期/失效且后线处理完成、超过保留期未修改的交易连同事件、现金流和账务记录移入归档表。
+每批一个事务，中断后重新运行即可继续。
+"""
+import argparse
+
+from app.config import settings
+from app.database import SessionLocal
+from app.logging_config import setup_logging
+from app.services.archive_service import ArchiveService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--retention-days', type=int, default=settings.archive_retention_days,
+                        help='保留天数（默认 ARCHIVE_RETENTION_DAYS）')
+    parser.add_argument('--batch-size', type=int, default=settings.archive_batch_size,
+                        help='每批交易数（默认 ARCHIVE_BATCH_SIZE）')
+    parser.add_argument('--max-batches', type=int, default=None, help='最多执行的批次数（默认不限）')
+    args = parser.parse_args()
+
+    setup_logging(log_level=settings.log_level, log_format=settings.log_format, use_queue=False)
+
+    db = SessionLocal()
+    try:
+        result = ArchiveService(db).run(
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            progress=lambda total: print(
+                f"batch {total.batches}: {total.transactions} transactions, {total.events} events, "
+                f"{total.cash_flows} cash flows, {total.accounting_records} accounting records"
+            )
+        )
+    finally:
+        db.close()
+
+    print(f"archived: {result.to_dict()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 """Application configuration"""
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -13,11 +13,89 @@ class Settings(BaseSettings):
     database_user: str = "postgres"
     database_password: str = "postgres"
     
+    # Database pool
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_recycle: int = 1800  # 秒，-1 表示不回收
+    database_pool_timeout: float = 30.0  # 等待空闲连接的秒数
+    database_pool_pre_ping: bool = True
+    database_pool_warmup: bool = True  # 启动时预建 pool_size 个连接
+    database_connect_timeout: int = 5  # 秒
+    database_statement_timeout_ms: int = 30000  # 0 表示不限制
+    database_echo: bool = False  # 输出全部SQL（与 debug 无关）
+    
     # Application
     app_host: str = "0.0.0.0"
     app_port: int = 8000
     debug: bool = True
     
+    # Authentication
+    # 内置静态令牌（test-token-123 等）仅供开发测试，生产环境应关闭
+    auth_static_tokens_enabled: bool = True
+    # 配置JWKS文件后启用JWT认证
+    auth_jwks_file: Optional[str] = None
+    auth_jwt_algorithms: List[str] = ["RS256", "ES256"]
+    auth_jwt_issuer: Optional[str] = None
+    auth_jwt_audience: Optional[str] = None
+    auth_jwt_leeway: int = 30
+    auth_token_cache_size: int = 10000
+    
+    # Rate limiting（按 用户 + 路由类别 的令牌桶：每秒补充令牌数 / 桶容量）
+    rate_limit_enabled: bool = True
+    rate_limit_query_rate: float = 5.0
+    rate_limit_query_burst: int = 30
+    rate_limit_progress_rate: float = 1.0
+    rate_limit_progress_burst: int = 5
+    rate_limit_export_rate: float = 0.1
+    rate_limit_export_burst: int = 3
+    export_max_concurrent_per_user: int = 2
+    
+    # Logging
+    log_level: str = "INFO"
+    log_format: str = "text"  # text / json
+    log_queue_enabled: bool = True
+    # 按日志记录器配置的采样率，如 {"app.middleware.logging_middleware": 0.1}
+    log_sample_rates: Dict[str, float] = {}
+    
+    # Response compression
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
+    compression_brotli_quality: int = 4
+    
+    # Metrics
+    metrics_enabled: bool = True
+    
+    # Tracing
+    tracing_enabled: bool = False
+    tracing_file: str = "traces/spans.jsonl"
+    tracing_sample_rate: float = 0.1
+    tracing_max_bytes: int = 10 * 1024 * 1024
+    tracing_backup_count: int = 5
+    
+    # SQL instrumentation
+    sql_instrumentation_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    n_plus_one_threshold: int = 10
+    
+    # Query workload capture (index advisor input)
+    query_workload_capture_enabled: bool = False
+    query_workload_max_shapes: int = 1000
+    query_workload_examples_per_shape: int = 5
+    
+    # Partition maintenance (PostgreSQL, after migration 004)
+    partition_maintenance_enabled: bool = False
+    partition_maintenance_interval_hours: float = 24.0
+    partition_months_ahead: int = 3
+    partition_events_retention_months: int = 0  # 0 表示不分离旧分区
+    # 警告：现金流分区分离后，查询、归档回退和导出都不再看到其中的行。
+    # 旧现金流应由归档任务迁入 cash_flows_archive，分区维护忽略此项非零值并记录警告
+    partition_cash_flows_retention_months: int = 0
+    
+    # Archive tier (python -m app.archive_job / POST /api/admin/archive/run)
+    archive_retention_days: int = 365
+    archive_batch_size: int = 500
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -29,6 +107,14 @@ class Settings(BaseSettings):
             f"postgresql://{self.database_user}:{self.database_password}"
             f"@{self.database_host}:{self.database_port}/{self.database_name}"
         )
+    
+    @property
+    def partition_retention_months(self) -> Dict[str, int]:
+        """Get retention months per partitioned table"""
+        return {
+            "events": self.partition_events_retention_months,
+            "cash_flows": self.partition_cash_flows_retention_months,
+        }
 
 
 settings = Settings()
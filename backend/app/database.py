@@ -1,19 +1,38 @@
 """Database connection and session management"""
-from sqlalchemy import create_engine
+import logging
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+
+logger = logging.getLogger(__name__)
+
 # Base class for models (must be defined before creating engine)
 Base = declarative_base()
 
+
+def _connect_args() -> Dict[str, Any]:
+    """PostgreSQL 连接参数（连接超时、语句超时）"""
+    connect_args: Dict[str, Any] = {"connect_timeout": settings.database_connect_timeout}
+    if settings.database_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.database_statement_timeout_ms}"
+    return connect_args
+
+
 # Create database engine (lazy - only connects when needed)
 engine = create_engine(
     settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    echo=settings.database_echo,
+    pool_pre_ping=settings.database_pool_pre_ping,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
+    pool_timeout=settings.database_pool_timeout,
+    connect_args=_connect_args()
 )
 
 # Create session factory
@@ -27,3 +46,80 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def warm_up_pool(target_engine, connections: int) -> int:
+    """
+    预先建立连接池连接，避免启动后首批请求承担建连开销
+
+    同时借出 connections 个连接再全部归还，使连接池中保留这些空闲连接
+
+    Args:
+        target_engine: SQLAlchemy 引擎
+        connections: 预建连接数
+
+    Returns:
+        int: 成功建立的连接数
+    """
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(target_engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def pool_status(target_engine) -> Dict[str, Any]:
+    """
+    获取连接池状态
+
+    Args:
+        target_engine: SQLAlchemy 引擎
+
+    Returns:
+        Dict[str, Any]: 连接池大小、借出/空闲/溢出连接数（连接池不支持的项为None）
+    """
+    pool = target_engine.pool
+
+    def read(method_name: str):
+        method = getattr(pool, method_name, None)
+        return method() if method is not None else None
+
+    # QueuePool 的 overflow() 在池未满时为负数，这里只报告实际溢出的连接数
+    overflow = read("overflow")
+    return {
+        "size": read("size"),
+        "checked_out": read("checkedout"),
+        "checked_in": read("checkedin"),
+        "overflow": max(overflow, 0) if overflow is not None else None,
+        "max_overflow": getattr(pool, "_max_overflow", None),
+    }
+
+
+def check_database(target_engine) -> Dict[str, Any]:
+    """
+    执行一次数据库往返并测量延迟
+
+    Args:
+        target_engine: SQLAlchemy 引擎
+
+    Returns:
+        Dict[str, Any]: status(up/down)、latency_ms，失败时包含 error
+    """
+    start = time.perf_counter()
+    try:
+        with target_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Database readiness check failed: {e}")
+        return {
+            "status": "down",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "error": type(e).__name__,
+        }
+    return {
+        "status": "up",
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
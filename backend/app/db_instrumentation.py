@@ -0,0 +1,161 @@
+"""Per-request SQL instrumentation"""
+import logging
+import re
+import time
+from collections import Counter as FingerprintCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.metrics import SLOW_QUERIES
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """单个请求（或代码块）内的SQL执行统计"""
+
+    __slots__ = ('request_id', 'statements', 'total_time', 'rows', 'fingerprints')
+
+    def __init__(self, request_id: str = 'N/A'):
+        self.request_id = request_id
+        self.statements = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.fingerprints: FingerprintCounter = FingerprintCounter()
+
+    def record(self, fingerprint: str, elapsed: float, rowcount: int) -> None:
+        """记录一条语句"""
+        self.statements += 1
+        self.total_time += elapsed
+        if rowcount > 0:
+            self.rows += rowcount
+        self.fingerprints[fingerprint] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        返回执行次数超过阈值的语句指纹（疑似 N+1 查询）
+
+        Args:
+            threshold: 同一指纹允许的最大执行次数
+
+        Returns:
+            List[Tuple[str, int]]: (指纹, 次数) 列表，按次数降序
+        """
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.fingerprints.most_common()
+            if count > threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """获取当前上下文的SQL统计（不在统计范围内时返回None）"""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(request_id: str = 'N/A') -> Iterator[QueryStats]:
+    """
+    在代码块内统计SQL执行情况
+
+    Args:
+        request_id: 请求ID，用于日志关联
+
+    Yields:
+        QueryStats: 统计对象（代码块结束后仍可读取）
+    """
+    stats = QueryStats(request_id)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|:\w+|\?|%s|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint_sql(statement: str) -> str:
+    """
+    规范化SQL语句为指纹
+
+    去除字面量和参数占位符差异，IN 列表折叠为单个占位符，
+    使同一查询模板得到相同指纹
+
+    Args:
+        statement: SQL语句
+
+    Returns:
+        str: 规范化后的指纹
+    """
+    fingerprint = _STRING_LITERAL.sub('?', statement)
+    fingerprint = _PLACEHOLDER.sub('?', fingerprint)
+    fingerprint = _NUMBER_LITERAL.sub('?', fingerprint)
+    fingerprint = _PLACEHOLDER_LIST.sub('(?)', fingerprint)
+    return _WHITESPACE.sub(' ', fingerprint).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    stats = _current_stats.get()
+    fingerprint = None
+
+    if stats is not None:
+        fingerprint = fingerprint_sql(statement)
+        # DBAPI 对 SELECT 的 rowcount 可能为 -1（如 SQLite），此时不计入
+        stats.record(fingerprint, elapsed, cursor.rowcount)
+
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        if fingerprint is None:
+            fingerprint = fingerprint_sql(statement)
+        SLOW_QUERIES.inc()
+        logger.warning(
+            f"Slow query: {elapsed * 1000:.1f}ms - {fingerprint}",
+            extra={
+                'request_id': stats.request_id if stats is not None else 'N/A',
+                'duration_ms': elapsed * 1000,
+                'fingerprint': fingerprint
+            }
+        )
+
+
+def _handle_error(context):
+    # 语句执行失败时不会触发 after_cursor_execute，弹出其开始时间，
+    # 避免连接池中的连接上开始时间栈随错误增长、后续语句与错误的开始时间配对
+    if context.connection is None or context.execution_context is None:
+        return
+    stack = context.connection.info.get('query_start_time')
+    if stack:
+        stack.pop()
+
+
+def install_sql_instrumentation() -> None:
+    """
+    为所有引擎注册SQL执行事件（重复调用无副作用）
+    """
+    for identifier, listener in (
+        ('before_cursor_execute', _before_cursor_execute),
+        ('after_cursor_execute', _after_cursor_execute),
+        ('handle_error', _handle_error),
+    ):
+        if not event.contains(Engine, identifier, listener):
+            event.listen(Engine, identifier, listener)
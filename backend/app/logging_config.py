@@ -1,56 +1,219 @@
 """Logging configuration"""
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from typing import Any, Dict
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
 
-def setup_logging(log_level: str = "INFO") -> None:
+# 当前请求ID（由错误处理中间件在请求开始时设置）
+request_id_var: ContextVar[str] = ContextVar('request_id', default='N/A')
+
+# 后台写日志线程（队列模式下启用）
+_listener: Optional[QueueListener] = None
+
+# LogRecord 的标准属性，其余属性视为 extra 字段
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    log_format: str = "text",
+    use_queue: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None
+) -> None:
     """
     配置应用日志
-    
+
     Args:
         log_level: 日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        log_format: 输出格式，text 为原有文本格式，json 为每行一个JSON对象
+        use_queue: 是否经 QueueHandler 交由后台线程写出，避免 stdout 阻塞事件循环
+        sample_rates: 按日志记录器名称配置的 INFO 及以下级别采样率（0~1）
     """
+    global _listener
+
     # 配置日志格式
-    log_format = (
-        "%(asctime)s - %(name)s - %(levelname)s - "
-        "%(message)s - [%(filename)s:%(lineno)d]"
-    )
-    
+    if log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - "
+            "%(message)s - [%(filename)s:%(lineno)d]"
+        )
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    if use_queue:
+        # 请求线程只负责入队；上下文信息必须在入队前由过滤器采集
+        handler: logging.Handler = _ContextQueueHandler(queue.SimpleQueue())
+    else:
+        handler = stream_handler
+    handler.addFilter(ContextFilter())
+
     # 配置根日志记录器
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[handler]
     )
-    
+
+    if use_queue and handler in logging.getLogger().handlers:
+        stop_logging()
+        _listener = QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+    # 按日志记录器采样
+    for logger_name, rate in (sample_rates or {}).items():
+        _set_sampling(logging.getLogger(logger_name), rate)
+
     # 配置第三方库的日志级别
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("fastapi").setLevel(logging.INFO)
 
 
+def stop_logging() -> None:
+    """停止后台写日志线程并写出队列中剩余的日志"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _set_sampling(logger: logging.Logger, rate: float) -> None:
+    """为日志记录器设置采样过滤器（替换已有的采样设置）"""
+    for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+        logger.removeFilter(existing)
+    if rate < 1.0:
+        logger.addFilter(SamplingFilter(rate))
+
+
 class ContextFilter(logging.Filter):
     """
     上下文过滤器
-    
+
     为日志记录添加额外的上下文信息
     """
-    
+
     def filter(self, record: logging.LogRecord) -> bool:
         """
         过滤日志记录
-        
+
         Args:
             record: 日志记录
-            
+
         Returns:
             bool: 是否保留该日志记录
         """
-        # 添加默认的上下文信息
+        # 添加默认的上下文信息（未通过 extra 指定时取当前请求上下文）
         if not hasattr(record, 'request_id'):
-            record.request_id = 'N/A'
-        
+            record.request_id = request_id_var.get()
+
         return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    采样过滤器
+
+    只对 INFO 及以下级别采样，WARNING 及以上始终保留。
+    按请求ID哈希决定是否保留，同一请求的开始/完成日志同进同出。
+    """
+
+    _SCALE = 10000
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self._threshold = int(max(0.0, min(rate, 1.0)) * self._SCALE)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        过滤日志记录
+
+        Args:
+            record: 日志记录
+
+        Returns:
+            bool: 是否保留该日志记录
+        """
+        if record.levelno > logging.INFO:
+            return True
+
+        request_id = getattr(record, 'request_id', None) or request_id_var.get()
+        bucket = zlib.crc32(request_id.encode('utf-8')) % self._SCALE
+        return bucket < self._threshold
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    JSON日志格式化器
+
+    每条日志输出为一行JSON，包含时间、级别、记录器、消息、请求ID及 extra 字段
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        格式化日志记录
+
+        Args:
+            record: 日志记录
+
+        Returns:
+            str: JSON字符串
+        """
+        entry: Dict[str, Any] = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec='milliseconds'
+            ),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', 'N/A'),
+            'source': f"{record.filename}:{record.lineno}",
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and key not in entry:
+                entry[key] = value
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    队列处理器
+
+    入队前只合并消息参数并把异常转为文本（可跨线程传递），
+    保留 extra 字段，由后台线程的处理器完成格式化
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
@@ -1,20 +1,98 @@
 """Main application entry point"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import HTTPException
 from datetime import datetime
+from starlette.concurrency import run_in_threadpool
 
-from app.api import transactions, cash_flows, export as export_api
+from app.api import transactions, cash_flows, admin, export as export_api
 from app.middleware.error_handler import error_handler_middleware
 from app.middleware.logging_middleware import logging_middleware
-from app.middleware.auth import auth_middleware
+from app.middleware.auth import AuthService, auth_middleware
+from app.middleware.jwt_auth import JWTAuthenticator
+from app.middleware.compression import compression_middleware
+from app.middleware.metrics import metrics_middleware
+from app.middleware.query_stats import query_stats_middleware
+from app.middleware.rate_limit import rate_limit_middleware
+from app.middleware.tracing import tracing_middleware
+from app.tracing import setup_tracing
+from app.query_workload import query_workload
+from app.partitioning import PartitionManager, partition_maintenance_loop
+from app.metrics import REGISTRY, CONTENT_TYPE_LATEST, register_pool_metrics
+from app.database import engine, warm_up_pool, pool_status, check_database
 from app.logging_config import setup_logging
+from app.config import settings
 
 # 配置日志
-setup_logging()
+setup_logging(
+    log_level=settings.log_level,
+    log_format=settings.log_format,
+    use_queue=settings.log_queue_enabled,
+    sample_rates=settings.log_sample_rates
+)
+
+# 配置本地追踪
+setup_tracing(
+    enabled=settings.tracing_enabled,
+    file_path=settings.tracing_file,
+    sample_rate=settings.tracing_sample_rate,
+    max_bytes=settings.tracing_max_bytes,
+    backup_count=settings.tracing_backup_count
+)
+
+# 配置认证方式
+AuthService.configure(
+    jwt_authenticator=JWTAuthenticator(
+        jwks_file=settings.auth_jwks_file,
+        algorithms=settings.auth_jwt_algorithms,
+        issuer=settings.auth_jwt_issuer,
+        audience=settings.auth_jwt_audience,
+        leeway=settings.auth_jwt_leeway,
+        cache_size=settings.auth_token_cache_size
+    ) if settings.auth_jwks_file else None,
+    static_tokens_enabled=settings.auth_static_tokens_enabled
+)
+
+# 配置查询负载记录（索引顾问的输入）
+query_workload.max_shapes = settings.query_workload_max_shapes
+query_workload.examples_per_shape = settings.query_workload_examples_per_shape
+if settings.query_workload_capture_enabled:
+    query_workload.start()
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时预建数据库连接池连接，并按配置启动分区维护"""
+    if settings.database_pool_warmup:
+        try:
+            opened = await run_in_threadpool(warm_up_pool, engine, settings.database_pool_size)
+            logger.info(f"Database pool warmed up with {opened} connections")
+        except Exception as e:
+            # 数据库暂不可用时仍然启动，由 /health/ready 反映未就绪
+            logger.warning(f"Database pool warm-up failed: {e}")
+
+    maintenance = None
+    if settings.partition_maintenance_enabled:
+        maintenance = asyncio.create_task(partition_maintenance_loop(
+            PartitionManager(engine),
+            settings.partition_maintenance_interval_hours * 3600,
+            settings.partition_months_ahead,
+            settings.partition_retention_months
+        ))
+    yield
+    if maintenance is not None:
+        maintenance.cancel()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Settlement Operation Guide API",
     description="""
     ## 操作指导系统API
@@ -66,15 +144,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add custom middleware (order matters: logging -> auth -> error handler)
+# Add custom middleware (order matters: query stats -> rate limit -> logging -> auth -> error handler -> compression -> metrics -> tracing)
+query_stats_middleware(app)
+rate_limit_middleware(app)
 logging_middleware(app)
 auth_middleware(app)
 error_handler_middleware(app)
+compression_middleware(app)
+metrics_middleware(app)
+tracing_middleware(app)
+
+# 数据库连接池指标
+register_pool_metrics(engine)
 
 # Include routers
 app.include_router(transactions.router)
 app.include_router(cash_flows.router)
 app.include_router(export_api.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
@@ -85,3 +172,22 @@ async def root():
 async def health():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness check endpoint (database round trip and pool stats)"""
+    database = await run_in_threadpool(check_database, engine)
+    ready = database["status"] == "up"
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "database": database,
+            "pool": pool_status(engine)
+        }
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
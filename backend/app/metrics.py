@@ -0,0 +1,385 @@
+"""In-process metrics registry (Prometheus text format)"""
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# 默认延迟桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label_value(value: str) -> str:
+    """转义标签值中的反斜杠、双引号和换行"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """格式化标签集合，如 {method="GET",status="200"}"""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值"""
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    """
+    指标基类
+
+    每个标签值组合对应一个子序列（child），子序列在首次使用时创建并缓存；
+    热路径上只做一次字典查找和子序列自身的计数操作。
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues: str):
+        """
+        获取指定标签值的子序列
+
+        Args:
+            labelvalues: 按 labelnames 顺序给出的标签值
+
+        Returns:
+            子序列对象
+        """
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(
+                    f"INVALID_PARAMETER: 指标 {self.name} 需要标签 {self.labelnames}"
+                )
+            with self._lock:
+                child = self._children.setdefault(labelvalues, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """创建一个子序列"""
+
+    def _default_child(self):
+        """无标签指标的唯一子序列"""
+        return self.labels()
+
+    def collect(self) -> List[str]:
+        """输出该指标的文本格式样本行"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for labelvalues, child in list(self._children.items()):
+            lines.extend(self._collect_child(labelvalues, child))
+        return lines
+
+    def _collect_child(self, labelvalues: Tuple[str, ...], child) -> List[str]:
+        labels = _format_labels(self.labelnames, labelvalues)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class _CounterChild:
+    """计数器子序列"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """增加计数"""
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """无标签计数器增加计数"""
+        self._default_child().inc(amount)
+
+
+class _GaugeChild:
+    """仪表子序列"""
+
+    __slots__ = ("_value", "_lock", "_function")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], Optional[float]]] = None
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """采集时调用 function 取值（返回None时不输出该样本）"""
+        self._function = function
+
+    def get(self) -> Optional[float]:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+
+class Gauge(_Metric):
+    """可增可减的仪表"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default_child().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default_child().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default_child().set(value)
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        self._default_child().set_function(function)
+
+    def _collect_child(self, labelvalues: Tuple[str, ...], child) -> List[str]:
+        value = child.get()
+        if value is None:
+            return []
+        labels = _format_labels(self.labelnames, labelvalues)
+        return [f"{self.name}{labels} {_format_value(float(value))}"]
+
+
+class _HistogramChild:
+    """直方图子序列（按桶计数，采集时再累加）"""
+
+    __slots__ = ("_upper_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * len(upper_bounds)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """记录一次观测值"""
+        index = bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    """直方图"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        upper_bounds = sorted(float(b) for b in buckets)
+        if not upper_bounds or upper_bounds[-1] != math.inf:
+            upper_bounds.append(math.inf)
+        self.upper_bounds = tuple(upper_bounds)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default_child().observe(value)
+
+    def _collect_child(self, labelvalues: Tuple[str, ...], child) -> List[str]:
+        counts, total = child.snapshot()
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds, counts):
+            cumulative += count
+            labels = _format_labels(names, labelvalues + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        注册指标
+
+        Args:
+            metric: 指标对象
+
+        Returns:
+            _Metric: 已注册的指标（同名指标重复注册时返回已有对象）
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        生成 Prometheus 文本格式输出
+
+        Returns:
+            str: 所有指标的文本表示
+        """
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# HTTP 请求
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP请求处理耗时（秒），按路由模板统计",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "正在处理的HTTP请求数"
+)
+
+# 数据导出
+EXPORT_ROWS = REGISTRY.counter(
+    "export_rows_total",
+    "导出的数据行数",
+    ("entity", "format")
+)
+EXPORT_BYTES = REGISTRY.counter(
+    "export_bytes_total",
+    "导出文件的字节数",
+    ("entity", "format")
+)
+
+# SQL 执行
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "db_queries_per_request",
+    "单个请求执行的SQL语句数",
+    ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+DB_TIME_PER_REQUEST = REGISTRY.histogram(
+    "db_time_per_request_seconds",
+    "单个请求的SQL执行总耗时（秒）",
+    ("route",)
+)
+SLOW_QUERIES = REGISTRY.counter(
+    "db_slow_queries_total",
+    "超过慢查询阈值的SQL语句数"
+)
+N_PLUS_ONE_WARNINGS = REGISTRY.counter(
+    "db_n_plus_one_warnings_total",
+    "同一语句指纹在单个请求内重复执行超过阈值的次数",
+    ("route",)
+)
+
+# 限流
+RATE_LIMITED_REQUESTS = REGISTRY.counter(
+    "rate_limited_requests_total",
+    "被限流拒绝（429）的请求数",
+    ("route_class",)
+)
+
+# 乐观锁
+OPTIMISTIC_LOCK_CONFLICTS = REGISTRY.counter(
+    "optimistic_lock_conflicts_total",
+    "乐观锁版本冲突次数",
+    ("entity",)
+)
+
+
+def register_pool_metrics(engine) -> None:
+    """
+    注册数据库连接池仪表（采集时从 engine.pool 实时读取）
+
+    Args:
+        engine: SQLAlchemy 引擎
+    """
+    pool_metrics = {
+        "db_pool_size": ("连接池大小", "size"),
+        "db_pool_checked_out": ("已借出的连接数", "checkedout"),
+        "db_pool_checked_in": ("池中空闲的连接数", "checkedin"),
+        "db_pool_overflow": ("当前溢出连接数", "overflow"),
+    }
+    for name, (documentation, method_name) in pool_metrics.items():
+        gauge = REGISTRY.gauge(name, documentation)
+        gauge.set_function(_pool_reader(engine, method_name))
+
+
+def _pool_reader(engine, method_name: str) -> Callable[[], Optional[float]]:
+    """读取连接池状态；StaticPool 等不支持的连接池返回None"""
+    def read() -> Optional[float]:
+        method = getattr(engine.pool, method_name, None)
+        return method() if method is not None else None
+    return read
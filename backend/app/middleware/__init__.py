@@ -2,5 +2,19 @@
 from app.middleware.error_handler import error_handler_middleware
 from app.middleware.logging_middleware import logging_middleware
 from app.middleware.auth import auth_middleware
+from app.middleware.compression import compression_middleware
+from app.middleware.metrics import metrics_middleware
+from app.middleware.query_stats import query_stats_middleware
+from app.middleware.rate_limit import rate_limit_middleware
+from app.middleware.tracing import tracing_middleware
 
-__all__ = ['error_handler_middleware', 'logging_middleware', 'auth_middleware']
+__all__ = [
+    'error_handler_middleware',
+    'logging_middleware',
+    'auth_middleware',
+    'compression_middleware',
+    'metrics_middleware',
+    'query_stats_middleware',
+    'rate_limit_middleware',
+    'tracing_middleware'
+]
@@ -1,11 +1,14 @@
 """Authentication and authorization middleware"""
 import logging
-from typing import Optional, List
+from typing import Callable, Dict, Iterable, List, Optional
 from enum import Enum
 
-from fastapi import Request, HTTPException, status
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 logger = logging.getLogger(__name__)
@@ -27,18 +30,60 @@ class Permission(str, Enum):
     ADMIN = "admin"
 
 
+# 权限位：用户权限以整数位掩码表示，权限检查只需一次按位与
+PERMISSION_BITS: Dict[Permission, int] = {
+    permission: 1 << index for index, permission in enumerate(Permission)
+}
+ALL_PERMISSIONS_MASK = (1 << len(PERMISSION_BITS)) - 1
+_PERMISSIONS_BY_BIT: Dict[int, Permission] = {bit: p for p, bit in PERMISSION_BITS.items()}
+
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    """
+    计算权限位掩码（管理员权限展开为全部权限位）
+    
+    Args:
+        permissions: 权限列表
+        
+    Returns:
+        int: 权限位掩码
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    if mask & PERMISSION_BITS[Permission.ADMIN]:
+        return ALL_PERMISSIONS_MASK
+    return mask
+
+
 class User:
-    """用户模型"""
+    """
+    用户模型（不可变）
+    
+    认证结果会在请求间缓存和共享，因此创建后不允许修改
+    """
+    
+    __slots__ = ("user_id", "username", "permissions", "permission_mask")
     
     def __init__(
         self,
         user_id: str,
         username: str,
-        permissions: List[Permission]
+        permissions: Iterable[Permission]
     ):
-        self.user_id = user_id
-        self.username = username
-        self.permissions = permissions
+        object.__setattr__(self, "user_id", user_id)
+        object.__setattr__(self, "username", username)
+        object.__setattr__(self, "permissions", frozenset(permissions))
+        object.__setattr__(self, "permission_mask", permission_mask(self.permissions))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"User is immutable, cannot set '{name}'")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"User is immutable, cannot delete '{name}'")
+    
+    def __repr__(self) -> str:
+        return f"User(user_id={self.user_id!r}, username={self.username!r})"
     
     def has_permission(self, permission: Permission) -> bool:
         """
@@ -50,19 +95,23 @@ class User:
         Returns:
             bool: 是否具有权限
         """
-        return (
-            Permission.ADMIN in self.permissions or
-            permission in self.permissions
-        )
+        return bool(self.permission_mask & PERMISSION_BITS[permission])
 
 
 class AuthService:
     """
     认证服务
     
-    注意：这是一个简化的实现，实际生产环境应该集成真实的认证系统
+    配置了JWT认证器时，形如JWT的令牌交由其校验；
+    内置静态令牌仅用于开发和测试，生产环境应通过 auth_static_tokens_enabled 关闭
     """
     
+    # JWT认证器（None 表示未配置，见 configure）
+    _jwt_authenticator = None
+    
+    # 是否接受内置静态令牌
+    static_tokens_enabled = True
+    
     # 模拟的用户数据库
     _users = {
         "test-token-123": User(
@@ -95,12 +144,25 @@ class AuthService:
         Returns:
             Optional[User]: 用户对象，如果令牌无效则返回None
         """
-        # 在实际生产环境中，这里应该：
-        # 1. 验证JWT令牌
-        # 2. 从数据库或缓存中获取用户信息
-        # 3. 验证令牌是否过期
+        jwt_authenticator = cls._jwt_authenticator
+        if jwt_authenticator is not None and token.count(".") == 2:
+            return jwt_authenticator.authenticate(token)
         
-        return cls._users.get(token)
+        if cls.static_tokens_enabled:
+            return cls._users.get(token)
+        return None
+    
+    @classmethod
+    def configure(cls, jwt_authenticator=None, static_tokens_enabled: bool = True) -> None:
+        """
+        配置认证方式
+        
+        Args:
+            jwt_authenticator: JWT认证器（提供 authenticate(token) 方法），None 表示不启用
+            static_tokens_enabled: 是否接受内置静态令牌
+        """
+        cls._jwt_authenticator = jwt_authenticator
+        cls.static_tokens_enabled = static_tokens_enabled
     
     @classmethod
     def authorize(cls, user: User, permission: Permission) -> bool:
@@ -117,46 +179,209 @@ class AuthService:
         return user.has_permission(permission)
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class _TrieNode:
+    """路由前缀树节点（按路径段）"""
+    
+    __slots__ = ("children", "param", "catch_all", "value")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.param: Optional["_TrieNode"] = None
+        self.catch_all: Optional[int] = None
+        self.value: Optional[int] = None
+
+
+class RoutePermissionTable:
     """
-    认证和授权中间件
+    路由 → 所需权限位 的编译表
     
-    验证请求的认证令牌并检查权限
+    根据已注册路由的路径模板一次性构建：不含参数的路径放入字典，
+    含路径参数的模板放入按路径段组织的前缀树，请求时不再逐条做字符串前缀匹配；
+    解析过的具体路径进入有界字典，重复访问同一路径时只需一次字典查找
     """
     
-    # 不需要认证的路径
-    PUBLIC_PATHS = ["/", "/health", "/docs", "/openapi.json", "/redoc"]
+    # 已解析的具体路径缓存上限（进度轮询等请求会反复访问同一路径）
+    RESOLVED_CACHE_SIZE = 4096
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, resolve: Callable[[str], Optional[Permission]]):
         """
-        处理请求并验证认证
+        Args:
+            resolve: 路径 → 所需权限的规则函数（编译时作用于路由模板，未匹配路由时作为兜底）
+        """
+        self._resolve = resolve
+        self._static: Dict[str, int] = {}
+        self._root = _TrieNode()
+        self._resolved: Dict[str, int] = {}
+    
+    @classmethod
+    def from_routes(
+        cls,
+        routes: Iterable[BaseRoute],
+        resolve: Callable[[str], Optional[Permission]]
+    ) -> "RoutePermissionTable":
+        """
+        根据应用路由构建权限表
+        
+        Args:
+            routes: 已注册的路由
+            resolve: 路径 → 所需权限的规则函数
+            
+        Returns:
+            RoutePermissionTable: 权限表
+        """
+        table = cls(resolve)
+        for route in routes:
+            path = getattr(route, "path", None)
+            if path:
+                table.add(path)
+        return table
+    
+    def _bit_for(self, path: str) -> int:
+        """按规则计算路径所需的权限位（0 表示无需权限）"""
+        permission = self._resolve(path)
+        return PERMISSION_BITS[permission] if permission else 0
+    
+    def add(self, template: str) -> None:
+        """
+        添加路由模板
+        
+        Args:
+            template: 路径模板，如 /api/transactions/{transaction_id}
+        """
+        bit = self._bit_for(template)
+        if "{" not in template:
+            self._static[template] = bit
+            return
+        
+        node = self._root
+        for segment in template.strip("/").split("/"):
+            if segment.startswith("{") and segment.endswith(":path}"):
+                node.catch_all = bit
+                return
+            if segment.startswith("{"):
+                if node.param is None:
+                    node.param = _TrieNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.value = bit
+    
+    def match(self, path: str) -> Optional[int]:
+        """
+        查找路径对应路由的权限位
+        
+        Args:
+            path: 请求路径
+            
+        Returns:
+            Optional[int]: 权限位，没有匹配的路由时返回None
+        """
+        bit = self._static.get(path)
+        if bit is not None:
+            return bit
+        
+        segments = path.strip("/").split("/")
+        count = len(segments)
+        # 深度优先：静态段优先，走不通时回溯到参数段或通配段
+        pending = [(self._root, 0)]
+        while pending:
+            node, index = pending.pop()
+            if node is None:
+                continue
+            while True:
+                if index == count:
+                    if node.value is not None:
+                        return node.value
+                    break
+                segment = segments[index]
+                child = node.children.get(segment)
+                if node.param is not None and segment:
+                    if child is None:
+                        node, index = node.param, index + 1
+                        continue
+                    pending.append((node.param, index + 1))
+                if child is None:
+                    break
+                node, index = child, index + 1
+            if node.catch_all is not None:
+                return node.catch_all
+        return None
+    
+    def required_bit(self, path: str) -> int:
+        """
+        获取路径所需的权限位
         
         Args:
-            request: HTTP请求
-            call_next: 下一个中间件或路由处理器
+            path: 请求路径
             
         Returns:
-            Response: HTTP响应
+            int: 权限位（0 表示无需权限）；未注册的路径按规则函数计算
+        """
+        bit = self._static.get(path)
+        if bit is not None:
+            return bit
+        bit = self._resolved.get(path)
+        if bit is not None:
+            return bit
+        
+        bit = self.match(path)
+        if bit is None:
+            bit = self._bit_for(path)
+        if len(self._resolved) >= self.RESOLVED_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[path] = bit
+        return bit
+
+
+class AuthMiddleware:
+    """
+    认证和授权中间件（纯ASGI实现）
+    
+    验证请求的认证令牌并检查权限，认证失败时直接返回401/403 JSON响应
+    """
+    
+    # 不需要认证的路径
+    PUBLIC_PATHS = frozenset(["/", "/health", "/health/ready", "/metrics", "/docs", "/openapi.json", "/redoc"])
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._permission_table: Optional[RoutePermissionTable] = None
+    
+    def _get_permission_table(self, scope: Scope) -> RoutePermissionTable:
+        """获取权限表（首个请求时根据应用已注册的路由构建）"""
+        table = self._permission_table
+        if table is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            table = RoutePermissionTable.from_routes(routes, self._get_required_permission)
+            self._permission_table = table
+        return table
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        处理请求并验证认证
+        
+        Args:
+            scope: ASGI连接信息
+            receive: ASGI接收通道
+            send: ASGI发送通道
         """
         # 检查是否是公开路径
-        if request.url.path in self.PUBLIC_PATHS:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in self.PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
         
         # 获取认证令牌
-        auth_header = request.headers.get("Authorization")
+        auth_header = Headers(scope=scope).get("Authorization")
         
         if not auth_header:
             logger.warning(
-                f"Missing authorization header for {request.url.path}",
-                extra={'path': request.url.path}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "code": "UNAUTHORIZED",
-                    "message": "缺少认证令牌"
-                }
+                f"Missing authorization header for {path}",
+                extra={'path': path}
             )
+            await self._reject(scope, receive, send, status.HTTP_401_UNAUTHORIZED, "缺少认证令牌")
+            return
         
         # 解析令牌
         try:
@@ -165,75 +390,88 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 raise ValueError("Invalid authentication scheme")
         except ValueError:
             logger.warning(
-                f"Invalid authorization header format for {request.url.path}",
-                extra={'path': request.url.path}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "code": "UNAUTHORIZED",
-                    "message": "无效的认证令牌格式"
-                }
+                f"Invalid authorization header format for {path}",
+                extra={'path': path}
             )
+            await self._reject(scope, receive, send, status.HTTP_401_UNAUTHORIZED, "无效的认证令牌格式")
+            return
         
         # 验证令牌
         user = AuthService.authenticate(token)
         
         if user is None:
             logger.warning(
-                f"Invalid token for {request.url.path}",
-                extra={'path': request.url.path}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "code": "UNAUTHORIZED",
-                    "message": "无效的认证令牌"
-                }
+                f"Invalid token for {path}",
+                extra={'path': path}
             )
+            await self._reject(scope, receive, send, status.HTTP_401_UNAUTHORIZED, "无效的认证令牌")
+            return
         
-        # 将用户信息添加到请求状态
-        request.state.user = user
+        # 将用户信息添加到请求状态（request.state.user）
+        scope.setdefault("state", {})["user"] = user
         
-        # 检查权限（基于路径）
-        required_permission = self._get_required_permission(request.url.path)
+        # 检查权限（基于路由权限表）
+        required_bit = self._get_permission_table(scope).required_bit(path)
         
-        if required_permission and not AuthService.authorize(user, required_permission):
+        if required_bit and not user.permission_mask & required_bit:
+            required_permission = _PERMISSIONS_BY_BIT[required_bit]
             logger.warning(
-                f"Permission denied for user {user.username} on {request.url.path}",
+                f"Permission denied for user {user.username} on {path}",
                 extra={
                     'user_id': user.user_id,
                     'username': user.username,
-                    'path': request.url.path,
+                    'path': path,
                     'required_permission': required_permission.value
                 }
             )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "code": "FORBIDDEN",
-                    "message": "没有权限访问该资源"
-                }
-            )
+            await self._reject(scope, receive, send, status.HTTP_403_FORBIDDEN, "没有权限访问该资源")
+            return
         
         # 记录认证成功
         logger.info(
-            f"User {user.username} authenticated for {request.url.path}",
+            f"User {user.username} authenticated for {path}",
             extra={
                 'user_id': user.user_id,
                 'username': user.username,
-                'path': request.url.path
+                'path': path
             }
         )
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        message: str
+    ) -> None:
+        """
+        返回认证/授权失败响应（格式与 HTTPException 处理器一致）
+        
+        Args:
+            scope: ASGI连接信息
+            receive: ASGI接收通道
+            send: ASGI发送通道
+            status_code: HTTP状态码
+            message: 错误消息
+        """
+        code = "FORBIDDEN" if status_code == status.HTTP_403_FORBIDDEN else "UNAUTHORIZED"
+        response = JSONResponse(
+            status_code=status_code,
+            content={"code": code, "message": message}
+        )
+        await response(scope, receive, send)
     
     def _get_required_permission(self, path: str) -> Optional[Permission]:
         """
         根据路径获取所需权限
         
+        作为路由权限表的编译规则作用于路由模板，运行时仅用于未注册路径的兜底
+        
         Args:
-            path: 请求路径
+            path: 请求路径或路由模板
             
         Returns:
             Optional[Permission]: 所需权限，如果不需要特定权限则返回None
@@ -253,6 +491,10 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if path.startswith("/api/export/cash-flows"):
             return Permission.EXPORT_CASH_FLOWS
         
+        # 诊断接口仅限管理员
+        if path.startswith("/api/admin"):
+            return Permission.ADMIN
+        
         # 默认需要查询权限
         return Permission.QUERY_TRANSACTIONS
 
@@ -0,0 +1,221 @@
+"""Response compression middleware"""
+import logging
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # Brotli为可选依赖，未安装时仅使用gzip
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# 可压缩的响应类型（xlsx、parquet等本身已压缩的格式不在此列）
+COMPRESSIBLE_CONTENT_TYPES = frozenset([
+    "application/json",
+    "text/csv",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "application/javascript",
+    "application/xml",
+])
+
+
+class _Compressor:
+    """流式压缩器（gzip / br）"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.finish
+        else:
+            # wbits=31 生成带gzip头的数据流
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._flush = self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        """压缩数据块"""
+        return self._compress(data)
+
+    def flush(self) -> bytes:
+        """结束压缩并输出剩余数据"""
+        return self._flush()
+
+
+class CompressionMiddleware:
+    """
+    响应压缩中间件（纯ASGI实现）
+
+    根据 Accept-Encoding 选择 br 或 gzip，仅压缩可压缩类型且超过最小阈值的响应；
+    对 StreamingResponse 按数据块流式压缩，不缓冲整个响应体
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = COMPRESSIBLE_CONTENT_TYPES
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = frozenset(content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+        """
+        解析 Accept-Encoding，优先选择 br，其次 gzip
+
+        Args:
+            accept_encoding: 请求头 Accept-Encoding
+
+        Returns:
+            Optional[str]: 编码名称，客户端不接受压缩时返回None
+        """
+        accepted = set()
+        for item in accept_encoding.lower().split(","):
+            coding, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if coding and quality > 0:
+                accepted.add(coding.strip())
+
+        if brotli is not None and ("br" in accepted or "*" in accepted):
+            return "br"
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip"
+        return None
+
+    def is_compressible(self, headers: Headers) -> bool:
+        """判断响应是否需要压缩"""
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return content_type in self.content_types
+
+
+class _CompressionResponder:
+    """单个请求的压缩状态"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream_send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # 等待第一个响应体数据块再决定是否压缩
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body":
+            await self.downstream_send(message)
+            return
+
+        if self.passthrough:
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = Headers(raw=self.start_message["headers"])
+            if not self.middleware.is_compressible(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self.downstream_send(self.start_message)
+                await self.downstream_send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality
+            )
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                # 完整响应：一次性压缩并修正 Content-Length
+                compressed = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(compressed))
+                await self.downstream_send(self.start_message)
+                await self.downstream_send({
+                    "type": "http.response.body",
+                    "body": compressed
+                })
+                return
+
+            # 流式响应：长度未知，改用分块传输
+            del headers["Content-Length"]
+            await self.downstream_send(self.start_message)
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.flush()
+        elif not compressed:
+            return
+
+        await self.downstream_send({
+            "type": "http.response.body",
+            "body": compressed,
+            "more_body": more_body
+        })
+
+
+def compression_middleware(app):
+    """
+    添加响应压缩中间件到应用
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if not settings.compression_enabled:
+        return
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_level,
+        brotli_quality=settings.compression_brotli_quality
+    )
@@ -3,53 +3,82 @@ import logging
 import traceback
 import uuid
 from datetime import datetime
-from typing import Callable
 
-from fastapi import Request, Response, status
+from fastapi import status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.schemas.common import ErrorResponse
+from app.logging_config import request_id_var
 
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """
-    统一错误处理中间件
+    统一错误处理中间件（纯ASGI实现）
     
-    捕获所有未处理的异常并返回标准化的错误响应
+    为每个请求生成请求ID，捕获所有未处理的异常并返回标准化的错误响应
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         处理请求并捕获异常
         
         Args:
-            request: HTTP请求
-            call_next: 下一个中间件或路由处理器
-            
-        Returns:
-            Response: HTTP响应
+            scope: ASGI连接信息
+            receive: ASGI接收通道
+            send: ASGI发送通道
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        # 写入 request.state.request_id，供下游中间件和路由使用；
+        # 同时写入上下文变量，供日志过滤器关联请求
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_token = request_id_var.set(request_id)
         
         try:
-            response = await call_next(request)
-            return response
+            await self._dispatch(scope, receive, send, request_id)
+        finally:
+            request_id_var.reset(request_id_token)
+    
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send, request_id: str) -> None:
+        """执行下游应用并把异常转换为错误响应"""
+        response_started = False
+        
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_tracking_start)
+            return
         except HTTPException:
             # HTTPException should be handled by FastAPI's default handler
             # Re-raise it to let FastAPI handle it
             raise
-        except ValueError as e:
-            # 业务逻辑错误
-            return self._handle_value_error(e, request_id)
         except Exception as e:
-            # 未预期的错误
-            return self._handle_unexpected_error(e, request, request_id)
+            # 响应已开始发送时无法再改写为错误响应
+            if response_started:
+                raise
+            if isinstance(e, ValueError):
+                # 业务逻辑错误
+                response = self._handle_value_error(e, request_id)
+            else:
+                # 未预期的错误
+                response = self._handle_unexpected_error(e, scope, request_id)
+        
+        await response(scope, receive, send)
     
     def _handle_value_error(self, error: ValueError, request_id: str) -> JSONResponse:
         """
@@ -81,6 +110,8 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             'RESOURCE_ALREADY_EXISTS': status.HTTP_409_CONFLICT,
             'CONCURRENT_CONFLICT': status.HTTP_409_CONFLICT,
             'EXPORT_LIMIT_EXCEEDED': status.HTTP_400_BAD_REQUEST,
+            'PROFILER_BUSY': status.HTTP_409_CONFLICT,
+            'PROFILER_NOT_STARTED': status.HTTP_409_CONFLICT,
             'UNAUTHORIZED': status.HTTP_401_UNAUTHORIZED,
             'FORBIDDEN': status.HTTP_403_FORBIDDEN,
         }
@@ -112,7 +143,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
     def _handle_unexpected_error(
         self,
         error: Exception,
-        request: Request,
+        scope: Scope,
         request_id: str
     ) -> JSONResponse:
         """
@@ -120,7 +151,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         
         Args:
             error: 异常对象
-            request: HTTP请求
+            scope: ASGI连接信息
             request_id: 请求ID
             
         Returns:
@@ -131,8 +162,8 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             f"Unexpected error: {str(error)}",
             extra={
                 'request_id': request_id,
-                'path': request.url.path,
-                'method': request.method,
+                'path': scope['path'],
+                'method': scope['method'],
                 'traceback': traceback.format_exc()
             }
         )
@@ -0,0 +1,233 @@
+"""JWT authentication against a local JWKS file"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import jwt
+except ImportError:  # pragma: no cover - 未安装时仅能使用静态令牌
+    jwt = None
+
+from app.middleware.auth import Permission, User
+
+
+logger = logging.getLogger(__name__)
+
+
+# 权限值 → 权限枚举（未知权限字符串直接忽略）
+_PERMISSIONS_BY_VALUE: Dict[str, Permission] = {p.value: p for p in Permission}
+
+
+class VerifiedTokenCache:
+    """
+    已验证令牌的有界LRU缓存
+
+    以令牌的SHA-256摘要为键（不在内存中保留原始令牌），缓存至令牌的 exp，
+    命中时同样校验 nbf，使轮询等高频请求只在首次出现时做一次签名校验
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[User, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes, now: float) -> Optional[User]:
+        """
+        获取已生效且未过期的缓存用户
+
+        Args:
+            key: 令牌摘要
+            now: 当前时间戳
+
+        Returns:
+            Optional[User]: 用户，未命中、尚未生效或已过期时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, not_before, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            if now < not_before:
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def put(self, key: bytes, user: User, expires_at: float, not_before: float = 0.0) -> None:
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 令牌摘要
+            user: 用户
+            expires_at: 过期时间戳
+            not_before: 生效时间戳（早于该时间命中时视为无效）
+        """
+        with self._lock:
+            self._entries[key] = (user, not_before, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+
+class JWTAuthenticator:
+    """
+    JWT认证器
+
+    使用本地JWKS文件中的公钥校验签名、exp/nbf 以及可选的 iss/aud，
+    校验通过后把声明一次性解码为不可变的 User 并缓存到令牌过期
+    """
+
+    def __init__(
+        self,
+        jwks_file: str,
+        algorithms: Iterable[str] = ("RS256", "ES256"),
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        leeway: int = 30,
+        cache_size: int = 10000
+    ):
+        """
+        Args:
+            jwks_file: JWKS文件路径
+            algorithms: 允许的签名算法
+            issuer: 要求的签发者（为空时不校验）
+            audience: 要求的受众（为空时不校验）
+            leeway: 时间校验容差（秒）
+            cache_size: 已验证令牌缓存容量
+        """
+        if jwt is None:
+            raise RuntimeError("PyJWT[crypto] is required for JWT authentication")
+
+        self.jwks_file = jwks_file
+        self.algorithms = list(algorithms)
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+        self.cache = VerifiedTokenCache(cache_size)
+        self._keys: Dict[Optional[str], object] = {}
+        self._jwks_mtime: Optional[float] = None
+        self.reload_keys()
+
+    def reload_keys(self) -> None:
+        """从JWKS文件加载公钥（按 kid 索引）"""
+        with open(self.jwks_file, encoding="utf-8") as f:
+            jwks = json.load(f)
+
+        keys: Dict[Optional[str], object] = {}
+        for jwk in jwks.get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            keys[jwk.get("kid")] = jwt.PyJWK(jwk).key
+
+        self._keys = keys
+        self._jwks_mtime = os.path.getmtime(self.jwks_file)
+        logger.info(f"Loaded {len(keys)} signing keys from {self.jwks_file}")
+
+    def authenticate(self, token: str) -> Optional[User]:
+        """
+        验证令牌并返回用户
+
+        Args:
+            token: JWT令牌
+
+        Returns:
+            Optional[User]: 用户对象，签名无效、已过期或声明不合法时返回None
+        """
+        now = time.time()
+        cache_key = hashlib.sha256(token.encode()).digest()
+        user = self.cache.get(cache_key, now)
+        if user is not None:
+            return user
+
+        claims = self._verify(token)
+        if claims is None:
+            return None
+
+        user = self.user_from_claims(claims)
+        # 缓存至 exp（不超过 exp，使过期令牌不会因缓存而继续有效）；nbf 与验签时一样计入容差
+        not_before = float(claims.get("nbf", 0)) - self.leeway
+        self.cache.put(cache_key, user, float(claims["exp"]), not_before)
+        return user
+
+    def _verify(self, token: str) -> Optional[dict]:
+        """校验签名和标准声明，失败时返回None"""
+        try:
+            key = self._signing_key(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                return None
+            return jwt.decode(
+                token,
+                key=key,
+                algorithms=self.algorithms,
+                issuer=self.issuer,
+                audience=self.audience,
+                leeway=self.leeway,
+                options={
+                    "require": ["exp", "sub"],
+                    "verify_aud": self.audience is not None,
+                },
+            )
+        except jwt.PyJWTError as e:
+            logger.warning(f"JWT verification failed: {type(e).__name__}: {e}")
+            return None
+
+    def _signing_key(self, kid: Optional[str]):
+        """
+        按 kid 查找公钥；未知 kid 时若JWKS文件已更新则重新加载（密钥轮换）
+
+        JWKS文件在轮换中被移除或尚未写完时继续使用已加载的公钥，
+        查不到时按认证失败处理，而不是让异常变成服务端错误
+        """
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        if key is None:
+            try:
+                if os.path.getmtime(self.jwks_file) != self._jwks_mtime:
+                    self.reload_keys()
+                    key = self._keys.get(kid)
+            except (OSError, ValueError) as e:
+                logger.warning(f"JWKS reload failed, keeping cached keys: {type(e).__name__}: {e}")
+        if key is None:
+            logger.warning(f"Unknown JWT key id: {kid}")
+        return key
+
+    @staticmethod
+    def user_from_claims(claims: dict) -> User:
+        """
+        把JWT声明解码为用户
+
+        权限取自 permissions（列表）或 scope（空格分隔字符串）声明
+
+        Args:
+            claims: 已验证的声明
+
+        Returns:
+            User: 不可变用户对象
+        """
+        granted: List[str] = list(claims.get("permissions") or [])
+        scope = claims.get("scope")
+        if isinstance(scope, str):
+            granted.extend(scope.split())
+
+        return User(
+            user_id=claims["sub"],
+            username=claims.get("preferred_username") or claims.get("name") or claims["sub"],
+            permissions=[_PERMISSIONS_BY_VALUE[p] for p in granted if p in _PERMISSIONS_BY_VALUE]
+        )
@@ -1,75 +1,86 @@
 """Logging middleware"""
 import logging
 import time
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
-    请求日志中间件
+    请求日志中间件（纯ASGI实现）
     
-    记录所有HTTP请求和响应的详细信息
+    记录所有HTTP请求和响应的详细信息，并在响应头中添加
+    X-Request-ID 和 X-Process-Time
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         处理请求并记录日志
         
         Args:
-            request: HTTP请求
-            call_next: 下一个中间件或路由处理器
-            
-        Returns:
-            Response: HTTP响应
+            scope: ASGI连接信息
+            receive: ASGI接收通道
+            send: ASGI发送通道
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # 记录请求开始时间
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 获取请求ID（由错误处理中间件设置）
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = scope.get("state", {}).get("request_id", "unknown")
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
         
         # 记录请求信息
         logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra={
-                'request_id': request_id,
-                'method': request.method,
-                'path': request.url.path,
-                'query_params': str(request.query_params),
-                'client_host': request.client.host if request.client else 'unknown'
-            }
-        )
-        
-        # 处理请求
-        response = await call_next(request)
-        
-        # 计算处理时间
-        process_time = time.time() - start_time
-        
-        # 记录响应信息
-        logger.info(
-            f"Request completed: {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - Time: {process_time:.3f}s",
+            f"Request started: {method} {path}",
             extra={
                 'request_id': request_id,
-                'method': request.method,
-                'path': request.url.path,
-                'status_code': response.status_code,
-                'process_time': process_time
+                'method': method,
+                'path': path,
+                'query_params': scope.get("query_string", b"").decode("latin-1"),
+                'client_host': client[0] if client else 'unknown'
             }
         )
         
-        # 添加响应头
-        response.headers['X-Request-ID'] = request_id
-        response.headers['X-Process-Time'] = f"{process_time:.3f}"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 计算处理时间（与原实现一致：到响应头发出为止）
+                process_time = time.perf_counter() - start_time
+                status_code = message["status"]
+                
+                # 记录响应信息
+                logger.info(
+                    f"Request completed: {method} {path} - "
+                    f"Status: {status_code} - Time: {process_time:.3f}s",
+                    extra={
+                        'request_id': request_id,
+                        'method': method,
+                        'path': path,
+                        'status_code': status_code,
+                        'process_time': process_time
+                    }
+                )
+                
+                # 添加响应头
+                headers = MutableHeaders(scope=message)
+                headers['X-Request-ID'] = request_id
+                headers['X-Process-Time'] = f"{process_time:.3f}"
+            
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
 def logging_middleware(app):
@@ -0,0 +1,63 @@
+"""Request metrics middleware"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+
+# 未匹配到路由的请求统一归入该标签，避免路径参数导致标签基数膨胀
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    请求指标中间件（纯ASGI实现）
+
+    按 (方法, 路由模板, 状态码) 记录请求耗时直方图，并维护在途请求数
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight.dec()
+            # 路由匹配后 FastAPI 会把路由对象写入 scope["route"]
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                str(status_code)
+            ).observe(time.perf_counter() - start_time)
+
+
+def metrics_middleware(app):
+    """
+    添加请求指标中间件到应用
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if not settings.metrics_enabled:
+        return
+
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,89 @@
+"""Per-request SQL statistics middleware"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.db_instrumentation import install_sql_instrumentation, track_queries
+from app.metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST, N_PLUS_ONE_WARNINGS
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    请求SQL统计中间件（纯ASGI实现）
+
+    统计每个请求执行的SQL语句数、总耗时和返回行数，
+    写入 X-DB-Queries / X-DB-Time(毫秒) 响应头和指标；
+    同一语句指纹重复执行超过阈值时记录 N+1 告警。
+
+    注意：流式响应在响应头发出后仍会继续查询，响应头只反映发出前的统计，
+    指标和 N+1 检测使用请求结束时的完整统计。
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id", "N/A")
+
+        with track_queries(request_id) as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.statements)
+                    headers["X-DB-Time"] = f"{stats.total_time * 1000:.3f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats) -> None:
+        """记录请求级指标并检测 N+1 查询"""
+        route = scope.get("route")
+        route_path = route.path if route is not None else UNMATCHED_ROUTE
+
+        DB_QUERIES_PER_REQUEST.labels(route_path).observe(stats.statements)
+        DB_TIME_PER_REQUEST.labels(route_path).observe(stats.total_time)
+
+        for fingerprint, count in stats.repeated(self.n_plus_one_threshold):
+            N_PLUS_ONE_WARNINGS.labels(route_path).inc()
+            logger.warning(
+                f"Possible N+1 query on {scope['method']} {route_path}: "
+                f"executed {count} times - {fingerprint}",
+                extra={
+                    'request_id': stats.request_id,
+                    'path': scope['path'],
+                    'route': route_path,
+                    'fingerprint': fingerprint,
+                    'count': count
+                }
+            )
+
+
+def query_stats_middleware(app):
+    """
+    添加请求SQL统计中间件到应用，并注册SQL执行事件
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if not settings.sql_instrumentation_enabled:
+        return
+
+    install_sql_instrumentation()
+    app.add_middleware(
+        QueryStatsMiddleware,
+        n_plus_one_threshold=settings.n_plus_one_threshold
+    )
@@ -0,0 +1,283 @@
+"""Per-user rate limiting middleware"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import RATE_LIMITED_REQUESTS
+
+
+logger = logging.getLogger(__name__)
+
+
+# 路由类别
+ROUTE_CLASS_QUERY = "query"
+ROUTE_CLASS_PROGRESS = "progress"
+ROUTE_CLASS_EXPORT = "export"
+
+
+def classify_route(path: str) -> Optional[str]:
+    """
+    获取请求路径的限流类别
+
+    Args:
+        path: 请求路径
+
+    Returns:
+        Optional[str]: 路由类别（query/progress/export），非API路径返回None
+    """
+    if not path.startswith("/api/"):
+        return None
+    if path.startswith("/api/export/"):
+        return ROUTE_CLASS_EXPORT
+    if path.endswith("/progress"):
+        return ROUTE_CLASS_PROGRESS
+    return ROUTE_CLASS_QUERY
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """令牌桶参数"""
+    rate: float  # 每秒补充的令牌数
+    burst: int  # 桶容量（允许的突发请求数）
+
+
+class RateLimitBackend(ABC):
+    """
+    限流状态存储接口
+
+    默认使用进程内存储；多实例部署需要共享额度时，可实现本接口（如基于 Redis）
+    并传给 RateLimitMiddleware
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: RateLimit) -> float:
+        """
+        从令牌桶取一个令牌
+
+        Args:
+            key: 限流键
+            limit: 令牌桶参数
+
+        Returns:
+            float: 0 表示放行，否则为需要等待的秒数
+        """
+
+    @abstractmethod
+    async def acquire_slot(self, key: str, max_concurrent: int) -> bool:
+        """
+        占用一个并发名额
+
+        Args:
+            key: 并发键
+            max_concurrent: 最大并发数
+
+        Returns:
+            bool: 是否占用成功
+        """
+
+    @abstractmethod
+    async def release_slot(self, key: str) -> None:
+        """
+        释放并发名额
+
+        Args:
+            key: 并发键
+        """
+
+
+class _TokenBucket:
+    """令牌桶状态"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    进程内限流存储
+
+    状态只在事件循环线程上读写，且读改写之间没有 await，
+    因此不需要加锁：每次判断只是一次字典查找和几次浮点运算
+    """
+
+    # 空闲超过该时长的令牌桶已补满，可以丢弃
+    IDLE_TTL = 600.0
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_keys: 令牌桶数量上限，超出时清理空闲令牌桶
+            clock: 单调时钟（测试时可替换）
+        """
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._slots: Dict[str, int] = {}
+
+    async def acquire(self, key: str, limit: RateLimit) -> float:
+        return self.try_acquire(key, limit)
+
+    def try_acquire(self, key: str, limit: RateLimit) -> float:
+        """同步取令牌（语义同 acquire）"""
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = _TokenBucket(limit.burst, now)
+
+        tokens = min(limit.burst, bucket.tokens + (now - bucket.updated) * limit.rate)
+        bucket.updated = now
+        if tokens >= 1:
+            bucket.tokens = tokens - 1
+            return 0.0
+        bucket.tokens = tokens
+        return (1 - tokens) / limit.rate
+
+    async def acquire_slot(self, key: str, max_concurrent: int) -> bool:
+        in_flight = self._slots.get(key, 0)
+        if in_flight >= max_concurrent:
+            return False
+        self._slots[key] = in_flight + 1
+        return True
+
+    async def release_slot(self, key: str) -> None:
+        in_flight = self._slots.get(key, 0) - 1
+        if in_flight > 0:
+            self._slots[key] = in_flight
+        else:
+            self._slots.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        """清理空闲令牌桶，仍超限时全部清空"""
+        idle = [key for key, bucket in self._buckets.items() if now - bucket.updated > self.IDLE_TTL]
+        for key in idle:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class RateLimitMiddleware:
+    """
+    限流中间件（纯ASGI实现）
+
+    按 用户ID + 路由类别 使用令牌桶限流，并限制每个用户同时进行的导出数，
+    超限时返回 429 和 Retry-After。需位于认证中间件之内，以读取 request.state.user
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Dict[str, RateLimit],
+        export_max_concurrent: int = 0,
+        backend: Optional[RateLimitBackend] = None
+    ):
+        """
+        Args:
+            app: 下游ASGI应用
+            limits: 路由类别 → 令牌桶参数（未配置的类别不限流）
+            export_max_concurrent: 每个用户的最大并发导出数（0 表示不限制）
+            backend: 限流状态存储，默认进程内存储
+        """
+        self.app = app
+        self.limits = limits
+        self.export_max_concurrent = export_max_concurrent
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_route(scope["path"])
+        user = scope.get("state", {}).get("user")
+        if route_class is None or user is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(route_class)
+        if limit is not None:
+            retry_after = await self.backend.acquire(f"{user.user_id}:{route_class}", limit)
+            if retry_after > 0:
+                await self._reject(
+                    scope, receive, send, user, route_class, retry_after,
+                    "请求过于频繁，请稍后重试"
+                )
+                return
+
+        if route_class != ROUTE_CLASS_EXPORT or not self.export_max_concurrent:
+            await self.app(scope, receive, send)
+            return
+
+        slot_key = f"{user.user_id}:{route_class}:in_flight"
+        if not await self.backend.acquire_slot(slot_key, self.export_max_concurrent):
+            await self._reject(
+                scope, receive, send, user, route_class, 1.0,
+                f"同时进行的导出任务不能超过{self.export_max_concurrent}个"
+            )
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.backend.release_slot(slot_key)
+
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        user,
+        route_class: str,
+        retry_after: float,
+        message: str
+    ) -> None:
+        """返回 429 响应"""
+        RATE_LIMITED_REQUESTS.labels(route_class).inc()
+        logger.warning(
+            f"Rate limited user {user.username} on {scope['path']}",
+            extra={
+                'user_id': user.user_id,
+                'path': scope['path'],
+                'route_class': route_class,
+                'retry_after': retry_after
+            }
+        )
+        response = JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"code": "RATE_LIMITED", "message": message},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
+
+
+def rate_limit_middleware(app):
+    """
+    添加限流中间件到应用
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if not settings.rate_limit_enabled:
+        return
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits={
+            ROUTE_CLASS_QUERY: RateLimit(settings.rate_limit_query_rate, settings.rate_limit_query_burst),
+            ROUTE_CLASS_PROGRESS: RateLimit(settings.rate_limit_progress_rate, settings.rate_limit_progress_burst),
+            ROUTE_CLASS_EXPORT: RateLimit(settings.rate_limit_export_rate, settings.rate_limit_export_burst),
+        },
+        export_max_concurrent=settings.export_max_concurrent_per_user
+    )
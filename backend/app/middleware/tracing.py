@@ -0,0 +1,61 @@
+"""Request tracing middleware"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import tracing
+from app.config import settings
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+
+class TracingMiddleware:
+    """
+    请求追踪中间件（纯ASGI实现）
+
+    为每个请求开启根span（SERVER），记录方法、路由模板、状态码和请求ID；
+    被采样的请求在响应头 X-Trace-Id 中返回追踪ID
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracing.span(
+            f"{method} {scope['path']}",
+            kind=tracing.SPAN_KIND_SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]}
+        ) as span:
+            async def send_with_trace(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if span.sampled:
+                        MutableHeaders(scope=message)["X-Trace-Id"] = span.trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                if span.sampled:
+                    # 路由匹配后按路由模板命名，便于聚合
+                    route = scope.get("route")
+                    route_path = route.path if route is not None else UNMATCHED_ROUTE
+                    span.name = f"{method} {route_path}"
+                    span.set_attribute("http.route", route_path)
+                    span.set_attribute("request_id", scope.get("state", {}).get("request_id", "N/A"))
+
+
+def tracing_middleware(app):
+    """
+    添加请求追踪中间件到应用
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if not settings.tracing_enabled:
+        return
+
+    app.add_middleware(TracingMiddleware)
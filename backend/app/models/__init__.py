@@ -9,12 +9,20 @@ from app.models.enums import (
     MatchStatus,
     CashFlowStatus,
     Direction,
-    DebitCreditIndicator
+    DebitCreditIndicator,
+    DeletedEntityType
 )
 from app.models.transaction import Transaction
 from app.models.event import EventRecord
 from app.models.accounting import AccountingRecord
 from app.models.cash_flow import CashFlow
+from app.models.deleted_record import DeletedRecord
+from app.models.archive import (
+    TransactionArchive,
+    EventRecordArchive,
+    CashFlowArchive,
+    AccountingRecordArchive
+)
 
 __all__ = [
     'ProductType',
@@ -27,8 +35,14 @@ __all__ = [
     'CashFlowStatus',
     'Direction',
     'DebitCreditIndicator',
+    'DeletedEntityType',
     'Transaction',
     'EventRecord',
     'AccountingRecord',
     'CashFlow',
+    'DeletedRecord',
+    'TransactionArchive',
+    'EventRecordArchive',
+    'CashFlowArchive',
+    'AccountingRecordArchive',
 ]
@@ -1,7 +1,8 @@
 """Accounting record model"""
-from sqlalchemy import Column, String, DateTime, Float, Index, ForeignKey
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Index, ForeignKey
 from app.database import Base
+from app.models.enum_codes import CodedEnum
+from app.models.money import amount_type
 from app.models.enums import DebitCreditIndicator
 
 
@@ -16,20 +17,22 @@ class AccountingRecord(Base):
     transaction_id = Column(String(100), ForeignKey('transactions.transaction_id'), nullable=False, index=True, comment='交易流水号')
     
     # 日期信息
-    actual_accounting_date = Column(DateTime, nullable=False, index=True, comment='实际记账日')
+    actual_accounting_date = Column(DateTime, nullable=False, comment='实际记账日')
     planned_accounting_date = Column(DateTime, nullable=False, comment='计划记账日')
     
     # 事件信息
     event_number = Column(String(100), nullable=False, comment='事件号')
     
     # 账务详情
-    debit_credit_indicator = Column(SQLEnum(DebitCreditIndicator), nullable=False, comment='借贷方向')
+    debit_credit_indicator = Column(CodedEnum(DebitCreditIndicator), nullable=False, comment='借贷方向')
     currency = Column(String(3), nullable=False, index=True, comment='货币')
     account_subject = Column(String(100), nullable=False, comment='科目')
-    transaction_amount = Column(Float, nullable=False, comment='交易金额')
+    transaction_amount = Column(amount_type(), nullable=False, comment='交易金额')
     
     # 创建复合索引
     __table_args__ = (
         Index('idx_transaction_id_accounting_date', 'transaction_id', 'actual_accounting_date'),
         Index('idx_currency_debit_credit', 'currency', 'debit_credit_indicator'),
+        # 实际记账日随记账单调递增：PostgreSQL 上用 BRIN，其他数据库保留 B-tree
+        Index('idx_actual_accounting_date', 'actual_accounting_date', postgresql_using='brin'),
     )
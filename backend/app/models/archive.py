@@ -0,0 +1,80 @@
+"""Archive tier models (matured/invalid transaction graphs moved out of the hot tables)"""
+from sqlalchemy import Column, DateTime, Index, Table
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.transaction import Transaction
+from app.models.event import EventRecord
+from app.models.cash_flow import CashFlow
+from app.models.accounting import AccountingRecord
+
+
+def archive_table(source: Table, *indexes: Index) -> Table:
+    """
+    按热表结构生成归档表
+
+    复制全部列（含主键），不复制外键和热表上的查询索引，只建归档读取需要的索引；
+    另加归档时间列
+
+    Args:
+        source: 热表
+        indexes: 归档表索引
+
+    Returns:
+        Table: 归档表（表名为 <热表名>_archive）
+    """
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            comment=column.comment
+        )
+        for column in source.columns
+    ]
+    columns.append(Column('archived_date', DateTime, nullable=False, server_default=func.now(), comment='归档时间'))
+    return Table(f'{source.name}_archive', Base.metadata, *columns, *indexes)
+
+
+class TransactionArchive(Base):
+    """交易归档表"""
+    __table__ = archive_table(
+        Transaction.__table__,
+        Index('idx_transactions_archive_transaction_id', 'transaction_id', unique=True),
+        Index('idx_transactions_archive_trade_date', 'trade_date'),
+    )
+
+
+class EventRecordArchive(Base):
+    """事件归档表"""
+    __table__ = archive_table(
+        EventRecord.__table__,
+        Index('idx_events_archive_external_id', 'external_id', 'modified_date'),
+        Index('idx_events_archive_transaction_id', 'transaction_id', 'modified_date'),
+    )
+
+
+class CashFlowArchive(Base):
+    """现金流归档表"""
+    __table__ = archive_table(
+        CashFlow.__table__,
+        Index('idx_cash_flows_archive_transaction_id', 'transaction_id'),
+        Index('idx_cash_flows_archive_payment_date', 'payment_date'),
+    )
+
+
+class AccountingRecordArchive(Base):
+    """账务记录归档表"""
+    __table__ = archive_table(
+        AccountingRecord.__table__,
+        Index('idx_accounting_records_archive_transaction_id', 'transaction_id', 'actual_accounting_date'),
+    )
+
+
+# 热表模型 → 归档表模型
+ARCHIVE_MODELS = {
+    Transaction: TransactionArchive,
+    EventRecord: EventRecordArchive,
+    CashFlow: CashFlowArchive,
+    AccountingRecord: AccountingRecordArchive,
+}
@@ -1,10 +1,21 @@
 """Cash flow model"""
-from sqlalchemy import Column, String, DateTime, Float, Integer, Index, ForeignKey
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Column, String, Date, DateTime, Integer, Index, ForeignKey, text
 from app.database import Base
+from app.models.enum_codes import CodedEnum, enum_code
+from app.models.money import amount_type
 from app.models.enums import SettlementMethod, CashFlowStatus, Direction
 
 
+# 终态现金流状态：结算完成/撤销成功后不再流转，占现金流表的绝大多数
+TERMINAL_CASH_FLOW_STATUSES = (CashFlowStatus.CORE_SUCCESS, CashFlowStatus.CANCEL_SUCCESS)
+
+# 在途现金流部分索引的条件（枚举列存储整数编码）。
+# 查询须以字面量 NOT IN 同一组状态过滤（见 CashFlowRepository），规划器才能选用部分索引
+ACTIVE_CASH_FLOW_INDEX_WHERE = text(
+    "current_status NOT IN ({})".format(", ".join(str(enum_code(status)) for status in TERMINAL_CASH_FLOW_STATUSES))
+)
+
+
 class CashFlow(Base):
     """现金流表"""
     __tablename__ = 'cash_flows'
@@ -18,10 +29,10 @@ class CashFlow(Base):
     settlement_id = Column(String(100), nullable=True, index=True, comment='结算内部ID')
     
     # 现金流详情
-    direction = Column(SQLEnum(Direction), nullable=False, index=True, comment='方向')
+    direction = Column(CodedEnum(Direction), nullable=False, index=True, comment='方向')
     currency = Column(String(3), nullable=False, index=True, comment='币种')
-    amount = Column(Float, nullable=False, comment='金额')
-    payment_date = Column(DateTime, nullable=False, index=True, comment='收付日期')
+    amount = Column(amount_type(), nullable=False, comment='金额')
+    payment_date = Column(Date, nullable=False, index=True, comment='收付日期')
     
     # 账号信息
     account_number = Column(String(100), nullable=False, comment='账号')
@@ -30,10 +41,10 @@ class CashFlow(Base):
     bank_code = Column(String(50), nullable=False, comment='开户行号')
     
     # 结算信息
-    settlement_method = Column(SQLEnum(SettlementMethod), nullable=False, index=True, comment='结算方式')
+    settlement_method = Column(CodedEnum(SettlementMethod), nullable=False, index=True, comment='结算方式')
     
     # 状态信息
-    current_status = Column(SQLEnum(CashFlowStatus), nullable=False, index=True, comment='当前状态')
+    current_status = Column(CodedEnum(CashFlowStatus), nullable=False, index=True, comment='当前状态')
     progress_percentage = Column(Integer, nullable=False, default=0, comment='进度百分比')
     
     # 并发控制
@@ -45,4 +56,14 @@ class CashFlow(Base):
         Index('idx_transaction_id_direction', 'transaction_id', 'direction'),
         Index('idx_payment_date_status', 'payment_date', 'current_status'),
         Index('idx_currency_direction', 'currency', 'direction'),
+        Index('idx_cash_flow_last_modified', 'last_modified_date', 'cash_flow_id'),
+        # 在途现金流部分索引（只包含非终态行，体积远小于全表索引）
+        Index(
+            'idx_active_payment_date_status', 'payment_date', 'current_status',
+            postgresql_where=ACTIVE_CASH_FLOW_INDEX_WHERE, sqlite_where=ACTIVE_CASH_FLOW_INDEX_WHERE
+        ),
+        Index(
+            'idx_active_currency_direction', 'currency', 'direction',
+            postgresql_where=ACTIVE_CASH_FLOW_INDEX_WHERE, sqlite_where=ACTIVE_CASH_FLOW_INDEX_WHERE
+        ),
     )
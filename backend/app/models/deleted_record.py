@@ -0,0 +1,27 @@
+"""Deleted record (tombstone) model"""
+from sqlalchemy import Column, String, DateTime, Integer, Index
+from app.database import Base
+from app.models.enum_codes import CodedEnum
+from app.models.enums import DeletedEntityType
+
+
+class DeletedRecord(Base):
+    """删除记录表（墓碑），供增量导出同步删除"""
+    __tablename__ = 'deleted_records'
+    
+    # 主键
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='墓碑ID')
+    
+    # 被删除实体
+    entity_type = Column(CodedEnum(DeletedEntityType), nullable=False, comment='实体类型')
+    entity_id = Column(String(100), nullable=False, comment='实体ID')
+    transaction_id = Column(String(100), nullable=True, comment='交易流水号')
+    
+    # 删除信息
+    deleted_date = Column(DateTime, nullable=False, comment='删除时间')
+    deleted_by = Column(String(100), nullable=False, comment='删除人')
+    
+    # 创建复合索引（按实体类型和删除时间增量读取）
+    __table_args__ = (
+        Index('idx_deleted_records_type_date', 'entity_type', 'deleted_date', 'id'),
+    )
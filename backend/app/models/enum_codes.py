@@ -0,0 +1,186 @@
+"""Integer-coded enum storage
+
+枚举列在数据库中存储为 SMALLINT 编码，ORM 读写时与枚举成员互相转换，API 不受影响。
+
+编码表是持久化格式的一部分，必须跨版本保持稳定：
+- 已分配的编码不得修改或复用（删除成员时保留其编码不再分配）；
+- 新增成员只能追加未使用过的编码；
+- 成员改名时编码随之保留。
+"""
+from enum import Enum
+from typing import Dict, Optional, Type
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+from app.models.enums import (
+    ProductType,
+    TransactionStatus,
+    BackOfficeStatus,
+    SettlementMethod,
+    ConfirmationType,
+    TransactionSource,
+    MatchStatus,
+    CashFlowStatus,
+    Direction,
+    DebitCreditIndicator,
+    DeletedEntityType
+)
+
+
+ENUM_CODES: Dict[Type[Enum], Dict[Enum, int]] = {
+    ProductType: {
+        ProductType.FX_SPOT: 1,
+        ProductType.FX_FORWARD: 2,
+        ProductType.FX_SWAP: 3,
+        ProductType.INTERBANK_LENDING: 4,
+        ProductType.MONEY_MARKET_DEPOSIT: 5,
+        ProductType.BOND_TRADING: 6,
+        ProductType.BUYOUT_REPO: 7,
+        ProductType.PLEDGE_REPO: 8,
+        ProductType.UNILATERAL_CASHFLOW: 9,
+    },
+    TransactionStatus: {
+        TransactionStatus.EFFECTIVE: 1,
+        TransactionStatus.MATURED: 2,
+        TransactionStatus.INVALID: 3,
+    },
+    BackOfficeStatus: {
+        BackOfficeStatus.CONFIRMED: 1,
+        BackOfficeStatus.SETTLED_PENDING_REPORT: 2,
+        BackOfficeStatus.REPORTED_PENDING_RECEIPT: 3,
+        BackOfficeStatus.COMPLETED: 4,
+    },
+    SettlementMethod: {
+        SettlementMethod.GROSS: 1,
+        SettlementMethod.NET: 2,
+        SettlementMethod.CENTRALIZED: 3,
+        SettlementMethod.NOT_REQUIRED: 4,
+        SettlementMethod.OUR_BANK_AGENT: 5,
+        SettlementMethod.OTHER_BANK_AGENT: 6,
+    },
+    ConfirmationType: {
+        ConfirmationType.SWIFT: 1,
+        ConfirmationType.TEXT: 2,
+        ConfirmationType.NO_CONFIRMATION: 3,
+    },
+    TransactionSource: {
+        TransactionSource.GIT: 1,
+        TransactionSource.FXO: 2,
+        TransactionSource.FXS: 3,
+        TransactionSource.FXY: 4,
+        TransactionSource.FXW: 5,
+    },
+    MatchStatus: {
+        MatchStatus.MATCHED: 1,
+        MatchStatus.UNMATCHED: 2,
+        MatchStatus.PENDING: 3,
+    },
+    # 现金流状态按阶段分段编码，各段预留空位供同阶段新增状态
+    CashFlowStatus: {
+        # 阶段1: 清算轧差
+        CashFlowStatus.PENDING_NETTING: 10,
+        CashFlowStatus.AUTO_NETTING_COMPLETE: 11,
+        CashFlowStatus.MANUAL_NETTING_COMPLETE: 12,
+        CashFlowStatus.PENDING_DISPATCH: 13,
+        # 阶段2: 合规准入
+        CashFlowStatus.COMPLIANCE_CHECKING: 20,
+        CashFlowStatus.COMPLIANCE_APPROVED: 21,
+        CashFlowStatus.COMPLIANCE_BLOCKED: 22,
+        CashFlowStatus.PENDING_APPROVAL: 23,
+        CashFlowStatus.APPROVAL_APPROVED: 24,
+        CashFlowStatus.APPROVAL_REJECTED: 25,
+        CashFlowStatus.ROUTE_DETERMINED: 26,
+        # 阶段3: SWIFT路径
+        CashFlowStatus.RMC_SENDING: 30,
+        CashFlowStatus.RMC_SUCCESS: 31,
+        CashFlowStatus.RMC_FAILED: 32,
+        CashFlowStatus.FTM_SENDING: 33,
+        CashFlowStatus.FTM_SUCCESS: 34,
+        CashFlowStatus.FTM_FAILED: 35,
+        # 阶段3: CBMNet路径
+        CashFlowStatus.PENDING_MANUAL_CONFIRM: 40,
+        CashFlowStatus.MANUAL_CONFIRM_APPROVED: 41,
+        CashFlowStatus.MANUAL_CONFIRM_REJECTED: 42,
+        # 阶段3: 账务层回执
+        CashFlowStatus.CORE_PROCESSING: 50,
+        CashFlowStatus.CORE_SUCCESS: 51,
+        CashFlowStatus.CORE_FAILED: 52,
+        CashFlowStatus.CORE_UNKNOWN: 53,
+        # 阶段4: 结算撤销
+        CashFlowStatus.CANCEL_RMC_SENDING: 60,
+        CashFlowStatus.CANCEL_RMC_FAILED: 61,
+        CashFlowStatus.CANCEL_FTM_SENDING: 62,
+        CashFlowStatus.CANCEL_FTM_FAILED: 63,
+        CashFlowStatus.CANCEL_PROCESSING: 64,
+        CashFlowStatus.CANCEL_SUCCESS: 65,
+        CashFlowStatus.CANCEL_FAILED: 66,
+    },
+    Direction: {
+        Direction.BUY: 1,
+        Direction.SELL: 2,
+        Direction.RECEIVE: 3,
+        Direction.PAY: 4,
+    },
+    DebitCreditIndicator: {
+        DebitCreditIndicator.DEBIT: 1,
+        DebitCreditIndicator.CREDIT: 2,
+    },
+    DeletedEntityType: {
+        DeletedEntityType.TRANSACTION: 1,
+        DeletedEntityType.CASH_FLOW: 2,
+        DeletedEntityType.EVENT: 3,
+    },
+}
+
+
+def enum_code(member: Enum) -> int:
+    """枚举成员的存储编码"""
+    return ENUM_CODES[type(member)][member]
+
+
+class CodedEnum(TypeDecorator):
+    """
+    以 SMALLINT 编码存储枚举的列类型
+
+    写入时接受枚举成员、成员名或成员值；读取时返回枚举成员
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: Type[Enum]):
+        """
+        Args:
+            enum_class: 枚举类（须在 ENUM_CODES 中登记）
+        """
+        super().__init__()
+        self.enum_class = enum_class
+        self._codes = ENUM_CODES[enum_class]
+        self._members = {code: member for member, code in self._codes.items()}
+
+    def _member(self, value) -> Enum:
+        if isinstance(value, self.enum_class):
+            return value
+        if value in self.enum_class.__members__:
+            return self.enum_class[value]
+        return self.enum_class(value)
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self._codes[self._member(value)]
+
+    def process_literal_param(self, value, dialect) -> str:
+        return str(self.process_bind_param(value, dialect))
+
+    def process_result_value(self, value, dialect) -> Optional[Enum]:
+        if value is None:
+            return None
+        return self._members[value]
+
+    def copy(self, **kw) -> 'CodedEnum':
+        return CodedEnum(self.enum_class)
+
+    def __repr__(self) -> str:
+        return f'CodedEnum({self.enum_class.__name__})'
@@ -121,3 +121,10 @@ class DebitCreditIndicator(str, Enum):
     """借贷方向"""
     DEBIT = 'DEBIT'
     CREDIT = 'CREDIT'
+
+
+class DeletedEntityType(str, Enum):
+    """删除记录实体类型"""
+    TRANSACTION = 'TRANSACTION'
+    CASH_FLOW = 'CASH_FLOW'
+    EVENT = 'EVENT'
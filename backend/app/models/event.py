@@ -1,7 +1,7 @@
 """Event record model"""
-from sqlalchemy import Column, String, DateTime, Index, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Index, ForeignKey
 from app.database import Base
-from sqlalchemy import Enum as SQLEnum
+from app.models.enum_codes import CodedEnum
 from app.models.enums import ProductType, TransactionStatus, BackOfficeStatus, MatchStatus
 
 
@@ -18,20 +18,20 @@ class EventRecord(Base):
     parent_transaction_id = Column(String(100), nullable=True, index=True, comment='父交易流水号')
     
     # 事件详情
-    product = Column(SQLEnum(ProductType), nullable=False, comment='产品')
+    product = Column(CodedEnum(ProductType), nullable=False, comment='产品')
     account = Column(String(100), nullable=False, comment='账户')
     event_type = Column(String(50), nullable=False, index=True, comment='事件类型')
-    transaction_status = Column(SQLEnum(TransactionStatus), nullable=False, comment='交易状态')
+    transaction_status = Column(CodedEnum(TransactionStatus), nullable=False, comment='交易状态')
     
     # 日期信息
     entry_date = Column(DateTime, nullable=False, comment='录入日')
-    trade_date = Column(DateTime, nullable=False, comment='交易日')
-    modified_date = Column(DateTime, nullable=False, index=True, comment='修改日')
+    trade_date = Column(Date, nullable=False, comment='交易日')
+    modified_date = Column(DateTime, nullable=False, comment='修改日')
     
     # 状态信息
-    back_office_status = Column(SQLEnum(BackOfficeStatus), nullable=False, comment='后线处理状态')
+    back_office_status = Column(CodedEnum(BackOfficeStatus), nullable=False, comment='后线处理状态')
     confirmation_status = Column(String(50), nullable=True, comment='证实状态')
-    confirmation_match_status = Column(SQLEnum(MatchStatus), nullable=True, comment='证实匹配状态')
+    confirmation_match_status = Column(CodedEnum(MatchStatus), nullable=True, comment='证实匹配状态')
     
     # 操作信息
     operator = Column(String(100), nullable=False, comment='操作用户')
@@ -40,4 +40,7 @@ class EventRecord(Base):
     __table_args__ = (
         Index('idx_external_id_modified_date', 'external_id', 'modified_date'),
         Index('idx_transaction_id_event_type', 'transaction_id', 'event_type'),
+        # 录入日、修改日随写入单调递增：PostgreSQL 上用 BRIN，其他数据库保留 B-tree
+        Index('idx_modified_date', 'modified_date', postgresql_using='brin'),
+        Index('idx_events_entry_date_brin', 'entry_date', postgresql_using='brin').ddl_if(dialect='postgresql'),
     )
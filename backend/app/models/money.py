@@ -0,0 +1,17 @@
+"""Exact monetary amount storage"""
+from decimal import Decimal
+
+from sqlalchemy import Numeric
+
+
+# 金额列统一为 NUMERIC(20, 4)：16 位整数、4 位小数，覆盖 ISO 4217 中小数位最多的币种。
+# 读取为 Decimal，汇总在数据库中以定点数精确计算
+AMOUNT_PRECISION = 20
+AMOUNT_SCALE = 4
+
+ZERO_AMOUNT = Decimal(0).quantize(Decimal(1).scaleb(-AMOUNT_SCALE))
+
+
+def amount_type() -> Numeric:
+    """金额列类型"""
+    return Numeric(AMOUNT_PRECISION, AMOUNT_SCALE, asdecimal=True)
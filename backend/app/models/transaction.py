@@ -1,7 +1,8 @@
 """Transaction model"""
-from sqlalchemy import Column, String, DateTime, Integer, Enum as SQLEnum, Index
+from sqlalchemy import Column, String, Date, DateTime, Integer, Index
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.enum_codes import CodedEnum
 from app.models.enums import (
     ProductType, TransactionStatus, BackOfficeStatus,
     SettlementMethod, ConfirmationType, TransactionSource,
@@ -20,31 +21,31 @@ class Transaction(Base):
     
     # 基本信息
     entry_date = Column(DateTime, nullable=False, comment='录入日')
-    trade_date = Column(DateTime, nullable=False, index=True, comment='交易日')
-    value_date = Column(DateTime, nullable=False, index=True, comment='起息日')
-    maturity_date = Column(DateTime, nullable=False, index=True, comment='到期日')
+    trade_date = Column(Date, nullable=False, index=True, comment='交易日')
+    value_date = Column(Date, nullable=False, index=True, comment='起息日')
+    maturity_date = Column(Date, nullable=False, index=True, comment='到期日')
     
     # 交易详情
     account = Column(String(100), nullable=False, comment='账户')
-    product = Column(SQLEnum(ProductType), nullable=False, index=True, comment='产品类型')
-    direction = Column(SQLEnum(Direction), nullable=False, comment='买卖方向')
+    product = Column(CodedEnum(ProductType), nullable=False, index=True, comment='产品类型')
+    direction = Column(CodedEnum(Direction), nullable=False, comment='买卖方向')
     underlying = Column(String(200), nullable=False, comment='标的物')
     counterparty = Column(String(200), nullable=False, index=True, comment='交易对手')
     
     # 状态信息
-    status = Column(SQLEnum(TransactionStatus), nullable=False, index=True, comment='交易状态')
-    back_office_status = Column(SQLEnum(BackOfficeStatus), nullable=False, index=True, comment='后线处理状态')
+    status = Column(CodedEnum(TransactionStatus), nullable=False, index=True, comment='交易状态')
+    back_office_status = Column(CodedEnum(BackOfficeStatus), nullable=False, index=True, comment='后线处理状态')
     
     # 清算证实信息
-    settlement_method = Column(SQLEnum(SettlementMethod), nullable=False, index=True, comment='清算方式')
+    settlement_method = Column(CodedEnum(SettlementMethod), nullable=False, index=True, comment='清算方式')
     confirmation_number = Column(String(100), nullable=True, comment='证实编号')
-    confirmation_type = Column(SQLEnum(ConfirmationType), nullable=False, index=True, comment='证实方式')
+    confirmation_type = Column(CodedEnum(ConfirmationType), nullable=False, index=True, comment='证实方式')
     confirmation_match_type = Column(String(50), nullable=True, comment='证实匹配方式')
-    confirmation_match_status = Column(SQLEnum(MatchStatus), nullable=True, index=True, comment='证实匹配状态')
+    confirmation_match_status = Column(CodedEnum(MatchStatus), nullable=True, index=True, comment='证实匹配状态')
     
     # 其他信息
     nature = Column(String(100), nullable=False, comment='交易性质')
-    source = Column(SQLEnum(TransactionSource), nullable=False, index=True, comment='交易来源')
+    source = Column(CodedEnum(TransactionSource), nullable=False, index=True, comment='交易来源')
     latest_event_type = Column(String(50), nullable=True, comment='最新事件类型')
     operating_institution = Column(String(200), nullable=False, index=True, comment='运营机构')
     business_institution = Column(String(200), nullable=True, comment='业务机构')
@@ -60,4 +61,7 @@ class Transaction(Base):
         Index('idx_trade_date_status', 'trade_date', 'status'),
         Index('idx_counterparty_product', 'counterparty', 'product'),
         Index('idx_operating_institution_trade_date', 'operating_institution', 'trade_date'),
+        Index('idx_transaction_last_modified', 'last_modified_date', 'external_id'),
+        # 录入日随写入单调递增，PostgreSQL 上用 BRIN 以极小的体积支持按录入时间范围扫描
+        Index('idx_transactions_entry_date_brin', 'entry_date', postgresql_using='brin').ddl_if(dialect='postgresql'),
     )
@@ -0,0 +1,363 @@
+"""Monthly range partition maintenance for events and cash_flows (PostgreSQL)"""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+logger = logging.getLogger(__name__)
+
+# 分区表 → 分区键（迁移 004 将这两张表改为按月 RANGE 分区）
+PARTITIONED_TABLES: Dict[str, str] = {
+    "events": "modified_date",
+    "cash_flows": "payment_date",
+}
+
+# 允许按保留期分离旧分区的表。现金流分离后查询、归档回退和导出都看不到这些行，
+# 应先由归档任务迁入 cash_flows_archive，因此不自动分离
+DETACHABLE_TABLES = frozenset({"events"})
+
+# 多个进程同时维护分区时用事务级咨询锁串行化
+MAINTENANCE_LOCK_ID = 460_046
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    """单个分区（默认分区的 lower/upper 为 None）"""
+    name: str
+    lower: Optional[date]
+    upper: Optional[date]
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None
+
+
+def month_start(value: date) -> date:
+    """所在月份的第一天"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """
+    月份加减（value 须为月初）
+
+    Args:
+        value: 月初日期
+        months: 月数（可为负）
+
+    Returns:
+        date: 月初日期
+    """
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """分区表名，例如 events_p202610"""
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table: str) -> str:
+    """默认分区表名（兜底超出已建分区范围的行）"""
+    return f"{table}_default"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """
+    创建单月分区的DDL
+
+    Args:
+        table: 分区表名
+        month: 月初日期
+
+    Returns:
+        str: CREATE TABLE ... PARTITION OF ... 语句
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def plan_future_partitions(
+    existing: List[Partition],
+    months_ahead: int,
+    today: date
+) -> List[date]:
+    """
+    计算需要新建的分区月份：当前月至未来 months_ahead 个月中尚未覆盖的月份
+
+    Args:
+        existing: 已有分区
+        months_ahead: 提前创建的月数
+        today: 当前日期
+
+    Returns:
+        List[date]: 需新建分区的月初日期（升序）
+    """
+    covered = {partition.lower for partition in existing if not partition.is_default}
+    current = month_start(today)
+    return [
+        month for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+        if month not in covered
+    ]
+
+
+def plan_detach_partitions(
+    existing: List[Partition],
+    retention_months: int,
+    today: date
+) -> List[Partition]:
+    """
+    计算需要分离的旧分区：上界不晚于保留期起点的分区
+
+    Args:
+        existing: 已有分区
+        retention_months: 保留月数（不含当前月），0 表示不分离
+        today: 当前日期
+
+    Returns:
+        List[Partition]: 需分离的分区（按下界升序）
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -retention_months)
+    return sorted(
+        (p for p in existing if not p.is_default and p.upper <= cutoff),
+        key=lambda p: p.lower
+    )
+
+
+def detachable_retention(retention_months: Dict[str, int]) -> Dict[str, int]:
+    """
+    过滤保留期配置，只保留允许分离旧分区的表
+
+    Args:
+        retention_months: 各表保留月数
+
+    Returns:
+        Dict[str, int]: 允许分离的表的保留月数（其他表的非零配置记录警告后忽略）
+    """
+    for table, months in retention_months.items():
+        if months > 0 and table not in DETACHABLE_TABLES:
+            logger.warning(
+                f"Partition retention for {table} is ignored: detached partitions are invisible to "
+                f"queries and exports, archive them into {table}_archive instead"
+            )
+    return {table: months for table, months in retention_months.items() if table in DETACHABLE_TABLES}
+
+
+def lock_record_id(conn: Connection, table: str, record_id: str) -> None:
+    """
+    按 (表, 业务ID) 取事务级咨询锁（仅 PostgreSQL）
+
+    分区表的主键须包含分区键，数据库不再保证现金流ID/事件ID唯一；插入前先取锁再检查
+    是否已存在，使并发写入同一ID时串行执行，不会同时通过检查。锁在事务结束时释放
+
+    Args:
+        conn: 数据库连接（须在写入所在的事务中）
+        table: 表名
+        record_id: 业务ID
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:table), hashtext(:record_id))"),
+            {"table": table, "record_id": record_id}
+        )
+
+
+class PartitionManager:
+    """
+    分区维护
+
+    提前创建未来月份的分区，并把超出保留期的分区从父表分离（DETACH，不删除数据，
+    分离后的表可由DBA归档或删除）。非 PostgreSQL 或表未分区时为空操作
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    @property
+    def supported(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def is_partitioned(self, conn: Connection, table: str) -> bool:
+        """表是否为分区表"""
+        relkind = conn.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table}
+        ).scalar()
+        return relkind == "p"
+
+    def list_partitions(self, conn: Connection, table: str) -> List[Partition]:
+        """
+        列出分区表的分区
+
+        Args:
+            conn: 数据库连接
+            table: 分区表名
+
+        Returns:
+            List[Partition]: 分区列表（按名称排序）
+        """
+        rows = conn.execute(text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+        ), {"table": table})
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND_PATTERN.search(bound or "")
+            if match:
+                lower, upper = (datetime.fromisoformat(value).date() for value in match.groups())
+                partitions.append(Partition(name, lower, upper))
+            else:
+                partitions.append(Partition(name, None, None))
+        return partitions
+
+    def create_partition(self, conn: Connection, table: str, month: date) -> None:
+        """
+        创建单月分区
+
+        若默认分区中已有落在该月的行，先把这些行移入新表再挂载，否则挂载会因默认分区约束冲突失败
+
+        Args:
+            conn: 数据库连接（在事务中）
+            table: 分区表名
+            month: 月初日期
+        """
+        key = PARTITIONED_TABLES[table]
+        name = partition_name(table, month)
+        default = default_partition_name(table)
+        upper = add_months(month, 1)
+        bounds = {"lower": month, "upper": upper}
+
+        has_default = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": default}).scalar()
+        stray = has_default and conn.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {key} >= :lower AND {key} < :upper)"),
+            bounds
+        ).scalar()
+
+        if not stray:
+            conn.execute(text(create_partition_sql(table, month)))
+            return
+
+        conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {key} >= :lower AND {key} < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        conn.execute(text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+
+    def maintain(
+        self,
+        months_ahead: int = 3,
+        retention_months: Optional[Dict[str, int]] = None,
+        today: Optional[date] = None
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        执行一次分区维护
+
+        Args:
+            months_ahead: 提前创建的月数
+            retention_months: 各表保留月数（缺省或0表示不分离；仅 DETACHABLE_TABLES 中的表生效）
+            today: 当前日期（默认今天）
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: {表名: {created: [...], detached: [...]}}，未分区的表不出现
+        """
+        if not self.supported:
+            return {}
+
+        today = today or date.today()
+        retention_months = detachable_retention(retention_months or {})
+        result: Dict[str, Dict[str, List[str]]] = {}
+
+        with self.engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MAINTENANCE_LOCK_ID})
+            for table in PARTITIONED_TABLES:
+                if not self.is_partitioned(conn, table):
+                    continue
+                existing = self.list_partitions(conn, table)
+
+                created = []
+                for month in plan_future_partitions(existing, months_ahead, today):
+                    self.create_partition(conn, table, month)
+                    created.append(partition_name(table, month))
+
+                detached = []
+                for partition in plan_detach_partitions(existing, retention_months.get(table, 0), today):
+                    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}"))
+                    detached.append(partition.name)
+
+                result[table] = {"created": created, "detached": detached}
+                if created or detached:
+                    logger.info(f"Partition maintenance on {table}: created={created} detached={detached}")
+        return result
+
+    def describe(self) -> Dict[str, List[Partition]]:
+        """
+        列出各分区表的分区
+
+        Returns:
+            Dict[str, List[Partition]]: {表名: 分区列表}，未分区的表不出现
+        """
+        if not self.supported:
+            return {}
+        with self.engine.connect() as conn:
+            return {
+                table: self.list_partitions(conn, table)
+                for table in PARTITIONED_TABLES
+                if self.is_partitioned(conn, table)
+            }
+
+
+async def partition_maintenance_loop(
+    manager: PartitionManager,
+    interval_seconds: float,
+    months_ahead: int,
+    retention_months: Dict[str, int]
+) -> None:
+    """
+    周期性执行分区维护（由应用生命周期启动，出错只记录日志）
+
+    Args:
+        manager: 分区维护器
+        interval_seconds: 执行间隔（秒）
+        months_ahead: 提前创建的月数
+        retention_months: 各表保留月数
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, manager.maintain, months_ahead, retention_months)
+        except Exception as e:
+            logger.warning(f"Partition maintenance failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+__all__: List[str] = [
+    "PARTITIONED_TABLES",
+    "Partition",
+    "month_start",
+    "add_months",
+    "partition_name",
+    "default_partition_name",
+    "create_partition_sql",
+    "plan_future_partitions",
+    "plan_detach_partitions",
+    "PartitionManager",
+    "partition_maintenance_loop",
+]
@@ -0,0 +1,246 @@
+"""In-process CPU sampling and memory allocation profiling"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# 同一时刻只允许一个采样任务，避免多个采样线程互相干扰
+_profile_lock = threading.Lock()
+
+
+@dataclass
+class ProfileResult:
+    """CPU采样结果"""
+    duration: float
+    interval: float
+    samples: int
+    stacks: Counter = field(default_factory=Counter)
+
+    def to_collapsed(self) -> str:
+        """
+        输出折叠栈格式（每行 "帧;帧;帧 次数"，根帧在前）
+
+        可直接交给 flamegraph.pl、speedscope 等工具生成火焰图
+
+        Returns:
+            str: 折叠栈文本
+        """
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def _frame_label(code) -> str:
+    """生成帧标签（函数名 + 文件名:首行号，按函数聚合）"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    统计采样分析器
+
+    在独立线程中按固定间隔读取 sys._current_frames()，
+    把每个线程的调用栈折叠为一行计数，仅依赖标准库，不需要重启进程
+    """
+
+    def __init__(self, duration: float, interval: float = 0.01, include_idle: bool = False):
+        """
+        Args:
+            duration: 采样时长（秒）
+            interval: 采样间隔（秒）
+            include_idle: 是否保留空闲线程（栈顶为等待/休眠的线程）
+        """
+        self.duration = duration
+        self.interval = interval
+        self.include_idle = include_idle
+
+    def run(self) -> ProfileResult:
+        """
+        在独立的采样线程中运行并等待结束
+
+        Returns:
+            ProfileResult: 采样结果
+
+        Raises:
+            ValueError: 已有采样任务在运行
+        """
+        if not _profile_lock.acquire(blocking=False):
+            raise ValueError("PROFILER_BUSY: 已有性能采样任务正在运行")
+
+        try:
+            result = ProfileResult(duration=self.duration, interval=self.interval, samples=0)
+            sampler = threading.Thread(
+                target=self._sample, args=(result,), name="profiler-sampler", daemon=True
+            )
+            sampler.start()
+            sampler.join()
+            return result
+        finally:
+            _profile_lock.release()
+
+    def _sample(self, result: ProfileResult) -> None:
+        """采样线程主循环"""
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + self.duration
+
+        while time.perf_counter() < deadline:
+            # 等待采样结果的线程（调用 run 的线程）也会被采到，
+            # 它的栈顶是 join，与其他空闲线程一样按 include_idle 处理
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = self._collapse(frame)
+                if stack is None:
+                    continue
+                result.stacks[f"{thread_names.get(ident, ident)};{stack}"] += 1
+            result.samples += 1
+            time.sleep(self.interval)
+
+    def _collapse(self, frame) -> Optional[str]:
+        """把调用栈折叠为根帧在前的字符串，空闲线程返回None"""
+        if not self.include_idle and _is_idle(frame):
+            return None
+
+        labels: List[str] = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+
+# 栈顶处于这些函数时视为线程空闲（等待锁、条件变量、队列或事件循环轮询）
+_IDLE_FUNCTIONS = frozenset(["wait", "select", "poll", "_worker", "get", "join", "sleep", "accept"])
+_IDLE_FILES = frozenset(["threading.py", "selectors.py", "queue.py", "thread.py", "socket.py"])
+
+
+def _is_idle(frame) -> bool:
+    """判断线程栈顶是否为空闲等待"""
+    code = frame.f_code
+    return (
+        code.co_name in _IDLE_FUNCTIONS
+        and os.path.basename(code.co_filename) in _IDLE_FILES
+    )
+
+
+@dataclass
+class MemoryStat:
+    """内存分配统计项"""
+    location: str
+    size: int
+    count: int
+    size_diff: Optional[int] = None
+    count_diff: Optional[int] = None
+
+
+class MemoryProfiler:
+    """
+    tracemalloc 内存分析器
+
+    start 时开启分配追踪并记录基线快照，之后的快照与基线比较，
+    用于定位导出等长时间运行任务的内存增长
+    """
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_tracing(self) -> bool:
+        """是否正在追踪内存分配"""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        """
+        开启内存分配追踪并记录基线快照
+
+        Args:
+            frames: 每次分配保留的调用栈帧数
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = self._take_snapshot()
+
+    def stop(self) -> None:
+        """停止追踪并释放快照"""
+        with self._lock:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def snapshot(
+        self,
+        limit: int = 20,
+        group_by: str = "lineno",
+        reset_baseline: bool = False
+    ) -> Dict:
+        """
+        获取当前快照的分配排行及相对基线的增长排行
+
+        Args:
+            limit: 返回条数
+            group_by: 聚合方式（lineno/filename/traceback）
+            reset_baseline: 是否用本次快照替换基线
+
+        Returns:
+            Dict: 当前/峰值内存、分配排行和增长排行
+
+        Raises:
+            ValueError: 未开启追踪或聚合方式无效
+        """
+        if group_by not in ("lineno", "filename", "traceback"):
+            raise ValueError(f"INVALID_PARAMETER: 不支持的聚合方式: {group_by}")
+
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise ValueError("PROFILER_NOT_STARTED: 内存分配追踪未开启")
+
+            snapshot = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            top = [
+                MemoryStat(_stat_location(stat.traceback), stat.size, stat.count)
+                for stat in snapshot.statistics(group_by)[:limit]
+            ]
+            growth = [
+                MemoryStat(
+                    _stat_location(stat.traceback), stat.size, stat.count,
+                    stat.size_diff, stat.count_diff
+                )
+                for stat in snapshot.compare_to(self._baseline, group_by)[:limit]
+            ] if self._baseline is not None else []
+
+            if reset_baseline or self._baseline is None:
+                self._baseline = snapshot
+
+        return {
+            "current": current,
+            "peak": peak,
+            "top": top,
+            "growth": growth,
+        }
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        """获取快照并排除 tracemalloc 自身和导入机制的分配"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+
+def _stat_location(traceback: tracemalloc.Traceback) -> str:
+    """格式化分配位置（多帧时从外层调用到分配点以 ; 连接）"""
+    return ";".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+
+
+# 进程级内存分析器（基线在多次请求之间保留）
+memory_profiler = MemoryProfiler()
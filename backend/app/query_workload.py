@@ -0,0 +1,217 @@
+"""Query workload capture for index tuning"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+# 过滤条件操作类型
+OP_EQ = "eq"          # 等值
+OP_RANGE = "range"    # 范围（from/to）
+OP_CONTAINS = "contains"  # 模糊匹配（LIKE '%x%'，B-tree 索引无法使用）
+OP_ACTIVE = "active"  # 仅在途（NOT IN 终态，可使用部分索引）
+
+# 查询条件字段 → (表.列, 操作)；与各仓储 _build_filters 的生成方式保持一致
+TRANSACTION_CRITERIA_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "external_id": ("transactions.external_id", OP_EQ),
+    "status": ("transactions.status", OP_EQ),
+    "trade_date_from": ("transactions.trade_date", OP_RANGE),
+    "trade_date_to": ("transactions.trade_date", OP_RANGE),
+    "value_date_from": ("transactions.value_date", OP_RANGE),
+    "value_date_to": ("transactions.value_date", OP_RANGE),
+    "maturity_date_from": ("transactions.maturity_date", OP_RANGE),
+    "maturity_date_to": ("transactions.maturity_date", OP_RANGE),
+    "counterparty": ("transactions.counterparty", OP_CONTAINS),
+    "product": ("transactions.product", OP_EQ),
+    "operating_institution": ("transactions.operating_institution", OP_EQ),
+    "business_institution": ("transactions.business_institution", OP_EQ),
+    "settlement_method": ("transactions.settlement_method", OP_EQ),
+    "confirmation_type": ("transactions.confirmation_type", OP_EQ),
+    "source": ("transactions.source", OP_EQ),
+}
+
+CASH_FLOW_CRITERIA_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "transaction_id": ("cash_flows.transaction_id", OP_EQ),
+    "cash_flow_id": ("cash_flows.cash_flow_id", OP_EQ),
+    "payment_info_id": ("cash_flows.payment_info_id", OP_EQ),
+    "settlement_id": ("cash_flows.settlement_id", OP_EQ),
+    "direction": ("cash_flows.direction", OP_EQ),
+    "currency": ("cash_flows.currency", OP_EQ),
+    "amount_min": ("cash_flows.amount", OP_RANGE),
+    "amount_max": ("cash_flows.amount", OP_RANGE),
+    "payment_date_from": ("cash_flows.payment_date", OP_RANGE),
+    "payment_date_to": ("cash_flows.payment_date", OP_RANGE),
+    "status": ("cash_flows.current_status", OP_EQ),
+    "active_only": ("cash_flows.current_status", OP_ACTIVE),
+    # 交易层条件通过 transaction_id IN (SELECT ...) 半连接过滤交易表
+    "counterparty": ("transactions.counterparty", OP_CONTAINS),
+    "product": ("transactions.product", OP_EQ),
+    "trade_date_from": ("transactions.trade_date", OP_RANGE),
+    "trade_date_to": ("transactions.trade_date", OP_RANGE),
+    "operating_institution": ("transactions.operating_institution", OP_EQ),
+}
+
+CRITERIA_COLUMNS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "transactions": TRANSACTION_CRITERIA_COLUMNS,
+    "cash_flows": CASH_FLOW_CRITERIA_COLUMNS,
+}
+
+
+# 查询形态：(实体, ((表.列, 操作), ...), 排序列, 排序方向)
+QueryShape = Tuple[str, Tuple[Tuple[str, str], ...], Optional[str], Optional[str]]
+
+
+def query_shape(
+    entity: str,
+    criteria: BaseModel,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None
+) -> QueryShape:
+    """
+    计算查询条件的形态（使用了哪些列、何种操作以及排序），与具体取值无关
+
+    Args:
+        entity: 实体（transactions/cash_flows）
+        criteria: 查询条件对象
+        sort_by: 排序列
+        sort_order: 排序方向
+
+    Returns:
+        QueryShape: 查询形态
+    """
+    columns = CRITERIA_COLUMNS[entity]
+    filters = set()
+    for field, value in criteria:
+        if value not in (None, "", False) and field in columns:
+            filters.add(columns[field])
+    return (
+        entity,
+        tuple(sorted(filters)),
+        sort_by,
+        sort_order.upper() if sort_by and sort_order else None,
+    )
+
+
+class _ShapeEntry:
+    """单个查询形态的统计"""
+
+    __slots__ = ("count", "examples")
+
+    def __init__(self, examples_per_shape: int):
+        self.count = 0
+        self.examples: Deque[Dict[str, Any]] = deque(maxlen=examples_per_shape)
+
+
+class QueryWorkloadRecorder:
+    """
+    查询负载记录器
+
+    记录仓储收到的查询条件形态（而不是原始SQL）及少量取值样例，
+    供索引顾问（benchmarks.index_advisor）离线回放分析。
+    未开启时 record 只做一次布尔判断
+    """
+
+    def __init__(self, max_shapes: int = 1000, examples_per_shape: int = 5):
+        """
+        Args:
+            max_shapes: 最多记录的形态数，超出后新形态只计数不记录
+            examples_per_shape: 每个形态保留的最近取值样例数
+        """
+        self.max_shapes = max_shapes
+        self.examples_per_shape = examples_per_shape
+        self.enabled = False
+        self.dropped = 0
+        self._shapes: Dict[QueryShape, _ShapeEntry] = {}
+        self._lock = threading.Lock()
+
+    def start(self, reset: bool = False) -> None:
+        """
+        开始记录
+
+        Args:
+            reset: 是否清空已记录的形态
+        """
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """停止记录（保留已记录的形态）"""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """清空已记录的形态"""
+        with self._lock:
+            self._shapes.clear()
+            self.dropped = 0
+
+    def record(
+        self,
+        entity: str,
+        criteria: BaseModel,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None
+    ) -> None:
+        """
+        记录一次查询
+
+        Args:
+            entity: 实体（transactions/cash_flows）
+            criteria: 查询条件对象
+            sort_by: 排序列
+            sort_order: 排序方向
+        """
+        if not self.enabled:
+            return
+
+        shape = query_shape(entity, criteria, sort_by, sort_order)
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.dropped += 1
+                    return
+                entry = self._shapes[shape] = _ShapeEntry(self.examples_per_shape)
+            entry.count += 1
+            entry.examples.append(criteria.model_dump(mode="json", exclude_defaults=True))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        导出已记录的负载（按次数降序）
+
+        Returns:
+            Dict[str, Any]: {recording, dropped, shapes: [{entity, filters, sort_by, sort_order, count, examples}]}
+        """
+        with self._lock:
+            shapes = [
+                {
+                    "entity": entity,
+                    "filters": [list(item) for item in filters],
+                    "sort_by": sort_by,
+                    "sort_order": sort_order,
+                    "count": entry.count,
+                    "examples": list(entry.examples),
+                }
+                for (entity, filters, sort_by, sort_order), entry in self._shapes.items()
+            ]
+            dropped = self.dropped
+        shapes.sort(key=lambda shape: shape["count"], reverse=True)
+        return {"recording": self.enabled, "dropped": dropped, "shapes": shapes}
+
+
+# 进程级记录器（由 settings.query_workload_capture_enabled 或管理接口开启）
+query_workload = QueryWorkloadRecorder()
+
+
+__all__: List[str] = [
+    "OP_EQ",
+    "OP_RANGE",
+    "OP_CONTAINS",
+    "OP_ACTIVE",
+    "CRITERIA_COLUMNS",
+    "QueryShape",
+    "query_shape",
+    "QueryWorkloadRecorder",
+    "query_workload",
+]
@@ -3,10 +3,12 @@ from app.repositories.transaction_repository import TransactionRepository
 from app.repositories.event_repository import EventRepository
 from app.repositories.accounting_repository import AccountingRepository
 from app.repositories.cash_flow_repository import CashFlowRepository
+from app.repositories.deleted_record_repository import DeletedRecordRepository
 
 __all__ = [
     'TransactionRepository',
     'EventRepository',
     'AccountingRepository',
     'CashFlowRepository',
+    'DeletedRecordRepository',
 ]
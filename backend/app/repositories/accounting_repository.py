@@ -1,8 +1,12 @@
 """Accounting repository"""
+from decimal import Decimal
 from typing import List, Dict
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 from app.models.accounting import AccountingRecord
+from app.models.archive import AccountingRecordArchive
+from app.models.enums import DebitCreditIndicator
+from app.models.money import ZERO_AMOUNT
 from app.schemas.common import PaginationParams
 
 
@@ -17,16 +21,19 @@ class AccountingRepository:
         transaction_id: str,
         pagination: PaginationParams
     ) -> tuple[List[AccountingRecord], int]:
-        """根据交易流水号查询账务记录列表"""
-        query = self.db.query(AccountingRecord).filter(
-            AccountingRecord.transaction_id == transaction_id
-        )
-        
-        # 获取总记录数
-        total_count = query.count()
+        """根据交易流水号查询账务记录列表（交易整体归档，热表无记录时查归档表）"""
+        for model in (AccountingRecord, AccountingRecordArchive):
+            query = self.db.query(model).filter(
+                model.transaction_id == transaction_id
+            )
+            
+            # 获取总记录数
+            total_count = query.count()
+            if total_count:
+                break
         
         # 按实际记账日降序排列
-        query = query.order_by(AccountingRecord.actual_accounting_date.desc())
+        query = query.order_by(model.actual_accounting_date.desc())
         
         # 应用分页
         offset = (pagination.page - 1) * pagination.page_size
@@ -37,30 +44,40 @@ class AccountingRepository:
         return results, total_count
     
     def find_by_voucher_id(self, voucher_id: str) -> AccountingRecord:
-        """根据传票号查询账务记录"""
-        return self.db.query(AccountingRecord).filter(
-            AccountingRecord.voucher_id == voucher_id
-        ).first()
+        """根据传票号查询账务记录（热表未命中时查归档表）"""
+        for model in (AccountingRecord, AccountingRecordArchive):
+            record = self.db.query(model).filter(
+                model.voucher_id == voucher_id
+            ).first()
+            if record is not None:
+                return record
+        return None
     
     def get_amount_summary_by_currency(
         self,
         transaction_id: str
-    ) -> Dict[str, Dict[str, float]]:
-        """按币种汇总借贷金额"""
-        records = self.db.query(AccountingRecord).filter(
-            AccountingRecord.transaction_id == transaction_id
-        ).all()
+    ) -> Dict[str, Dict[str, Decimal]]:
+        """按币种汇总借贷金额（在数据库中按定点数求和；热表无记录时汇总归档表）"""
+        for model in (AccountingRecord, AccountingRecordArchive):
+            rows = self.db.query(
+                model.currency,
+                model.debit_credit_indicator,
+                func.sum(model.transaction_amount)
+            ).filter(
+                model.transaction_id == transaction_id
+            ).group_by(
+                model.currency, model.debit_credit_indicator
+            ).all()
+            if rows:
+                break
         
         summary = {}
-        for record in records:
-            currency = record.currency
-            if currency not in summary:
-                summary[currency] = {'debit': 0.0, 'credit': 0.0}
-            
-            if record.debit_credit_indicator.value == 'DEBIT':
-                summary[currency]['debit'] += record.transaction_amount
+        for currency, debit_credit_indicator, total in rows:
+            amounts = summary.setdefault(currency, {'debit': ZERO_AMOUNT, 'credit': ZERO_AMOUNT})
+            if debit_credit_indicator == DebitCreditIndicator.DEBIT:
+                amounts['debit'] = total
             else:
-                summary[currency]['credit'] += record.transaction_amount
+                amounts['credit'] = total
         
         return summary
     
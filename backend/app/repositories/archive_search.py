@@ -0,0 +1,62 @@
+"""Paged search across a hot table and its archive table"""
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.schemas.common import PaginationParams
+
+
+def find_page_across_archive(
+    db: Session,
+    sources: Sequence[Tuple[Any, list]],
+    key: str,
+    sort_column: str,
+    descending: bool,
+    pagination: PaginationParams
+) -> Tuple[List[Any], int]:
+    """
+    在热表和归档表中联合分页查询
+
+    两阶段执行：先对各表的 (主键, 排序列) 做 UNION ALL 并分页，只取一页主键；
+    再按主键分别从各表加载对象，按页内顺序返回（热表对象和归档对象混合）
+
+    Args:
+        db: 数据库会话
+        sources: [(模型, 过滤表达式列表)]，通常为热表和归档表各一项
+        key: 主键列名
+        sort_column: 排序列名
+        descending: 是否降序
+        pagination: 分页参数
+
+    Returns:
+        tuple[List[Any], int]: (当前页对象列表, 总记录数)
+    """
+    parts = [
+        select(
+            getattr(model, key).label('key'),
+            getattr(model, sort_column).label('sort_key'),
+            literal(index).label('source')
+        ).where(*filters)
+        for index, (model, filters) in enumerate(sources)
+    ]
+    keys = union_all(*parts).subquery()
+
+    total_count = db.scalar(select(func.count()).select_from(keys))
+
+    order = keys.c.sort_key.desc() if descending else keys.c.sort_key.asc()
+    page = db.execute(
+        select(keys.c.key, keys.c.source)
+        .order_by(order, keys.c.key)
+        .offset((pagination.page - 1) * pagination.page_size)
+        .limit(pagination.page_size)
+    ).all()
+
+    loaded = {}
+    for index, (model, _) in enumerate(sources):
+        ids = [row.key for row in page if row.source == index]
+        if ids:
+            for obj in db.query(model).filter(getattr(model, key).in_(ids)):
+                loaded[(index, getattr(obj, key))] = obj
+
+    return [loaded[(row.source, row.key)] for row in page], total_count
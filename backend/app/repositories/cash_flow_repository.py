@@ -1,8 +1,18 @@
 """Cash flow repository"""
-from typing import List, Dict, Optional
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Dict, Optional, Sequence, Iterator, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from app.models.cash_flow import CashFlow
+from sqlalchemy import and_, or_, func, select, bindparam
+from sqlalchemy.engine import Row
+from app.models.cash_flow import CashFlow, TERMINAL_CASH_FLOW_STATUSES
+from app.models.transaction import Transaction
+from app.models.archive import CashFlowArchive, TransactionArchive
+from app.models.enums import DeletedEntityType
+from app.repositories.deleted_record_repository import DeletedRecordRepository
+from app.repositories.archive_search import find_page_across_archive
+from app.partitioning import lock_record_id
+from app.query_workload import query_workload
 from app.schemas.cash_flow import CashFlowQueryCriteria
 from app.schemas.common import PaginationParams
 
@@ -14,26 +24,33 @@ class CashFlowRepository:
         self.db = db
     
     def find_by_cash_flow_id(self, cash_flow_id: str) -> Optional[CashFlow]:
-        """根据现金流ID查询现金流"""
-        return self.db.query(CashFlow).filter(
-            CashFlow.cash_flow_id == cash_flow_id
-        ).first()
+        """根据现金流ID查询现金流（热表未命中时查归档表）"""
+        for model in (CashFlow, CashFlowArchive):
+            cash_flow = self.db.query(model).filter(
+                model.cash_flow_id == cash_flow_id
+            ).first()
+            if cash_flow is not None:
+                return cash_flow
+        return None
     
     def find_by_transaction_id(
         self,
         transaction_id: str,
         pagination: PaginationParams
     ) -> tuple[List[CashFlow], int]:
-        """根据交易流水号查询现金流列表"""
-        query = self.db.query(CashFlow).filter(
-            CashFlow.transaction_id == transaction_id
-        )
-        
-        # 获取总记录数
-        total_count = query.count()
+        """根据交易流水号查询现金流列表（交易整体归档，热表无记录时查归档表）"""
+        for model in (CashFlow, CashFlowArchive):
+            query = self.db.query(model).filter(
+                model.transaction_id == transaction_id
+            )
+            
+            # 获取总记录数
+            total_count = query.count()
+            if total_count:
+                break
         
         # 按收付日期降序排列
-        query = query.order_by(CashFlow.payment_date.desc())
+        query = query.order_by(model.payment_date.desc())
         
         # 应用分页
         offset = (pagination.page - 1) * pagination.page_size
@@ -43,49 +60,112 @@ class CashFlowRepository:
         
         return results, total_count
     
-    def find_by_criteria(
+    def _build_filters(
         self,
         criteria: CashFlowQueryCriteria,
-        pagination: PaginationParams
-    ) -> tuple[List[CashFlow], int]:
-        """根据条件查询现金流"""
-        query = self.db.query(CashFlow)
-        
-        # 应用查询条件
+        model=CashFlow,
+        transaction_model=Transaction
+    ) -> list:
+        """根据查询条件构建过滤表达式（model/transaction_model 为热表或归档表模型）"""
         filters = []
         
         if criteria.transaction_id:
-            filters.append(CashFlow.transaction_id == criteria.transaction_id)
+            filters.append(model.transaction_id == criteria.transaction_id)
         
         if criteria.cash_flow_id:
-            filters.append(CashFlow.cash_flow_id == criteria.cash_flow_id)
+            filters.append(model.cash_flow_id == criteria.cash_flow_id)
         
         if criteria.payment_info_id:
-            filters.append(CashFlow.payment_info_id == criteria.payment_info_id)
+            filters.append(model.payment_info_id == criteria.payment_info_id)
         
         if criteria.settlement_id:
-            filters.append(CashFlow.settlement_id == criteria.settlement_id)
+            filters.append(model.settlement_id == criteria.settlement_id)
         
         if criteria.direction:
-            filters.append(CashFlow.direction == criteria.direction)
+            filters.append(model.direction == criteria.direction)
         
         if criteria.currency:
-            filters.append(CashFlow.currency == criteria.currency)
+            filters.append(model.currency == criteria.currency)
         
         if criteria.amount_min is not None:
-            filters.append(CashFlow.amount >= criteria.amount_min)
+            filters.append(model.amount >= criteria.amount_min)
         
         if criteria.amount_max is not None:
-            filters.append(CashFlow.amount <= criteria.amount_max)
+            filters.append(model.amount <= criteria.amount_max)
         
         if criteria.payment_date_from:
-            filters.append(CashFlow.payment_date >= criteria.payment_date_from)
+            filters.append(model.payment_date >= criteria.payment_date_from)
         
         if criteria.payment_date_to:
-            filters.append(CashFlow.payment_date <= criteria.payment_date_to)
+            filters.append(model.payment_date <= criteria.payment_date_to)
         
         if criteria.status:
-            filters.append(CashFlow.current_status == criteria.status)
+            filters.append(model.current_status == criteria.status)
+        
+        if criteria.active_only:
+            # 以字面量渲染（而非绑定参数），使条件与部分索引的 WHERE 一致
+            filters.append(model.current_status.not_in(bindparam(
+                'terminal_statuses',
+                TERMINAL_CASH_FLOW_STATUSES,
+                expanding=True,
+                literal_execute=True,
+                type_=model.__table__.c.current_status.type
+            )))
+        
+        # 交易层条件：transaction_id IN (SELECT ...) 半连接，走交易表索引
+        transaction_filters = self._build_transaction_filters(criteria, transaction_model)
+        if transaction_filters:
+            filters.append(model.transaction_id.in_(
+                select(transaction_model.transaction_id).where(and_(*transaction_filters))
+            ))
+        
+        return filters
+    
+    def _build_transaction_filters(self, criteria: CashFlowQueryCriteria, model=Transaction) -> list:
+        """根据交易层查询条件构建交易表过滤表达式"""
+        filters = []
+        
+        if criteria.counterparty:
+            filters.append(model.counterparty.like(f'%{criteria.counterparty}%'))
+        
+        if criteria.product:
+            filters.append(model.product == criteria.product)
+        
+        if criteria.trade_date_from:
+            filters.append(model.trade_date >= criteria.trade_date_from)
+        
+        if criteria.trade_date_to:
+            filters.append(model.trade_date <= criteria.trade_date_to)
+        
+        if criteria.operating_institution:
+            filters.append(model.operating_institution == criteria.operating_institution)
+        
+        return filters
+    
+    def find_by_criteria(
+        self,
+        criteria: CashFlowQueryCriteria,
+        pagination: PaginationParams
+    ) -> tuple[List[CashFlow], int]:
+        """根据条件查询现金流（include_archived 时同时查询归档表）"""
+        query_workload.record('cash_flows', criteria, 'payment_date', 'DESC')
+        if criteria.include_archived:
+            return find_page_across_archive(
+                self.db,
+                [
+                    (CashFlow, self._build_filters(criteria)),
+                    (CashFlowArchive, self._build_filters(criteria, CashFlowArchive, TransactionArchive)),
+                ],
+                key='cash_flow_id',
+                sort_column='payment_date',
+                descending=True,
+                pagination=pagination
+            )
+        
+        query = self.db.query(CashFlow)
+        
+        # 应用查询条件
+        filters = self._build_filters(criteria)
         
         if filters:
             query = query.filter(and_(*filters))
@@ -107,70 +187,104 @@ class CashFlowRepository:
     def get_amount_summary(
         self,
         criteria: CashFlowQueryCriteria
-    ) -> Dict[str, Dict[str, float]]:
-        """按币种和方向汇总金额"""
-        query = self.db.query(CashFlow)
+    ) -> Dict[str, Dict[str, Decimal]]:
+        """按币种和方向汇总金额（在数据库中按定点数分组求和，不加载现金流行）"""
+        query_workload.record('cash_flows', criteria)
+        query = self.db.query(CashFlow.currency, CashFlow.direction, func.sum(CashFlow.amount))
         
         # 应用查询条件（与find_by_criteria相同的逻辑）
-        filters = []
-        
-        if criteria.transaction_id:
-            filters.append(CashFlow.transaction_id == criteria.transaction_id)
-        
-        if criteria.cash_flow_id:
-            filters.append(CashFlow.cash_flow_id == criteria.cash_flow_id)
-        
-        if criteria.payment_info_id:
-            filters.append(CashFlow.payment_info_id == criteria.payment_info_id)
+        filters = self._build_filters(criteria)
         
-        if criteria.settlement_id:
-            filters.append(CashFlow.settlement_id == criteria.settlement_id)
-        
-        if criteria.direction:
-            filters.append(CashFlow.direction == criteria.direction)
-        
-        if criteria.currency:
-            filters.append(CashFlow.currency == criteria.currency)
-        
-        if criteria.amount_min is not None:
-            filters.append(CashFlow.amount >= criteria.amount_min)
+        if filters:
+            query = query.filter(and_(*filters))
         
-        if criteria.amount_max is not None:
-            filters.append(CashFlow.amount <= criteria.amount_max)
+        # 按币种和方向汇总
+        summary = {}
+        for currency, direction, total in query.group_by(CashFlow.currency, CashFlow.direction):
+            summary.setdefault(currency, {})[direction.value] = total
         
-        if criteria.payment_date_from:
-            filters.append(CashFlow.payment_date >= criteria.payment_date_from)
+        return summary
+    
+    def count_by_criteria(self, criteria: CashFlowQueryCriteria) -> int:
+        """统计符合条件的现金流数"""
+        query = self.db.query(CashFlow)
         
-        if criteria.payment_date_to:
-            filters.append(CashFlow.payment_date <= criteria.payment_date_to)
+        filters = self._build_filters(criteria)
+        if filters:
+            query = query.filter(and_(*filters))
         
-        if criteria.status:
-            filters.append(CashFlow.current_status == criteria.status)
+        return query.count()
+    
+    def stream_by_criteria(
+        self,
+        criteria: CashFlowQueryCriteria,
+        columns: Sequence[Any],
+        batch_size: int = 1000,
+        join_transaction: bool = False
+    ) -> Iterator[Row]:
+        """
+        按条件流式读取指定列（Core 行元组，不构造ORM对象）
+        
+        单条查询配合 yield_per 分批拉取，按收付日期降序排列；
+        join_transaction 为 True 时在同一条查询中关联交易表，columns 可包含交易表列
+        """
+        query_workload.record('cash_flows', criteria, 'payment_date', 'DESC')
+        stmt = select(*columns).select_from(CashFlow)
+        
+        if join_transaction:
+            stmt = stmt.join(
+                Transaction, CashFlow.transaction_id == Transaction.transaction_id
+            )
         
+        filters = self._build_filters(criteria)
         if filters:
-            query = query.filter(and_(*filters))
+            stmt = stmt.where(and_(*filters))
         
-        # 获取所有记录
-        records = query.all()
+        stmt = stmt.order_by(CashFlow.payment_date.desc()).execution_options(
+            yield_per=batch_size
+        )
         
-        # 按币种和方向汇总
-        summary = {}
-        for record in records:
-            currency = record.currency
-            direction = record.direction.value
-            
-            if currency not in summary:
-                summary[currency] = {}
-            
-            if direction not in summary[currency]:
-                summary[currency][direction] = 0.0
-            
-            summary[currency][direction] += record.amount
+        yield from self.db.execute(stmt)
+    
+    def stream_modified_since(
+        self,
+        since: datetime,
+        since_id: Optional[str],
+        columns: Sequence[Any],
+        limit: int,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        按 (last_modified_date, cash_flow_id) 水位线增量读取现金流
+        
+        返回行的最后两列固定为 last_modified_date 和 cash_flow_id，供调用方推进水位线
+        """
+        stmt = select(*columns, CashFlow.last_modified_date, CashFlow.cash_flow_id)
+        
+        if since_id is None:
+            watermark = CashFlow.last_modified_date > since
+        else:
+            watermark = or_(
+                CashFlow.last_modified_date > since,
+                and_(CashFlow.last_modified_date == since, CashFlow.cash_flow_id > since_id)
+            )
         
-        return summary
+        stmt = stmt.where(watermark).order_by(
+            CashFlow.last_modified_date.asc(), CashFlow.cash_flow_id.asc()
+        ).limit(limit).execution_options(yield_per=batch_size)
+        
+        yield from self.db.execute(stmt)
     
     def create(self, cash_flow: CashFlow) -> CashFlow:
-        """创建现金流"""
+        """
+        创建现金流
+
+        Raises:
+            ValueError: 当现金流ID已存在时（分区表主键含收付日期，唯一性由此处保证）
+        """
+        lock_record_id(self.db.connection(), CashFlow.__tablename__, cash_flow.cash_flow_id)
+        if self.exists(cash_flow.cash_flow_id):
+            raise ValueError(f'RESOURCE_ALREADY_EXISTS: Cash flow with id {cash_flow.cash_flow_id} already exists')
         self.db.add(cash_flow)
         self.db.commit()
         self.db.refresh(cash_flow)
@@ -198,7 +312,8 @@ class CashFlowRepository:
         ).update({
             'current_status': status,
             'progress_percentage': progress_percentage,
-            'version': CashFlow.version + 1
+            'version': CashFlow.version + 1,
+            'last_modified_date': datetime.now()
         }, synchronize_session=False)
         
         self.db.commit()
@@ -210,10 +325,17 @@ class CashFlowRepository:
             CashFlow.cash_flow_id == cash_flow_id
         ).count() > 0
     
-    def delete(self, cash_flow_id: str) -> bool:
-        """删除现金流"""
-        result = self.db.query(CashFlow).filter(
+    def delete(self, cash_flow_id: str, deleted_by: str = 'system') -> bool:
+        """删除现金流（同时登记删除记录，供增量导出同步）"""
+        query = self.db.query(CashFlow).filter(
             CashFlow.cash_flow_id == cash_flow_id
-        ).delete()
+        )
+        transaction_id = query.with_entities(CashFlow.transaction_id).scalar()
+        
+        result = query.delete()
+        if result > 0:
+            DeletedRecordRepository(self.db).record(
+                DeletedEntityType.CASH_FLOW, cash_flow_id, transaction_id, deleted_by
+            )
         self.db.commit()
         return result > 0
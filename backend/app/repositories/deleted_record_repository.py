@@ -0,0 +1,71 @@
+"""Deleted record (tombstone) repository"""
+from datetime import datetime
+from typing import Optional, Sequence, Iterator, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from sqlalchemy.engine import Row
+from app.models.deleted_record import DeletedRecord
+from app.models.enums import DeletedEntityType
+
+
+class DeletedRecordRepository:
+    """删除记录（墓碑）仓储"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def record(
+        self,
+        entity_type: DeletedEntityType,
+        entity_id: str,
+        transaction_id: Optional[str],
+        deleted_by: str
+    ) -> DeletedRecord:
+        """
+        登记删除记录
+        
+        不提交事务，由调用方与删除操作在同一事务中提交
+        """
+        tombstone = DeletedRecord(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            transaction_id=transaction_id,
+            deleted_date=datetime.now(),
+            deleted_by=deleted_by
+        )
+        self.db.add(tombstone)
+        return tombstone
+    
+    def stream_deleted_since(
+        self,
+        since: datetime,
+        since_id: Optional[int],
+        columns: Sequence[Any],
+        limit: int,
+        entity_types: Optional[Sequence[DeletedEntityType]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        按 (deleted_date, id) 水位线增量读取删除记录
+        
+        返回行的最后两列固定为 deleted_date 和 id，供调用方推进水位线
+        """
+        stmt = select(*columns, DeletedRecord.deleted_date, DeletedRecord.id)
+        
+        if since_id is None:
+            watermark = DeletedRecord.deleted_date > since
+        else:
+            watermark = or_(
+                DeletedRecord.deleted_date > since,
+                and_(DeletedRecord.deleted_date == since, DeletedRecord.id > since_id)
+            )
+        stmt = stmt.where(watermark)
+        
+        if entity_types:
+            stmt = stmt.where(DeletedRecord.entity_type.in_(entity_types))
+        
+        stmt = stmt.order_by(
+            DeletedRecord.deleted_date.asc(), DeletedRecord.id.asc()
+        ).limit(limit).execution_options(yield_per=batch_size)
+        
+        yield from self.db.execute(stmt)
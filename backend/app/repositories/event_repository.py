@@ -1,8 +1,11 @@
 """Event repository"""
-from typing import List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import and_
 from app.models.event import EventRecord
+from app.models.archive import EventRecordArchive
+from app.partitioning import lock_record_id
 from app.schemas.common import PaginationParams
 
 
@@ -12,21 +15,41 @@ class EventRepository:
     def __init__(self, db: Session):
         self.db = db
     
+    @staticmethod
+    def _apply_modified_window(
+        query: Query,
+        model,
+        modified_date_from: Optional[datetime],
+        modified_date_to: Optional[datetime]
+    ) -> Query:
+        """按修改日区间过滤（events 按修改日分区时只扫描区间内的分区）"""
+        if modified_date_from:
+            query = query.filter(model.modified_date >= modified_date_from)
+        if modified_date_to:
+            query = query.filter(model.modified_date <= modified_date_to)
+        return query
+    
     def find_by_external_id(
         self,
         external_id: str,
-        pagination: PaginationParams
+        pagination: PaginationParams,
+        modified_date_from: Optional[datetime] = None,
+        modified_date_to: Optional[datetime] = None
     ) -> tuple[List[EventRecord], int]:
-        """根据外部流水号查询事件列表"""
-        query = self.db.query(EventRecord).filter(
-            EventRecord.external_id == external_id
-        )
-        
-        # 获取总记录数
-        total_count = query.count()
+        """根据外部流水号查询事件列表（可按修改日区间过滤；交易整体归档，热表无记录时查归档表）"""
+        for model in (EventRecord, EventRecordArchive):
+            query = self.db.query(model).filter(
+                model.external_id == external_id
+            )
+            query = self._apply_modified_window(query, model, modified_date_from, modified_date_to)
+            
+            # 获取总记录数
+            total_count = query.count()
+            if total_count:
+                break
         
         # 按修改日降序排列
-        query = query.order_by(EventRecord.modified_date.desc())
+        query = query.order_by(model.modified_date.desc())
         
         # 应用分页
         offset = (pagination.page - 1) * pagination.page_size
@@ -39,18 +62,24 @@ class EventRepository:
     def find_by_transaction_id(
         self,
         transaction_id: str,
-        pagination: PaginationParams
+        pagination: PaginationParams,
+        modified_date_from: Optional[datetime] = None,
+        modified_date_to: Optional[datetime] = None
     ) -> tuple[List[EventRecord], int]:
-        """根据交易流水号查询事件列表"""
-        query = self.db.query(EventRecord).filter(
-            EventRecord.transaction_id == transaction_id
-        )
-        
-        # 获取总记录数
-        total_count = query.count()
+        """根据交易流水号查询事件列表（可按修改日区间过滤；交易整体归档，热表无记录时查归档表）"""
+        for model in (EventRecord, EventRecordArchive):
+            query = self.db.query(model).filter(
+                model.transaction_id == transaction_id
+            )
+            query = self._apply_modified_window(query, model, modified_date_from, modified_date_to)
+            
+            # 获取总记录数
+            total_count = query.count()
+            if total_count:
+                break
         
         # 按修改日降序排列
-        query = query.order_by(EventRecord.modified_date.desc())
+        query = query.order_by(model.modified_date.desc())
         
         # 应用分页
         offset = (pagination.page - 1) * pagination.page_size
@@ -61,13 +90,25 @@ class EventRepository:
         return results, total_count
     
     def find_by_event_id(self, event_id: str) -> EventRecord:
-        """根据事件ID查询事件"""
-        return self.db.query(EventRecord).filter(
-            EventRecord.event_id == event_id
-        ).first()
+        """根据事件ID查询事件（热表未命中时查归档表）"""
+        for model in (EventRecord, EventRecordArchive):
+            event = self.db.query(model).filter(
+                model.event_id == event_id
+            ).first()
+            if event is not None:
+                return event
+        return None
     
     def create(self, event: EventRecord) -> EventRecord:
-        """创建事件记录"""
+        """
+        创建事件记录
+
+        Raises:
+            ValueError: 当事件ID已存在时（分区表主键含修改时间，唯一性由此处保证）
+        """
+        lock_record_id(self.db.connection(), EventRecord.__tablename__, event.event_id)
+        if self.exists(event.event_id):
+            raise ValueError(f'RESOURCE_ALREADY_EXISTS: Event with id {event.event_id} already exists')
         self.db.add(event)
         self.db.commit()
         self.db.refresh(event)
@@ -1,8 +1,18 @@
 """Transaction repository"""
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence, Iterator, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
+from sqlalchemy.engine import Row
 from app.models.transaction import Transaction
+from app.models.archive import TransactionArchive
+from app.models.accounting import AccountingRecord
+from app.models.cash_flow import CashFlow
+from app.models.event import EventRecord
+from app.models.enums import DeletedEntityType
+from app.repositories.deleted_record_repository import DeletedRecordRepository
+from app.repositories.archive_search import find_page_across_archive
+from app.query_workload import query_workload
 from app.schemas.transaction import TransactionQueryCriteria
 from app.schemas.common import PaginationParams
 
@@ -14,72 +24,89 @@ class TransactionRepository:
         self.db = db
     
     def find_by_external_id(self, external_id: str) -> Optional[Transaction]:
-        """根据外部流水号查询交易"""
-        return self.db.query(Transaction).filter(
-            Transaction.external_id == external_id
-        ).first()
+        """根据外部流水号查询交易（热表未命中时查归档表）"""
+        for model in (Transaction, TransactionArchive):
+            transaction = self.db.query(model).filter(
+                model.external_id == external_id
+            ).first()
+            if transaction is not None:
+                return transaction
+        return None
     
     def find_by_transaction_id(self, transaction_id: str) -> Optional[Transaction]:
-        """根据交易流水号查询交易"""
-        return self.db.query(Transaction).filter(
-            Transaction.transaction_id == transaction_id
-        ).first()
+        """根据交易流水号查询交易（热表未命中时查归档表）"""
+        for model in (Transaction, TransactionArchive):
+            transaction = self.db.query(model).filter(
+                model.transaction_id == transaction_id
+            ).first()
+            if transaction is not None:
+                return transaction
+        return None
     
-    def find_by_criteria(
-        self,
-        criteria: TransactionQueryCriteria,
-        pagination: PaginationParams
-    ) -> tuple[List[Transaction], int]:
-        """根据条件查询交易"""
-        query = self.db.query(Transaction)
-        
-        # 应用查询条件
+    def _build_filters(self, criteria: TransactionQueryCriteria, model=Transaction) -> list:
+        """根据查询条件构建过滤表达式（model 为热表或归档表模型）"""
         filters = []
         
         if criteria.external_id:
-            filters.append(Transaction.external_id == criteria.external_id)
+            filters.append(model.external_id == criteria.external_id)
         
         if criteria.status:
-            filters.append(Transaction.status == criteria.status)
+            filters.append(model.status == criteria.status)
         
         if criteria.trade_date_from:
-            filters.append(Transaction.trade_date >= criteria.trade_date_from)
+            filters.append(model.trade_date >= criteria.trade_date_from)
         
         if criteria.trade_date_to:
-            filters.append(Transaction.trade_date <= criteria.trade_date_to)
+            filters.append(model.trade_date <= criteria.trade_date_to)
         
         if criteria.value_date_from:
-            filters.append(Transaction.value_date >= criteria.value_date_from)
+            filters.append(model.value_date >= criteria.value_date_from)
         
         if criteria.value_date_to:
-            filters.append(Transaction.value_date <= criteria.value_date_to)
+            filters.append(model.value_date <= criteria.value_date_to)
         
         if criteria.maturity_date_from:
-            filters.append(Transaction.maturity_date >= criteria.maturity_date_from)
+            filters.append(model.maturity_date >= criteria.maturity_date_from)
         
         if criteria.maturity_date_to:
-            filters.append(Transaction.maturity_date <= criteria.maturity_date_to)
+            filters.append(model.maturity_date <= criteria.maturity_date_to)
         
         if criteria.counterparty:
-            filters.append(Transaction.counterparty.like(f'%{criteria.counterparty}%'))
+            filters.append(model.counterparty.like(f'%{criteria.counterparty}%'))
         
         if criteria.product:
-            filters.append(Transaction.product == criteria.product)
+            filters.append(model.product == criteria.product)
         
         if criteria.operating_institution:
-            filters.append(Transaction.operating_institution == criteria.operating_institution)
+            filters.append(model.operating_institution == criteria.operating_institution)
         
         if criteria.business_institution:
-            filters.append(Transaction.business_institution == criteria.business_institution)
+            filters.append(model.business_institution == criteria.business_institution)
         
         if criteria.settlement_method:
-            filters.append(Transaction.settlement_method == criteria.settlement_method)
+            filters.append(model.settlement_method == criteria.settlement_method)
         
         if criteria.confirmation_type:
-            filters.append(Transaction.confirmation_type == criteria.confirmation_type)
+            filters.append(model.confirmation_type == criteria.confirmation_type)
         
         if criteria.source:
-            filters.append(Transaction.source == criteria.source)
+            filters.append(model.source == criteria.source)
+        
+        return filters
+    
+    def find_by_criteria(
+        self,
+        criteria: TransactionQueryCriteria,
+        pagination: PaginationParams
+    ) -> tuple[List[Transaction], int]:
+        """根据条件查询交易（include_archived 时同时查询归档表）"""
+        if criteria.include_archived:
+            return self._find_including_archived(criteria, pagination)
+        
+        query = self.db.query(Transaction)
+        
+        # 应用查询条件
+        filters = self._build_filters(criteria)
         
         if filters:
             query = query.filter(and_(*filters))
@@ -90,6 +117,7 @@ class TransactionRepository:
         # 应用排序
         sort_by = pagination.sort_by or 'trade_date'
         sort_order = pagination.sort_order or 'DESC'
+        query_workload.record('transactions', criteria, sort_by, sort_order)
         
         if hasattr(Transaction, sort_by):
             order_column = getattr(Transaction, sort_by)
@@ -109,6 +137,94 @@ class TransactionRepository:
         
         return results, total_count
     
+    def _find_including_archived(
+        self,
+        criteria: TransactionQueryCriteria,
+        pagination: PaginationParams
+    ) -> tuple[List[Transaction], int]:
+        """在交易表和交易归档表中联合查询（排序规则与 find_by_criteria 相同）"""
+        sort_by = pagination.sort_by or 'trade_date'
+        sort_order = pagination.sort_order or 'DESC'
+        query_workload.record('transactions', criteria, sort_by, sort_order)
+        
+        if sort_by not in Transaction.__table__.c:
+            sort_by, sort_order = 'trade_date', 'DESC'
+        
+        return find_page_across_archive(
+            self.db,
+            [
+                (Transaction, self._build_filters(criteria)),
+                (TransactionArchive, self._build_filters(criteria, TransactionArchive)),
+            ],
+            key='external_id',
+            sort_column=sort_by,
+            descending=sort_order.upper() == 'DESC',
+            pagination=pagination
+        )
+    
+    def count_by_criteria(self, criteria: TransactionQueryCriteria) -> int:
+        """统计符合条件的交易数"""
+        query = self.db.query(Transaction)
+        
+        filters = self._build_filters(criteria)
+        if filters:
+            query = query.filter(and_(*filters))
+        
+        return query.count()
+    
+    def stream_by_criteria(
+        self,
+        criteria: TransactionQueryCriteria,
+        columns: Sequence[Any],
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        按条件流式读取指定列（Core 行元组，不构造ORM对象）
+        
+        单条查询配合 yield_per 分批拉取，按交易日降序排列
+        """
+        query_workload.record('transactions', criteria, 'trade_date', 'DESC')
+        stmt = select(*columns)
+        
+        filters = self._build_filters(criteria)
+        if filters:
+            stmt = stmt.where(and_(*filters))
+        
+        stmt = stmt.order_by(Transaction.trade_date.desc()).execution_options(
+            yield_per=batch_size
+        )
+        
+        yield from self.db.execute(stmt)
+    
+    def stream_modified_since(
+        self,
+        since: datetime,
+        since_id: Optional[str],
+        columns: Sequence[Any],
+        limit: int,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        按 (last_modified_date, external_id) 水位线增量读取交易
+        
+        返回行的最后两列固定为 last_modified_date 和 external_id，供调用方推进水位线
+        """
+        stmt = select(*columns, Transaction.last_modified_date, Transaction.external_id)
+        
+        if since_id is None:
+            watermark = Transaction.last_modified_date > since
+        else:
+            watermark = or_(
+                Transaction.last_modified_date > since,
+                and_(Transaction.last_modified_date == since, Transaction.external_id > since_id)
+            )
+        
+        stmt = stmt.where(watermark).order_by(
+            Transaction.last_modified_date.asc(), Transaction.external_id.asc()
+        ).limit(limit).execution_options(yield_per=batch_size)
+        
+        yield from self.db.execute(stmt)
+    
     def create(self, transaction: Transaction) -> Transaction:
         """创建交易"""
         self.db.add(transaction)
@@ -150,10 +266,34 @@ class TransactionRepository:
             Transaction.external_id == external_id
         ).count() > 0
     
-    def delete(self, external_id: str) -> bool:
-        """删除交易"""
-        result = self.db.query(Transaction).filter(
+    def delete(self, external_id: str, deleted_by: str = 'system') -> bool:
+        """
+        删除交易
+        
+        连同其现金流、事件和账务记录一并删除，并为交易及其现金流、事件登记删除记录，
+        供增量导出同步
+        """
+        query = self.db.query(Transaction).filter(
             Transaction.external_id == external_id
-        ).delete()
+        )
+        transaction_id = query.with_entities(Transaction.transaction_id).scalar()
+        if transaction_id is None:
+            return False
+        
+        tombstones = DeletedRecordRepository(self.db)
+        children = [
+            (DeletedEntityType.CASH_FLOW, CashFlow.cash_flow_id, CashFlow.transaction_id == transaction_id),
+            (DeletedEntityType.EVENT, EventRecord.event_id, EventRecord.external_id == external_id),
+        ]
+        for entity_type, id_column, condition in children:
+            for entity_id in self.db.scalars(select(id_column).where(condition)).all():
+                tombstones.record(entity_type, entity_id, transaction_id, deleted_by)
+            self.db.query(id_column.class_).filter(condition).delete(synchronize_session=False)
+        self.db.query(AccountingRecord).filter(
+            AccountingRecord.transaction_id == transaction_id
+        ).delete(synchronize_session=False)
+        
+        query.delete()
+        tombstones.record(DeletedEntityType.TRANSACTION, external_id, transaction_id, deleted_by)
         self.db.commit()
-        return result > 0
+        return True
@@ -2,6 +2,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 from app.models.enums import DebitCreditIndicator
+from app.schemas.common import Amount, BusinessDate
 
 
 class AccountingRecordBase(BaseModel):
@@ -17,7 +18,7 @@ class AccountingRecordBase(BaseModel):
     debit_credit_indicator: DebitCreditIndicator = Field(..., description='借贷方向')
     currency: str = Field(..., description='货币')
     account_subject: str = Field(..., description='科目')
-    transaction_amount: float = Field(..., description='交易金额')
+    transaction_amount: Amount = Field(..., description='交易金额')
     
     class Config:
         from_attributes = True
@@ -48,9 +49,9 @@ class PaymentInfo(BaseModel):
     
     # 支付信息
     instruction_id: str = Field(..., description='指令ID')
-    payment_date: datetime = Field(..., description='支付日期')
+    payment_date: BusinessDate = Field(..., description='支付日期')
     message_type: str = Field(..., description='报文类型')
     currency: str = Field(..., description='币种')
-    amount: float = Field(..., description='金额')
+    amount: Amount = Field(..., description='金额')
     message_sender: str = Field(..., description='报文发送人')
     message_send_time: datetime = Field(..., description='报文发送时间')
@@ -0,0 +1,11 @@
+"""Archive job schemas"""
+from pydantic import BaseModel, Field
+
+
+class ArchiveRunResponse(BaseModel):
+    """归档结果"""
+    batches: int = Field(..., description='执行的批次数')
+    transactions: int = Field(..., description='归档的交易数')
+    events: int = Field(..., description='归档的事件数')
+    cash_flows: int = Field(..., description='归档的现金流数')
+    accounting_records: int = Field(..., description='归档的账务记录数')
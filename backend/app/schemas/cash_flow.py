@@ -1,8 +1,10 @@
 """Cash flow schemas"""
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 from pydantic import BaseModel, Field
-from app.models.enums import SettlementMethod, CashFlowStatus, Direction
+from app.models.enums import SettlementMethod, CashFlowStatus, Direction, ProductType
+from app.schemas.common import Amount, BusinessDate
 
 
 class AccountInfo(BaseModel):
@@ -22,8 +24,8 @@ class CashFlowBase(BaseModel):
     
     direction: Direction = Field(..., description='方向')
     currency: str = Field(..., description='币种')
-    amount: float = Field(..., description='金额')
-    payment_date: datetime = Field(..., description='收付日期')
+    amount: Amount = Field(..., description='金额')
+    payment_date: BusinessDate = Field(..., description='收付日期')
     
     account_number: str = Field(..., description='账号')
     account_name: str = Field(..., description='户名')
@@ -60,8 +62,8 @@ class CashFlowSummary(BaseModel):
     transaction_id: str
     direction: Direction
     currency: str
-    amount: float
-    payment_date: datetime
+    amount: Amount
+    payment_date: BusinessDate
     account_number: str
     current_status: CashFlowStatus
     progress_percentage: int
@@ -83,8 +85,17 @@ class CashFlowQueryCriteria(BaseModel):
     settlement_id: Optional[str] = Field(None, description='结算内部ID')
     direction: Optional[Direction] = Field(None, description='方向')
     currency: Optional[str] = Field(None, description='币种')
-    amount_min: Optional[float] = Field(None, description='最小金额')
-    amount_max: Optional[float] = Field(None, description='最大金额')
-    payment_date_from: Optional[datetime] = Field(None, description='收付日期起始')
-    payment_date_to: Optional[datetime] = Field(None, description='收付日期结束')
+    amount_min: Optional[Decimal] = Field(None, description='最小金额')
+    amount_max: Optional[Decimal] = Field(None, description='最大金额')
+    payment_date_from: Optional[BusinessDate] = Field(None, description='收付日期起始')
+    payment_date_to: Optional[BusinessDate] = Field(None, description='收付日期结束')
     status: Optional[CashFlowStatus] = Field(None, description='状态')
+    active_only: bool = Field(False, description='仅查询在途现金流（排除结算完成/撤销成功）')
+    include_archived: bool = Field(False, description='是否同时查询已归档现金流')
+    
+    # 交易层条件（通过 transaction_id 半连接过滤）
+    counterparty: Optional[str] = Field(None, description='交易对手')
+    product: Optional[ProductType] = Field(None, description='产品')
+    trade_date_from: Optional[BusinessDate] = Field(None, description='交易日起始')
+    trade_date_to: Optional[BusinessDate] = Field(None, description='交易日结束')
+    operating_institution: Optional[str] = Field(None, description='运营机构')
@@ -1,11 +1,34 @@
 """Common schemas"""
-from typing import Generic, TypeVar, List, Optional
-from pydantic import BaseModel, Field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Annotated, Any, Generic, TypeVar, List, Optional
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer
 
 
 T = TypeVar('T')
 
 
+def to_business_date(value: Any) -> Any:
+    """
+    把日期时间（或其ISO字符串）截断为所在日期，其他值交给 date 校验
+
+    营业日期（交易日、起息日、到期日、收付日期）按整日存储和比较，
+    查询条件的结束日期因此包含当天全天
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str) and len(value) > 10:
+        return datetime.fromisoformat(value).date()
+    return value
+
+
+# 营业日期：接受日期、日期时间或ISO字符串，按日粒度取值
+BusinessDate = Annotated[date, BeforeValidator(to_business_date)]
+
+# 金额：模型内保持 Decimal（存储和数据库汇总为定点数），JSON 中按数字输出，与前端约定一致
+Amount = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used='json')]
+
+
 class PaginationParams(BaseModel):
     """Pagination parameters"""
     page: int = Field(default=1, ge=1, description='页码（从1开始）')
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
 from app.models.enums import ProductType, TransactionStatus, BackOfficeStatus, MatchStatus
+from app.schemas.common import BusinessDate
 
 
 class EventRecordBase(BaseModel):
@@ -18,7 +19,7 @@ class EventRecordBase(BaseModel):
     transaction_status: TransactionStatus = Field(..., description='交易状态')
     
     entry_date: datetime = Field(..., description='录入日')
-    trade_date: datetime = Field(..., description='交易日')
+    trade_date: BusinessDate = Field(..., description='交易日')
     modified_date: datetime = Field(..., description='修改日')
     
     back_office_status: BackOfficeStatus = Field(..., description='后线处理状态')
@@ -0,0 +1,27 @@
+"""Partition maintenance schemas"""
+from datetime import date
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class PartitionItem(BaseModel):
+    """分区信息"""
+    name: str = Field(..., description='分区表名')
+    lower: Optional[date] = Field(None, description='下界（含），默认分区为空')
+    upper: Optional[date] = Field(None, description='上界（不含），默认分区为空')
+
+
+class PartitionMaintenanceResult(BaseModel):
+    """单张分区表的维护结果"""
+    created: List[str] = Field(..., description='新建的分区')
+    detached: List[str] = Field(..., description='分离的旧分区')
+
+
+class PartitionsResponse(BaseModel):
+    """各分区表的分区"""
+    tables: Dict[str, List[PartitionItem]] = Field(..., description='表名 → 分区列表（未分区的表不出现）')
+
+
+class PartitionMaintenanceResponse(BaseModel):
+    """分区维护结果"""
+    tables: Dict[str, PartitionMaintenanceResult] = Field(..., description='表名 → 维护结果（未分区的表不出现）')
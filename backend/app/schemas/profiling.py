@@ -0,0 +1,28 @@
+"""Profiling response schemas"""
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class MemoryStatItem(BaseModel):
+    """内存分配统计项"""
+    location: str = Field(..., description='分配位置（文件:行号，多帧以 ; 连接）')
+    size: int = Field(..., description='当前占用字节数')
+    count: int = Field(..., description='当前分配块数')
+    size_diff: Optional[int] = Field(None, description='相对基线的字节增量')
+    count_diff: Optional[int] = Field(None, description='相对基线的分配块增量')
+
+    class Config:
+        from_attributes = True
+
+
+class MemorySnapshotResponse(BaseModel):
+    """内存快照响应"""
+    current: int = Field(..., description='当前追踪到的内存（字节）')
+    peak: int = Field(..., description='追踪期间的峰值内存（字节）')
+    top: List[MemoryStatItem] = Field(..., description='当前占用排行')
+    growth: List[MemoryStatItem] = Field(..., description='相对基线的增长排行')
+
+
+class MemoryTracingStatus(BaseModel):
+    """内存追踪状态"""
+    tracing: bool = Field(..., description='是否正在追踪内存分配')
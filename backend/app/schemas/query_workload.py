@@ -0,0 +1,25 @@
+"""Query workload capture schemas"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class QueryShapeItem(BaseModel):
+    """查询形态统计"""
+    entity: str = Field(..., description='实体(transactions/cash_flows)')
+    filters: List[List[str]] = Field(..., description='过滤条件 [表.列, 操作(eq/range/contains)]')
+    sort_by: Optional[str] = Field(None, description='排序列')
+    sort_order: Optional[str] = Field(None, description='排序方向')
+    count: int = Field(..., description='出现次数')
+    examples: List[Dict[str, Any]] = Field(..., description='最近的查询条件取值样例')
+
+
+class QueryWorkloadResponse(BaseModel):
+    """查询负载快照"""
+    recording: bool = Field(..., description='是否正在记录')
+    dropped: int = Field(..., description='超出形态上限而未记录的查询数')
+    shapes: List[QueryShapeItem] = Field(..., description='查询形态（按次数降序）')
+
+
+class QueryWorkloadStatus(BaseModel):
+    """查询负载记录状态"""
+    recording: bool = Field(..., description='是否正在记录')
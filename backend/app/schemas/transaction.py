@@ -7,6 +7,7 @@ from app.models.enums import (
     SettlementMethod, ConfirmationType, TransactionSource,
     MatchStatus, Direction
 )
+from app.schemas.common import BusinessDate
 
 
 class TransactionBase(BaseModel):
@@ -16,9 +17,9 @@ class TransactionBase(BaseModel):
     parent_transaction_id: Optional[str] = Field(None, description='父交易流水号')
     
     entry_date: datetime = Field(..., description='录入日')
-    trade_date: datetime = Field(..., description='交易日')
-    value_date: datetime = Field(..., description='起息日')
-    maturity_date: datetime = Field(..., description='到期日')
+    trade_date: BusinessDate = Field(..., description='交易日')
+    value_date: BusinessDate = Field(..., description='起息日')
+    maturity_date: BusinessDate = Field(..., description='到期日')
     
     account: str = Field(..., description='账户')
     product: ProductType = Field(..., description='产品类型')
@@ -71,9 +72,9 @@ class TransactionSummary(BaseModel):
     external_id: str
     transaction_id: str
     entry_date: datetime
-    trade_date: datetime
-    value_date: datetime
-    maturity_date: datetime
+    trade_date: BusinessDate
+    value_date: BusinessDate
+    maturity_date: BusinessDate
     account: str
     product: ProductType
     direction: Direction
@@ -104,12 +105,12 @@ class TransactionQueryCriteria(BaseModel):
     """Query criteria for transactions"""
     external_id: Optional[str] = Field(None, description='外部流水号')
     status: Optional[TransactionStatus] = Field(None, description='交易状态')
-    trade_date_from: Optional[datetime] = Field(None, description='交易日起始')
-    trade_date_to: Optional[datetime] = Field(None, description='交易日结束')
-    value_date_from: Optional[datetime] = Field(None, description='起息日起始')
-    value_date_to: Optional[datetime] = Field(None, description='起息日结束')
-    maturity_date_from: Optional[datetime] = Field(None, description='到期日起始')
-    maturity_date_to: Optional[datetime] = Field(None, description='到期日结束')
+    trade_date_from: Optional[BusinessDate] = Field(None, description='交易日起始')
+    trade_date_to: Optional[BusinessDate] = Field(None, description='交易日结束')
+    value_date_from: Optional[BusinessDate] = Field(None, description='起息日起始')
+    value_date_to: Optional[BusinessDate] = Field(None, description='起息日结束')
+    maturity_date_from: Optional[BusinessDate] = Field(None, description='到期日起始')
+    maturity_date_to: Optional[BusinessDate] = Field(None, description='到期日结束')
     counterparty: Optional[str] = Field(None, description='交易对手')
     product: Optional[ProductType] = Field(None, description='产品')
     currency: Optional[str] = Field(None, description='货币')
@@ -118,3 +119,4 @@ class TransactionQueryCriteria(BaseModel):
     settlement_method: Optional[SettlementMethod] = Field(None, description='清算方式')
     confirmation_type: Optional[ConfirmationType] = Field(None, description='证实方式')
     source: Optional[TransactionSource] = Field(None, description='交易来源')
+    include_archived: bool = Field(False, description='是否同时查询已归档交易')
@@ -25,7 +25,8 @@ from app.services.operation_guide_service import (
 from app.services.export_service import (
     ExportService,
     ExportFormat,
-    ExportResult
+    ExportResult,
+    DeltaExportResult
 )
 
 __all__ = [
@@ -48,5 +49,6 @@ __all__ = [
     'ActionEntry',
     'ExportService',
     'ExportFormat',
-    'ExportResult'
+    'ExportResult',
+    'DeltaExportResult'
 ]
@@ -1,4 +1,5 @@
 """Accounting service for managing accounting records and payment information"""
+from decimal import Decimal
 from typing import Optional, Dict
 from sqlalchemy.orm import Session
 from app.repositories.accounting_repository import AccountingRepository
@@ -123,7 +124,7 @@ class AccountingService:
             pagination=pagination_meta
         )
     
-    def get_amount_summary(self, transaction_id: str) -> Dict[str, Dict[str, float]]:
+    def get_amount_summary(self, transaction_id: str) -> Dict[str, Dict[str, Decimal]]:
         """
         按币种汇总借贷金额
         
@@ -131,10 +132,10 @@ class AccountingService:
             transaction_id: 交易流水号
         
         Returns:
-            Dict[str, Dict[str, float]]: 按币种汇总的借贷金额
+            Dict[str, Dict[str, Decimal]]: 按币种汇总的借贷金额
             格式: {
-                'USD': {'debit': 1000.0, 'credit': 500.0},
-                'CNY': {'debit': 7000.0, 'credit': 3500.0}
+                'USD': {'debit': Decimal('1000.0000'), 'credit': Decimal('500.0000')},
+                'CNY': {'debit': Decimal('7000.0000'), 'credit': Decimal('3500.0000')}
             }
         """
         return self.accounting_repository.get_amount_summary_by_currency(transaction_id)
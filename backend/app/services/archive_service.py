@@ -0,0 +1,155 @@
+"""Archive service for moving closed transaction graphs into the archive tables"""
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.accounting import AccountingRecord
+from app.models.archive import ARCHIVE_MODELS
+from app.models.cash_flow import CashFlow, TERMINAL_CASH_FLOW_STATUSES
+from app.models.enums import BackOfficeStatus, TransactionStatus
+from app.models.event import EventRecord
+from app.models.transaction import Transaction
+
+
+logger = logging.getLogger(__name__)
+
+# 可归档的交易状态（且后线处理已完成）
+ARCHIVABLE_STATUSES = (TransactionStatus.MATURED, TransactionStatus.INVALID)
+
+
+@dataclass
+class ArchiveResult:
+    """归档结果统计"""
+    batches: int = 0
+    transactions: int = 0
+    events: int = 0
+    cash_flows: int = 0
+    accounting_records: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class ArchiveService:
+    """
+    归档服务
+
+    把到期/失效且后线处理完成、超过保留期未修改的交易，连同其事件、现金流和账务记录，
+    从热表移入 *_archive 表。每批在一个事务内完成复制和删除，中断后重新运行即从剩余的
+    候选交易继续（已归档的交易不再满足候选条件）
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize archive service
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def _candidate_query(self, cutoff: datetime, after: Optional[str], batch_size: int):
+        """候选交易：状态可归档、后线完成、保留期内未修改，且没有在途现金流"""
+        active_cash_flow = exists().where(and_(
+            CashFlow.transaction_id == Transaction.transaction_id,
+            CashFlow.current_status.not_in(TERMINAL_CASH_FLOW_STATUSES)
+        ))
+        stmt = select(Transaction.external_id, Transaction.transaction_id).where(
+            Transaction.status.in_(ARCHIVABLE_STATUSES),
+            Transaction.back_office_status == BackOfficeStatus.COMPLETED,
+            Transaction.last_modified_date < cutoff,
+            ~active_cash_flow
+        )
+        if after is not None:
+            stmt = stmt.where(Transaction.external_id > after)
+        # PostgreSQL 上锁定本批交易，跳过正被其他事务修改的行（下次运行再处理）
+        return stmt.order_by(Transaction.external_id).limit(batch_size).with_for_update(
+            skip_locked=True, of=Transaction
+        )
+
+    def _move(self, model, column, keys: List[str]) -> int:
+        """把热表中 column IN keys 的行复制到归档表后删除，返回行数"""
+        source = model.__table__
+        target = ARCHIVE_MODELS[model].__table__
+        names = [c.name for c in source.columns]
+        condition = source.c[column].in_(keys)
+
+        self.db.execute(insert(target).from_select(names, select(*[source.c[n] for n in names]).where(condition)))
+        return self.db.execute(delete(source).where(condition)).rowcount
+
+    def archive_batch(self, cutoff: datetime, batch_size: int, after: Optional[str] = None) -> Tuple[ArchiveResult, Optional[str]]:
+        """
+        归档一批交易（单个事务）
+
+        Args:
+            cutoff: 最后修改早于该时间的交易才归档
+            batch_size: 每批交易数
+            after: 只处理外部流水号大于该值的交易（本次运行的游标）
+
+        Returns:
+            tuple[ArchiveResult, Optional[str]]: (本批统计, 本批最后一个外部流水号；无候选时为None)
+        """
+        try:
+            candidates = self.db.execute(self._candidate_query(cutoff, after, batch_size)).all()
+            if not candidates:
+                self.db.rollback()
+                return ArchiveResult(), None
+
+            external_ids = [row.external_id for row in candidates]
+            transaction_ids = [row.transaction_id for row in candidates]
+
+            # 先移子表（外键指向交易表），最后移交易
+            result = ArchiveResult(
+                batches=1,
+                events=self._move(EventRecord, 'external_id', external_ids),
+                cash_flows=self._move(CashFlow, 'transaction_id', transaction_ids),
+                accounting_records=self._move(AccountingRecord, 'transaction_id', transaction_ids),
+            )
+            result.transactions = self._move(Transaction, 'external_id', external_ids)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return result, external_ids[-1]
+
+    def run(
+        self,
+        retention_days: int,
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+        now: Optional[datetime] = None,
+        progress: Optional[Callable[[ArchiveResult], None]] = None
+    ) -> ArchiveResult:
+        """
+        分批归档，直到没有候选交易或达到批次上限
+
+        Args:
+            retention_days: 保留天数（最后修改早于该天数的交易才归档）
+            batch_size: 每批交易数
+            max_batches: 最多执行的批次数（None 表示不限）
+            now: 当前时间（默认当前时间）
+            progress: 每批完成后的回调，参数为累计统计
+
+        Returns:
+            ArchiveResult: 累计统计
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        total = ArchiveResult()
+        after = None
+
+        while max_batches is None or total.batches < max_batches:
+            batch, after = self.archive_batch(cutoff, batch_size, after)
+            if after is None:
+                break
+            for field, value in batch.to_dict().items():
+                setattr(total, field, getattr(total, field) + value)
+            logger.info(f"Archived batch {total.batches}: {batch.to_dict()}")
+            if progress:
+                progress(total)
+
+        return total
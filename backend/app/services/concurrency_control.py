@@ -5,6 +5,8 @@ from typing import Optional, Protocol, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.metrics import OPTIMISTIC_LOCK_CONFLICTS
+
 
 @dataclass
 class Lock:
@@ -146,6 +148,7 @@ class ConcurrencyControl:
             # 检查版本号
             actual_version = entity.version
             if actual_version != expected_version:
+                OPTIMISTIC_LOCK_CONFLICTS.labels(model_class.__name__).inc()
                 raise OptimisticLockError(
                     entity_id=entity_id,
                     expected_version=expected_version,
@@ -1,4 +1,5 @@
 """Event service for managing event records"""
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.event_repository import EventRepository
@@ -24,7 +25,9 @@ class EventService:
         self,
         transaction_id: Optional[str] = None,
         external_id: Optional[str] = None,
-        pagination: Optional[PaginationParams] = None
+        pagination: Optional[PaginationParams] = None,
+        modified_date_from: Optional[datetime] = None,
+        modified_date_to: Optional[datetime] = None
     ) -> PagedResult[EventRecordResponse]:
         """
         查询事件列表
@@ -33,6 +36,8 @@ class EventService:
             transaction_id: 交易流水号（可选）
             external_id: 外部流水号（可选）
             pagination: 分页参数
+            modified_date_from: 修改日起始（可选）
+            modified_date_to: 修改日结束（可选）
         
         Returns:
             PagedResult[EventRecordResponse]: 分页的事件记录列表
@@ -52,12 +57,16 @@ class EventService:
         if external_id:
             events, total_count = self.repository.find_by_external_id(
                 external_id=external_id,
-                pagination=pagination
+                pagination=pagination,
+                modified_date_from=modified_date_from,
+                modified_date_to=modified_date_to
             )
         else:
             events, total_count = self.repository.find_by_transaction_id(
                 transaction_id=transaction_id,
-                pagination=pagination
+                pagination=pagination,
+                modified_date_from=modified_date_from,
+                modified_date_to=modified_date_to
             )
         
         # 计算总页数
@@ -95,11 +104,7 @@ class EventService:
         Raises:
             ValueError: 当事件ID已存在时
         """
-        # 检查事件ID是否已存在
-        if self.repository.exists(event_data.event_id):
-            raise ValueError(f'RESOURCE_ALREADY_EXISTS: Event with id {event_data.event_id} already exists')
-        
-        # 创建事件记录实体
+        # 创建事件记录实体（事件ID已存在时由仓储在加锁后拒绝）
         event = EventRecord(
             event_id=event_data.event_id,
             external_id=event_data.external_id,
@@ -1,16 +1,22 @@
 """Export service for transactions and cash flows"""
-from typing import Optional, List, Generator, Any
+from typing import Optional, List, Generator, Any, Iterable
 from enum import Enum
 from datetime import datetime
 from io import BytesIO, StringIO
 import csv
 from sqlalchemy.orm import Session
 
+from app.models.transaction import Transaction
+from app.models.cash_flow import CashFlow
+from app.models.deleted_record import DeletedRecord
+from app.models.enums import DeletedEntityType
 from app.repositories.transaction_repository import TransactionRepository
 from app.repositories.cash_flow_repository import CashFlowRepository
+from app.repositories.deleted_record_repository import DeletedRecordRepository
 from app.schemas.transaction import TransactionQueryCriteria
 from app.schemas.cash_flow import CashFlowQueryCriteria
-from app.schemas.common import PaginationParams
+from app.services.row_formatter import RowFormatter, compile_row_formatter
+from app.metrics import EXPORT_ROWS, EXPORT_BYTES
 
 
 class ExportFormat(str, Enum):
@@ -36,19 +42,136 @@ class ExportResult:
         self.format = format
 
 
+class DeltaExportResult(ExportResult):
+    """增量导出结果（附带下一次导出使用的水位线）"""
+    def __init__(
+        self,
+        content: bytes,
+        filename: str,
+        record_count: int,
+        export_time: datetime,
+        format: ExportFormat,
+        next_watermark: datetime,
+        next_watermark_id: Optional[Any],
+        has_more: bool
+    ):
+        super().__init__(content, filename, record_count, export_time, format)
+        self.next_watermark = next_watermark
+        self.next_watermark_id = next_watermark_id
+        self.has_more = has_more
+
+
 class ExportService:
     """导出服务"""
     
     # 导出记录数上限
     MAX_EXPORT_RECORDS = 10000
     
-    # 流式处理批次大小（不能超过PaginationParams的page_size限制）
-    BATCH_SIZE = 100
+    # 流式读取批次大小（yield_per）
+    BATCH_SIZE = 1000
+    
+    # 交易字段名映射（中文表头）
+    TRANSACTION_FIELD_NAMES = {
+        'external_id': '外部流水号',
+        'transaction_id': '交易流水号',
+        'entry_date': '录入日',
+        'trade_date': '交易日',
+        'value_date': '起息日',
+        'maturity_date': '到期日',
+        'account': '账户',
+        'product': '产品',
+        'direction': '买卖方向',
+        'underlying': '标的物',
+        'counterparty': '交易对手',
+        'status': '交易状态',
+        'back_office_status': '后线处理状态',
+        'settlement_method': '清算方式',
+        'confirmation_number': '证实编号',
+        'confirmation_type': '证实方式',
+        'confirmation_match_type': '证实匹配方式',
+        'nature': '交易性质',
+        'source': '交易来源',
+        'latest_event_type': '事件类型',
+        'operating_institution': '运营机构',
+        'trader': '交易员'
+    }
+    
+    # 交易默认导出字段
+    DEFAULT_TRANSACTION_FIELDS = [
+        'external_id', 'transaction_id', 'entry_date', 'trade_date',
+        'value_date', 'maturity_date', 'account', 'product', 'direction',
+        'underlying', 'counterparty', 'status', 'back_office_status',
+        'settlement_method', 'confirmation_number', 'confirmation_type',
+        'confirmation_match_type', 'nature', 'source', 'latest_event_type',
+        'operating_institution', 'trader'
+    ]
+    
+    # 现金流字段名映射（中文表头）
+    CASH_FLOW_FIELD_NAMES = {
+        'cash_flow_id': '现金流内部ID',
+        'transaction_id': '交易流水号',
+        'direction': '方向',
+        'currency': '币种',
+        'amount': '金额',
+        'payment_date': '收付日期',
+        'account_number': '账号',
+        'account_name': '户名',
+        'bank_name': '开户行',
+        'bank_code': '开户行号',
+        'settlement_method': '结算方式',
+        'current_status': '当前状态',
+        'progress_percentage': '进度百分比'
+    }
+    
+    # 现金流导出字段
+    CASH_FLOW_FIELDS = [
+        'cash_flow_id', 'transaction_id', 'direction', 'currency',
+        'amount', 'payment_date', 'account_number', 'account_name',
+        'bank_name', 'bank_code', 'settlement_method', 'current_status',
+        'progress_percentage'
+    ]
+    
+    # 现金流关联交易字段（单条 JOIN 查询中从交易表读取）
+    CASH_FLOW_TRANSACTION_COLUMNS = {
+        'counterparty': Transaction.__table__.c.counterparty,
+        'product': Transaction.__table__.c.product,
+        'trade_date': Transaction.__table__.c.trade_date,
+        'operating_institution': Transaction.__table__.c.operating_institution,
+        'trader': Transaction.__table__.c.trader
+    }
+    
+    # 关联交易的现金流字段名映射（中文表头）
+    ENRICHED_CASH_FLOW_FIELD_NAMES = {
+        **CASH_FLOW_FIELD_NAMES,
+        'counterparty': '交易对手',
+        'product': '产品',
+        'trade_date': '交易日',
+        'operating_institution': '运营机构',
+        'trader': '交易员'
+    }
+    
+    # 关联交易的现金流导出字段
+    ENRICHED_CASH_FLOW_FIELDS = CASH_FLOW_FIELDS + list(CASH_FLOW_TRANSACTION_COLUMNS)
+    
+    # 删除记录字段名映射（中文表头）
+    TOMBSTONE_FIELD_NAMES = {
+        'entity_type': '实体类型',
+        'entity_id': '实体ID',
+        'transaction_id': '交易流水号',
+        'deleted_date': '删除时间',
+        'deleted_by': '删除人'
+    }
+    
+    # 删除记录导出字段
+    TOMBSTONE_FIELDS = [
+        'entity_type', 'entity_id', 'transaction_id', 'deleted_date', 'deleted_by'
+    ]
     
     def __init__(self, db: Session):
         self.db = db
         self.transaction_repo = TransactionRepository(db)
         self.cash_flow_repo = CashFlowRepository(db)
+        self.deleted_record_repo = DeletedRecordRepository(db)
     
     def export_transactions(
         self,
@@ -78,17 +201,11 @@ class ExportService:
                 f"EXPORT_LIMIT_EXCEEDED: 导出记录数({total_count})超过限制({self.MAX_EXPORT_RECORDS})，请缩小查询范围"
             )
         
-        # 定义默认字段
-        default_fields = [
-            'external_id', 'transaction_id', 'entry_date', 'trade_date',
-            'value_date', 'maturity_date', 'account', 'product', 'direction',
-            'underlying', 'counterparty', 'status', 'back_office_status',
-            'settlement_method', 'confirmation_number', 'confirmation_type',
-            'confirmation_match_type', 'nature', 'source', 'latest_event_type',
-            'operating_institution', 'trader'
-        ]
-        
-        export_fields = fields if fields else default_fields
+        export_fields = fields if fields else self.DEFAULT_TRANSACTION_FIELDS
+        formatter = compile_row_formatter(
+            Transaction, export_fields, self.TRANSACTION_FIELD_NAMES
+        )
+        rows = self._stream_transaction_rows(criteria, formatter)
         
         # 生成文件名
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -96,22 +213,23 @@ class ExportService:
         
         # 根据格式导出
         if format == ExportFormat.EXCEL:
-            content = self._export_transactions_to_excel(criteria, export_fields)
+            content = self._write_excel("交易汇总", formatter.headers, rows)
         else:  # CSV
-            content = self._export_transactions_to_csv(criteria, export_fields)
+            content = self._write_csv(formatter.headers, rows)
         
-        return ExportResult(
+        return self._record_metrics("transaction", ExportResult(
             content=content,
             filename=filename,
             record_count=total_count,
             export_time=datetime.now(),
             format=format
-        )
+        ))
     
     def export_cash_flows(
         self,
         criteria: CashFlowQueryCriteria,
-        format: ExportFormat
+        format: ExportFormat,
+        enriched: bool = False
     ) -> ExportResult:
         """
         导出现金流列表
@@ -119,6 +237,8 @@ class ExportService:
         Args:
             criteria: 查询条件
             format: 导出格式
+            enriched: 是否附带交易信息（交易对手、产品、交易日、运营机构、交易员），
+                在同一条 JOIN 查询中读取，避免逐条查询交易
             
         Returns:
             ExportResult: 导出结果
@@ -134,13 +254,18 @@ class ExportService:
                 f"EXPORT_LIMIT_EXCEEDED: 导出记录数({total_count})超过限制({self.MAX_EXPORT_RECORDS})，请缩小查询范围"
             )
         
-        # 定义导出字段
-        export_fields = [
-            'cash_flow_id', 'transaction_id', 'direction', 'currency',
-            'amount', 'payment_date', 'account_number', 'account_name',
-            'bank_name', 'bank_code', 'settlement_method', 'current_status',
-            'progress_percentage'
-        ]
+        if enriched:
+            formatter = compile_row_formatter(
+                CashFlow,
+                self.ENRICHED_CASH_FLOW_FIELDS,
+                self.ENRICHED_CASH_FLOW_FIELD_NAMES,
+                self.CASH_FLOW_TRANSACTION_COLUMNS
+            )
+        else:
+            formatter = compile_row_formatter(
+                CashFlow, self.CASH_FLOW_FIELDS, self.CASH_FLOW_FIELD_NAMES
+            )
+        rows = self._stream_cash_flow_rows(criteria, formatter, join_transaction=enriched)
         
         # 生成文件名
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -148,340 +273,260 @@ class ExportService:
         
         # 根据格式导出
         if format == ExportFormat.EXCEL:
-            content = self._export_cash_flows_to_excel(criteria, export_fields)
+            content = self._write_excel("现金流", formatter.headers, rows)
         else:  # CSV
-            content = self._export_cash_flows_to_csv(criteria, export_fields)
+            content = self._write_csv(formatter.headers, rows)
         
-        return ExportResult(
+        return self._record_metrics("cash_flow", ExportResult(
             content=content,
             filename=filename,
             record_count=total_count,
             export_time=datetime.now(),
             format=format
-        )
+        ))
     
-    def _count_transactions(self, criteria: TransactionQueryCriteria) -> int:
-        """统计交易记录数"""
-        pagination = PaginationParams(page=1, page_size=1)
-        _, total_count = self.transaction_repo.find_by_criteria(criteria, pagination)
-        return total_count
-    
-    def _count_cash_flows(self, criteria: CashFlowQueryCriteria) -> int:
-        """统计现金流记录数"""
-        pagination = PaginationParams(page=1, page_size=1)
-        _, total_count = self.cash_flow_repo.find_by_criteria(criteria, pagination)
-        return total_count
-    
-    def _stream_transactions(
+    def export_transactions_delta(
         self,
-        criteria: TransactionQueryCriteria
-    ) -> Generator[Any, None, None]:
+        since: datetime,
+        format: ExportFormat,
+        since_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> DeltaExportResult:
         """
-        流式读取交易记录
+        增量导出水位线之后修改的交易
+        
+        按 (last_modified_date, external_id) 升序导出，单次最多
+        MAX_EXPORT_RECORDS 条；超出部分通过返回的水位线继续拉取
         
         Args:
-            criteria: 查询条件
+            since: 上次导出返回的水位线（last_modified_date）
+            format: 导出格式
+            since_id: 上次导出返回的水位线ID（external_id），用于同一时间戳的断点续传
+            fields: 要导出的字段列表，None表示导出所有字段
             
-        Yields:
-            Transaction: 交易记录
+        Returns:
+            DeltaExportResult: 增量导出结果
         """
-        page = 1
-        while True:
-            pagination = PaginationParams(
-                page=page,
-                page_size=self.BATCH_SIZE
-            )
-            
-            transactions, _ = self.transaction_repo.find_by_criteria(
-                criteria, pagination
-            )
-            
-            if not transactions:
-                break
-            
-            for transaction in transactions:
-                yield transaction
-            
-            page += 1
+        export_fields = fields if fields else self.DEFAULT_TRANSACTION_FIELDS
+        formatter = compile_row_formatter(
+            Transaction, export_fields, self.TRANSACTION_FIELD_NAMES
+        )
+        rows = self.transaction_repo.stream_modified_since(
+            since, since_id, formatter.columns,
+            self.MAX_EXPORT_RECORDS + 1, self.BATCH_SIZE
+        )
+        
+        return self._export_delta(
+            rows, formatter, format, "交易增量", "transaction_delta", since, since_id
+        )
     
-    def _stream_cash_flows(
+    def export_cash_flows_delta(
         self,
-        criteria: CashFlowQueryCriteria
-    ) -> Generator[Any, None, None]:
+        since: datetime,
+        format: ExportFormat,
+        since_id: Optional[str] = None
+    ) -> DeltaExportResult:
         """
-        流式读取现金流记录
+        增量导出水位线之后修改的现金流
+        
+        按 (last_modified_date, cash_flow_id) 升序导出，单次最多
+        MAX_EXPORT_RECORDS 条；超出部分通过返回的水位线继续拉取
         
         Args:
-            criteria: 查询条件
+            since: 上次导出返回的水位线（last_modified_date）
+            format: 导出格式
+            since_id: 上次导出返回的水位线ID（cash_flow_id）
             
-        Yields:
-            CashFlow: 现金流记录
+        Returns:
+            DeltaExportResult: 增量导出结果
         """
-        page = 1
-        while True:
-            pagination = PaginationParams(
-                page=page,
-                page_size=self.BATCH_SIZE
-            )
-            
-            cash_flows, _ = self.cash_flow_repo.find_by_criteria(
-                criteria, pagination
-            )
-            
-            if not cash_flows:
-                break
-            
-            for cash_flow in cash_flows:
-                yield cash_flow
-            
-            page += 1
+        formatter = compile_row_formatter(
+            CashFlow, self.CASH_FLOW_FIELDS, self.CASH_FLOW_FIELD_NAMES
+        )
+        rows = self.cash_flow_repo.stream_modified_since(
+            since, since_id, formatter.columns,
+            self.MAX_EXPORT_RECORDS + 1, self.BATCH_SIZE
+        )
+        
+        return self._export_delta(
+            rows, formatter, format, "现金流增量", "cash_flow_delta", since, since_id
+        )
     
-    def _export_transactions_to_csv(
+    def export_tombstones(
         self,
-        criteria: TransactionQueryCriteria,
-        fields: List[str]
-    ) -> bytes:
+        since: datetime,
+        format: ExportFormat,
+        since_id: Optional[int] = None,
+        entity_types: Optional[List[DeletedEntityType]] = None
+    ) -> DeltaExportResult:
         """
-        导出交易到CSV
+        导出水位线之后的删除记录（墓碑）
         
         Args:
-            criteria: 查询条件
-            fields: 导出字段列表
+            since: 上次导出返回的水位线（deleted_date）
+            format: 导出格式
+            since_id: 上次导出返回的水位线ID（墓碑ID）
+            entity_types: 实体类型，None表示全部
             
         Returns:
-            bytes: CSV文件内容
+            DeltaExportResult: 增量导出结果
         """
-        output = StringIO()
-        
-        # 字段名映射（中文表头）
-        field_names = {
-            'external_id': '外部流水号',
-            'transaction_id': '交易流水号',
-            'entry_date': '录入日',
-            'trade_date': '交易日',
-            'value_date': '起息日',
-            'maturity_date': '到期日',
-            'account': '账户',
-            'product': '产品',
-            'direction': '买卖方向',
-            'underlying': '标的物',
-            'counterparty': '交易对手',
-            'status': '交易状态',
-            'back_office_status': '后线处理状态',
-            'settlement_method': '清算方式',
-            'confirmation_number': '证实编号',
-            'confirmation_type': '证实方式',
-            'confirmation_match_type': '证实匹配方式',
-            'nature': '交易性质',
-            'source': '交易来源',
-            'latest_event_type': '事件类型',
-            'operating_institution': '运营机构',
-            'trader': '交易员'
-        }
+        formatter = compile_row_formatter(
+            DeletedRecord, self.TOMBSTONE_FIELDS, self.TOMBSTONE_FIELD_NAMES
+        )
+        rows = self.deleted_record_repo.stream_deleted_since(
+            since, since_id, formatter.columns,
+            self.MAX_EXPORT_RECORDS + 1, entity_types, self.BATCH_SIZE
+        )
         
-        # 写入表头
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[field_names.get(f, f) for f in fields],
-            extrasaction='ignore'
+        return self._export_delta(
+            rows, formatter, format, "删除记录", "tombstone", since, since_id
         )
-        writer.writeheader()
-        
-        # 流式写入数据
-        for transaction in self._stream_transactions(criteria):
-            row = {}
-            for field in fields:
-                value = getattr(transaction, field, '')
-                
-                # 格式化特殊类型
-                if isinstance(value, datetime):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif hasattr(value, 'value'):  # Enum类型
-                    value = value.value
-                elif value is None:
-                    value = ''
-                
-                row[field_names.get(field, field)] = value
-            
-            writer.writerow(row)
+    
+    def _export_delta(
+        self,
+        rows: Iterable[Any],
+        formatter: RowFormatter,
+        format: ExportFormat,
+        title: str,
+        entity: str,
+        since: datetime,
+        since_id: Optional[Any]
+    ) -> DeltaExportResult:
+        """
+        写出增量数据并推进水位线
         
-        # 转换为bytes（UTF-8 BOM for Excel compatibility）
-        content = output.getvalue()
-        return '\ufeff'.encode('utf-8') + content.encode('utf-8')
+        rows 的最后两列为水位线 (时间戳, ID)；最多写出 MAX_EXPORT_RECORDS 行，
+        多取的一行仅用于判断是否还有剩余数据
+        """
+        cursor = {'watermark': since, 'watermark_id': since_id, 'count': 0, 'has_more': False}
+        
+        def formatted_rows():
+            format_row = formatter.format_row
+            for row in rows:
+                if cursor['count'] == self.MAX_EXPORT_RECORDS:
+                    cursor['has_more'] = True
+                    break
+                cursor['count'] += 1
+                cursor['watermark'] = row[-2]
+                cursor['watermark_id'] = row[-1]
+                yield format_row(row)
+        
+        if format == ExportFormat.EXCEL:
+            content = self._write_excel(title, formatter.headers, formatted_rows())
+        else:  # CSV
+            content = self._write_csv(formatter.headers, formatted_rows())
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        return self._record_metrics(entity, DeltaExportResult(
+            content=content,
+            filename=f"{title}_{timestamp}.{format.value}",
+            record_count=cursor['count'],
+            export_time=datetime.now(),
+            format=format,
+            next_watermark=cursor['watermark'],
+            next_watermark_id=cursor['watermark_id'],
+            has_more=cursor['has_more']
+        ))
+    
+    @staticmethod
+    def _record_metrics(entity: str, result: ExportResult) -> ExportResult:
+        """记录导出行数和字节数指标"""
+        EXPORT_ROWS.labels(entity, result.format.value).inc(result.record_count)
+        EXPORT_BYTES.labels(entity, result.format.value).inc(len(result.content))
+        return result
+    
+    def _count_transactions(self, criteria: TransactionQueryCriteria) -> int:
+        """统计交易记录数"""
+        return self.transaction_repo.count_by_criteria(criteria)
     
-    def _export_transactions_to_excel(
+    def _count_cash_flows(self, criteria: CashFlowQueryCriteria) -> int:
+        """统计现金流记录数"""
+        return self.cash_flow_repo.count_by_criteria(criteria)
+    
+    def _stream_transaction_rows(
         self,
         criteria: TransactionQueryCriteria,
-        fields: List[str]
-    ) -> bytes:
+        formatter: RowFormatter
+    ) -> Generator[List[Any], None, None]:
         """
-        导出交易到Excel
+        流式读取并格式化交易记录
         
         Args:
             criteria: 查询条件
-            fields: 导出字段列表
+            formatter: 编译后的行格式化器
             
-        Returns:
-            bytes: Excel文件内容
+        Yields:
+            List[Any]: 格式化后的行
         """
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment
-        except ImportError:
-            raise ImportError("需要安装openpyxl库: pip install openpyxl")
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "交易汇总"
-        
-        # 字段名映射（中文表头）
-        field_names = {
-            'external_id': '外部流水号',
-            'transaction_id': '交易流水号',
-            'entry_date': '录入日',
-            'trade_date': '交易日',
-            'value_date': '起息日',
-            'maturity_date': '到期日',
-            'account': '账户',
-            'product': '产品',
-            'direction': '买卖方向',
-            'underlying': '标的物',
-            'counterparty': '交易对手',
-            'status': '交易状态',
-            'back_office_status': '后线处理状态',
-            'settlement_method': '清算方式',
-            'confirmation_number': '证实编号',
-            'confirmation_type': '证实方式',
-            'confirmation_match_type': '证实匹配方式',
-            'nature': '交易性质',
-            'source': '交易来源',
-            'latest_event_type': '事件类型',
-            'operating_institution': '运营机构',
-            'trader': '交易员'
-        }
-        
-        # 写入表头
-        headers = [field_names.get(f, f) for f in fields]
-        ws.append(headers)
-        
-        # 设置表头样式
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
+        format_row = formatter.format_row
+        for row in self.transaction_repo.stream_by_criteria(
+            criteria, formatter.columns, self.BATCH_SIZE
+        ):
+            yield format_row(row)
+    
+    def _stream_cash_flow_rows(
+        self,
+        criteria: CashFlowQueryCriteria,
+        formatter: RowFormatter,
+        join_transaction: bool = False
+    ) -> Generator[List[Any], None, None]:
+        """
+        流式读取并格式化现金流记录
         
-        # 流式写入数据
-        for transaction in self._stream_transactions(criteria):
-            row = []
-            for field in fields:
-                value = getattr(transaction, field, '')
-                
-                # 格式化特殊类型
-                if isinstance(value, datetime):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif hasattr(value, 'value'):  # Enum类型
-                    value = value.value
-                elif value is None:
-                    value = ''
-                
-                row.append(value)
+        Args:
+            criteria: 查询条件
+            formatter: 编译后的行格式化器
+            join_transaction: 是否关联交易表
             
-            ws.append(row)
-        
-        # 自动调整列宽
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # 保存到BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        return output.read()
+        Yields:
+            List[Any]: 格式化后的行
+        """
+        format_row = formatter.format_row
+        for row in self.cash_flow_repo.stream_by_criteria(
+            criteria, formatter.columns, self.BATCH_SIZE, join_transaction
+        ):
+            yield format_row(row)
     
-    def _export_cash_flows_to_csv(
+    def _write_csv(
         self,
-        criteria: CashFlowQueryCriteria,
-        fields: List[str]
+        headers: List[str],
+        rows: Iterable[List[Any]]
     ) -> bytes:
         """
-        导出现金流到CSV
+        写入CSV
         
         Args:
-            criteria: 查询条件
-            fields: 导出字段列表
+            headers: 表头
+            rows: 已格式化的数据行
             
         Returns:
             bytes: CSV文件内容
         """
         output = StringIO()
         
-        # 字段名映射（中文表头）
-        field_names = {
-            'cash_flow_id': '现金流内部ID',
-            'transaction_id': '交易流水号',
-            'direction': '方向',
-            'currency': '币种',
-            'amount': '金额',
-            'payment_date': '收付日期',
-            'account_number': '账号',
-            'account_name': '户名',
-            'bank_name': '开户行',
-            'bank_code': '开户行号',
-            'settlement_method': '结算方式',
-            'current_status': '当前状态',
-            'progress_percentage': '进度百分比'
-        }
-        
-        # 写入表头
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[field_names.get(f, f) for f in fields],
-            extrasaction='ignore'
-        )
-        writer.writeheader()
-        
-        # 流式写入数据
-        for cash_flow in self._stream_cash_flows(criteria):
-            row = {}
-            for field in fields:
-                value = getattr(cash_flow, field, '')
-                
-                # 格式化特殊类型
-                if isinstance(value, datetime):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif hasattr(value, 'value'):  # Enum类型
-                    value = value.value
-                elif value is None:
-                    value = ''
-                
-                row[field_names.get(field, field)] = value
-            
-            writer.writerow(row)
+        writer = csv.writer(output)
+        writer.writerow(headers)
+        writer.writerows(rows)
         
         # 转换为bytes（UTF-8 BOM for Excel compatibility）
         content = output.getvalue()
         return '\ufeff'.encode('utf-8') + content.encode('utf-8')
     
-    def _export_cash_flows_to_excel(
+    def _write_excel(
         self,
-        criteria: CashFlowQueryCriteria,
-        fields: List[str]
+        title: str,
+        headers: List[str],
+        rows: Iterable[List[Any]]
     ) -> bytes:
         """
-        导出现金流到Excel
+        写入Excel
         
         Args:
-            criteria: 查询条件
-            fields: 导出字段列表
+            title: 工作表名称
+            headers: 表头
+            rows: 已格式化的数据行
             
         Returns:
             bytes: Excel文件内容
@@ -489,32 +534,15 @@ class ExportService:
         try:
             from openpyxl import Workbook
             from openpyxl.styles import Font, Alignment
+            from openpyxl.utils import get_column_letter
         except ImportError:
             raise ImportError("需要安装openpyxl库: pip install openpyxl")
         
         wb = Workbook()
         ws = wb.active
-        ws.title = "现金流"
-        
-        # 字段名映射（中文表头）
-        field_names = {
-            'cash_flow_id': '现金流内部ID',
-            'transaction_id': '交易流水号',
-            'direction': '方向',
-            'currency': '币种',
-            'amount': '金额',
-            'payment_date': '收付日期',
-            'account_number': '账号',
-            'account_name': '户名',
-            'bank_name': '开户行',
-            'bank_code': '开户行号',
-            'settlement_method': '结算方式',
-            'current_status': '当前状态',
-            'progress_percentage': '进度百分比'
-        }
+        ws.title = title
         
         # 写入表头
-        headers = [field_names.get(f, f) for f in fields]
         ws.append(headers)
         
         # 设置表头样式
@@ -522,36 +550,19 @@ class ExportService:
             cell.font = Font(bold=True)
             cell.alignment = Alignment(horizontal='center')
         
-        # 流式写入数据
-        for cash_flow in self._stream_cash_flows(criteria):
-            row = []
-            for field in fields:
-                value = getattr(cash_flow, field, '')
-                
-                # 格式化特殊类型
-                if isinstance(value, datetime):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif hasattr(value, 'value'):  # Enum类型
-                    value = value.value
-                elif value is None:
-                    value = ''
-                
-                row.append(value)
-            
+        # 流式写入数据，同时记录每列最大宽度
+        column_widths = [len(str(header)) for header in headers]
+        for row in rows:
             ws.append(row)
+            for index, value in enumerate(row):
+                length = len(str(value))
+                if length > column_widths[index]:
+                    column_widths[index] = length
         
         # 自动调整列宽
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        for index, max_length in enumerate(column_widths, start=1):
+            column_letter = get_column_letter(index)
+            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
         
         # 保存到BytesIO
         output = BytesIO()
@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 from app.repositories.transaction_repository import TransactionRepository
 from app.repositories.cash_flow_repository import CashFlowRepository
 from app.models.enums import (
-    MatchStatus, CashFlowStatus, SettlementMethod, ConfirmationType
+    MatchStatus, CashFlowStatus, SettlementMethod, ConfirmationType, ProductType
 )
 
 
@@ -0,0 +1,146 @@
+"""Compiled row formatters for export hot loops"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, DateTime, Enum as SQLEnum, null
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.enum_codes import CodedEnum
+
+
+Converter = Callable[[Any], Any]
+
+
+def _format_datetime(value: datetime) -> str:
+    """格式化日期时间（与 strftime('%Y-%m-%d %H:%M:%S') 输出一致）"""
+    return value.isoformat(' ', 'seconds')
+
+
+def _format_date(value: date) -> str:
+    """格式化日期（营业日期列，YYYY-MM-DD）"""
+    return value.isoformat()
+
+
+def _format_enum(value: Any) -> Any:
+    """枚举类型取值"""
+    return value.value
+
+
+def _empty_if_none(value: Any) -> Any:
+    """None 转为空字符串，其他值原样输出"""
+    return '' if value is None else value
+
+
+def _nullable(converter: Converter) -> Converter:
+    """为转换器增加 None 处理"""
+    def convert(value: Any) -> Any:
+        return '' if value is None else converter(value)
+    return convert
+
+
+def _resolve_converter(column) -> Converter:
+    """根据列类型解析专用转换器（每个字段只解析一次）"""
+    if isinstance(column.type, (CodedEnum, SQLEnum)):
+        converter = _format_enum
+    elif isinstance(column.type, DateTime):
+        converter = _format_datetime
+    elif isinstance(column.type, Date):
+        converter = _format_date
+    else:
+        return _empty_if_none
+
+    return _nullable(converter) if column.nullable else converter
+
+
+class RowFormatter:
+    """
+    编译后的行格式化器
+
+    在编译阶段把每个导出字段解析为 (查询列, 转换器)，
+    导出时直接对 Core 查询返回的行元组逐列套用转换器，
+    避免逐行逐字段的 getattr / isinstance / hasattr 判断。
+    """
+
+    __slots__ = ('fields', 'headers', 'columns', 'converters')
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        headers: List[str],
+        columns: List[ColumnElement],
+        converters: Tuple[Converter, ...]
+    ):
+        self.fields = tuple(fields)
+        self.headers = headers
+        self.columns = columns
+        self.converters = converters
+
+    def format_row(self, row: Sequence[Any]) -> List[Any]:
+        """
+        格式化单行
+
+        Args:
+            row: Core 查询返回的行元组（列顺序与 columns 一致）
+
+        Returns:
+            List[Any]: 格式化后的单元格值
+        """
+        return [convert(value) for convert, value in zip(self.converters, row)]
+
+
+def compile_row_formatter(
+    model: Any,
+    fields: Sequence[str],
+    field_names: Dict[str, str],
+    extra_columns: Optional[Dict[str, Any]] = None
+) -> RowFormatter:
+    """
+    编译行格式化器
+
+    Args:
+        model: SQLAlchemy 模型类
+        fields: 导出字段列表
+        field_names: 字段名到中文表头的映射
+        extra_columns: 模型之外的字段（如关联表列），字段名到列的映射
+
+    Returns:
+        RowFormatter: 编译后的行格式化器
+    """
+    return _compile(
+        model,
+        tuple(fields),
+        tuple(field_names.items()),
+        tuple((extra_columns or {}).items())
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile(
+    model: Any,
+    fields: Tuple[str, ...],
+    field_names: Tuple[Tuple[str, str], ...],
+    extra_columns: Tuple[Tuple[str, Any], ...]
+) -> RowFormatter:
+    """按 (模型, 字段列表, 表头映射, 关联列) 缓存编译结果"""
+    table_columns = model.__table__.columns
+    names = dict(field_names)
+    extras = dict(extra_columns)
+
+    columns = []
+    converters = []
+    for index, field in enumerate(fields):
+        column = table_columns.get(field)
+        if column is None:
+            column = extras.get(field)
+        if column is None:
+            # 未知字段：与原逻辑 getattr(obj, field, '') 保持一致，输出空字符串
+            columns.append(null().label(f'_unknown_{index}'))
+            converters.append(_empty_if_none)
+        else:
+            columns.append(column)
+            converters.append(_resolve_converter(column))
+
+    headers = [names.get(f, f) for f in fields]
+
+    return RowFormatter(fields, headers, columns, tuple(converters))
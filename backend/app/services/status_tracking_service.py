@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
+from app import tracing
 from app.repositories.transaction_repository import TransactionRepository
 from app.repositories.cash_flow_repository import CashFlowRepository
 from app.repositories.event_repository import EventRepository
@@ -362,10 +363,11 @@ class StatusTrackingService:
         sending_route = self._determine_sending_route(cash_flow)
         
         # 生成各阶段数据
-        netting_stage = self._generate_netting_stage(cash_flow)
-        compliance_stage = self._generate_compliance_stage(cash_flow, sending_route)
-        settlement_stage = self._generate_settlement_stage(cash_flow, sending_route)
-        cancellation_stage = self._generate_cancellation_stage(cash_flow, sending_route)
+        with tracing.span('StatusTrackingService.generate_stages'):
+            netting_stage = self._generate_netting_stage(cash_flow)
+            compliance_stage = self._generate_compliance_stage(cash_flow, sending_route)
+            settlement_stage = self._generate_settlement_stage(cash_flow, sending_route)
+            cancellation_stage = self._generate_cancellation_stage(cash_flow, sending_route)
         
         # 计算当前阶段和进度
         current_stage, current_status, progress_percentage = self._calculate_current_progress(
@@ -373,9 +375,10 @@ class StatusTrackingService:
         )
         
         # 生成流程可视化
-        flow_nodes = self._generate_flow_visualization(
-            cash_flow, netting_stage, compliance_stage, settlement_stage, cancellation_stage
-        )
+        with tracing.span('StatusTrackingService.generate_flow_visualization'):
+            flow_nodes = self._generate_flow_visualization(
+                cash_flow, netting_stage, compliance_stage, settlement_stage, cancellation_stage
+            )
         
         # 生成操作指引
         operation_guide = self._generate_operation_guide(cash_flow, current_stage, current_status)
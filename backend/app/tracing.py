@@ -0,0 +1,378 @@
+"""Lightweight local tracing with JSONL span export"""
+import atexit
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+SPAN_KIND_INTERNAL = "SPAN_KIND_INTERNAL"
+SPAN_KIND_SERVER = "SPAN_KIND_SERVER"
+
+STATUS_CODE_UNSET = "STATUS_CODE_UNSET"
+STATUS_CODE_ERROR = "STATUS_CODE_ERROR"
+
+# 启用追踪时自动为这些包导出的 Repository / Service 类的公开方法创建span
+AUTO_INSTRUMENT_PACKAGES = ("app.repositories", "app.services")
+
+
+class Span:
+    """追踪span"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "kind",
+        "start_time_ns", "end_time_ns", "attributes", "status_code", "status_message"
+    )
+
+    sampled = True
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        kind: str,
+        attributes: Optional[Dict[str, Any]]
+    ):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = 0
+        self.attributes = dict(attributes) if attributes else {}
+        self.status_code = STATUS_CODE_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """设置span属性"""
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        """标记span为错误状态"""
+        self.status_code = STATUS_CODE_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def to_otlp(self, service_name: str) -> Dict[str, Any]:
+        """
+        转换为类OTLP结构
+
+        Args:
+            service_name: 服务名称
+
+        Returns:
+            Dict[str, Any]: 可直接序列化为JSON的span
+        """
+        return {
+            "resource": {"service.name": service_name},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_time_ns,
+            "endTimeUnixNano": self.end_time_ns,
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+
+
+class _NonRecordingSpan:
+    """未采样或未启用追踪时使用的空span（所有操作均为空操作）"""
+
+    __slots__ = ()
+
+    sampled = False
+    trace_id = ""
+    span_id = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, error: BaseException) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """按OTLP AnyValue格式包装属性值"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_current_span: ContextVar[Optional[Any]] = ContextVar("current_span", default=None)
+
+
+class _NoopSpanContext:
+    """追踪关闭时 span() 返回的上下文管理器"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return NON_RECORDING_SPAN
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN_CONTEXT = _NoopSpanContext()
+
+
+class _SpanContext:
+    """开启span的上下文管理器"""
+
+    __slots__ = ("_tracer", "_name", "_kind", "_attributes", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, attributes: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._kind = kind
+        self._attributes = attributes
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            # 头部采样：只在根span决定，子span继承
+            if random.random() < self._tracer.sample_rate:
+                span = Span(self._name, f"{random.getrandbits(128):032x}", None, self._kind, self._attributes)
+            else:
+                span = NON_RECORDING_SPAN
+        elif parent.sampled:
+            span = Span(self._name, parent.trace_id, parent.span_id, self._kind, self._attributes)
+        else:
+            span = NON_RECORDING_SPAN
+
+        self._span = span
+        self._token = _current_span.set(span)
+        return span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        span = self._span
+        if span.sampled:
+            if exc is not None:
+                span.set_error(exc)
+            span.end_time_ns = time.time_ns()
+            self._tracer.exporter.export(span)
+        return False
+
+
+class JsonlSpanExporter:
+    """
+    JSONL文件span导出器
+
+    span 经队列交给后台线程序列化并写入按大小轮转的本地文件，请求线程只负责入队
+    """
+
+    def __init__(self, path: str, service_name: str, max_bytes: int, backup_count: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.service_name = service_name
+        self._handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(_SpanFormatter(service_name))
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, self._handler)
+        self._listener.start()
+
+    def export(self, span: Span) -> None:
+        """提交span等待写出"""
+        self._queue.put(logging.makeLogRecord({"span": span}))
+
+    def shutdown(self) -> None:
+        """写出剩余span并关闭文件"""
+        self._listener.stop()
+        self._handler.close()
+
+
+class _SpanFormatter(logging.Formatter):
+    """把span记录格式化为一行JSON"""
+
+    def __init__(self, service_name: str):
+        super().__init__()
+        self.service_name = service_name
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.span.to_otlp(self.service_name), ensure_ascii=False, default=str)
+
+
+class Tracer:
+    """追踪器"""
+
+    def __init__(self, exporter: JsonlSpanExporter, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def span(self, name: str, kind: str, attributes: Optional[Dict[str, Any]]) -> _SpanContext:
+        return _SpanContext(self, name, kind, attributes)
+
+
+# 当前追踪器（None 表示追踪关闭）
+_tracer: Optional[Tracer] = None
+
+
+def is_enabled() -> bool:
+    """追踪是否已启用"""
+    return _tracer is not None
+
+
+def span(name: str, kind: str = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+    """
+    开启一个span（上下文管理器）
+
+    追踪关闭时返回共享的空上下文，开销仅为一次全局变量判断
+
+    Args:
+        name: span名称
+        kind: span类型
+        attributes: 初始属性
+
+    Returns:
+        上下文管理器，进入后得到 Span（未采样时为空span）
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN_CONTEXT
+    return tracer.span(name, kind, attributes)
+
+
+def current_span():
+    """获取当前span（不在追踪中时返回空span）"""
+    return _current_span.get() or NON_RECORDING_SPAN
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    为函数创建span的装饰器（支持同步和异步函数）
+
+    Args:
+        name: span名称，默认为函数的限定名
+
+    Returns:
+        Callable: 装饰器
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _tracer.span(span_name, SPAN_KIND_INTERNAL, None):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name, SPAN_KIND_INTERNAL, None):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls: type) -> type:
+    """
+    为类的公开方法添加span（生成器方法除外，其耗时发生在迭代阶段）
+
+    Args:
+        cls: 要注入追踪的类
+
+    Returns:
+        type: 原类（原地修改）
+    """
+    if cls.__dict__.get("_traced"):
+        return cls
+
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        if inspect.isgeneratorfunction(attr):
+            continue
+        setattr(cls, attr_name, traced(f"{cls.__name__}.{attr_name}")(attr))
+
+    cls._traced = True
+    return cls
+
+
+def _auto_instrument(packages: Iterable[str]) -> None:
+    """为包中导出的 Repository / Service 类注入追踪"""
+    for package_name in packages:
+        package = importlib.import_module(package_name)
+        for exported in getattr(package, "__all__", []):
+            candidate = getattr(package, exported, None)
+            if inspect.isclass(candidate) and exported.endswith(("Repository", "Service")):
+                instrument_class(candidate)
+
+
+def setup_tracing(
+    enabled: bool,
+    file_path: str = "traces/spans.jsonl",
+    sample_rate: float = 1.0,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    service_name: str = "settlement-operation-guide",
+    auto_instrument: Iterable[str] = AUTO_INSTRUMENT_PACKAGES
+) -> None:
+    """
+    配置本地追踪
+
+    关闭时不做任何方法注入，仅保留 span() / traced 的一次全局判断
+
+    Args:
+        enabled: 是否启用
+        file_path: span 输出文件（JSONL，按大小轮转）
+        sample_rate: 头部采样率（0~1），在根span处决定整条链路是否记录
+        max_bytes: 单个文件最大字节数
+        backup_count: 保留的轮转文件数
+        service_name: 写入 resource 的服务名称
+        auto_instrument: 自动注入追踪的包
+    """
+    global _tracer
+
+    shutdown_tracing()
+    if not enabled:
+        return
+
+    exporter = JsonlSpanExporter(file_path, service_name, max_bytes, backup_count)
+    _tracer = Tracer(exporter, sample_rate)
+    _auto_instrument(auto_instrument)
+    atexit.register(shutdown_tracing)
+    logger.info(f"Tracing enabled: {file_path} (sample rate {sample_rate})")
+
+
+def shutdown_tracing() -> None:
+    """关闭追踪并写出剩余span"""
+    global _tracer
+
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.exporter.shutdown()
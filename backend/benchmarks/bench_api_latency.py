@@ -0,0 +1,98 @@
+"""API latency benchmark
+
+用法（在 backend 目录下运行）:
+    python -m benchmarks.bench_api_latency --rows 2000 --requests 300
+
+使用 SQLite 内存库生成测试数据，通过 TestClient 走完整中间件链，
+测量高频查询接口的单请求延迟（mean / p50 / p95）。
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# 基准测试会连续请求同一接口，需在导入应用前关闭限流
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+from app.api.dependencies import get_db
+from app.database import Base
+from app.main import app
+from benchmarks.bench_export import seed
+
+
+AUTH_HEADERS = {'Authorization': 'Bearer test-token-123'}
+
+ENDPOINTS = [
+    ('health', '/health'),
+    ('transactions?page_size=20', '/api/transactions?page_size=20'),
+    ('transactions?page_size=100', '/api/transactions?page_size=100'),
+    ('cash-flows?page_size=100', '/api/cash-flows?page_size=100'),
+    ('cash-flows/{id}/progress', '/api/cash-flows/CF-00000001/progress'),
+]
+
+
+def measure(client: TestClient, label: str, path: str, requests: int) -> None:
+    """请求 requests 次并打印延迟分布"""
+    # 预热
+    for _ in range(10):
+        client.get(path, headers=AUTH_HEADERS)
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=AUTH_HEADERS)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<28} mean={statistics.mean(samples):7.2f} ms  "
+        f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000, help='测试数据行数')
+    parser.add_argument('--requests', type=int, default=300, help='每个接口请求次数')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+    seed(session, args.rows)
+    session.close()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            for label, path in ENDPOINTS:
+                measure(client, label, path, args.requests)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Authentication overhead benchmark
+
+用法（在 backend 目录下运行）:
+    python -m benchmarks.bench_auth --tokens 2000
+
+生成临时RSA密钥和JWKS文件，测量每次请求的认证开销：
+静态令牌查表、JWT冷启动（缓存未命中，需验签）和JWT热路径（命中已验证令牌缓存）。
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+from app.middleware.auth import AuthService
+from app.middleware.jwt_auth import JWTAuthenticator
+
+
+def report(label: str, samples) -> None:
+    """打印单次认证耗时分布（微秒）"""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<24} mean={statistics.mean(samples):8.2f} us  "
+        f"p50={statistics.median(samples):8.2f} us  p95={p95:8.2f} us"
+    )
+
+
+def timed(func, tokens):
+    """逐个令牌计时，返回微秒列表"""
+    samples = []
+    for token in tokens:
+        start = time.perf_counter()
+        user = func(token)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+        assert user is not None
+    return samples
+
+
+def bench_algorithm(label: str, algorithm: str, private_key, jwk_alg, tokens: int, directory: str):
+    """测量单个签名算法的冷/热认证开销"""
+    jwk = json.loads(jwk_alg.to_jwk(private_key.public_key()))
+    jwk.update({"kid": label, "use": "sig", "alg": algorithm})
+    path = os.path.join(directory, f"{label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"keys": [jwk]}, f)
+
+    exp = int(time.time()) + 3600
+    token_list = [
+        jwt.encode(
+            {"sub": f"user-{i}", "scope": "query:transactions query:cash_flows", "exp": exp},
+            private_key, algorithm=algorithm, headers={"kid": label}
+        )
+        for i in range(tokens)
+    ]
+
+    authenticator = JWTAuthenticator(path, algorithms=[algorithm], cache_size=tokens)
+    report(f"jwt {algorithm} cold", timed(authenticator.authenticate, token_list))
+    report(f"jwt {algorithm} warm", timed(authenticator.authenticate, token_list))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000, help="不同令牌数量")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    report("static token", timed(AuthService.authenticate, ["test-token-123"] * args.tokens))
+    with tempfile.TemporaryDirectory() as directory:
+        bench_algorithm(
+            "rsa", "RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048),
+            jwt.algorithms.RSAAlgorithm, args.tokens, directory
+        )
+        bench_algorithm(
+            "ec", "ES256", ec.generate_private_key(ec.SECP256R1()),
+            jwt.algorithms.ECAlgorithm, args.tokens, directory
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Enum storage footprint benchmark
+
+用法（在 backend 目录下运行）:
+    python -m benchmarks.bench_enum_storage --transactions 50000
+
+在临时 SQLite 文件中生成数据集（枚举列为 SMALLINT 编码），再复制一份把枚举列改回
+枚举名文本（迁移 006 之前的存储形式），两库均 VACUUM 后用 dbstat 对比各表和索引的
+页面占用。PostgreSQL 上原先的原生枚举类型每值占 4 字节，编码后为 2 字节，
+节省幅度小于这里的文本对比，可用 pg_relation_size 在迁移前后自行对比。
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Dict, List, Tuple
+
+from sqlalchemy import create_engine
+
+from app.database import Base
+from app.models.cash_flow import TERMINAL_CASH_FLOW_STATUSES
+from app.models.enum_codes import CodedEnum, ENUM_CODES
+from benchmarks.datagen import generate_dataset
+
+
+# 迁移 006 之前的在途部分索引条件（枚举名）
+LEGACY_ACTIVE_WHERE = "current_status NOT IN ({})".format(
+    ", ".join(f"'{status.name}'" for status in TERMINAL_CASH_FLOW_STATUSES)
+)
+
+
+def _enum_columns() -> Dict[str, List[Tuple[str, type]]]:
+    """各表的枚举列 [(列名, 枚举类)]"""
+    columns = {}
+    for table in Base.metadata.sorted_tables:
+        coded = [(c.name, c.type.enum_class) for c in table.columns if isinstance(c.type, CodedEnum)]
+        if coded:
+            columns[table.name] = coded
+    return columns
+
+
+def _index_columns() -> Dict[str, Tuple[str, List[str]]]:
+    """索引名 → (表名, 列名列表)"""
+    return {
+        index.name: (table.name, [c.name for c in index.columns])
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+
+
+def _to_legacy_names(path: str) -> None:
+    """把枚举列的编码改写为枚举名文本，并按枚举名条件重建部分索引"""
+    conn = sqlite3.connect(path)
+    try:
+        for table, columns in _enum_columns().items():
+            assignments = ', '.join(
+                f"{column} = CASE {column} "
+                + ' '.join(f"WHEN {code} THEN '{member.name}'" for member, code in ENUM_CODES[enum_class].items())
+                + ' END'
+                for column, enum_class in columns
+            )
+            conn.execute(f'UPDATE {table} SET {assignments}')
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.dialect_options['sqlite'].get('where') is None:
+                    continue
+                columns = ', '.join(c.name for c in index.columns)
+                conn.execute(f'DROP INDEX {index.name}')
+                conn.execute(f'CREATE INDEX {index.name} ON {table.name} ({columns}) WHERE {LEGACY_ACTIVE_WHERE}')
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _page_usage(path: str) -> Dict[str, int]:
+    """VACUUM 后各表/索引占用的字节数"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('VACUUM')
+        return dict(conn.execute('SELECT name, SUM(pgsize) FROM dbstat GROUP BY name'))
+    finally:
+        conn.close()
+
+
+def _mb(size: int) -> str:
+    return f'{size / 1024 / 1024:>9.2f}'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=50000, help='生成的交易数')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    coded_path = os.path.join(directory, 'coded.db')
+    legacy_path = os.path.join(directory, 'legacy.db')
+    try:
+        engine = create_engine(f'sqlite:///{coded_path}')
+        generate_dataset(engine, args.transactions, drop_existing=True)
+        engine.dispose()
+
+        shutil.copyfile(coded_path, legacy_path)
+        _to_legacy_names(legacy_path)
+        coded, legacy = _page_usage(coded_path), _page_usage(legacy_path)
+
+        enum_columns = {table: {name for name, _ in columns} for table, columns in _enum_columns().items()}
+        indexes = _index_columns()
+        enum_indexes = sorted(
+            name for name, (table, columns) in indexes.items()
+            if name in coded and enum_columns.get(table, set()) & set(columns)
+        )
+
+        print(f"{'index (contains enum column)':<44} {'names MB':>9} {'codes MB':>9} {'saved':>7}")
+        for name in enum_indexes:
+            before, after = legacy[name], coded[name]
+            print(f'{name:<44} {_mb(before)} {_mb(after)} {1 - after / before:>7.1%}')
+
+        def total(usage: Dict[str, int], names) -> int:
+            return sum(usage.get(name, 0) for name in names)
+
+        autoindexes = [name for name in coded if name.startswith('sqlite_autoindex')]
+        groups = {
+            'enum indexes': enum_indexes,
+            'all indexes': [name for name in coded if name in indexes] + autoindexes,
+            'tables': [name for name in coded if name in Base.metadata.tables],
+            'database': list(coded),
+        }
+        print()
+        for label, names in groups.items():
+            before, after = total(legacy, names), total(coded, names)
+            print(f'{label:<44} {_mb(before)} {_mb(after)} {1 - after / before:>7.1%}')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Export throughput benchmark
+
+用法（在 backend 目录下运行）:
+    python -m benchmarks.bench_export --rows 10000 --repeat 3
+
+使用 SQLite 内存库生成测试数据，分别测量交易和现金流在各导出格式下的吞吐量（rows/s）。
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.transaction import Transaction
+from app.models.cash_flow import CashFlow
+from app.models.enums import (
+    ProductType, TransactionStatus, BackOfficeStatus,
+    SettlementMethod, ConfirmationType, TransactionSource,
+    Direction, CashFlowStatus
+)
+from app.schemas.transaction import TransactionQueryCriteria
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from app.services.export_service import ExportService, ExportFormat
+
+
+def seed(session, rows: int) -> None:
+    """写入 rows 条交易及对应现金流"""
+    products = list(ProductType)
+    statuses = list(CashFlowStatus)
+    base_date = datetime(2026, 1, 1, 9, 30, 0)
+
+    transactions = []
+    cash_flows = []
+    for i in range(rows):
+        trade_date = base_date + timedelta(minutes=i)
+        transactions.append({
+            'external_id': f'EXT-{i:08d}',
+            'transaction_id': f'TXN-{i:08d}',
+            'entry_date': trade_date,
+            'trade_date': trade_date,
+            'value_date': trade_date + timedelta(days=2),
+            'maturity_date': trade_date + timedelta(days=30),
+            'account': f'ACC-{i % 50:03d}',
+            'product': products[i % len(products)],
+            'direction': Direction.BUY if i % 2 == 0 else Direction.SELL,
+            'underlying': 'USD/CNY',
+            'counterparty': f'Bank {i % 200}',
+            'status': TransactionStatus.EFFECTIVE,
+            'back_office_status': BackOfficeStatus.CONFIRMED,
+            'settlement_method': SettlementMethod.GROSS,
+            'confirmation_number': None if i % 3 else f'CONF-{i}',
+            'confirmation_type': ConfirmationType.SWIFT,
+            'nature': 'Normal',
+            'source': TransactionSource.GIT,
+            'operating_institution': 'BOCHK',
+            'trader': f'Trader {i % 20}',
+            'version': 1,
+            'last_modified_date': trade_date,
+            'last_modified_by': 'bench',
+        })
+        cash_flows.append({
+            'cash_flow_id': f'CF-{i:08d}',
+            'transaction_id': f'TXN-{i:08d}',
+            'direction': Direction.RECEIVE if i % 2 == 0 else Direction.PAY,
+            'currency': 'USD' if i % 2 == 0 else 'CNY',
+            'amount': 10000.0 + i,
+            'payment_date': trade_date + timedelta(days=2),
+            'account_number': f'{i:010d}',
+            'account_name': f'Account {i}',
+            'bank_name': 'Bank of China',
+            'bank_code': 'BKCH',
+            'settlement_method': SettlementMethod.GROSS,
+            'current_status': statuses[i % len(statuses)],
+            'progress_percentage': i % 100,
+            'version': 1,
+            'last_modified_date': trade_date,
+        })
+
+    session.execute(insert(Transaction), transactions)
+    session.execute(insert(CashFlow), cash_flows)
+    session.commit()
+
+
+def measure(label: str, rows: int, repeat: int, export) -> None:
+    """执行导出并打印最佳吞吐量"""
+    best = None
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = export()
+        elapsed = time.perf_counter() - start
+        size = len(result.content)
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(
+        f"{label:<24} rows={rows:<8} best={best * 1000:9.1f} ms  "
+        f"{rows / best:12,.0f} rows/s  size={size / 1024:,.0f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='测试数据行数')
+    parser.add_argument('--repeat', type=int, default=3, help='每种格式重复次数')
+    args = parser.parse_args()
+
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, args.rows)
+
+    service = ExportService(session)
+    service.MAX_EXPORT_RECORDS = args.rows
+
+    for export_format in ExportFormat:
+        measure(
+            f'transactions/{export_format.value}', args.rows, args.repeat,
+            lambda: service.export_transactions(TransactionQueryCriteria(), export_format)
+        )
+        measure(
+            f'cash_flows/{export_format.value}', args.rows, args.repeat,
+            lambda: service.export_cash_flows(CashFlowQueryCriteria(), export_format)
+        )
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
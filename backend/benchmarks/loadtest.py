@@ -0,0 +1,464 @@
+"""In-process HTTP load test
+
+用法（在 backend 目录下运行）:
+    python -m benchmarks.loadtest --transactions 5000 --concurrency 10,25,50 --duration 30
+    python -m benchmarks.loadtest --url sqlite:///bench.db --concurrency 50 --ramp 10
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --concurrency 20
+
+默认通过 httpx ASGITransport 在进程内驱动应用（完整中间件链，无需网络），
+数据来自 --url 指定的数据集（benchmarks.datagen 生成），未指定时在内存库中生成；
+指定 --base-url 时改为压测本机启动的 uvicorn。
+
+每个虚拟用户（操作员）循环执行脚本化的操作流程：查询交易 → 打开详情 → 轮询交易进度
+→ 查询现金流 → 轮询现金流进度 → 按比例导出。并发按阶段逐级提升，每个阶段先在 --ramp
+秒内线性加入用户，然后在稳定期 --duration 秒内统计各接口的吞吐量、延迟分位数和错误率。
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# 所有虚拟用户共用同一个令牌，需在导入应用前关闭限流
+# （如需把限流计入压测，运行前设置 RATE_LIMIT_ENABLED=true）
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+from app.api.dependencies import get_db
+from app.main import app
+from benchmarks.datagen import generate_dataset
+
+
+AUTH_HEADERS = {'Authorization': 'Bearer test-token-123'}
+
+# 全部接口汇总行的名称
+TOTAL = 'TOTAL'
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """
+    计算分位数（最近秩法）
+
+    Args:
+        sorted_samples: 已排序的样本
+        fraction: 分位（0.99 表示 p99）
+
+    Returns:
+        float: 分位数，无样本时返回0
+    """
+    if not sorted_samples:
+        return 0.0
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class LoadRecorder:
+    """按接口记录请求延迟和结果"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+        # 爬坡期的请求不计入统计
+        self.recording = False
+
+    def record(self, endpoint: str, elapsed_ms: float, outcome: Optional[str] = None) -> None:
+        """
+        记录一次请求
+
+        Args:
+            endpoint: 接口名称（路由模板）
+            elapsed_ms: 耗时（毫秒）
+            outcome: 错误类型（HTTP状态码或异常名），成功时为None
+        """
+        if not self.recording:
+            return
+        self.latencies[endpoint].append(elapsed_ms)
+        if outcome is not None:
+            self.errors[endpoint][outcome] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """
+        汇总统计
+
+        Args:
+            elapsed: 统计时长（秒）
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 接口名称 → 统计（含 TOTAL 汇总行）
+        """
+        result = {}
+        everything: List[float] = []
+        all_errors: Counter = Counter()
+        for endpoint in sorted(self.latencies):
+            samples = self.latencies[endpoint]
+            everything.extend(samples)
+            all_errors.update(self.errors[endpoint])
+            result[endpoint] = self._stats(samples, self.errors[endpoint], elapsed)
+        result[TOTAL] = self._stats(everything, all_errors, elapsed)
+        return result
+
+    @staticmethod
+    def _stats(samples: List[float], errors: Counter, elapsed: float) -> Dict[str, Any]:
+        samples = sorted(samples)
+        count = len(samples)
+        error_count = sum(errors.values())
+        return {
+            'requests': count,
+            'throughput_rps': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            'error_rate': round(error_count / count, 4) if count else 0.0,
+            'errors': dict(errors),
+            'p50_ms': round(percentile(samples, 0.50), 2),
+            'p90_ms': round(percentile(samples, 0.90), 2),
+            'p95_ms': round(percentile(samples, 0.95), 2),
+            'p99_ms': round(percentile(samples, 0.99), 2),
+            'max_ms': round(samples[-1], 2) if samples else 0.0,
+        }
+
+
+@dataclass
+class JourneyOptions:
+    """操作流程参数"""
+    think_time: float = 0.5  # 步骤之间的思考时间（秒，实际在0.5~1.5倍之间随机）
+    poll_interval: float = 1.0  # 进度轮询间隔（秒）
+    polls: int = 3  # 每次轮询进度的次数
+    export_ratio: float = 0.1  # 执行导出的流程占比
+
+
+class OperatorJourney:
+    """
+    单个操作员的脚本化操作流程
+
+    查询条件从启动时采样的交易中选取，使请求分布接近真实使用
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: LoadRecorder,
+        samples: List[Dict[str, Any]],
+        options: JourneyOptions,
+        rng: random.Random
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.samples = samples
+        self.options = options
+        self.rng = rng
+
+    async def request(self, endpoint: str, path: str, params: Optional[dict] = None) -> Optional[Any]:
+        """
+        发起请求并记录结果
+
+        Args:
+            endpoint: 接口名称（路由模板，用于分组统计）
+            path: 请求路径
+            params: 查询参数
+
+        Returns:
+            Optional[Any]: 成功时返回JSON响应体（导出接口返回空字典），失败时返回None
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(path, params=params)
+        except Exception as e:
+            self.recorder.record(endpoint, (time.perf_counter() - start) * 1000, type(e).__name__)
+            return None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            self.recorder.record(endpoint, elapsed_ms, str(response.status_code))
+            return None
+        self.recorder.record(endpoint, elapsed_ms)
+        if response.headers.get('content-type', '').startswith('application/json'):
+            return response.json()
+        return {}
+
+    async def think(self, seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds * self.rng.uniform(0.5, 1.5))
+
+    def search_params(self) -> Dict[str, Any]:
+        """随机选择一种常用查询条件组合"""
+        sample = self.rng.choice(self.samples)
+        choice = self.rng.randrange(5)
+        if choice == 0:
+            return {}
+        if choice == 1:
+            return {'counterparty': sample['counterparty']}
+        if choice == 2:
+            return {'status': sample['status'], 'settlement_method': sample['settlement_method']}
+        if choice == 3:
+            return {'product': sample['product']}
+        return {'external_id': sample['external_id']}
+
+    async def run_once(self) -> None:
+        """执行一遍完整流程"""
+        options = self.options
+        page = await self.request('GET /api/transactions', '/api/transactions', self.search_params())
+        await self.think(options.think_time)
+
+        rows = (page or {}).get('data') or [self.rng.choice(self.samples)]
+        transaction = self.rng.choice(rows)
+        await self.request(
+            'GET /api/transactions/{external_id}',
+            f"/api/transactions/{transaction['external_id']}"
+        )
+        await self.think(options.think_time)
+
+        transaction_id = transaction['transaction_id']
+        for _ in range(options.polls):
+            await self.request(
+                'GET /api/transactions/{transaction_id}/progress',
+                f'/api/transactions/{transaction_id}/progress'
+            )
+            await self.think(options.poll_interval)
+
+        cash_flows = await self.request(
+            'GET /api/cash-flows', '/api/cash-flows', {'transaction_id': transaction_id}
+        )
+        cash_flow_rows = (cash_flows or {}).get('data') or []
+        if cash_flow_rows:
+            cash_flow_id = self.rng.choice(cash_flow_rows)['cash_flow_id']
+            for _ in range(options.polls):
+                await self.request(
+                    'GET /api/cash-flows/{cash_flow_id}/progress',
+                    f'/api/cash-flows/{cash_flow_id}/progress'
+                )
+                await self.think(options.poll_interval)
+
+        if self.rng.random() < options.export_ratio:
+            await self.request(
+                'GET /api/export/cash-flows',
+                '/api/export/cash-flows',
+                {'format': 'csv', 'counterparty': transaction['counterparty'], 'enriched': 'true'}
+            )
+        await self.think(options.think_time)
+
+
+async def sample_transactions(client: httpx.AsyncClient, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    通过API采样交易，作为操作流程的查询条件来源
+
+    Args:
+        client: HTTP客户端
+        count: 采样数量（最多100）
+
+    Returns:
+        List[Dict[str, Any]]: 交易汇总列表
+    """
+    response = await client.get('/api/transactions', params={'page_size': min(count, 100)})
+    response.raise_for_status()
+    samples = response.json()['data']
+    if not samples:
+        raise SystemExit('数据集为空，请先运行 python -m benchmarks.datagen')
+    return samples
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    samples: List[Dict[str, Any]],
+    concurrency: int,
+    ramp: float,
+    duration: float,
+    options: JourneyOptions,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    以指定并发运行一个压测阶段
+
+    Args:
+        client: HTTP客户端
+        samples: 采样交易
+        concurrency: 虚拟用户数
+        ramp: 爬坡时长（秒），期间线性加入用户，不计入统计
+        duration: 稳定期时长（秒）
+        options: 操作流程参数
+        seed: 随机种子
+
+    Returns:
+        Dict[str, Any]: 阶段参数和各接口统计
+    """
+    recorder = LoadRecorder()
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + ramp + duration
+    completed = Counter()
+
+    async def operator(index: int) -> None:
+        await asyncio.sleep(ramp * index / concurrency)
+        journey = OperatorJourney(client, recorder, samples, options, random.Random(seed * 100003 + index))
+        while loop.time() < stop_at:
+            await journey.run_once()
+            completed['journeys'] += 1
+
+    tasks = [asyncio.create_task(operator(index)) for index in range(concurrency)]
+    await asyncio.sleep(ramp)
+    recorder.recording = True
+    measured_from = time.perf_counter()
+    # 超过稳定期后仍在执行的流程可能还在轮询，停止统计后取消
+    await asyncio.wait(tasks, timeout=duration)
+    recorder.recording = False
+    elapsed = time.perf_counter() - measured_from
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        'concurrency': concurrency,
+        'ramp_s': ramp,
+        'duration_s': round(elapsed, 2),
+        'journeys': completed['journeys'],
+        'endpoints': recorder.summary(elapsed),
+    }
+
+
+def print_stage(stage: Dict[str, Any]) -> None:
+    """打印阶段统计表"""
+    print(f"\n== concurrency={stage['concurrency']}  duration={stage['duration_s']}s  "
+          f"journeys={stage['journeys']}")
+    print(f"{'endpoint':<48} {'reqs':>7} {'rps':>8} {'err%':>6} "
+          f"{'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for endpoint, stats in stage['endpoints'].items():
+        print(
+            f"{endpoint:<48} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} "
+            f"{stats['error_rate'] * 100:>5.1f}% {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    concurrency_levels: List[int],
+    ramp: float,
+    duration: float,
+    options: JourneyOptions,
+    seed: int = 0,
+    progress=None
+) -> List[Dict[str, Any]]:
+    """
+    按并发级别依次运行压测阶段
+
+    Args:
+        client: HTTP客户端（已配置认证头）
+        concurrency_levels: 各阶段虚拟用户数
+        ramp: 每阶段爬坡时长（秒）
+        duration: 每阶段稳定期时长（秒）
+        options: 操作流程参数
+        seed: 随机种子
+        progress: 每阶段结束后的回调(阶段统计)
+
+    Returns:
+        List[Dict[str, Any]]: 各阶段统计
+    """
+    samples = await sample_transactions(client)
+    stages = []
+    for concurrency in concurrency_levels:
+        stage = await run_stage(client, samples, concurrency, ramp, duration, options, seed)
+        stages.append(stage)
+        if progress is not None:
+            progress(stage)
+    return stages
+
+
+def in_process_client(url: Optional[str], transactions: int, seed: int) -> httpx.AsyncClient:
+    """
+    创建进程内客户端，并把应用的数据库会话指向数据集
+
+    Args:
+        url: 数据集所在数据库URL，为空时在内存库中生成
+        transactions: 内存库生成的交易数
+        seed: 数据生成种子
+
+    Returns:
+        httpx.AsyncClient: 通过 ASGITransport 调用应用的客户端
+    """
+    if url:
+        engine = create_engine(url)
+    else:
+        engine = create_engine(
+            'sqlite://',
+            connect_args={'check_same_thread': False},
+            poolclass=StaticPool
+        )
+        generate_dataset(engine, transactions, seed=seed)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url='http://loadtest',
+        headers=AUTH_HEADERS,
+        timeout=60.0
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='数据集所在数据库URL（进程内模式）')
+    parser.add_argument('--transactions', type=int, default=2000, help='未指定 --url 时内存库生成的交易数')
+    parser.add_argument('--base-url', help='压测本机运行的服务（如 http://127.0.0.1:8000）')
+    parser.add_argument('--concurrency', default='10,25,50', help='各阶段虚拟用户数（逗号分隔）')
+    parser.add_argument('--ramp', type=float, default=5.0, help='每阶段爬坡时长（秒）')
+    parser.add_argument('--duration', type=float, default=30.0, help='每阶段稳定期时长（秒）')
+    parser.add_argument('--think-time', type=float, default=0.5, help='步骤间思考时间（秒）')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='进度轮询间隔（秒）')
+    parser.add_argument('--polls', type=int, default=3, help='每次轮询进度的次数')
+    parser.add_argument('--export-ratio', type=float, default=0.1, help='执行导出的流程占比')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--output', help='结果JSON文件')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    options = JourneyOptions(
+        think_time=args.think_time,
+        poll_interval=args.poll_interval,
+        polls=args.polls,
+        export_ratio=args.export_ratio
+    )
+    levels = [int(level) for level in args.concurrency.split(',') if level]
+
+    async def run() -> List[Dict[str, Any]]:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, headers=AUTH_HEADERS, timeout=60.0)
+        else:
+            client = in_process_client(args.url, args.transactions, args.seed)
+        async with client:
+            return await run_load_test(
+                client, levels, args.ramp, args.duration, options, args.seed, progress=print_stage
+            )
+
+    try:
+        stages = asyncio.run(run())
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    print(f"\n{'concurrency':>11} {'rps':>8} {'p95':>8} {'p99':>8} {'err%':>6}")
+    for stage in stages:
+        total = stage['endpoints'][TOTAL]
+        print(f"{stage['concurrency']:>11} {total['throughput_rps']:>8.1f} {total['p95_ms']:>8.1f} "
+              f"{total['p99_ms']:>8.1f} {total['error_rate'] * 100:>5.1f}%")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'stages': stages}, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
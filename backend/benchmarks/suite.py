@@ -0,0 +1,410 @@
+"""Repository and service benchmark suite
+
+用法（在 backend 目录下运行，数据集由 benchmarks.datagen 生成）:
+    python -m benchmarks.suite run --url sqlite:///bench.db --output results.json
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+
+run 在生成的数据集上逐项计时（每项先预热一次，再重复 --repeat 次，每次使用新会话），
+结果写入JSON；compare 对比两份结果，任一指标相对基线变慢超过阈值时以非零状态退出，
+可直接用于CI。
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.transaction import Transaction
+from app.models.cash_flow import CashFlow
+from app.models.enums import (
+    CashFlowStatus, Direction, ProductType, SettlementMethod, TransactionStatus
+)
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.schemas.common import PaginationParams
+from app.schemas.transaction import TransactionQueryCriteria
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from app.services.accounting_service import AccountingService
+from app.services.export_service import ExportFormat, ExportService
+from app.services.operation_guide_service import OperationGuideService
+from app.services.status_tracking_service import StatusTrackingService
+
+
+# 单个基准项：名称 → 接收会话、返回处理行数（或None）的函数
+Case = Tuple[str, Callable[[Session], Optional[int]]]
+
+
+class DatasetProfile:
+    """从数据集中读取构造基准参数所需的信息（规模、日期范围、头部交易对手、样本ID）"""
+
+    def __init__(self, session: Session):
+        self.transactions = session.scalar(select(func.count()).select_from(Transaction))
+        self.cash_flows = session.scalar(select(func.count()).select_from(CashFlow))
+        if not self.transactions:
+            raise SystemExit("数据集为空，请先运行 python -m benchmarks.datagen")
+
+        self.trade_date_min, self.trade_date_max = session.execute(
+            select(func.min(Transaction.trade_date), func.max(Transaction.trade_date))
+        ).one()
+        self.payment_date_min, self.payment_date_max = session.execute(
+            select(func.min(CashFlow.payment_date), func.max(CashFlow.payment_date))
+        ).one()
+        self.top_counterparty = session.execute(
+            select(Transaction.counterparty)
+            .group_by(Transaction.counterparty)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).scalar_one()
+
+        # 样本取数据集中间位置的交易和现金流，避免落在边界
+        middle = session.execute(
+            select(Transaction.transaction_id)
+            .order_by(Transaction.transaction_id)
+            .offset(self.transactions // 2)
+            .limit(1)
+        ).scalar_one()
+        self.sample_transaction_id = middle
+        self.sample_cash_flow_id = session.execute(
+            select(CashFlow.cash_flow_id).where(CashFlow.transaction_id == middle).limit(1)
+        ).scalar_one()
+
+    def trade_window(self, rows: int):
+        """估算包含约 rows 笔交易的交易日区间（取数据集最后一段）"""
+        span = self.trade_date_max - self.trade_date_min
+        fraction = min(1.0, rows / self.transactions)
+        return self.trade_date_max - span * fraction, self.trade_date_max
+
+    def payment_window(self, rows: int):
+        """估算包含约 rows 条现金流的收付日期区间（取数据集中间一段）"""
+        span = self.payment_date_max - self.payment_date_min
+        fraction = min(1.0, rows / self.cash_flows)
+        start = self.payment_date_min + span * (0.5 - fraction / 2)
+        return start, start + span * fraction
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "transactions": self.transactions,
+            "cash_flows": self.cash_flows,
+            "top_counterparty": self.top_counterparty,
+            "sample_transaction_id": self.sample_transaction_id,
+            "sample_cash_flow_id": self.sample_cash_flow_id,
+        }
+
+
+def build_cases(profile: DatasetProfile, export_sizes: List[int]) -> List[Case]:
+    """
+    构造基准项
+
+    Args:
+        profile: 数据集信息
+        export_sizes: 导出规模（行数）
+
+    Returns:
+        List[Case]: 基准项列表
+    """
+    first_page = PaginationParams(page=1, page_size=20)
+    deep_page = PaginationParams(page=max(1, profile.transactions // 20 // 2), page_size=20)
+    month_from, month_to = profile.trade_window(max(1, profile.transactions // 24))
+    payment_from, payment_to = profile.payment_window(max(1, profile.cash_flows // 24))
+
+    def transactions(criteria: TransactionQueryCriteria, pagination: PaginationParams = first_page):
+        def run(session: Session) -> int:
+            results, _ = TransactionRepository(session).find_by_criteria(criteria, pagination)
+            return len(results)
+        return run
+
+    def cash_flows(criteria: CashFlowQueryCriteria, pagination: PaginationParams = first_page):
+        def run(session: Session) -> int:
+            results, _ = CashFlowRepository(session).find_by_criteria(criteria, pagination)
+            return len(results)
+        return run
+
+    def amount_summary(criteria: CashFlowQueryCriteria):
+        def run(session: Session) -> int:
+            return len(CashFlowRepository(session).get_amount_summary(criteria))
+        return run
+
+    cases: List[Case] = [
+        ("transactions.find.no_filter", transactions(TransactionQueryCriteria())),
+        ("transactions.find.status", transactions(
+            TransactionQueryCriteria(status=TransactionStatus.EFFECTIVE))),
+        ("transactions.find.top_counterparty", transactions(
+            TransactionQueryCriteria(counterparty=profile.top_counterparty))),
+        ("transactions.find.product_settlement", transactions(
+            TransactionQueryCriteria(product=ProductType.FX_SWAP, settlement_method=SettlementMethod.NET))),
+        ("transactions.find.trade_month_status", transactions(
+            TransactionQueryCriteria(trade_date_from=month_from, trade_date_to=month_to,
+                                     status=TransactionStatus.MATURED))),
+        ("transactions.find.currency", transactions(TransactionQueryCriteria(currency="USD"))),
+        ("transactions.find.deep_page", transactions(TransactionQueryCriteria(), deep_page)),
+        ("cash_flows.find.no_filter", cash_flows(CashFlowQueryCriteria())),
+        ("cash_flows.find.payment_month_status", cash_flows(
+            CashFlowQueryCriteria(payment_date_from=payment_from, payment_date_to=payment_to,
+                                  status=CashFlowStatus.CORE_SUCCESS))),
+        ("cash_flows.find.pending_status", cash_flows(
+            CashFlowQueryCriteria(status=CashFlowStatus.PENDING_NETTING))),
+        ("cash_flows.find.currency_direction", cash_flows(
+            CashFlowQueryCriteria(currency="USD", direction=Direction.PAY))),
+        ("cash_flows.find.desk_active", cash_flows(CashFlowQueryCriteria(active_only=True))),
+        ("cash_flows.find.desk_active_currency_direction", cash_flows(
+            CashFlowQueryCriteria(active_only=True, currency="USD", direction=Direction.PAY))),
+        ("cash_flows.find.top_counterparty", cash_flows(
+            CashFlowQueryCriteria(counterparty=profile.top_counterparty))),
+        ("cash_flows.find.deep_page", cash_flows(
+            CashFlowQueryCriteria(), PaginationParams(page=max(1, profile.cash_flows // 20 // 2), page_size=20))),
+        ("cash_flows.amount_summary.payment_month", amount_summary(
+            CashFlowQueryCriteria(payment_date_from=payment_from, payment_date_to=payment_to))),
+        ("cash_flows.amount_summary.top_counterparty", amount_summary(
+            CashFlowQueryCriteria(counterparty=profile.top_counterparty))),
+        ("accounting.amount_summary", lambda session: len(
+            AccountingService(session).get_amount_summary(profile.sample_transaction_id))),
+        ("status.cash_flow_progress", lambda session: StatusTrackingService(session)
+            .get_cash_flow_progress(profile.sample_cash_flow_id) and 1),
+        ("guide.transaction", lambda session: OperationGuideService(session)
+            .get_transaction_guide(profile.sample_transaction_id) and 1),
+    ]
+
+    for size in export_sizes:
+        trade_from, trade_to = profile.trade_window(size)
+        payment_from_size, payment_to_size = profile.payment_window(size)
+        cases.append((f"export.transactions.csv.{size}", _export(
+            lambda service, c=TransactionQueryCriteria(trade_date_from=trade_from, trade_date_to=trade_to):
+                service.export_transactions(c, ExportFormat.CSV))))
+        cases.append((f"export.cash_flows.csv.{size}", _export(
+            lambda service, c=CashFlowQueryCriteria(payment_date_from=payment_from_size, payment_date_to=payment_to_size):
+                service.export_cash_flows(c, ExportFormat.CSV))))
+    return cases
+
+
+def _export(export: Callable[[ExportService], Any]) -> Callable[[Session], int]:
+    """导出基准项（放宽导出上限，以测量较大规模）"""
+    def run(session: Session) -> int:
+        service = ExportService(session)
+        service.MAX_EXPORT_RECORDS = sys.maxsize
+        return export(service).record_count
+    return run
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    按最近秩法取百分位数
+
+    Args:
+        samples: 已升序排列的样本
+        fraction: 百分位（0~1）
+
+    Returns:
+        float: 至少 fraction 比例的样本不大于它的最小样本
+    """
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def time_case(session_factory: sessionmaker, run: Callable[[Session], Optional[int]], repeat: int) -> Dict[str, Any]:
+    """
+    对单个基准项计时
+
+    Args:
+        session_factory: 会话工厂
+        run: 基准函数
+        repeat: 重复次数
+
+    Returns:
+        Dict[str, Any]: 各项耗时（毫秒）及处理行数
+    """
+    samples = []
+    rows = None
+    for iteration in range(repeat + 1):
+        session = session_factory()
+        try:
+            start = time.perf_counter()
+            rows = run(session)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            session.close()
+        if iteration > 0:  # 第一次为预热
+            samples.append(elapsed)
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "min_ms": round(samples[0], 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "repeat": repeat,
+        "rows": rows,
+    }
+
+
+def run_suite(
+    engine: Engine,
+    repeat: int = 5,
+    export_sizes: Optional[List[int]] = None,
+    only: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    运行基准套件
+
+    Args:
+        engine: 数据集所在数据库引擎
+        repeat: 每项重复次数
+        export_sizes: 导出规模
+        only: 仅运行名称包含该子串的基准项
+        progress: 每项完成后的回调(名称, 结果)
+
+    Returns:
+        Dict[str, Any]: 运行环境信息和各项结果
+    """
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        profile = DatasetProfile(session)
+
+    results = {}
+    for name, run in build_cases(profile, export_sizes or [1000, 10000]):
+        if only and only not in name:
+            continue
+        results[name] = time_case(session_factory, run, repeat)
+        if progress is not None:
+            progress(name, results[name])
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "git_commit": _git_commit(),
+            "dataset": profile.to_dict(),
+        },
+        "results": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """当前 git 提交（不在仓库中时返回None）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.2,
+    metric: str = "median_ms",
+    min_delta_ms: float = 1.0
+) -> List[Dict[str, Any]]:
+    """
+    对比两次运行结果
+
+    只有相对变化超过 threshold 且绝对变化超过 min_delta_ms 时才算退化，避免毫秒以下的抖动误报
+
+    Args:
+        baseline: 基线结果
+        current: 本次结果
+        threshold: 允许的相对退化比例（0.2 表示慢20%）
+        metric: 比较的指标
+        min_delta_ms: 最小绝对变化（毫秒）
+
+    Returns:
+        List[Dict[str, Any]]: 每个基准项的对比（name/baseline/current/change/status）
+    """
+    rows = []
+    base_results = baseline["results"]
+    current_results = current["results"]
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in base_results:
+            rows.append({"name": name, "status": "new", "current": current_results[name][metric]})
+            continue
+
+        before = base_results[name][metric]
+        after = current_results[name][metric]
+        change = (after - before) / before if before else 0.0
+        if change > threshold and after - before > min_delta_ms:
+            status = "regressed"
+        elif change < -threshold and before - after > min_delta_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": before, "current": after, "change": change, "status": status})
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]], metric: str) -> None:
+    print(f"{'benchmark':<44} {'baseline':>12} {'current':>12} {'change':>9}  status   ({metric})")
+    for row in rows:
+        if "change" in row:
+            print(
+                f"{row['name']:<44} {row['baseline']:>12.3f} {row['current']:>12.3f} "
+                f"{row['change']:>+8.1%}  {row['status']}"
+            )
+        else:
+            print(f"{row['name']:<44} {'':>12} {row.get('current', ''):>12} {'':>9}  {row['status']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subcommands.add_parser("run", help="运行基准并输出JSON")
+    run_parser.add_argument("--url", default="sqlite:///bench.db", help="数据集所在数据库URL")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="结果文件")
+    run_parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    run_parser.add_argument("--export-sizes", default="1000,10000", help="导出规模（逗号分隔）")
+    run_parser.add_argument("--only", help="仅运行名称包含该子串的基准项")
+
+    compare_parser = subcommands.add_parser("compare", help="对比结果与基线")
+    compare_parser.add_argument("baseline", help="基线结果文件")
+    compare_parser.add_argument("current", help="本次结果文件")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="允许的相对退化比例")
+    compare_parser.add_argument("--metric", default="median_ms", help="比较的指标")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0, help="最小绝对变化（毫秒）")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        engine = create_engine(args.url)
+        report = run_suite(
+            engine,
+            repeat=args.repeat,
+            export_sizes=[int(size) for size in args.export_sizes.split(",") if size],
+            only=args.only,
+            progress=lambda name, result: print(
+                f"{name:<44} median={result['median_ms']:10.3f} ms  "
+                f"p95={result['p95_ms']:10.3f} ms  rows={result['rows']}"
+            )
+        )
+        engine.dispose()
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.output}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold, args.metric, args.min_delta_ms)
+    _print_comparison(rows, args.metric)
+
+    regressed = [row["name"] for row in rows if row["status"] in ("regressed", "missing")]
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 import pytest
 import os
 
+# 接口测试会以同一用户连续发起大量请求，关闭限流（限流中间件有独立测试）
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
 
 @pytest.fixture(scope="session")
 def test_db_engine():
@@ -1,6 +1,6 @@
 """Tests for AccountingService"""
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from app.services.accounting_service import AccountingService
 from app.models.accounting import AccountingRecord
 from app.models.cash_flow import CashFlow
@@ -54,7 +54,7 @@ class TestAccountingService:
         assert result.our_account_name == "Test Account"
         assert result.our_account_number == "ACC-001"
         assert result.instruction_id == "PAY-001"
-        assert result.payment_date == datetime(2026, 2, 28)
+        assert result.payment_date == date(2026, 2, 28)
         assert result.currency == "USD"
         assert result.amount == 10000.0
     
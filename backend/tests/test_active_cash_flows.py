@@ -0,0 +1,63 @@
+"""Tests for the active cash flow filter and its partial indexes"""
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.cash_flow import CashFlow, TERMINAL_CASH_FLOW_STATUSES
+from app.query_workload import OP_ACTIVE, query_shape
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from app.schemas.common import PaginationParams
+from benchmarks.datagen import generate_dataset
+
+
+@pytest.fixture(scope="module")
+def dataset_engine():
+    """生成的小规模数据集"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    generate_dataset(engine, 500, seed=7)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+class TestActiveCashFlows:
+    """在途现金流查询测试"""
+
+    def test_active_only_excludes_terminal_statuses(self, dataset_engine):
+        """测试仅在途时排除结算完成和撤销成功的现金流"""
+        with Session(dataset_engine) as session:
+            repository = CashFlowRepository(session)
+            cash_flows, total = repository.find_by_criteria(
+                CashFlowQueryCriteria(active_only=True), PaginationParams(page=1, page_size=100)
+            )
+            expected = session.scalar(
+                select(func.count()).select_from(CashFlow).where(
+                    CashFlow.current_status.not_in(TERMINAL_CASH_FLOW_STATUSES)
+                )
+            )
+
+        assert total == expected
+        assert 0 < total
+        assert all(cf.current_status not in TERMINAL_CASH_FLOW_STATUSES for cf in cash_flows)
+
+    def test_planner_uses_partial_index(self, dataset_engine):
+        """测试终态以字面量渲染，使查询可以命中部分索引"""
+        with Session(dataset_engine) as session:
+            filters = CashFlowRepository(session)._build_filters(CashFlowQueryCriteria(active_only=True))
+            stmt = select(func.count()).select_from(CashFlow).where(*filters)
+            sql = str(stmt.compile(dialect=dataset_engine.dialect, compile_kwargs={"literal_binds": True}))
+            plan = " ".join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+        assert "NOT IN (51, 65)" in sql
+        assert "idx_active_payment_date_status" in plan
+
+    def test_shape_records_active_filter(self):
+        """测试仅在途条件记录为 active 操作，未勾选时不计入形态"""
+        active = query_shape("cash_flows", CashFlowQueryCriteria(active_only=True), "payment_date", "DESC")
+        default = query_shape("cash_flows", CashFlowQueryCriteria(), "payment_date", "DESC")
+
+        assert active[1] == (("cash_flows.current_status", OP_ACTIVE),)
+        assert default[1] == ()
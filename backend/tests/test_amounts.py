@@ -0,0 +1,95 @@
+"""Tests for fixed-point amount types and SQL-side summaries
+
+SQLite 把 NUMERIC 列按 REAL 存储，这里的测试只校验金额类型、精度和汇总的形状；
+定点数的精确运算由 PostgreSQL 的 NUMERIC(20, 4) 保证，本测试套件不覆盖
+"""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.accounting import AccountingRecord
+from app.models.cash_flow import CashFlow
+from app.models.enums import DebitCreditIndicator
+from app.repositories.accounting_repository import AccountingRepository
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.schemas.accounting import AccountingRecordResponse
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from benchmarks.datagen import generate_dataset
+
+
+def _add_record(db_session, n, indicator, amount, currency='USD'):
+    db_session.add(AccountingRecord(
+        voucher_id=f'VOUCHER-{n}',
+        transaction_id='TXN-001',
+        actual_accounting_date=datetime(2026, 10, 19),
+        planned_accounting_date=datetime(2026, 10, 19),
+        event_number=f'EVT-{n}',
+        debit_credit_indicator=indicator,
+        currency=currency,
+        account_subject='SUBJECT-1',
+        transaction_amount=amount
+    ))
+
+
+class TestAmounts:
+    """定点金额测试"""
+
+    def test_accounting_summary_is_quantized_decimal(self, db_session):
+        """测试借贷汇总按金额精度返回 Decimal（三个 0.1 按浮点累加为 0.30000000000000004），无发生额的方向为零"""
+        for n in range(3):
+            _add_record(db_session, n, DebitCreditIndicator.DEBIT, Decimal('0.1'))
+        _add_record(db_session, 3, DebitCreditIndicator.CREDIT, Decimal('98765.4321'), currency='KWD')
+        db_session.commit()
+
+        summary = AccountingRepository(db_session).get_amount_summary_by_currency('TXN-001')
+
+        assert summary == {
+            'USD': {'debit': Decimal('0.3'), 'credit': Decimal('0')},
+            'KWD': {'debit': Decimal('0'), 'credit': Decimal('98765.4321')},
+        }
+        assert str(summary['USD']['debit']) == '0.3000'
+        assert all(isinstance(value, Decimal) for amounts in summary.values() for value in amounts.values())
+
+    def test_schema_serializes_amounts_as_json_numbers(self, db_session):
+        """测试响应模型保留 Decimal，JSON 中按数字输出"""
+        _add_record(db_session, 1, DebitCreditIndicator.DEBIT, Decimal('100.05'))
+        db_session.commit()
+
+        response = AccountingRecordResponse.model_validate(db_session.query(AccountingRecord).one())
+
+        assert response.transaction_amount == Decimal('100.05')
+        assert isinstance(response.model_dump()['transaction_amount'], Decimal)
+        assert response.model_dump(mode='json')['transaction_amount'] == 100.05
+        assert b'"transaction_amount":100.05' in response.model_dump_json().encode()
+
+    def test_amount_columns_are_numeric_on_postgresql(self):
+        """测试金额列在 PostgreSQL 上为 NUMERIC(20, 4)"""
+        dialect = postgresql.dialect()
+
+        for column in (CashFlow.__table__.c.amount, AccountingRecord.__table__.c.transaction_amount):
+            assert column.type.compile(dialect=dialect) == 'NUMERIC(20, 4)'
+
+    def test_cash_flow_summary_matches_row_totals(self):
+        """测试数据库分组求和与逐行累加的结果一致"""
+        engine = create_engine('sqlite://', poolclass=StaticPool)
+        generate_dataset(engine, 300, seed=11)
+        criteria = CashFlowQueryCriteria(active_only=True)
+
+        with Session(engine) as session:
+            summary = CashFlowRepository(session).get_amount_summary(criteria)
+            expected = defaultdict(dict)
+            for currency, direction, amount in session.execute(
+                select(CashFlow.currency, CashFlow.direction, CashFlow.amount).where(
+                    *CashFlowRepository(session)._build_filters(criteria)
+                )
+            ):
+                expected[currency][direction.value] = expected[currency].get(direction.value, 0) + amount
+        engine.dispose()
+
+        assert summary == expected
+        assert all(isinstance(total, Decimal) for totals in summary.values() for total in totals.values())
@@ -143,13 +143,8 @@ def sample_accounting_record(db_session, sample_transaction):
 
 # ============================================================================
 # Authentication Tests
-# Note: These tests are skipped because the auth middleware correctly raises
-# 401 errors, but the error handler middleware converts them to 500 when
-# there's no database connection. In a real environment with proper DB setup,
-# these would work correctly.
 # ============================================================================
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_health_endpoint():
     """Test health check endpoint (no auth required)"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -158,7 +153,6 @@ def test_health_endpoint():
     assert response.json() == {"status": "healthy"}
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_root_endpoint():
     """Test root endpoint (no auth required)"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -167,7 +161,6 @@ def test_root_endpoint():
     assert response.json()["status"] == "ok"
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_transactions_endpoint_without_auth():
     """Test transactions endpoint without authentication"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -175,7 +168,6 @@ def test_transactions_endpoint_without_auth():
     assert response.status_code == 401
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_cash_flows_endpoint_without_auth():
     """Test cash flows endpoint without authentication"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -183,7 +175,6 @@ def test_cash_flows_endpoint_without_auth():
     assert response.status_code == 401
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_export_endpoint_without_auth():
     """Test export endpoint without authentication"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -191,7 +182,6 @@ def test_export_endpoint_without_auth():
     assert response.status_code == 401
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_invalid_token():
     """Test with invalid authentication token"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -200,7 +190,6 @@ def test_invalid_token():
     assert response.status_code == 401
 
 
-@pytest.mark.skip(reason="Auth middleware works but error handler interferes without DB")
 def test_missing_bearer_scheme():
     """Test with missing Bearer scheme"""
     client = TestClient(app, raise_server_exceptions=False)
@@ -422,6 +411,88 @@ def test_invalid_export_format(client, auth_headers):
     assert error["code"] == "INVALID_PARAMETER"
 
 
+def test_delta_export_returns_watermark_headers(client, auth_headers, sample_transaction):
+    """Test delta export returns the next watermark in response headers"""
+    since = (sample_transaction.last_modified_date - timedelta(seconds=1)).isoformat()
+    response = client.get(
+        "/api/export/transactions/delta",
+        params={"since": since, "format": "csv"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Next-Watermark"] == sample_transaction.last_modified_date.isoformat()
+    assert response.headers["X-Next-Watermark-Id"] == sample_transaction.external_id
+    assert response.headers["X-Has-More"] == "false"
+    
+    # Using the returned watermark yields no further rows
+    response = client.get(
+        "/api/export/transactions/delta",
+        params={
+            "since": response.headers["X-Next-Watermark"],
+            "since_id": response.headers["X-Next-Watermark-Id"]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Record-Count"] == "0"
+
+
+def test_tombstone_exports_follow_entity_permissions(client, db_session, sample_transaction, monkeypatch):
+    """Test each tombstone feed requires the export permission of its entity"""
+    from app.middleware.auth import AuthService, Permission, User
+    from app.repositories.transaction_repository import TransactionRepository
+
+    db_session.add(CashFlow(
+        cash_flow_id="CF-TEST-001",
+        transaction_id=sample_transaction.transaction_id,
+        direction=Direction.PAY,
+        currency="USD",
+        amount=10000.00,
+        payment_date=datetime.now() + timedelta(days=2),
+        account_number="1234567890",
+        account_name="账户A",
+        bank_name="中国银行",
+        bank_code="BOC001",
+        settlement_method=SettlementMethod.GROSS,
+        current_status=CashFlowStatus.PENDING_NETTING,
+        progress_percentage=0,
+        version=1,
+        last_modified_date=datetime.now()
+    ))
+    db_session.commit()
+    monkeypatch.setitem(AuthService._users, "cash-flow-exporter", User(
+        user_id="user-002", username="cash_flow_exporter", permissions=[Permission.EXPORT_CASH_FLOWS]
+    ))
+    headers = {"Authorization": "Bearer cash-flow-exporter"}
+    since = (datetime.now() - timedelta(seconds=1)).isoformat()
+    assert TransactionRepository(db_session).delete("EXT-TEST-001", deleted_by="tester")
+    assert db_session.query(CashFlow).count() == 0
+
+    response = client.get("/api/export/cash-flows/tombstones", params={"since": since}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-Record-Count"] == "1"
+    assert "CF-TEST-001" in response.content.decode("utf-8-sig")
+
+    response = client.get("/api/export/transactions/tombstones", params={"since": since}, headers=headers)
+    assert response.status_code == 403
+
+    response = client.get(
+        "/api/export/transactions/tombstones",
+        params={"since": since},
+        headers={"Authorization": "Bearer test-token-123"}
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Record-Count"] == "1"
+    assert "CF-TEST-001" not in response.content.decode("utf-8-sig")
+
+    response = client.get(
+        "/api/export/transactions/tombstones",
+        params={"since": since, "entity_type": "CASH_FLOW"},
+        headers={"Authorization": "Bearer test-token-123"}
+    )
+    assert response.status_code == 400
+
+
 def test_invalid_pagination_parameters(client, auth_headers):
     """Test error handling for invalid pagination parameters"""
     # Negative page number
@@ -0,0 +1,174 @@
+"""Tests for the archive tier"""
+import pytest
+from datetime import datetime
+
+from app.models.accounting import AccountingRecord
+from app.models.archive import CashFlowArchive, TransactionArchive
+from app.models.cash_flow import CashFlow
+from app.models.enums import (
+    ProductType, TransactionStatus, BackOfficeStatus,
+    SettlementMethod, ConfirmationType, TransactionSource,
+    Direction, CashFlowStatus, DebitCreditIndicator
+)
+from app.models.event import EventRecord
+from app.models.transaction import Transaction
+from app.repositories.accounting_repository import AccountingRepository
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.repositories.event_repository import EventRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from app.schemas.common import PaginationParams
+from app.schemas.transaction import TransactionQueryCriteria
+from app.services.archive_service import ArchiveService
+
+
+NOW = datetime(2026, 10, 19)
+OLD = datetime(2025, 1, 15)
+
+
+def _add_graph(db_session, n, status, back_office_status, last_modified, cash_flow_status=CashFlowStatus.CORE_SUCCESS):
+    """创建一笔交易及其事件、现金流和账务记录"""
+    db_session.add(Transaction(
+        external_id=f'EXT-{n}',
+        transaction_id=f'TXN-{n}',
+        entry_date=datetime(2024, 12, n),
+        trade_date=datetime(2024, 12, n),
+        value_date=datetime(2024, 12, n + 2),
+        maturity_date=datetime(2025, 1, n),
+        account='ACC-001',
+        product=ProductType.FX_SPOT,
+        direction=Direction.BUY,
+        underlying='USD/CNY',
+        counterparty='Bank A',
+        status=status,
+        back_office_status=back_office_status,
+        settlement_method=SettlementMethod.GROSS,
+        confirmation_type=ConfirmationType.SWIFT,
+        nature='Normal',
+        source=TransactionSource.GIT,
+        operating_institution='1530H',
+        trader='Trader A',
+        last_modified_date=last_modified,
+        last_modified_by='system'
+    ))
+    db_session.flush()
+    db_session.add(EventRecord(
+        event_id=f'EVT-{n}',
+        external_id=f'EXT-{n}',
+        transaction_id=f'TXN-{n}',
+        product=ProductType.FX_SPOT,
+        account='ACC-001',
+        event_type='MATURED',
+        transaction_status=status,
+        entry_date=datetime(2024, 12, n),
+        trade_date=datetime(2024, 12, n),
+        modified_date=datetime(2025, 1, n),
+        back_office_status=back_office_status,
+        operator='user1'
+    ))
+    db_session.add(CashFlow(
+        cash_flow_id=f'CF-{n}',
+        transaction_id=f'TXN-{n}',
+        direction=Direction.RECEIVE,
+        currency='USD',
+        amount=1000.0 * n,
+        payment_date=datetime(2024, 12, n + 2),
+        account_number='1234567890',
+        account_name='Test Account',
+        bank_name='Test Bank',
+        bank_code='TEST001',
+        settlement_method=SettlementMethod.GROSS,
+        current_status=cash_flow_status,
+        progress_percentage=100,
+        last_modified_date=last_modified
+    ))
+    db_session.add(AccountingRecord(
+        voucher_id=f'VOUCHER-{n}',
+        transaction_id=f'TXN-{n}',
+        actual_accounting_date=datetime(2024, 12, n + 2),
+        planned_accounting_date=datetime(2024, 12, n + 2),
+        event_number=f'EVT-{n}',
+        debit_credit_indicator=DebitCreditIndicator.DEBIT,
+        currency='USD',
+        account_subject='SUBJECT-1',
+        transaction_amount=1000.0 * n
+    ))
+    db_session.commit()
+
+
+@pytest.fixture
+def graphs(db_session):
+    """两笔可归档交易，以及三笔不应归档的交易"""
+    _add_graph(db_session, 1, TransactionStatus.MATURED, BackOfficeStatus.COMPLETED, OLD)
+    _add_graph(db_session, 2, TransactionStatus.INVALID, BackOfficeStatus.COMPLETED, OLD)
+    # 后线未完成
+    _add_graph(db_session, 3, TransactionStatus.MATURED, BackOfficeStatus.CONFIRMED, OLD)
+    # 保留期内修改过
+    _add_graph(db_session, 4, TransactionStatus.MATURED, BackOfficeStatus.COMPLETED, datetime(2026, 10, 1))
+    # 仍有在途现金流
+    _add_graph(db_session, 5, TransactionStatus.MATURED, BackOfficeStatus.COMPLETED, OLD,
+               cash_flow_status=CashFlowStatus.PENDING_NETTING)
+    return db_session
+
+
+class TestArchiveService:
+    """归档服务测试"""
+
+    def test_moves_whole_graph_of_eligible_transactions(self, graphs):
+        """测试只归档符合条件的交易，并连同事件、现金流和账务记录一起移动"""
+        result = ArchiveService(graphs).run(retention_days=180, now=NOW)
+
+        assert result.to_dict() == {
+            'batches': 1, 'transactions': 2, 'events': 2, 'cash_flows': 2, 'accounting_records': 2
+        }
+        assert sorted(t.external_id for t in graphs.query(Transaction)) == ['EXT-3', 'EXT-4', 'EXT-5']
+        assert sorted(t.external_id for t in graphs.query(TransactionArchive)) == ['EXT-1', 'EXT-2']
+        assert graphs.query(CashFlow).filter(CashFlow.transaction_id == 'TXN-1').count() == 0
+        assert graphs.query(CashFlowArchive).filter(CashFlowArchive.transaction_id == 'TXN-1').count() == 1
+
+    def test_batches_are_resumable(self, graphs):
+        """测试达到批次上限后再次运行会继续归档剩余交易"""
+        service = ArchiveService(graphs)
+
+        first = service.run(retention_days=180, batch_size=1, max_batches=1, now=NOW)
+        second = service.run(retention_days=180, batch_size=1, now=NOW)
+
+        assert (first.transactions, second.transactions, second.batches) == (1, 1, 1)
+        assert graphs.query(TransactionArchive).count() == 2
+
+    def test_repositories_fall_back_to_archive_by_id(self, graphs):
+        """测试按ID查询在热表未命中时返回归档记录"""
+        ArchiveService(graphs).run(retention_days=180, now=NOW)
+        pagination = PaginationParams(page=1, page_size=20)
+
+        assert TransactionRepository(graphs).find_by_external_id('EXT-1').transaction_id == 'TXN-1'
+        assert TransactionRepository(graphs).find_by_transaction_id('TXN-2').external_id == 'EXT-2'
+        assert CashFlowRepository(graphs).find_by_cash_flow_id('CF-1').amount == 1000.0
+        assert CashFlowRepository(graphs).find_by_transaction_id('TXN-1', pagination)[1] == 1
+        assert EventRepository(graphs).find_by_external_id('EXT-1', pagination)[1] == 1
+        assert AccountingRepository(graphs).get_amount_summary_by_currency('TXN-2') == {
+            'USD': {'debit': 2000.0, 'credit': 0.0}
+        }
+        assert TransactionRepository(graphs).find_by_external_id('EXT-404') is None
+
+    def test_include_archived_extends_searches(self, graphs):
+        """测试 include_archived 合并热表和归档表的查询结果，并保持排序和分页"""
+        ArchiveService(graphs).run(retention_days=180, now=NOW)
+        repository = TransactionRepository(graphs)
+
+        hot, hot_total = repository.find_by_criteria(
+            TransactionQueryCriteria(counterparty='Bank'), PaginationParams(page=1, page_size=20)
+        )
+        page, total = repository.find_by_criteria(
+            TransactionQueryCriteria(counterparty='Bank', include_archived=True),
+            PaginationParams(page=1, page_size=3, sort_by='trade_date', sort_order='DESC')
+        )
+        cash_flows, cash_flow_total = CashFlowRepository(graphs).find_by_criteria(
+            CashFlowQueryCriteria(counterparty='Bank', include_archived=True), PaginationParams(page=2, page_size=2)
+        )
+
+        assert hot_total == 3
+        assert total == 5
+        assert [t.external_id for t in page] == ['EXT-5', 'EXT-4', 'EXT-3']
+        assert cash_flow_total == 5
+        assert [cf.cash_flow_id for cf in cash_flows] == ['CF-3', 'CF-2']
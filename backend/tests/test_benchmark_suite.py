@@ -0,0 +1,65 @@
+"""Tests for the benchmark suite runner and regression comparison"""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.datagen import generate_dataset
+from benchmarks.suite import compare_results, percentile, run_suite
+
+
+def _report(**medians):
+    return {"results": {name: {"median_ms": value} for name, value in medians.items()}}
+
+
+class TestCompareResults:
+    """基准结果对比测试"""
+
+    def test_regression_beyond_threshold(self):
+        """测试超过阈值且超过最小绝对变化时判定为退化"""
+        rows = compare_results(_report(a=10.0, b=10.0), _report(a=13.0, b=11.0), threshold=0.2)
+        status = {row["name"]: row["status"] for row in rows}
+
+        assert status == {"a": "regressed", "b": "ok"}
+
+    def test_sub_millisecond_noise_ignored(self):
+        """测试绝对变化低于最小阈值时不判定为退化"""
+        rows = compare_results(_report(a=0.2), _report(a=0.6), threshold=0.2, min_delta_ms=1.0)
+
+        assert rows[0]["status"] == "ok"
+
+    def test_missing_new_and_improved(self):
+        """测试缺失、新增和变快的基准项"""
+        rows = compare_results(_report(a=10.0, b=10.0), _report(b=5.0, c=1.0))
+        status = {row["name"]: row["status"] for row in rows}
+
+        assert status == {"a": "missing", "b": "improved", "c": "new"}
+
+
+class TestPercentile:
+    """百分位数测试"""
+
+    def test_nearest_rank(self):
+        """测试按最近秩取 p95，样本较少时取最大值"""
+        assert percentile([1.0, 2.0], 0.95) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.95) == 5.0
+        assert percentile([float(value) for value in range(1, 101)], 0.95) == 95.0
+        assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.5) == 3.0
+        assert percentile([7.0], 0.95) == 7.0
+
+
+class TestRunSuite:
+    """基准套件运行测试"""
+
+    def test_runs_all_cases_on_generated_dataset(self):
+        """测试在生成的数据集上运行全部基准项"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        generate_dataset(engine, 300, seed=5, batch_size=100)
+
+        report = run_suite(engine, repeat=1, export_sizes=[50])
+        engine.dispose()
+
+        results = report["results"]
+        assert report["meta"]["dataset"]["transactions"] == 300
+        assert "transactions.find.deep_page" in results
+        assert "export.cash_flows.csv.50" in results
+        assert results["guide.transaction"]["rows"] == 1
+        assert all(result["median_ms"] >= 0 for result in results.values())
@@ -0,0 +1,73 @@
+"""Tests for day-granularity business dates and BRIN indexes"""
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex
+
+from app.models.event import EventRecord
+from app.models.transaction import Transaction
+from app.repositories.transaction_repository import TransactionRepository
+from app.schemas.transaction import TransactionQueryCriteria
+from benchmarks.datagen import generate_dataset
+
+
+class TestBusinessDates:
+    """营业日期测试"""
+
+    def test_criteria_truncate_to_day(self):
+        """测试查询条件接受日期、日期时间和ISO字符串，统一截断为日期"""
+        criteria = TransactionQueryCriteria(
+            trade_date_from='2026-10-01',
+            trade_date_to='2026-10-31T23:59:59',
+            value_date_to=datetime(2026, 10, 19, 15, 30),
+        )
+
+        assert criteria.trade_date_from == date(2026, 10, 1)
+        assert criteria.trade_date_to == date(2026, 10, 31)
+        assert criteria.value_date_to == date(2026, 10, 19)
+
+    def test_range_end_includes_whole_day(self):
+        """测试结束日期为午夜时间点时仍包含当天的交易"""
+        engine = create_engine('sqlite://', poolclass=StaticPool)
+        generate_dataset(engine, 200, seed=7)
+
+        with Session(engine) as session:
+            day = session.execute(select(func.max(Transaction.trade_date))).scalar()
+            expected = session.execute(
+                select(func.count()).where(Transaction.trade_date == day)
+            ).scalar()
+            criteria = TransactionQueryCriteria(
+                trade_date_from=day, trade_date_to=datetime.combine(day, datetime.min.time())
+            )
+            found = session.execute(
+                select(func.count()).where(*TransactionRepository(session)._build_filters(criteria))
+            ).scalar()
+        engine.dispose()
+
+        assert isinstance(day, date) and not isinstance(day, datetime)
+        assert found == expected > 0
+
+    def test_brin_indexes_on_postgresql_only(self):
+        """测试追加写入的时间列在 PostgreSQL 上建 BRIN 索引，其他数据库不建或保留 B-tree"""
+        indexes = {index.name: index for index in EventRecord.__table__.indexes}
+        dialect = postgresql.dialect()
+
+        modified = str(CreateIndex(indexes['idx_modified_date']).compile(dialect=dialect))
+        entry = str(CreateIndex(indexes['idx_events_entry_date_brin']).compile(dialect=dialect))
+        assert 'USING brin (modified_date)' in modified
+        assert 'USING brin (entry_date)' in entry
+
+        engine = create_engine('sqlite://', poolclass=StaticPool)
+        generate_dataset(engine, 1)
+        with engine.connect() as conn:
+            names = {row[0] for row in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name IN ('events', 'transactions')"
+            )}
+        engine.dispose()
+
+        assert 'idx_modified_date' in names
+        assert 'idx_events_entry_date_brin' not in names
+        assert 'idx_transactions_entry_date_brin' not in names
@@ -0,0 +1,107 @@
+"""Tests for response compression middleware"""
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@pytest.fixture
+def client():
+    """创建带压缩中间件的测试应用"""
+    app = FastAPI()
+
+    @app.get("/large-json")
+    async def large_json():
+        return JSONResponse({"data": [{"id": i, "name": f"交易{i}"} for i in range(200)]})
+
+    @app.get("/small-json")
+    async def small_json():
+        return JSONResponse({"status": "ok"})
+
+    @app.get("/stream-csv")
+    async def stream_csv():
+        def rows():
+            yield "id,name\n".encode("utf-8")
+            for i in range(500):
+                yield f"{i},交易{i}\n".encode("utf-8")
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    @app.get("/xlsx")
+    async def xlsx():
+        return Response(content=b"PK" + b"\x00" * 4096, media_type=XLSX_MEDIA_TYPE)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=6)
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """响应压缩中间件测试"""
+
+    def test_large_json_is_gzip_compressed(self, client, monkeypatch):
+        """测试超过阈值的JSON响应被gzip压缩"""
+        monkeypatch.setattr(compression, "brotli", None)
+        response = client.get("/large-json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()["data"]) == 200
+
+    def test_small_response_is_not_compressed(self, client):
+        """测试低于阈值的响应不压缩"""
+        response = client.get("/small-json", headers={"Accept-Encoding": "gzip, br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+
+    def test_streaming_csv_is_compressed_in_chunks(self, client, monkeypatch):
+        """测试流式CSV响应按数据块压缩"""
+        monkeypatch.setattr(compression, "brotli", None)
+        with client.stream("GET", "/stream-csv", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(raw).decode("utf-8").splitlines()
+        assert lines[0] == "id,name"
+        assert len(lines) == 501
+
+    def test_already_compressed_formats_are_skipped(self, client):
+        """测试xlsx等已压缩格式不再压缩"""
+        response = client.get("/xlsx", headers={"Accept-Encoding": "gzip, br"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == 4098
+
+    def test_no_compression_without_accept_encoding(self, client):
+        """测试客户端不接受压缩时原样返回"""
+        response = client.get("/large-json", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize("accept_encoding, expected", [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("", None),
+    ])
+    def test_negotiate_encoding_without_brotli(self, monkeypatch, accept_encoding, expected):
+        """测试未安装Brotli时的编码协商"""
+        monkeypatch.setattr(compression, "brotli", None)
+
+        assert CompressionMiddleware._negotiate_encoding(accept_encoding) == expected
+
+    def test_brotli_preferred_when_available(self, client):
+        """测试安装Brotli时优先使用br"""
+        brotli = pytest.importorskip("brotli")
+        with client.stream("GET", "/large-json", headers={"Accept-Encoding": "gzip, br"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "br"
+        assert b'"data"' in brotli.decompress(raw)
@@ -0,0 +1,66 @@
+"""Tests for connection pool warm-up and readiness"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+import app.main as main_module
+from app.database import check_database, pool_status, warm_up_pool
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """基于SQLite文件的 QueuePool 引擎"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePool,
+        pool_size=3,
+        max_overflow=2
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPool:
+    """连接池测试"""
+
+    def test_warm_up_opens_pool_size_connections(self, pooled_engine):
+        """测试预热后连接池保留 pool_size 个空闲连接"""
+        assert warm_up_pool(pooled_engine, 3) == 3
+
+        status = pool_status(pooled_engine)
+        assert status["checked_in"] == 3
+        assert status["checked_out"] == 0
+        assert status["overflow"] == 0
+        assert status["max_overflow"] == 2
+
+    def test_check_database_reports_latency(self, pooled_engine):
+        """测试数据库往返检查返回延迟"""
+        result = check_database(pooled_engine)
+
+        assert result["status"] == "up"
+        assert result["latency_ms"] >= 0
+
+
+class TestReadiness:
+    """就绪检查接口测试"""
+
+    def test_ready(self, pooled_engine, monkeypatch):
+        """测试数据库可用时返回200和连接池状态"""
+        monkeypatch.setattr(main_module, "engine", pooled_engine)
+
+        response = TestClient(main_module.app).get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["pool"]["size"] == 3
+
+    def test_not_ready(self, tmp_path, monkeypatch):
+        """测试数据库不可用时返回503（无需认证）"""
+        broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+        monkeypatch.setattr(main_module, "engine", broken)
+
+        response = TestClient(main_module.app).get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["database"]["status"] == "down"
@@ -0,0 +1,70 @@
+"""Tests for the synthetic dataset generator"""
+from collections import Counter
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.cash_flow import CashFlow
+from app.models.enums import CashFlowStatus, ProductType, SettlementMethod
+from app.models.transaction import Transaction
+from benchmarks.datagen import (
+    STAGE_1, STAGE_2, STAGE_3, STAGE_4,
+    DatasetGenerator,
+    generate_dataset
+)
+
+
+class TestDatasetGenerator:
+    """合成数据生成器测试"""
+
+    def test_deterministic_per_seed(self):
+        """测试相同种子生成相同数据，不同种子不同"""
+        first = DatasetGenerator(seed=7).generate(123)
+        again = DatasetGenerator(seed=7).generate(123)
+        other = DatasetGenerator(seed=8).generate(123)
+
+        assert first == again
+        assert first != other
+
+    def test_batches_independent_of_batch_size(self):
+        """测试分批方式不影响生成结果"""
+        generator = DatasetGenerator(seed=1)
+        small = [row for batch in generator.batches(0, 20, 3) for row in batch[Transaction]]
+        large = [row for batch in generator.batches(0, 20, 20) for row in batch[Transaction]]
+
+        assert small == large
+
+    def test_distribution_coverage(self):
+        """测试覆盖全部产品/清算方式、掉期4条现金流、4个阶段及倾斜的交易对手"""
+        generator = DatasetGenerator(seed=42)
+        products, methods, statuses, counterparties = set(), set(), set(), Counter()
+        for index in range(3000):
+            rows = generator.generate(index)
+            transaction = rows[Transaction][0]
+            products.add(transaction["product"])
+            methods.add(transaction["settlement_method"])
+            counterparties[transaction["counterparty"]] += 1
+            statuses.update(cf["current_status"] for cf in rows[CashFlow])
+            if transaction["product"] == ProductType.FX_SWAP:
+                assert len(rows[CashFlow]) == 4
+
+        assert products == set(ProductType)
+        assert methods == set(SettlementMethod)
+        for stage in (STAGE_1, STAGE_2, STAGE_3, STAGE_4 + [CashFlowStatus.CORE_SUCCESS]):
+            assert statuses & set(stage)
+        top_share = sum(count for _, count in counterparties.most_common(20)) / 3000
+        assert top_share > 0.3
+
+    def test_bulk_load_matches_orm_storage(self):
+        """测试批量写入的数据可被ORM正常读取"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        counts = generate_dataset(engine, 200, seed=3, batch_size=64)
+
+        with Session(engine) as session:
+            assert session.scalar(select(func.count()).select_from(Transaction)) == 200
+            assert session.scalar(select(func.count()).select_from(CashFlow)) == counts[CashFlow]
+            cash_flow = session.scalars(select(CashFlow).limit(1)).one()
+            assert isinstance(cash_flow.current_status, CashFlowStatus)
+            assert cash_flow.payment_date.year >= 2024
+        engine.dispose()
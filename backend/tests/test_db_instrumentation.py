@@ -0,0 +1,124 @@
+"""Tests for per-request SQL instrumentation"""
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app import db_instrumentation
+from app.db_instrumentation import fingerprint_sql, install_sql_instrumentation, track_queries
+from app.middleware.query_stats import QueryStatsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def instrumentation():
+    """注册SQL执行事件"""
+    install_sql_instrumentation()
+
+
+class TestFingerprint:
+    """SQL指纹规范化测试"""
+
+    @pytest.mark.parametrize("first, second", [
+        (
+            "SELECT * FROM transactions WHERE external_id = 'EXT-001'",
+            "SELECT * FROM transactions WHERE external_id = 'EXT-002'",
+        ),
+        (
+            "SELECT * FROM cash_flows WHERE id IN (?, ?, ?) LIMIT ? OFFSET ?",
+            "SELECT * FROM cash_flows WHERE id IN (?) LIMIT ? OFFSET ?",
+        ),
+        (
+            "SELECT * FROM events WHERE transaction_id = %(transaction_id_1)s LIMIT 15",
+            "SELECT *\n  FROM events\n WHERE transaction_id = %(transaction_id_1)s LIMIT 30",
+        ),
+    ])
+    def test_equivalent_statements_share_fingerprint(self, first, second):
+        """测试仅字面量或参数个数不同的语句指纹相同"""
+        assert fingerprint_sql(first) == fingerprint_sql(second)
+
+    def test_identifiers_are_kept(self):
+        """测试表名和列名中的数字不被替换"""
+        assert fingerprint_sql("SELECT anon_1.id FROM t1 AS anon_1") == "SELECT anon_1.id FROM t1 AS anon_1"
+
+
+class TestTrackQueries:
+    """代码块SQL统计测试"""
+
+    def test_statements_are_counted(self, db_session):
+        """测试统计语句数、耗时和指纹"""
+        with track_queries("req-1") as stats:
+            for value in range(3):
+                db_session.execute(text("SELECT :value"), {"value": value})
+
+        assert stats.statements == 3
+        assert stats.total_time > 0
+        assert stats.repeated(2) == [("SELECT ?", 3)]
+
+    def test_queries_outside_scope_are_ignored(self, db_session):
+        """测试统计范围外的语句不计入"""
+        with track_queries() as stats:
+            pass
+        db_session.execute(text("SELECT 1"))
+
+        assert stats.statements == 0
+
+    def test_failed_statement_pops_start_time(self, db_session):
+        """测试执行失败的语句不在连接上残留开始时间"""
+        connection = db_session.connection()
+        for _ in range(3):
+            with pytest.raises(Exception):
+                connection.execute(text("SELECT * FROM no_such_table"))
+
+        assert connection.info.get('query_start_time', []) == []
+
+    def test_slow_query_is_logged(self, db_session, monkeypatch, caplog):
+        """测试超过阈值的语句记录慢查询日志"""
+        monkeypatch.setattr(db_instrumentation.settings, "slow_query_threshold_ms", 0.0)
+
+        with caplog.at_level(logging.WARNING, logger="app.db_instrumentation"):
+            db_session.execute(text("SELECT 42"))
+
+        assert any("Slow query" in r.message and "SELECT ?" in r.message for r in caplog.records)
+
+
+class TestQueryStatsMiddleware:
+    """请求SQL统计中间件测试"""
+
+    @pytest.fixture
+    def client(self, db_session):
+        app = FastAPI()
+
+        @app.get("/items")
+        async def items():
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 2"))
+            return {"ok": True}
+
+        @app.get("/items/{item_id}/children")
+        async def children(item_id: str):
+            for value in range(4):
+                db_session.execute(text("SELECT :value"), {"value": value})
+            return {"ok": True}
+
+        app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=3)
+        return TestClient(app)
+
+    def test_headers_report_request_statements(self, client):
+        """测试响应头返回请求内的语句数和耗时"""
+        response = client.get("/items")
+
+        assert response.headers["X-DB-Queries"] == "2"
+        assert float(response.headers["X-DB-Time"]) >= 0
+
+    def test_repeated_fingerprint_warns(self, client, caplog):
+        """测试同一指纹重复超过阈值时记录 N+1 告警"""
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_stats"):
+            response = client.get("/items/A/children")
+
+        assert response.headers["X-DB-Queries"] == "4"
+        warnings = [r for r in caplog.records if "N+1" in r.message]
+        assert len(warnings) == 1
+        assert "/items/{item_id}/children" in warnings[0].message
+        assert "executed 4 times" in warnings[0].message
@@ -0,0 +1,105 @@
+"""Tests for integer-coded enum storage"""
+from datetime import datetime
+
+from sqlalchemy import Enum as SQLEnum, text
+
+from app.database import Base
+from app.models import enums
+from app.models.cash_flow import CashFlow
+from app.models.enum_codes import CodedEnum, ENUM_CODES, enum_code
+from app.models.enums import CashFlowStatus, Direction, SettlementMethod
+
+
+# 已发布的编码：只允许追加，修改已有编码即破坏已存储的数据
+PINNED_CODES = {
+    'ProductType': {
+        'FX_SPOT': 1, 'FX_FORWARD': 2, 'FX_SWAP': 3, 'INTERBANK_LENDING': 4, 'MONEY_MARKET_DEPOSIT': 5,
+        'BOND_TRADING': 6, 'BUYOUT_REPO': 7, 'PLEDGE_REPO': 8, 'UNILATERAL_CASHFLOW': 9,
+    },
+    'TransactionStatus': {'EFFECTIVE': 1, 'MATURED': 2, 'INVALID': 3},
+    'BackOfficeStatus': {'CONFIRMED': 1, 'SETTLED_PENDING_REPORT': 2, 'REPORTED_PENDING_RECEIPT': 3, 'COMPLETED': 4},
+    'SettlementMethod': {
+        'GROSS': 1, 'NET': 2, 'CENTRALIZED': 3, 'NOT_REQUIRED': 4, 'OUR_BANK_AGENT': 5, 'OTHER_BANK_AGENT': 6,
+    },
+    'ConfirmationType': {'SWIFT': 1, 'TEXT': 2, 'NO_CONFIRMATION': 3},
+    'TransactionSource': {'GIT': 1, 'FXO': 2, 'FXS': 3, 'FXY': 4, 'FXW': 5},
+    'MatchStatus': {'MATCHED': 1, 'UNMATCHED': 2, 'PENDING': 3},
+    'CashFlowStatus': {
+        'PENDING_NETTING': 10, 'AUTO_NETTING_COMPLETE': 11, 'MANUAL_NETTING_COMPLETE': 12, 'PENDING_DISPATCH': 13,
+        'COMPLIANCE_CHECKING': 20, 'COMPLIANCE_APPROVED': 21, 'COMPLIANCE_BLOCKED': 22, 'PENDING_APPROVAL': 23,
+        'APPROVAL_APPROVED': 24, 'APPROVAL_REJECTED': 25, 'ROUTE_DETERMINED': 26, 'RMC_SENDING': 30,
+        'RMC_SUCCESS': 31, 'RMC_FAILED': 32, 'FTM_SENDING': 33, 'FTM_SUCCESS': 34, 'FTM_FAILED': 35,
+        'PENDING_MANUAL_CONFIRM': 40, 'MANUAL_CONFIRM_APPROVED': 41, 'MANUAL_CONFIRM_REJECTED': 42,
+        'CORE_PROCESSING': 50, 'CORE_SUCCESS': 51, 'CORE_FAILED': 52, 'CORE_UNKNOWN': 53, 'CANCEL_RMC_SENDING': 60,
+        'CANCEL_RMC_FAILED': 61, 'CANCEL_FTM_SENDING': 62, 'CANCEL_FTM_FAILED': 63, 'CANCEL_PROCESSING': 64,
+        'CANCEL_SUCCESS': 65, 'CANCEL_FAILED': 66,
+    },
+    'Direction': {'BUY': 1, 'SELL': 2, 'RECEIVE': 3, 'PAY': 4},
+    'DebitCreditIndicator': {'DEBIT': 1, 'CREDIT': 2},
+    'DeletedEntityType': {'TRANSACTION': 1, 'CASH_FLOW': 2, 'EVENT': 3},
+}
+
+
+def _add_cash_flow(db_session, cash_flow_id, status):
+    db_session.execute(CashFlow.__table__.insert().values(
+        cash_flow_id=cash_flow_id, transaction_id='TXN-1', direction=Direction.PAY, currency='USD',
+        amount=100.0, payment_date=datetime(2026, 10, 19), account_number='1', account_name='A',
+        bank_name='B', bank_code='C', settlement_method=SettlementMethod.GROSS, current_status=status,
+        progress_percentage=0, version=1, last_modified_date=datetime(2026, 10, 19)
+    ))
+
+
+class TestEnumCodes:
+    """枚举编码表测试"""
+
+    def test_every_enum_member_has_a_unique_code(self):
+        """测试所有枚举均已登记，每个成员都有编码且同一枚举内不重复"""
+        enum_classes = {
+            value for value in vars(enums).values()
+            if isinstance(value, type) and issubclass(value, enums.Enum) and value is not enums.Enum
+        }
+        assert enum_classes == set(ENUM_CODES)
+        for enum_class, codes in ENUM_CODES.items():
+            assert set(codes) == set(enum_class)
+            assert len(set(codes.values())) == len(codes)
+            assert all(0 < code < 2 ** 15 for code in codes.values())
+
+    def test_published_codes_are_stable(self):
+        """测试已发布的编码未被修改或删除"""
+        current = {
+            enum_class.__name__: {member.name: code for member, code in codes.items()}
+            for enum_class, codes in ENUM_CODES.items()
+        }
+        for enum_name, codes in PINNED_CODES.items():
+            assert {name: current[enum_name].get(name) for name in codes} == codes
+
+    def test_all_enum_columns_use_coded_storage(self):
+        """测试模型中不再有按枚举名存储的列"""
+        columns = [column for table in Base.metadata.sorted_tables for column in table.columns]
+        assert not [column for column in columns if isinstance(column.type, SQLEnum)]
+        assert {column.type.enum_class for column in columns if isinstance(column.type, CodedEnum)} == set(ENUM_CODES)
+
+
+class TestCodedEnum:
+    """编码存储列类型测试"""
+
+    def test_stores_codes_and_loads_members(self, db_session):
+        """测试写入编码、读取枚举成员，并接受枚举值和枚举名作为查询参数"""
+        _add_cash_flow(db_session, 'CF-1', CashFlowStatus.CORE_SUCCESS)
+        _add_cash_flow(db_session, 'CF-2', 'PENDING_NETTING')
+        db_session.commit()
+
+        raw = dict(db_session.execute(text('SELECT cash_flow_id, current_status FROM cash_flows')).all())
+        assert raw == {'CF-1': enum_code(CashFlowStatus.CORE_SUCCESS), 'CF-2': enum_code(CashFlowStatus.PENDING_NETTING)}
+
+        cash_flow = db_session.query(CashFlow).filter(CashFlow.current_status == '结算完成').one()
+        assert cash_flow.cash_flow_id == 'CF-1'
+        assert cash_flow.current_status is CashFlowStatus.CORE_SUCCESS
+        assert cash_flow.direction is Direction.PAY
+        assert db_session.query(CashFlow).filter(CashFlow.current_status == 'PENDING_NETTING').count() == 1
+
+    def test_renders_codes_as_literals(self):
+        """测试字面量渲染为编码（部分索引条件依赖字面量查询）"""
+        stmt = CashFlow.__table__.select().where(CashFlow.current_status.in_([CashFlowStatus.CANCEL_SUCCESS]))
+        sql = str(stmt.compile(compile_kwargs={'literal_binds': True}))
+        assert 'current_status IN (65)' in sql
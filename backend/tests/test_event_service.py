@@ -170,6 +170,39 @@ class TestEventService:
         assert result.pagination.current_page == 1
         assert result.pagination.page_size == 2
     
+    def test_query_events_with_modified_date_window(self, db_session):
+        """测试按修改日区间过滤事件"""
+        service = EventService(db_session)
+        external_id = "EXT-001"
+        
+        # 每月一个事件（1月至4月）
+        for month in range(1, 5):
+            event = EventRecord(
+                event_id=f"EVT-{month}",
+                external_id=external_id,
+                transaction_id="TXN-001",
+                product=ProductType.FX_SPOT,
+                account="ACC-001",
+                event_type="BOOKED",
+                transaction_status=TransactionStatus.EFFECTIVE,
+                entry_date=datetime(2026, 1, 1),
+                trade_date=datetime(2026, 1, 1),
+                modified_date=datetime(2026, month, 15),
+                back_office_status=BackOfficeStatus.CONFIRMED,
+                operator="user1"
+            )
+            db_session.add(event)
+        db_session.commit()
+        
+        result = service.query_events(
+            external_id=external_id,
+            modified_date_from=datetime(2026, 2, 1),
+            modified_date_to=datetime(2026, 3, 31)
+        )
+        
+        assert [event.event_id for event in result.data] == ["EVT-3", "EVT-2"]
+        assert result.pagination.total_records == 2
+    
     def test_record_event_creates_new_event(self, db_session):
         """测试记录新事件成功创建"""
         service = EventService(db_session)
@@ -350,6 +350,239 @@ class TestExportService:
         assert result.filename.endswith('.csv')
 
 
+
+class TestDeltaExport:
+    """增量导出测试"""
+    
+    def _add_transactions(self, db_session, sample_transactions):
+        """写入交易并设置不同的最后修改时间"""
+        for i, txn in enumerate(sample_transactions):
+            txn.last_modified_date = datetime(2026, 3, 1, 10, 0, 0) if i < 2 else datetime(2026, 3, 2, 10, 0, 0)
+            db_session.add(txn)
+        db_session.commit()
+    
+    def test_delta_export_returns_rows_modified_after_watermark(self, db_session, sample_transactions):
+        """测试增量导出只返回水位线之后修改的交易"""
+        self._add_transactions(db_session, sample_transactions)
+        
+        service = ExportService(db_session)
+        result = service.export_transactions_delta(
+            since=datetime(2026, 3, 1, 12, 0, 0),
+            format=ExportFormat.CSV
+        )
+        
+        lines = result.content.decode('utf-8-sig').strip().split('\n')
+        assert result.record_count == 3
+        assert len(lines) == 4  # 包含表头
+        assert result.next_watermark == datetime(2026, 3, 2, 10, 0, 0)
+        assert result.next_watermark_id == 'EXT-004'
+        assert result.has_more is False
+    
+    def test_delta_export_resumes_within_same_timestamp(self, db_session, sample_transactions):
+        """测试同一时间戳的记录可以通过水位线ID分批续传"""
+        self._add_transactions(db_session, sample_transactions)
+        
+        service = ExportService(db_session)
+        service.MAX_EXPORT_RECORDS = 2
+        
+        first = service.export_transactions_delta(
+            since=datetime(2026, 3, 1, 12, 0, 0),
+            format=ExportFormat.CSV,
+            fields=['external_id']
+        )
+        assert first.record_count == 2
+        assert first.has_more is True
+        assert first.next_watermark_id == 'EXT-003'
+        
+        second = service.export_transactions_delta(
+            since=first.next_watermark,
+            since_id=first.next_watermark_id,
+            format=ExportFormat.CSV,
+            fields=['external_id']
+        )
+        lines = second.content.decode('utf-8-sig').strip().split('\n')
+        assert second.record_count == 1
+        assert second.has_more is False
+        assert lines[1].strip() == 'EXT-004'
+    
+    def test_delta_export_without_changes_keeps_watermark(self, db_session, sample_transactions):
+        """测试没有新修改时水位线保持不变"""
+        self._add_transactions(db_session, sample_transactions)
+        
+        service = ExportService(db_session)
+        since = datetime(2026, 3, 5)
+        result = service.export_cash_flows_delta(since=since, format=ExportFormat.CSV)
+        
+        assert result.record_count == 0
+        assert result.next_watermark == since
+        assert result.next_watermark_id is None
+    
+    def test_delete_records_tombstone_for_delta_export(self, db_session, sample_transaction):
+        """测试删除现金流会登记墓碑记录"""
+        from app.repositories.cash_flow_repository import CashFlowRepository
+        from app.models.enums import DeletedEntityType
+        
+        db_session.add(sample_transaction)
+        db_session.add(CashFlow(
+            cash_flow_id='CF-001',
+            transaction_id=sample_transaction.transaction_id,
+            direction=Direction.RECEIVE,
+            currency='USD',
+            amount=10000.0,
+            payment_date=datetime(2026, 2, 28),
+            account_number='1234567890',
+            account_name='Test Account',
+            bank_name='Test Bank',
+            bank_code='TEST001',
+            settlement_method=SettlementMethod.GROSS,
+            current_status=CashFlowStatus.PENDING_NETTING,
+            progress_percentage=0,
+            version=1,
+            last_modified_date=datetime.now()
+        ))
+        db_session.commit()
+        
+        before_delete = datetime.now()
+        assert CashFlowRepository(db_session).delete('CF-001', deleted_by='tester')
+        assert not CashFlowRepository(db_session).delete('CF-NOT-EXIST')
+        
+        service = ExportService(db_session)
+        result = service.export_tombstones(
+            since=before_delete,
+            format=ExportFormat.CSV,
+            entity_types=[DeletedEntityType.CASH_FLOW]
+        )
+        
+        content_str = result.content.decode('utf-8-sig')
+        rows = list(csv.DictReader(content_str.strip().split('\n')))
+        assert result.record_count == 1
+        assert rows[0]['实体ID'] == 'CF-001'
+        assert rows[0]['交易流水号'] == 'TXN-001'
+        assert rows[0]['删除人'] == 'tester'
+        assert result.next_watermark_id is not None
+
+    def test_delete_transaction_records_tombstones_for_children(self, db_session, sample_transaction):
+        """测试删除交易时其现金流和事件随之删除并登记墓碑"""
+        from app.repositories.transaction_repository import TransactionRepository
+        from app.models.event import EventRecord
+
+        db_session.add(sample_transaction)
+        db_session.add(CashFlow(
+            cash_flow_id='CF-001',
+            transaction_id=sample_transaction.transaction_id,
+            direction=Direction.RECEIVE,
+            currency='USD',
+            amount=10000.0,
+            payment_date=datetime(2026, 2, 28),
+            account_number='1234567890',
+            account_name='Test Account',
+            bank_name='Test Bank',
+            bank_code='TEST001',
+            settlement_method=SettlementMethod.GROSS,
+            current_status=CashFlowStatus.PENDING_NETTING,
+            progress_percentage=0,
+            version=1,
+            last_modified_date=datetime.now()
+        ))
+        db_session.add(EventRecord(
+            event_id='EVT-001',
+            external_id=sample_transaction.external_id,
+            transaction_id=sample_transaction.transaction_id,
+            product=sample_transaction.product,
+            account=sample_transaction.account,
+            event_type='BOOKED',
+            transaction_status=sample_transaction.status,
+            entry_date=sample_transaction.entry_date,
+            trade_date=sample_transaction.trade_date,
+            modified_date=datetime.now(),
+            back_office_status=sample_transaction.back_office_status,
+            operator='tester'
+        ))
+        db_session.commit()
+
+        before_delete = datetime.now()
+        assert TransactionRepository(db_session).delete('EXT-001', deleted_by='tester')
+        assert not TransactionRepository(db_session).delete('EXT-001')
+
+        result = ExportService(db_session).export_tombstones(since=before_delete, format=ExportFormat.CSV)
+
+        rows = list(csv.DictReader(result.content.decode('utf-8-sig').strip().split('\n')))
+        assert sorted(row['实体ID'] for row in rows) == ['CF-001', 'EVT-001', 'EXT-001']
+        assert {row['交易流水号'] for row in rows} == {'TXN-001'}
+        assert db_session.query(CashFlow).count() == 0
+        assert db_session.query(EventRecord).count() == 0
+
+
+class TestEnrichedCashFlowExport:
+    """关联交易信息的现金流导出测试"""
+    
+    @pytest.fixture
+    def linked_cash_flows(self, db_session, sample_transactions):
+        """为每笔交易创建一条现金流"""
+        for txn in sample_transactions:
+            db_session.add(txn)
+        db_session.commit()
+        
+        for i, txn in enumerate(sample_transactions):
+            db_session.add(CashFlow(
+                cash_flow_id=f'CF-{i:03d}',
+                transaction_id=txn.transaction_id,
+                direction=Direction.RECEIVE,
+                currency='USD',
+                amount=10000.0 + i,
+                payment_date=datetime(2026, 2, 28),
+                account_number=f'123456789{i}',
+                account_name=f'Test Account {i}',
+                bank_name='Test Bank',
+                bank_code='TEST001',
+                settlement_method=SettlementMethod.GROSS,
+                current_status=CashFlowStatus.PENDING_NETTING,
+                progress_percentage=0,
+                version=1,
+                last_modified_date=datetime.now()
+            ))
+        db_session.commit()
+        return sample_transactions
+    
+    def test_enriched_export_includes_transaction_columns(self, db_session, linked_cash_flows):
+        """测试关联导出包含交易信息列"""
+        service = ExportService(db_session)
+        result = service.export_cash_flows(
+            CashFlowQueryCriteria(cash_flow_id='CF-001'), ExportFormat.CSV, enriched=True
+        )
+        
+        content_str = result.content.decode('utf-8-sig')
+        rows = list(csv.DictReader(content_str.strip().split('\n')))
+        assert len(rows) == 1
+        assert rows[0]['现金流内部ID'] == 'CF-001'
+        assert rows[0]['交易对手'] == 'Bank B'
+        assert rows[0]['产品'] == ProductType.FX_FORWARD.value
+        assert rows[0]['交易日'] == '2026-02-26'
+        assert rows[0]['运营机构'] == 'BOCHK'
+        assert rows[0]['交易员'] == 'Trader B'
+    
+    def test_plain_export_excludes_transaction_columns(self, db_session, linked_cash_flows):
+        """测试默认导出不包含交易信息列"""
+        service = ExportService(db_session)
+        result = service.export_cash_flows(CashFlowQueryCriteria(), ExportFormat.CSV)
+        
+        headers = csv.DictReader(result.content.decode('utf-8-sig').strip().split('\n')).fieldnames
+        assert '交易对手' not in headers
+        assert result.record_count == len(linked_cash_flows)
+    
+    def test_transaction_level_filters_apply_to_cash_flows(self, db_session, linked_cash_flows):
+        """测试交易层条件通过半连接过滤现金流"""
+        service = ExportService(db_session)
+        criteria = CashFlowQueryCriteria(
+            product=ProductType.FX_SPOT,
+            trade_date_from=datetime(2026, 2, 24)
+        )
+        result = service.export_cash_flows(criteria, ExportFormat.CSV, enriched=True)
+        
+        rows = list(csv.DictReader(result.content.decode('utf-8-sig').strip().split('\n')))
+        assert result.record_count == 2
+        assert sorted(row['现金流内部ID'] for row in rows) == ['CF-000', 'CF-002']
+
 @pytest.fixture
 def sample_transaction(db_session):
     """创建示例交易"""
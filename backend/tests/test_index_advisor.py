@@ -0,0 +1,165 @@
+"""Tests for query workload capture and the index advisor"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.models.enums import CashFlowStatus, Direction
+from app.query_workload import QueryWorkloadRecorder, query_shape, query_workload
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.schemas.cash_flow import CashFlowQueryCriteria
+from app.schemas.common import PaginationParams
+from app.schemas.transaction import TransactionQueryCriteria
+from benchmarks.datagen import generate_dataset
+from benchmarks.index_advisor import DropRecommendation, ExistingIndex, IndexAdvisor, render_migration
+
+
+ADMIN_HEADERS = {"Authorization": "Bearer admin-token-456"}
+
+
+@pytest.fixture
+def recorder():
+    """进程级记录器（测试结束后停止并清空）"""
+    query_workload.start(reset=True)
+    yield query_workload
+    query_workload.stop()
+    query_workload.reset()
+
+
+@pytest.fixture(scope="module")
+def dataset_engine():
+    """生成的小规模数据集"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    generate_dataset(engine, 1000, seed=11)
+    yield engine
+    engine.dispose()
+
+
+class TestQueryWorkloadRecorder:
+    """查询负载记录测试"""
+
+    def test_shape_ignores_values_and_merges_ranges(self):
+        """测试形态与取值无关，from/to 合并为同一范围条件"""
+        first = query_shape("transactions", TransactionQueryCriteria(
+            trade_date_from="2025-01-01T00:00:00", trade_date_to="2025-02-01T00:00:00", currency="USD"
+        ), "trade_date", "desc")
+        second = query_shape("transactions", TransactionQueryCriteria(
+            trade_date_from="2024-06-01T00:00:00", currency="EUR"
+        ), "trade_date", "DESC")
+
+        assert first == second
+        assert first[1] == (("transactions.trade_date", "range"),)
+
+    def test_disabled_and_shape_limit(self):
+        """测试未开启时不记录，超出形态上限时只计数"""
+        recorder = QueryWorkloadRecorder(max_shapes=1, examples_per_shape=2)
+        recorder.record("cash_flows", CashFlowQueryCriteria(currency="USD"))
+        assert recorder.snapshot()["shapes"] == []
+
+        recorder.start()
+        for currency in ("USD", "EUR", "JPY"):
+            recorder.record("cash_flows", CashFlowQueryCriteria(currency=currency))
+        recorder.record("cash_flows", CashFlowQueryCriteria(direction=Direction.PAY))
+
+        snapshot = recorder.snapshot()
+        assert snapshot["dropped"] == 1
+        assert snapshot["shapes"][0]["count"] == 3
+        assert snapshot["shapes"][0]["examples"] == [{"currency": "EUR"}, {"currency": "JPY"}]
+
+    def test_repository_records_shape(self, recorder, dataset_engine):
+        """测试仓储查询时记录形态"""
+        with Session(dataset_engine) as session:
+            CashFlowRepository(session).find_by_criteria(
+                CashFlowQueryCriteria(currency="USD", counterparty="CP"), PaginationParams()
+            )
+
+        shape = recorder.snapshot()["shapes"][0]
+        assert shape["entity"] == "cash_flows"
+        assert shape["filters"] == [
+            ["cash_flows.currency", "eq"], ["transactions.counterparty", "contains"]
+        ]
+        assert shape["sort_by"] == "payment_date"
+
+    def test_admin_endpoints(self, recorder):
+        """测试管理接口开启、导出和停止记录"""
+        client = TestClient(app)
+
+        started = client.post("/api/admin/query-workload/start", params={"reset": True}, headers=ADMIN_HEADERS)
+        recorder.record("transactions", TransactionQueryCriteria(source="GIT"))
+        workload = client.get("/api/admin/query-workload", headers=ADMIN_HEADERS)
+        stopped = client.post("/api/admin/query-workload/stop", headers=ADMIN_HEADERS)
+
+        assert started.json() == {"recording": True}
+        assert workload.json()["shapes"][0]["filters"] == [["transactions.source", "eq"]]
+        assert stopped.json() == {"recording": False}
+
+
+class TestIndexAdvisor:
+    """索引顾问测试"""
+
+    def _workload(self):
+        recorder = QueryWorkloadRecorder()
+        recorder.start()
+        for _ in range(5):
+            recorder.record(
+                "cash_flows", CashFlowQueryCriteria(currency="USD", direction=Direction.PAY), "payment_date", "DESC"
+            )
+        recorder.record(
+            "cash_flows", CashFlowQueryCriteria(status=CashFlowStatus.PENDING_NETTING), "payment_date", "DESC"
+        )
+        return recorder.snapshot()
+
+    def test_recommends_composite_partial_and_redundant_drops(self, dataset_engine):
+        """测试推荐组合索引、部分索引，并找出被前缀覆盖的冗余索引"""
+        advisor = IndexAdvisor(dataset_engine, self._workload())
+        advisor.replay()
+        additions, drops = advisor.recommend()
+
+        created = {(a.table, tuple(a.columns), a.where) for a in additions}
+        assert ("cash_flows", ("currency", "direction", "payment_date"), None) in created
+        assert ("cash_flows", ("payment_date",), "current_status IN (10)") in created
+
+        dropped = {drop.index.name: drop for drop in drops}
+        assert dropped["idx_currency_direction"].verified
+        assert "ix_cash_flows_currency_direction_payment_date" in dropped["ix_cash_flows_currency"].reason
+
+    def test_partial_indexes_are_not_prefix_redundant(self, dataset_engine):
+        """测试部分索引（SQLite 上反射为 sqlite_where）不替代全量索引，也不被前缀覆盖删除"""
+        advisor = IndexAdvisor(dataset_engine, self._workload())
+        advisor.replay()
+        _, drops = advisor.recommend()
+
+        dropped = {drop.index.name: drop for drop in drops}
+        assert "idx_active_currency_direction" not in dropped
+        assert "idx_active_payment_date_status" not in dropped
+        assert "idx_active" not in dropped["ix_cash_flows_payment_date"].reason
+
+    def test_migration_draft_is_reversible_python(self, dataset_engine):
+        """测试迁移草稿为合法Python，且降级逆序撤销"""
+        advisor = IndexAdvisor(dataset_engine, self._workload())
+        advisor.replay()
+        additions, drops = advisor.recommend()
+
+        source = render_migration(additions, drops, "002", "003")
+        compile(source, "003_index_advisor_draft.py", "exec")
+        assert "down_revision = '002'" in source
+        upgrade, downgrade = source.split("def downgrade")
+        assert "postgresql_where=sa.text(" in upgrade
+        assert "op.drop_index('ix_cash_flows_currency_direction_payment_date'" in downgrade
+
+    def test_migration_draft_restores_partial_index_predicate(self):
+        """测试降级重建被删除的部分索引时带上 WHERE 条件"""
+        index = ExistingIndex(
+            table="cash_flows", name="idx_active_currency_direction",
+            columns=["currency", "direction"], where="current_status IN (10, 20)"
+        )
+        source = render_migration([], [DropRecommendation(index, "unused", True)], "002", "003")
+
+        downgrade = source.split("def downgrade")[1]
+        assert (
+            "op.create_index('idx_active_currency_direction', 'cash_flows', ['currency', 'direction'], "
+            "postgresql_where=sa.text('current_status IN (10, 20)'), "
+            "sqlite_where=sa.text('current_status IN (10, 20)'))"
+        ) in downgrade
@@ -0,0 +1,147 @@
+"""Tests for JWT authentication"""
+import json
+import os
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.middleware.auth import AuthService, Permission, User
+from app.middleware.jwt_auth import JWTAuthenticator, VerifiedTokenCache
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks_file(tmp_path, private_key):
+    """写入包含签名公钥的JWKS文件"""
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "key-1", "use": "sig", "alg": "RS256"})
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [jwk]}), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def make_token(private_key):
+    def make(kid="key-1", expires_in=300, **claims):
+        payload = {
+            "iss": "sso",
+            "sub": "user-100",
+            "preferred_username": "jwt_user",
+            "scope": "query:transactions export:transactions unknown:scope",
+            "exp": int(time.time()) + expires_in,
+        }
+        payload.update(claims)
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+    return make
+
+
+class TestUser:
+    """用户模型测试"""
+
+    def test_user_is_immutable(self):
+        """测试用户对象不可修改"""
+        user = User("u-1", "name", [Permission.QUERY_TRANSACTIONS])
+
+        with pytest.raises(AttributeError):
+            user.username = "other"
+        assert user.permissions == frozenset([Permission.QUERY_TRANSACTIONS])
+
+
+class TestJWTAuthenticator:
+    """JWT认证器测试"""
+
+    def test_valid_token_decodes_permissions(self, jwks_file, make_token):
+        """测试有效令牌解码为用户并忽略未知权限"""
+        user = JWTAuthenticator(jwks_file).authenticate(make_token())
+
+        assert user.user_id == "user-100"
+        assert user.username == "jwt_user"
+        assert user.permissions == frozenset(
+            [Permission.QUERY_TRANSACTIONS, Permission.EXPORT_TRANSACTIONS]
+        )
+
+    def test_verified_token_is_cached(self, jwks_file, make_token, monkeypatch):
+        """测试同一令牌只做一次签名校验"""
+        authenticator = JWTAuthenticator(jwks_file)
+        token = make_token()
+        first = authenticator.authenticate(token)
+
+        monkeypatch.setattr(authenticator, "_verify", lambda t: pytest.fail("cache miss"))
+        assert authenticator.authenticate(token) is first
+
+    @pytest.mark.parametrize("overrides", [
+        {"expires_in": -120},
+        {"kid": "unknown"},
+        {"iss": "other-issuer"},
+    ])
+    def test_invalid_tokens_are_rejected(self, jwks_file, make_token, overrides):
+        """测试过期、未知密钥和签发者不符的令牌被拒绝"""
+        authenticator = JWTAuthenticator(jwks_file, issuer="sso")
+
+        assert authenticator.authenticate(make_token(**overrides)) is None
+
+    def test_tampered_signature_is_rejected(self, jwks_file, make_token):
+        """测试篡改后的令牌被拒绝"""
+        header, payload, signature = make_token().split(".")
+        tampered = f"{header}.{payload}.{signature[:-4]}AAAA"
+
+        assert JWTAuthenticator(jwks_file).authenticate(tampered) is None
+
+    def test_missing_jwks_file_keeps_cached_keys(self, jwks_file, make_token):
+        """测试JWKS文件在轮换中缺失时未知密钥按认证失败处理，已加载密钥仍可用"""
+        authenticator = JWTAuthenticator(jwks_file)
+        os.remove(jwks_file)
+
+        assert authenticator.authenticate(make_token(kid="rotated")) is None
+        assert authenticator.authenticate(make_token()).user_id == "user-100"
+
+
+class TestVerifiedTokenCache:
+    """已验证令牌缓存测试"""
+
+    def test_lru_eviction_and_expiry(self):
+        """测试超出容量淘汰最久未用条目且过期条目失效"""
+        cache = VerifiedTokenCache(max_size=2)
+        user = User("u-1", "name", [])
+        cache.put(b"a", user, expires_at=100)
+        cache.put(b"b", user, expires_at=100)
+        cache.get(b"a", now=0)
+        cache.put(b"c", user, expires_at=100)
+
+        assert cache.get(b"b", now=0) is None
+        assert cache.get(b"a", now=0) is user
+        assert cache.get(b"c", now=100) is None
+        assert len(cache) == 1
+
+    def test_not_yet_valid_entry_is_not_returned(self):
+        """测试命中时校验生效时间"""
+        cache = VerifiedTokenCache()
+        user = User("u-1", "name", [])
+        cache.put(b"a", user, expires_at=100, not_before=50)
+
+        assert cache.get(b"a", now=10) is None
+        assert cache.get(b"a", now=50) is user
+
+
+class TestAuthServiceConfiguration:
+    """认证服务配置测试"""
+
+    def test_jwt_and_static_tokens(self, jwks_file, make_token):
+        """测试JWT令牌交由认证器校验，静态令牌可关闭"""
+        try:
+            AuthService.configure(JWTAuthenticator(jwks_file), static_tokens_enabled=False)
+            assert AuthService.authenticate(make_token()).user_id == "user-100"
+            assert AuthService.authenticate("test-token-123") is None
+        finally:
+            AuthService.configure()
+
+        assert AuthService.authenticate("test-token-123").user_id == "user-001"
@@ -0,0 +1,70 @@
+"""Tests for the in-process load test harness"""
+import asyncio
+
+from app.api.dependencies import get_db
+from app.main import app
+from benchmarks.loadtest import (
+    TOTAL,
+    JourneyOptions,
+    LoadRecorder,
+    in_process_client,
+    percentile,
+    run_load_test
+)
+
+
+class TestLoadRecorder:
+    """压测统计测试"""
+
+    def test_percentile_nearest_rank(self):
+        """测试最近秩分位数"""
+        samples = [float(i) for i in range(1, 101)]
+
+        assert percentile(samples, 0.50) == 50.0
+        assert percentile(samples, 0.99) == 99.0
+        assert percentile([], 0.99) == 0.0
+
+    def test_ramp_excluded_and_errors_counted(self):
+        """测试爬坡期请求不计入，错误率按接口统计"""
+        recorder = LoadRecorder()
+        recorder.record('GET /a', 100.0)
+        recorder.recording = True
+        recorder.record('GET /a', 10.0)
+        recorder.record('GET /a', 20.0, '500')
+        recorder.record('GET /b', 5.0)
+
+        summary = recorder.summary(elapsed=2.0)
+
+        assert summary['GET /a']['requests'] == 2
+        assert summary['GET /a']['error_rate'] == 0.5
+        assert summary['GET /a']['errors'] == {'500': 1}
+        assert summary[TOTAL]['requests'] == 3
+        assert summary[TOTAL]['throughput_rps'] == 1.5
+
+
+class TestRunLoadTest:
+    """压测运行测试"""
+
+    def test_journeys_cover_all_endpoints_without_errors(self):
+        """测试操作流程覆盖查询、详情、进度轮询和导出且无错误"""
+        options = JourneyOptions(think_time=0, poll_interval=0, polls=1, export_ratio=1.0)
+
+        async def scenario():
+            async with in_process_client(None, transactions=200, seed=1) as client:
+                return await run_load_test(client, [3], ramp=0.1, duration=1.0, options=options)
+
+        try:
+            stages = asyncio.run(scenario())
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        endpoints = stages[0]['endpoints']
+        assert stages[0]['concurrency'] == 3
+        assert {
+            'GET /api/transactions',
+            'GET /api/transactions/{external_id}',
+            'GET /api/transactions/{transaction_id}/progress',
+            'GET /api/export/cash-flows',
+        } <= set(endpoints)
+        assert endpoints[TOTAL]['requests'] > 0
+        assert endpoints[TOTAL]['error_rate'] == 0.0
@@ -0,0 +1,152 @@
+"""Tests for structured and queued logging"""
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from app import logging_config
+from app.logging_config import (
+    ContextFilter,
+    JsonFormatter,
+    SamplingFilter,
+    request_id_var,
+    setup_logging,
+    stop_logging
+)
+
+
+def _make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("app.test", level, __file__, 10, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestContextFilter:
+    """上下文过滤器测试"""
+
+    def test_request_id_from_context(self):
+        """测试从上下文变量读取请求ID"""
+        token = request_id_var.set("req-123")
+        try:
+            record = _make_record()
+            ContextFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-123"
+
+    def test_explicit_request_id_is_kept(self):
+        """测试 extra 中显式传入的请求ID优先"""
+        record = _make_record(request_id="explicit")
+        ContextFilter().filter(record)
+
+        assert record.request_id == "explicit"
+
+
+class TestJsonFormatter:
+    """JSON格式化器测试"""
+
+    def test_output_contains_message_and_extra(self):
+        """测试输出合并消息参数并包含 extra 字段"""
+        record = _make_record(request_id="req-1", status_code=200, path="/api/交易")
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "app.test"
+        assert entry["request_id"] == "req-1"
+        assert entry["status_code"] == 200
+        assert entry["path"] == "/api/交易"
+
+    def test_exception_is_serialized(self):
+        """测试异常堆栈输出到 exception 字段"""
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = logging.LogRecord(
+                "app.test", logging.ERROR, __file__, 10, "failed", (), sys.exc_info()
+            )
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "RuntimeError: boom" in entry["exception"]
+
+
+class TestSamplingFilter:
+    """采样过滤器测试"""
+
+    def test_rate_bounds(self):
+        """测试采样率为0时全部丢弃、为1时全部保留"""
+        records = [_make_record(request_id=f"req-{i}") for i in range(50)]
+
+        assert not any(SamplingFilter(0.0).filter(r) for r in records)
+        assert all(SamplingFilter(1.0).filter(r) for r in records)
+
+    def test_same_request_is_sampled_consistently(self):
+        """测试同一请求的开始/完成日志采样结果一致"""
+        sampler = SamplingFilter(0.5)
+        for i in range(50):
+            start = _make_record(msg="Request started", args=(), request_id=f"req-{i}")
+            complete = _make_record(msg="Request completed", args=(), request_id=f"req-{i}")
+            assert sampler.filter(start) == sampler.filter(complete)
+
+    def test_warnings_are_never_sampled(self):
+        """测试WARNING及以上级别不参与采样"""
+        record = _make_record(level=logging.WARNING, request_id="req-1")
+
+        assert SamplingFilter(0.0).filter(record)
+
+
+class TestQueuedLogging:
+    """队列日志测试"""
+
+    @pytest.fixture
+    def queued_output(self, request, monkeypatch):
+        """
+        以队列JSON模式重新配置根日志记录器，返回输出缓冲区
+
+        需在测试运行前完成配置：测试执行阶段 pytest 会向根记录器挂载捕获处理器，
+        此时 basicConfig 不再生效
+        """
+        root = logging.getLogger()
+        original_handlers = root.handlers[:]
+        original_level = root.level
+        root.handlers = []
+        stream = io.StringIO()
+        monkeypatch.setattr(logging_config.sys, "stdout", stream)
+        setup_logging(log_format="json", use_queue=True, sample_rates=getattr(request, "param", None))
+        yield stream
+        stop_logging()
+        root.handlers = original_handlers
+        root.setLevel(original_level)
+        logging.getLogger("app.sampled").filters = []
+
+    def test_records_are_written_by_background_thread(self, queued_output):
+        """测试经队列写出JSON日志并保留请求上下文"""
+        token = request_id_var.set("req-queued")
+        try:
+            logging.getLogger("app.queued").info("queued %d", 1, extra={"rows": 5})
+        finally:
+            request_id_var.reset(token)
+        stop_logging()
+
+        entries = [json.loads(line) for line in queued_output.getvalue().splitlines()]
+        entry = next(e for e in entries if e["logger"] == "app.queued")
+        assert entry["message"] == "queued 1"
+        assert entry["request_id"] == "req-queued"
+        assert entry["rows"] == 5
+
+    @pytest.mark.parametrize("queued_output", [{"app.sampled": 0.0}], indirect=True)
+    def test_per_logger_sampling(self, queued_output):
+        """测试按日志记录器配置采样率"""
+        logging.getLogger("app.sampled").info("dropped")
+        logging.getLogger("app.sampled").warning("kept")
+        stop_logging()
+
+        messages = [json.loads(line)["message"] for line in queued_output.getvalue().splitlines()]
+        assert "dropped" not in messages
+        assert "kept" in messages
@@ -0,0 +1,181 @@
+"""Tests for metrics registry and /metrics endpoint"""
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.metrics import (
+    MetricsRegistry,
+    EXPORT_ROWS,
+    EXPORT_BYTES,
+    OPTIMISTIC_LOCK_CONFLICTS,
+    HTTP_REQUEST_DURATION
+)
+from app.middleware.metrics import MetricsMiddleware
+from app.models.transaction import Transaction
+from app.models.enums import (
+    ProductType, TransactionStatus, BackOfficeStatus,
+    SettlementMethod, ConfirmationType, TransactionSource, Direction
+)
+from app.services.concurrency_control import TransactionConcurrencyControl, OptimisticLockError
+
+
+class TestMetricsRegistry:
+    """指标注册表测试"""
+
+    def test_counter_and_gauge_render(self):
+        """测试计数器和仪表的文本格式输出"""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "任务数", ("kind",))
+        gauge = registry.gauge("queue_depth", "队列深度")
+
+        counter.labels("export").inc()
+        counter.labels("export").inc(2)
+        gauge.set(7)
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="export"} 3' in text
+        assert "queue_depth 7" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """测试直方图桶计数累加输出"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "耗时", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 3.65" in text
+
+    def test_label_values_are_escaped(self):
+        """测试标签值转义"""
+        registry = MetricsRegistry()
+        registry.counter("escaped_total", "转义", ("path",)).labels('a"b\\c').inc()
+
+        assert 'escaped_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_gauge_function_without_value_is_skipped(self):
+        """测试回调仪表返回None时不输出样本"""
+        registry = MetricsRegistry()
+        registry.gauge("pool_size", "连接池大小").set_function(lambda: None)
+
+        text = registry.render()
+        assert "# TYPE pool_size gauge" in text
+        assert "\npool_size " not in text
+
+    def test_wrong_label_count_raises(self):
+        """测试标签数量不匹配时报错"""
+        registry = MetricsRegistry()
+        counter = registry.counter("labelled_total", "标签", ("a", "b"))
+
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_metric_type_without_child_cannot_be_created(self):
+        """测试未实现子序列创建的指标类型在创建时即报错"""
+        from app.metrics import _Metric
+
+        class Summary(_Metric):
+            type_name = "summary"
+
+        with pytest.raises(TypeError, match="_new_child"):
+            Summary("summary_seconds", "摘要")
+
+
+class TestMetricsMiddleware:
+    """请求指标中间件测试"""
+
+    def test_route_template_is_used_as_label(self):
+        """测试使用路由模板而非实际路径作为标签"""
+        app = FastAPI()
+
+        @app.get("/api/metrics-test/{item_id}")
+        async def item(item_id: str):
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware)
+        client = TestClient(app)
+
+        client.get("/api/metrics-test/A-1")
+        client.get("/api/metrics-test/A-2")
+        client.get("/no-such-path")
+
+        count, _ = HTTP_REQUEST_DURATION.labels(
+            "GET", "/api/metrics-test/{item_id}", "200"
+        ).snapshot()
+        assert sum(count) >= 2
+        unmatched, _ = HTTP_REQUEST_DURATION.labels("GET", "unmatched", "404").snapshot()
+        assert sum(unmatched) >= 1
+
+    def test_metrics_endpoint_is_public(self):
+        """测试 /metrics 无需认证并输出文本格式"""
+        from app.main import app
+
+        client = TestClient(app)
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+        assert "http_requests_in_flight" in response.text
+
+
+class TestDomainMetrics:
+    """业务指标测试"""
+
+    def test_export_rows_counter(self, db_session):
+        """测试导出行数和字节数计数"""
+        from app.schemas.transaction import TransactionQueryCriteria
+        from app.services.export_service import ExportService, ExportFormat
+
+        rows_before = EXPORT_ROWS.labels("transaction", "csv").get()
+        bytes_before = EXPORT_BYTES.labels("transaction", "csv").get()
+        result = ExportService(db_session).export_transactions(
+            TransactionQueryCriteria(), ExportFormat.CSV
+        )
+
+        # 空结果仅包含表头
+        assert EXPORT_ROWS.labels("transaction", "csv").get() == rows_before
+        assert EXPORT_BYTES.labels("transaction", "csv").get() == bytes_before + len(result.content)
+
+    def test_optimistic_lock_conflict_counter(self, db_session):
+        """测试乐观锁冲突计数"""
+        db_session.add(Transaction(
+            external_id="EXT-LOCK-001",
+            transaction_id="TXN-LOCK-001",
+            entry_date=datetime.now(),
+            trade_date=datetime.now(),
+            value_date=datetime.now(),
+            maturity_date=datetime.now(),
+            account="ACC-001",
+            product=ProductType.FX_SPOT,
+            direction=Direction.BUY,
+            underlying="USD/CNY",
+            counterparty="Bank A",
+            status=TransactionStatus.EFFECTIVE,
+            back_office_status=BackOfficeStatus.CONFIRMED,
+            settlement_method=SettlementMethod.GROSS,
+            confirmation_type=ConfirmationType.SWIFT,
+            nature="Normal",
+            source=TransactionSource.GIT,
+            operating_institution="BOCHK",
+            trader="Trader A",
+            version=2,
+            last_modified_by="system"
+        ))
+        db_session.commit()
+        before = OPTIMISTIC_LOCK_CONFLICTS.labels("Transaction").get()
+
+        with pytest.raises(OptimisticLockError):
+            TransactionConcurrencyControl(db_session).update_with_version_check(
+                Transaction, "EXT-LOCK-001", 1, {"trader": "Trader B"}
+            )
+
+        assert OPTIMISTIC_LOCK_CONFLICTS.labels("Transaction").get() == before + 1
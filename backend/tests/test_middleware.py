@@ -0,0 +1,107 @@
+"""Tests for logging, auth and error handling middleware"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.auth import auth_middleware
+from app.middleware.error_handler import error_handler_middleware
+from app.middleware.logging_middleware import logging_middleware
+
+
+AUTH_HEADERS = {"Authorization": "Bearer test-token-123"}
+
+
+@pytest.fixture
+def client():
+    """创建与主应用相同中间件顺序的测试应用"""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/api/transactions/state")
+    async def state(request: Request):
+        return {
+            "request_id": request.state.request_id,
+            "user_id": request.state.user.user_id
+        }
+
+    @app.get("/api/transactions/missing")
+    async def missing():
+        raise ValueError("RESOURCE_NOT_FOUND: 未找到交易")
+
+    @app.get("/api/transactions/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    @app.get("/api/transactions/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a,b\n", b"1,2\n"]), media_type="text/csv")
+
+    logging_middleware(app)
+    auth_middleware(app)
+    error_handler_middleware(app)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestMiddlewareStack:
+    """纯ASGI中间件链测试"""
+
+    def test_public_path_has_request_headers(self, client):
+        """测试公开路径无需认证且带有请求ID和处理时间"""
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] != "unknown"
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    def test_request_state_is_shared(self, client):
+        """测试请求ID和用户信息写入 request.state"""
+        response = client.get("/api/transactions/state", headers=AUTH_HEADERS)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["request_id"] == response.headers["X-Request-ID"]
+        assert body["user_id"] == "user-001"
+
+    @pytest.mark.parametrize("headers, message", [
+        ({}, "缺少认证令牌"),
+        ({"Authorization": "test-token-123"}, "无效的认证令牌格式"),
+        ({"Authorization": "Basic test-token-123"}, "无效的认证令牌格式"),
+        ({"Authorization": "Bearer invalid-token"}, "无效的认证令牌"),
+    ])
+    def test_authentication_failures_return_401(self, client, headers, message):
+        """测试认证失败返回401 JSON"""
+        response = client.get("/api/transactions/state", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json() == {"code": "UNAUTHORIZED", "message": message}
+
+    def test_value_error_is_mapped_by_code(self, client):
+        """测试业务错误按错误代码映射状态码"""
+        response = client.get("/api/transactions/missing", headers=AUTH_HEADERS)
+
+        assert response.status_code == 404
+        body = response.json()
+        assert body["code"] == "RESOURCE_NOT_FOUND"
+        assert body["message"] == "未找到交易"
+        assert body["request_id"]
+
+    def test_unexpected_error_returns_500(self, client):
+        """测试未预期错误返回500且不暴露细节"""
+        response = client.get("/api/transactions/broken", headers=AUTH_HEADERS)
+
+        assert response.status_code == 500
+        body = response.json()
+        assert body["code"] == "INTERNAL_ERROR"
+        assert body["details"] == {"error_type": "RuntimeError"}
+
+    def test_streaming_response_passes_through(self, client):
+        """测试流式响应正常透传并带有请求头"""
+        response = client.get("/api/transactions/stream", headers=AUTH_HEADERS)
+
+        assert response.status_code == 200
+        assert response.text == "a,b\n1,2\n"
+        assert "X-Process-Time" in response.headers
@@ -0,0 +1,112 @@
+"""Tests for Alembic migrations on seeded SQLite databases"""
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("alembic")
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Date, create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.cash_flow import CashFlow
+from app.models.event import EventRecord
+from app.models.transaction import Transaction
+from benchmarks.datagen import generate_dataset
+
+
+VERSIONS = Path(__file__).resolve().parent.parent / 'alembic' / 'versions'
+
+
+def _revisions():
+    """按修订号顺序加载迁移模块"""
+    modules = []
+    for path in sorted(VERSIONS.glob('0*.py')):
+        spec = importlib.util.spec_from_file_location(f'migration_{path.stem}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules.append(module)
+    return modules
+
+
+def _run(engine, modules, direction):
+    """在同一事务中依次执行迁移的 upgrade/downgrade"""
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={'transactional_ddl': True})
+        with Operations.context(context), context.begin_transaction():
+            for module in modules:
+                getattr(module, direction)()
+
+
+def _copy_as_datetimes(source, target):
+    """把数据集复制到迁移后的库，DATE 列按 008 之前 DateTime 的文本格式写入"""
+    tables = set(inspect(target).get_table_names())
+    with source.connect() as src, target.begin() as dst:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            columns = [column['name'] for column in inspect(target).get_columns(table.name)]
+            dates = {column.name for column in table.columns if isinstance(column.type, Date)}
+            rows = [
+                tuple(f'{value} 00:00:00.000000' if name in dates else value for name, value in zip(columns, row))
+                for row in src.exec_driver_sql(f"SELECT {', '.join(columns)} FROM {table.name}")
+            ]
+            if rows:
+                dst.exec_driver_sql(
+                    f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows
+                )
+
+
+class TestDateMigration:
+    """迁移 008（营业日期改为 DATE）测试"""
+
+    @pytest.fixture
+    def databases(self, tmp_path):
+        """迁移到 007 并写入带时间部分的营业日期，返回 (数据集库, 迁移库, 迁移模块)"""
+        modules = _revisions()
+        source = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+        generate_dataset(source, 20, seed=3)
+        target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+        _run(target, [m for m in modules if m.revision < '008'], 'upgrade')
+        _copy_as_datetimes(source, target)
+        yield source, target, next(m for m in modules if m.revision == '008')
+        source.dispose()
+        target.dispose()
+
+    def test_upgrade_keeps_dates_readable(self, databases):
+        """测试 008 截掉时间部分后，营业日期可经 ORM 按日期原样读出"""
+        source, target, migration = databases
+        _run(target, [migration], 'upgrade')
+
+        queries = [
+            select(Transaction.external_id, Transaction.trade_date, Transaction.value_date, Transaction.maturity_date),
+            select(EventRecord.event_id, EventRecord.trade_date),
+            select(CashFlow.cash_flow_id, CashFlow.payment_date),
+        ]
+        with Session(source) as expected, Session(target) as migrated:
+            for query in queries:
+                rows = sorted(migrated.execute(query).all())
+                assert rows and rows == sorted(expected.execute(query).all())
+                assert all(type(value) is date for row in rows for value in row[1:])
+
+            day = migrated.scalar(select(Transaction.trade_date))
+            assert migrated.scalar(
+                select(Transaction.external_id).where(Transaction.trade_date <= day, Transaction.trade_date >= day)
+            ) is not None
+
+    def test_downgrade_restores_datetime_text(self, databases):
+        """测试降级恢复 008 之前的日期时间文本"""
+        _, target, migration = databases
+        _run(target, [migration], 'upgrade')
+        _run(target, [migration], 'downgrade')
+
+        with target.connect() as conn:
+            values = conn.exec_driver_sql(
+                'SELECT trade_date FROM events UNION ALL SELECT payment_date FROM cash_flows'
+            ).scalars().all()
+        assert values and all(value.endswith(' 00:00:00.000000') for value in values)
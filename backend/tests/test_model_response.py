@@ -0,0 +1,68 @@
+"""Tests for fast model JSON responses"""
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.responses import ModelJSONResponse, model_response
+from app.models.enums import BackOfficeStatus, ProductType, SettlementMethod, TransactionStatus
+from app.schemas.common import PagedResult, PaginationMeta
+from app.schemas.transaction import TransactionSummary
+
+
+def _paged_summaries() -> PagedResult:
+    """构造与查询服务返回结构一致的分页结果"""
+    summary = TransactionSummary(
+        external_id='EXT-001',
+        transaction_id='TXN-001',
+        entry_date=datetime(2026, 2, 27, 10, 0, 0),
+        trade_date=datetime(2026, 2, 27, 9, 30, 15),
+        value_date=datetime(2026, 3, 2),
+        maturity_date=datetime(2026, 3, 27),
+        account='ACC-001',
+        product=ProductType.FX_SPOT,
+        direction='BUY',
+        underlying='USD/CNY',
+        counterparty='中国银行',
+        status=TransactionStatus.EFFECTIVE,
+        back_office_status=BackOfficeStatus.CONFIRMED,
+        settlement_method=SettlementMethod.GROSS,
+        confirmation_number=None,
+        confirmation_type='SWIFT',
+        confirmation_match_type=None,
+        nature='Normal',
+        source='GIT',
+        latest_event_type=None,
+        operating_institution='BOCHK',
+        trader='Trader A'
+    )
+    return PagedResult(
+        data=[summary],
+        pagination=PaginationMeta(current_page=1, total_pages=1, total_records=1, page_size=20)
+    )
+
+
+class TestModelJSONResponse:
+    """快速JSON响应测试"""
+
+    def test_output_matches_default_encoding(self):
+        """测试输出与FastAPI默认序列化结果一致"""
+        result = _paged_summaries()
+
+        response = model_response(result)
+
+        assert json.loads(response.body) == jsonable_encoder(result)
+        assert response.media_type == 'application/json'
+
+    def test_non_ascii_is_not_escaped(self):
+        """测试中文字段按UTF-8原样输出"""
+        response = model_response(_paged_summaries())
+
+        assert '中国银行'.encode('utf-8') in response.body
+
+    def test_plain_content_is_supported(self):
+        """测试非模型内容同样可以序列化"""
+        response = ModelJSONResponse(content={'status': 'ok', 'count': 1}, status_code=201)
+
+        assert json.loads(response.body) == {'status': 'ok', 'count': 1}
+        assert response.status_code == 201
@@ -0,0 +1,104 @@
+"""Tests for monthly partition maintenance planning"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, make_transient
+from sqlalchemy.pool import StaticPool
+
+from app.models.cash_flow import CashFlow
+from app.models.event import EventRecord
+
+from app.partitioning import (
+    Partition,
+    PartitionManager,
+    add_months,
+    create_partition_sql,
+    detachable_retention,
+    partition_name,
+    plan_detach_partitions,
+    plan_future_partitions,
+)
+from app.repositories.cash_flow_repository import CashFlowRepository
+from app.repositories.event_repository import EventRepository
+from benchmarks.datagen import generate_dataset
+
+
+def _monthly(table, first, count):
+    """连续 count 个月的分区（外加默认分区）"""
+    partitions = [Partition(f"{table}_default", None, None)]
+    for offset in range(count):
+        month = add_months(first, offset)
+        partitions.append(Partition(partition_name(table, month), month, add_months(month, 1)))
+    return partitions
+
+
+class TestPartitionPlanning:
+    """分区维护计划测试"""
+
+    def test_month_arithmetic_and_ddl(self):
+        """测试跨年月份加减和分区DDL"""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert create_partition_sql("events", date(2026, 12, 1)) == (
+            "CREATE TABLE IF NOT EXISTS events_p202612 PARTITION OF events "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+        )
+
+    def test_plans_only_missing_future_months(self):
+        """测试只创建当前月至未来N个月中缺失的分区"""
+        existing = _monthly("cash_flows", date(2026, 8, 1), 4)  # 8月至11月
+
+        planned = plan_future_partitions(existing, 3, today=date(2026, 10, 19))
+
+        assert planned == [date(2026, 12, 1), date(2027, 1, 1)]
+
+    def test_detaches_partitions_outside_retention(self):
+        """测试分离保留期之前的分区，保留0表示不分离"""
+        existing = _monthly("events", date(2026, 1, 1), 10)  # 1月至10月
+
+        detached = plan_detach_partitions(existing, 6, today=date(2026, 10, 19))
+
+        assert [p.name for p in detached] == ["events_p202601", "events_p202602", "events_p202603"]
+        assert plan_detach_partitions(existing, 0, today=date(2026, 10, 19)) == []
+
+    def test_cash_flow_partitions_are_never_detached(self):
+        """测试现金流的保留期配置被忽略"""
+        assert detachable_retention({"events": 6, "cash_flows": 12}) == {"events": 6}
+
+    def test_maintenance_is_noop_on_sqlite(self):
+        """测试非 PostgreSQL 数据库上分区维护为空操作"""
+        manager = PartitionManager(create_engine("sqlite://"))
+
+        assert manager.maintain(months_ahead=3) == {}
+        assert manager.describe() == {}
+
+
+class TestRecordIdUniqueness:
+    """分区表业务ID唯一性测试（分区后主键含分区键，由仓储保证ID唯一）"""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        generate_dataset(engine, 20, seed=5)
+        with Session(engine) as session:
+            yield session
+        engine.dispose()
+
+    @pytest.mark.parametrize("model, repository_class, key", [
+        (CashFlow, CashFlowRepository, "payment_date"),
+        (EventRecord, EventRepository, "modified_date"),
+    ])
+    def test_duplicate_id_in_another_partition_is_rejected(self, session, model, repository_class, key):
+        """测试分区键不同但ID相同的记录被拒绝，且不写入"""
+        duplicate = session.scalars(select(model).limit(1)).one()
+        session.expunge(duplicate)
+        make_transient(duplicate)
+        setattr(duplicate, key, getattr(duplicate, key) + timedelta(days=40))
+        total = session.scalar(select(func.count()).select_from(model))
+
+        with pytest.raises(ValueError, match="RESOURCE_ALREADY_EXISTS"):
+            repository_class(session).create(duplicate)
+
+        session.rollback()
+        assert session.scalar(select(func.count()).select_from(model)) == total
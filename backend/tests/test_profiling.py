@@ -0,0 +1,122 @@
+"""Tests for admin profiling endpoints"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.profiling import MemoryProfiler, SamplingProfiler, memory_profiler
+
+
+ADMIN_HEADERS = {"Authorization": "Bearer admin-token-456"}
+USER_HEADERS = {"Authorization": "Bearer test-token-123"}
+
+
+def _busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def client():
+    """主应用测试客户端（诊断接口不访问数据库）"""
+    yield TestClient(app)
+    memory_profiler.stop()
+
+
+class TestSamplingProfiler:
+    """统计采样分析器测试"""
+
+    def test_collapsed_stacks_contain_busy_thread(self):
+        """测试忙碌线程的调用栈以根帧在前的折叠格式输出"""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            result = SamplingProfiler(duration=0.2, interval=0.005).run()
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = result.to_collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        assert result.samples > 0
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any(frame.startswith("_busy_loop (test_profiling.py:") for frame in stack.split(";"))
+
+    def test_concurrent_profile_is_rejected(self):
+        """测试同时只允许一个采样任务"""
+        profiler = SamplingProfiler(duration=0.3, interval=0.01)
+        runner = threading.Thread(target=profiler.run)
+        runner.start()
+        try:
+            threading.Event().wait(0.05)
+            with pytest.raises(ValueError, match="PROFILER_BUSY"):
+                SamplingProfiler(duration=0.1).run()
+        finally:
+            runner.join()
+
+
+class TestMemoryProfiler:
+    """内存分析器测试"""
+
+    def test_growth_against_baseline(self):
+        """测试快照相对基线报告内存增长"""
+        profiler = MemoryProfiler()
+        profiler.start(frames=1)
+        try:
+            retained = [bytearray(1024) for _ in range(200)]
+            snapshot = profiler.snapshot(limit=5)
+        finally:
+            profiler.stop()
+
+        assert snapshot["current"] > 0
+        assert any(
+            "test_profiling.py" in stat.location and stat.size_diff >= 200 * 1024
+            for stat in snapshot["growth"]
+        )
+        assert len(retained) == 200
+
+    def test_snapshot_requires_tracing(self):
+        """测试未开启追踪时获取快照报错"""
+        with pytest.raises(ValueError, match="PROFILER_NOT_STARTED"):
+            MemoryProfiler().snapshot()
+
+
+class TestAdminEndpoints:
+    """诊断接口测试"""
+
+    def test_profile_requires_admin(self, client):
+        """测试普通用户无权访问诊断接口"""
+        response = client.get("/api/admin/profile", headers=USER_HEADERS)
+
+        assert response.status_code == 403
+
+    def test_profile_returns_collapsed_file(self, client):
+        """测试管理员获取折叠栈附件"""
+        response = client.get(
+            "/api/admin/profile",
+            params={"seconds": 0.1, "interval_ms": 5, "include_idle": True},
+            headers=ADMIN_HEADERS
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Disposition"].endswith(".collapsed")
+        assert int(response.headers["X-Profile-Samples"]) > 0
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+    def test_tracemalloc_lifecycle(self, client):
+        """测试内存追踪开启、快照、停止"""
+        snapshot_url = "/api/admin/tracemalloc/snapshot"
+        assert client.get(snapshot_url, headers=ADMIN_HEADERS).status_code == 409
+
+        started = client.post("/api/admin/tracemalloc/start", headers=ADMIN_HEADERS)
+        snapshot = client.get(snapshot_url, params={"limit": 3}, headers=ADMIN_HEADERS)
+        stopped = client.post("/api/admin/tracemalloc/stop", headers=ADMIN_HEADERS)
+
+        assert started.json() == {"tracing": True}
+        assert snapshot.status_code == 200
+        assert len(snapshot.json()["top"]) <= 3
+        assert stopped.json() == {"tracing": False}
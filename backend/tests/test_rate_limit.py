@@ -0,0 +1,161 @@
+"""Tests for per-user rate limiting"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.auth import User, auth_middleware
+from app.middleware.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimit,
+    RateLimitBackend,
+    RateLimitMiddleware,
+    classify_route
+)
+
+
+AUTH_HEADERS = {"Authorization": "Bearer test-token-123"}
+ADMIN_HEADERS = {"Authorization": "Bearer admin-token-456"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client():
+    """限流中间件位于认证之内的测试应用"""
+    app = FastAPI()
+
+    @app.get("/api/transactions")
+    async def transactions():
+        return {"data": []}
+
+    @app.get("/api/cash-flows/{cash_flow_id}/progress")
+    async def progress(cash_flow_id: str):
+        return {"id": cash_flow_id}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits={"query": RateLimit(rate=0.001, burst=2), "progress": RateLimit(rate=0.001, burst=1)}
+    )
+    auth_middleware(app)
+    return TestClient(app)
+
+
+class TestTokenBucket:
+    """令牌桶测试"""
+
+    def test_burst_then_refill(self):
+        """测试突发额度用尽后按速率补充"""
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(clock=clock)
+        limit = RateLimit(rate=2.0, burst=2)
+
+        assert backend.try_acquire("u:query", limit) == 0
+        assert backend.try_acquire("u:query", limit) == 0
+        assert backend.try_acquire("u:query", limit) == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert backend.try_acquire("u:query", limit) == 0
+
+    def test_prune_keeps_bucket_count_bounded(self):
+        """测试超过上限时清理空闲令牌桶"""
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(max_keys=2, clock=clock)
+        limit = RateLimit(rate=1.0, burst=1)
+        backend.try_acquire("a", limit)
+        backend.try_acquire("b", limit)
+
+        clock.now = backend.IDLE_TTL + 1
+        backend.try_acquire("c", limit)
+
+        assert set(backend._buckets) == {"c"}
+
+    def test_concurrency_slots(self):
+        """测试并发名额占用与释放"""
+        backend = InMemoryRateLimitBackend()
+
+        async def scenario():
+            assert await backend.acquire_slot("u:export", 1)
+            assert not await backend.acquire_slot("u:export", 1)
+            await backend.release_slot("u:export")
+            return await backend.acquire_slot("u:export", 1)
+
+        assert asyncio.run(scenario())
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """测试未实现全部接口方法的存储在创建时即报错"""
+        class TokenOnlyBackend(RateLimitBackend):
+            async def acquire(self, key, limit):
+                return 0.0
+
+        with pytest.raises(TypeError, match="acquire_slot"):
+            TokenOnlyBackend()
+
+    @pytest.mark.parametrize("path,expected", [
+        ("/api/transactions", "query"),
+        ("/api/cash-flows/CF-1/progress", "progress"),
+        ("/api/export/cash-flows", "export"),
+        ("/health", None),
+    ])
+    def test_classify_route(self, path, expected):
+        """测试路由类别划分"""
+        assert classify_route(path) == expected
+
+
+class TestRateLimitMiddleware:
+    """限流中间件测试"""
+
+    def test_returns_429_with_retry_after(self, client):
+        """测试超出额度返回429和Retry-After"""
+        statuses = [client.get("/api/transactions", headers=AUTH_HEADERS).status_code for _ in range(3)]
+        response = client.get("/api/transactions", headers=AUTH_HEADERS)
+
+        assert statuses == [200, 200, 429]
+        assert response.json()["code"] == "RATE_LIMITED"
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_buckets_are_per_user_and_route_class(self, client):
+        """测试不同用户、不同路由类别分别计数"""
+        assert client.get("/api/cash-flows/CF-1/progress", headers=AUTH_HEADERS).status_code == 200
+        assert client.get("/api/cash-flows/CF-1/progress", headers=AUTH_HEADERS).status_code == 429
+        assert client.get("/api/cash-flows/CF-1/progress", headers=ADMIN_HEADERS).status_code == 200
+        assert client.get("/api/transactions", headers=AUTH_HEADERS).status_code == 200
+
+    def test_export_concurrency_cap(self):
+        """测试同一用户的并发导出数受限，导出结束后释放名额"""
+        backend = InMemoryRateLimitBackend()
+        responses = []
+
+        async def export_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        middleware = RateLimitMiddleware(export_app, limits={}, export_max_concurrent=1, backend=backend)
+
+        user = User("user-001", "test_user", [])
+
+        async def call():
+            scope = {"type": "http", "path": "/api/export/transactions", "state": {"user": user}}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    responses.append(message["status"])
+
+            await middleware(scope, None, send)
+
+        async def scenario():
+            assert await backend.acquire_slot("user-001:export:in_flight", 1)
+            await call()
+            await backend.release_slot("user-001:export:in_flight")
+            await call()
+
+        asyncio.run(scenario())
+        assert responses == [429, 200]
+        assert backend._slots == {}
@@ -0,0 +1,83 @@
+"""Tests for the compiled route permission table and permission bitmasks"""
+import re
+
+import pytest
+from fastapi.routing import APIRoute
+
+from app.main import app
+from app.middleware.auth import (
+    ALL_PERMISSIONS_MASK,
+    PERMISSION_BITS,
+    AuthMiddleware,
+    Permission,
+    RoutePermissionTable,
+    User
+)
+
+
+def _rules():
+    return AuthMiddleware(app=None)._get_required_permission
+
+
+def _concrete(template: str) -> str:
+    """把路由模板中的路径参数替换为示例值"""
+    return re.sub(r"\{[^}]+\}", "SAMPLE-1", template)
+
+
+class TestPermissionBits:
+    """权限位掩码测试"""
+
+    def test_each_permission_has_distinct_bit(self):
+        """测试每个权限对应唯一的一位"""
+        bits = list(PERMISSION_BITS.values())
+
+        assert len(set(bits)) == len(Permission)
+        assert all(bit & (bit - 1) == 0 for bit in bits)
+
+    def test_user_mask_checks(self):
+        """测试普通用户只具备授予的权限，管理员具备全部权限"""
+        user = User("u-1", "user", [Permission.QUERY_TRANSACTIONS])
+        admin = User("a-1", "admin", [Permission.ADMIN])
+
+        assert user.has_permission(Permission.QUERY_TRANSACTIONS)
+        assert not user.has_permission(Permission.EXPORT_CASH_FLOWS)
+        assert admin.permission_mask == ALL_PERMISSIONS_MASK
+        assert all(admin.has_permission(p) for p in Permission)
+
+
+class TestRoutePermissionTable:
+    """路由权限表测试"""
+
+    @pytest.fixture(scope="class")
+    def table(self):
+        return RoutePermissionTable.from_routes(app.routes, _rules())
+
+    def test_every_api_route_resolves(self, table):
+        """测试每个已注册API路由都能在编译表中解析出与规则一致的权限"""
+        api_routes = [
+            route for route in app.routes
+            if isinstance(route, APIRoute) and route.path.startswith("/api/")
+        ]
+        assert api_routes
+
+        for route in api_routes:
+            bit = table.match(_concrete(route.path))
+            assert bit, route.path
+            assert bit == PERMISSION_BITS[_rules()(route.path)], route.path
+
+    def test_static_segment_preferred_over_parameter(self):
+        """测试静态路径段优先于同层级的路径参数"""
+        table = RoutePermissionTable(
+            lambda path: Permission.ADMIN if "summary" in path else Permission.QUERY_EVENTS
+        )
+        table.add("/api/items/{item_id}/detail")
+        table.add("/api/items/summary/detail")
+
+        assert table.match("/api/items/summary/detail") == PERMISSION_BITS[Permission.ADMIN]
+        assert table.match("/api/items/X-1/detail") == PERMISSION_BITS[Permission.QUERY_EVENTS]
+        assert table.match("/api/items/X-1/other") is None
+
+    def test_unregistered_path_falls_back_to_rules(self, table):
+        """测试未注册路径按规则函数计算权限"""
+        assert table.match("/api/admin/unknown") is None
+        assert table.required_bit("/api/admin/unknown") == PERMISSION_BITS[Permission.ADMIN]
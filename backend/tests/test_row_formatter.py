@@ -0,0 +1,111 @@
+"""Tests for compiled row formatters"""
+import pytest
+from datetime import date, datetime
+
+from app.services.row_formatter import compile_row_formatter
+from app.services.export_service import ExportService
+from app.models.transaction import Transaction
+from app.models.cash_flow import CashFlow
+from app.models.enums import ProductType, MatchStatus, CashFlowStatus
+
+
+class TestRowFormatter:
+    """行格式化器测试"""
+
+    def test_headers_use_field_name_mapping(self):
+        """测试表头使用中文映射，未知字段保留原名"""
+        formatter = compile_row_formatter(
+            Transaction,
+            ['external_id', 'trade_date', 'unknown_field'],
+            ExportService.TRANSACTION_FIELD_NAMES
+        )
+
+        assert formatter.headers == ['外部流水号', '交易日', 'unknown_field']
+        assert len(formatter.columns) == 3
+
+    def test_converters_match_legacy_formatting(self):
+        """测试转换结果与逐字段判断的旧逻辑一致"""
+        formatter = compile_row_formatter(
+            Transaction,
+            ['entry_date', 'trade_date', 'product', 'confirmation_match_status', 'confirmation_number', 'unknown_field'],
+            ExportService.TRANSACTION_FIELD_NAMES
+        )
+
+        row = (
+            datetime(2026, 2, 27, 9, 30, 15, 123456),
+            date(2026, 2, 27),
+            ProductType.FX_SPOT,
+            None,
+            None,
+            None,
+        )
+
+        assert formatter.format_row(row) == [
+            '2026-02-27 09:30:15',
+            '2026-02-27',
+            ProductType.FX_SPOT.value,
+            '',
+            '',
+            '',
+        ]
+
+    def test_nullable_enum_keeps_value(self):
+        """测试可空枚举字段有值时输出枚举值"""
+        formatter = compile_row_formatter(
+            Transaction,
+            ['confirmation_match_status'],
+            ExportService.TRANSACTION_FIELD_NAMES
+        )
+
+        assert formatter.format_row((MatchStatus.MATCHED,)) == [MatchStatus.MATCHED.value]
+
+    def test_compiled_formatter_is_cached(self):
+        """测试相同字段列表复用编译结果"""
+        first = compile_row_formatter(
+            CashFlow, ExportService.CASH_FLOW_FIELDS, ExportService.CASH_FLOW_FIELD_NAMES
+        )
+        second = compile_row_formatter(
+            CashFlow, list(ExportService.CASH_FLOW_FIELDS), ExportService.CASH_FLOW_FIELD_NAMES
+        )
+
+        assert first is second
+
+    def test_formats_core_rows_from_database(self, db_session):
+        """测试直接格式化Core查询返回的行元组"""
+        from sqlalchemy import select
+
+        db_session.add(Transaction(
+            external_id='EXT-001',
+            transaction_id='TXN-001',
+            entry_date=datetime(2026, 2, 27, 10, 0, 0),
+            trade_date=datetime(2026, 2, 27),
+            value_date=datetime(2026, 2, 28),
+            maturity_date=datetime(2026, 3, 28),
+            account='ACC-001',
+            product=ProductType.FX_SPOT,
+            direction='BUY',
+            underlying='USD/CNY',
+            counterparty='Bank A',
+            status='EFFECTIVE',
+            back_office_status='CONFIRMED',
+            settlement_method='GROSS',
+            confirmation_type='SWIFT',
+            nature='Normal',
+            source='GIT',
+            operating_institution='BOCHK',
+            trader='Trader A',
+            version=1,
+            last_modified_by='system'
+        ))
+        db_session.commit()
+
+        formatter = compile_row_formatter(
+            Transaction,
+            ['external_id', 'trade_date', 'product', 'business_institution'],
+            ExportService.TRANSACTION_FIELD_NAMES
+        )
+        row = db_session.execute(select(*formatter.columns)).one()
+
+        assert formatter.format_row(row) == [
+            'EXT-001', '2026-02-27', ProductType.FX_SPOT.value, ''
+        ]
@@ -0,0 +1,144 @@
+"""Tests for local tracing"""
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.middleware.tracing import TracingMiddleware
+
+
+@pytest.fixture
+def span_file(tmp_path):
+    """启用追踪（不自动注入类），返回span文件读取函数"""
+    path = tmp_path / "spans.jsonl"
+
+    def enable(sample_rate=1.0):
+        tracing.setup_tracing(
+            enabled=True, file_path=str(path), sample_rate=sample_rate, auto_instrument=()
+        )
+
+    def read():
+        tracing.shutdown_tracing()
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    enable.read = read
+    yield enable
+    tracing.shutdown_tracing()
+
+
+class TestTracingDisabled:
+    """追踪关闭测试"""
+
+    def test_span_is_noop(self):
+        """测试关闭时返回空span且不报错"""
+        tracing.shutdown_tracing()
+
+        with tracing.span("noop") as span:
+            span.set_attribute("key", "value")
+
+        assert span is tracing.NON_RECORDING_SPAN
+        assert not span.sampled
+
+
+class TestTracingEnabled:
+    """追踪启用测试"""
+
+    def test_nested_spans_share_trace(self, span_file):
+        """测试嵌套span共享追踪ID并记录父span"""
+        span_file()
+        with tracing.span("parent", attributes={"rows": 3}):
+            with tracing.span("child"):
+                pass
+
+        child, parent = span_file.read()
+        assert child["traceId"] == parent["traceId"]
+        assert child["parentSpanId"] == parent["spanId"]
+        assert parent["parentSpanId"] == ""
+        assert parent["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
+        assert parent["endTimeUnixNano"] >= parent["startTimeUnixNano"]
+
+    def test_exception_marks_span_as_error(self, span_file):
+        """测试异常时span状态为错误"""
+        span_file()
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("RESOURCE_NOT_FOUND: 未找到")
+
+        (span,) = span_file.read()
+        assert span["status"]["code"] == tracing.STATUS_CODE_ERROR
+        assert "RESOURCE_NOT_FOUND" in span["status"]["message"]
+
+    def test_head_sampling_drops_whole_trace(self, span_file):
+        """测试根span未采样时整条链路都不记录"""
+        span_file(sample_rate=0.0)
+        with tracing.span("root") as root:
+            with tracing.span("child") as child:
+                pass
+
+        assert not root.sampled
+        assert not child.sampled
+        assert span_file.read() == []
+
+    def test_traced_decorator_supports_sync_and_async(self, span_file):
+        """测试装饰器支持同步和异步函数"""
+        @tracing.traced()
+        def compute(value):
+            return value * 2
+
+        @tracing.traced("custom.name")
+        async def compute_async(value):
+            return value + 1
+
+        span_file()
+        assert compute(2) == 4
+        assert asyncio.run(compute_async(2)) == 3
+
+        names = [span["name"] for span in span_file.read()]
+        assert names[0].endswith("compute")
+        assert names[1] == "custom.name"
+
+    def test_instrument_class_wraps_public_methods(self, span_file):
+        """测试类注入只包装公开的普通方法"""
+        class SampleRepository:
+            def find(self):
+                return self._helper()
+
+            def _helper(self):
+                return "found"
+
+            def stream(self):
+                yield 1
+
+        tracing.instrument_class(SampleRepository)
+        span_file()
+        repository = SampleRepository()
+        assert repository.find() == "found"
+        assert list(repository.stream()) == [1]
+
+        assert [span["name"] for span in span_file.read()] == ["SampleRepository.find"]
+
+    def test_middleware_creates_server_span(self, span_file):
+        """测试中间件按路由模板创建根span并返回追踪ID"""
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: str):
+            with tracing.span("load"):
+                return {"id": item_id}
+
+        app.add_middleware(TracingMiddleware)
+        span_file()
+        response = TestClient(app).get("/items/A-1")
+
+        spans = span_file.read()
+        server = next(s for s in spans if s["kind"] == tracing.SPAN_KIND_SERVER)
+        load = next(s for s in spans if s["name"] == "load")
+        assert server["name"] == "GET /items/{item_id}"
+        assert response.headers["X-Trace-Id"] == server["traceId"]
+        assert load["parentSpanId"] == server["spanId"]
+        assert {"key": "http.status_code", "value": {"intValue": "200"}} in server["attributes"]